@@ -6,19 +6,21 @@ from ag_ui_langgraph import add_langgraph_fastapi_endpoint
 from ag_ui_langgraph.agent import CompiledStateGraph
 from copilotkit import LangGraphAGUIAgent
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from psycopg import Error
 
 from database.config import db_settings
 from database.session import CheckpointerDep, db_lifespan, get_checkpointer
 from nutrition_agent import make_graph
+from src.shared import metrics, summarize_usage
 
 load_dotenv()
 
 
 def _register_agent(app: FastAPI, graph: CompiledStateGraph) -> None:
     """Register the nutrition agent AG-UI endpoint on the app."""
+    app.state.graph = graph
     add_langgraph_fastapi_endpoint(
         app=app,
         agent=LangGraphAGUIAgent(
@@ -82,6 +84,25 @@ async def health_checkpointer(checkpointer: CheckpointerDep) -> dict:
         }
 
 
+@app.get("/metrics")  # type: ignore[misc]
+async def get_metrics() -> dict:
+    """Snapshot of this worker's in-process metrics (LLM scheduler, caches...)."""
+    return metrics.snapshot()
+
+
+@app.get("/threads/{thread_id}/usage")
+async def get_thread_usage(thread_id: str, request: Request) -> dict:
+    """Token usage and estimated cost of a thread, per run and per node."""
+    graph: CompiledStateGraph = request.app.state.graph
+    snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+    if not snapshot.values:
+        raise HTTPException(status_code=404, detail=f"Thread '{thread_id}' not found")
+    return {
+        "thread_id": thread_id,
+        **summarize_usage(snapshot.values.get("token_usage", [])),
+    }
+
+
 def main() -> None:
     """Run the uvicorn server."""
     uvicorn.run(
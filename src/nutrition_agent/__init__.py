@@ -16,6 +16,21 @@ Usage:
     custom_graph = make_graph(checkpointer=my_checkpointer)
 """
 
-from src.nutrition_agent.graph import graph, make_graph
+from typing import Any
 
 __all__ = ["graph", "make_graph"]
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily import the graph (PEP 562).
+
+    Importing the compiled graph eagerly would create an import cycle with
+    src.shared.tools, which needs src.nutrition_agent.models at import time.
+    """
+    if name in __all__:
+        from src.nutrition_agent.graph import graph, make_graph
+
+        # Rebind over the `graph` submodule attribute set by the import system
+        globals().update(graph=graph, make_graph=make_graph)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
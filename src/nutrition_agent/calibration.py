@@ -0,0 +1,159 @@
+"""Online calibration of systematic LLM kcal bias per model and meal slot.
+
+Models tend to miss the kcal target stated in the prompt in a consistent
+direction for a given slot (e.g. overshooting Cena, undershooting Snack AM).
+Each miss costs a retry in the generation loop. The calibrator learns that
+bias from every generated meal and pre-adjusts the target stated in the
+prompt so the first attempt lands inside tolerance more often:
+
+    bias   = EWMA(produced kcal / stated kcal)   per (model, slot)
+    stated = target / bias                       (clamped to ±MAX_ADJUSTMENT)
+
+Acceptance is still checked against the real target; only the number shown
+to the LLM changes. A slot is adjusted once it has MIN_SAMPLES observations.
+The last meal of the day asks for the exact remaining budget, so it is
+neither adjusted nor recorded.
+
+Metrics:
+- kcal_calibration_bias{model, slot} (gauge)
+- meal_first_attempt_total{model, slot, outcome=pass|fail}
+  (first-attempt pass rate = pass / all outcomes)
+
+Configuration (environment):
+    NUTRITION_KCAL_CALIBRATION: on | off (default: on)
+    NUTRITION_KCAL_CALIBRATION_ALPHA: EWMA smoothing factor (default: 0.2)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+
+from src.shared.metrics import metrics
+
+DEFAULT_ALPHA = 0.2
+# Observations per (model, slot) before the stated target is adjusted
+MIN_SAMPLES = 3
+# Largest relative change applied to the stated target (±15%)
+MAX_ADJUSTMENT = 0.15
+
+
+@dataclass
+class _BiasEstimate:
+    """Running produced/stated ratio for one (model, slot)."""
+
+    ratio: float = 1.0
+    samples: int = 0
+
+
+class KcalCalibrator:
+    """Learns per (model, slot) kcal bias and adjusts stated targets.
+
+    Args:
+        alpha: EWMA smoothing factor (weight of the newest observation)
+        min_samples: Observations required before adjusting
+        max_adjustment: Largest relative change of the stated target
+        enabled: When False, targets are never adjusted (still records)
+    """
+
+    def __init__(
+        self,
+        alpha: float = DEFAULT_ALPHA,
+        min_samples: int = MIN_SAMPLES,
+        max_adjustment: float = MAX_ADJUSTMENT,
+        enabled: bool = True,
+    ) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.max_adjustment = max_adjustment
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._estimates: dict[tuple[str, str], _BiasEstimate] = {}
+
+    @classmethod
+    def from_env(cls) -> KcalCalibrator:
+        """Build the calibrator from NUTRITION_KCAL_CALIBRATION(_ALPHA)."""
+        return cls(
+            alpha=float(
+                os.getenv("NUTRITION_KCAL_CALIBRATION_ALPHA") or str(DEFAULT_ALPHA)
+            ),
+            enabled=os.getenv("NUTRITION_KCAL_CALIBRATION", "on").lower() != "off",
+        )
+
+    def bias(self, model: str, slot: str) -> float:
+        """Current produced/stated ratio (1.0 until MIN_SAMPLES are seen)."""
+        with self._lock:
+            estimate = self._estimates.get((model, slot))
+            if estimate is None or estimate.samples < self.min_samples:
+                return 1.0
+            return estimate.ratio
+
+    def stated_target(self, model: str, slot: str, target_kcal: float) -> float:
+        """Target to state in the prompt so the model produces `target_kcal`.
+
+        Args:
+            model: Model that will serve the call
+            slot: Meal slot (meal_distribution key)
+            target_kcal: Calories the meal must actually have
+
+        Returns:
+            target_kcal corrected for the learned bias
+        """
+        if not self.enabled:
+            return target_kcal
+        factor = 1.0 / self.bias(model, slot)
+        factor = min(max(factor, 1 - self.max_adjustment), 1 + self.max_adjustment)
+        return target_kcal * factor
+
+    def record(
+        self, model: str, slot: str, stated_kcal: float, produced_kcal: float
+    ) -> None:
+        """Update the bias estimate with one generated meal.
+
+        Args:
+            model: Model that produced the meal
+            slot: Meal slot
+            stated_kcal: Target stated in the prompt
+            produced_kcal: total_calories of the generated meal
+        """
+        if stated_kcal <= 0 or produced_kcal <= 0:
+            return
+        ratio = produced_kcal / stated_kcal
+        with self._lock:
+            estimate = self._estimates.setdefault((model, slot), _BiasEstimate())
+            if estimate.samples == 0:
+                estimate.ratio = ratio
+            else:
+                estimate.ratio += self.alpha * (ratio - estimate.ratio)
+            estimate.samples += 1
+            current = estimate.ratio
+        metrics.set_gauge("kcal_calibration_bias", current, model=model, slot=slot)
+
+    def reset(self) -> None:
+        """Forget every estimate (used by tests)."""
+        with self._lock:
+            self._estimates.clear()
+
+
+def record_first_attempt(model: str, slot: str, passed: bool) -> None:
+    """Count whether the first generation attempt for a slot was accepted."""
+    metrics.increment(
+        "meal_first_attempt_total",
+        model=model,
+        slot=slot,
+        outcome="pass" if passed else "fail",
+    )
+
+
+_calibrator: KcalCalibrator | None = None
+
+
+def get_kcal_calibrator() -> KcalCalibrator:
+    """Get or create the process-wide calibrator singleton."""
+    global _calibrator
+    if _calibrator is None:
+        _calibrator = KcalCalibrator.from_env()
+    return _calibrator
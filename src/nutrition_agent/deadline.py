@@ -0,0 +1,74 @@
+"""Per-run deadline helpers for the nutrition agent.
+
+A run (one client invocation of the graph) has a wall-clock time budget so
+that retry loops (MAX_ATTEMPTS per meal × MAX_VALIDATION_RETRIES) can never
+outlive gunicorn's --timeout 120. The deadline is an absolute epoch timestamp:
+
+- Started by the node that begins a run: data_collection (new plan) and
+  meal_review_batch (resume after HITL)
+- Stored in state["run_deadline"] so it survives checkpointing
+- Overridable per invocation via config["configurable"]["run_deadline"]
+  or config["configurable"]["run_budget_s"]
+
+Generation helpers stop retrying when the deadline is near and return their
+best candidate; route_after_validation then goes straight to HITL review.
+
+Configuration (environment):
+    NUTRITION_RUN_BUDGET_S: Seconds per run (default: 90)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+
+RUN_BUDGET_SECONDS = float(os.getenv("NUTRITION_RUN_BUDGET_S", "90"))
+# Time reserved after generation for validation and the review payload
+DEADLINE_MARGIN_SECONDS = 5.0
+
+
+def _configurable(config: RunnableConfig | None) -> dict[str, Any]:
+    return dict((config or {}).get("configurable") or {})
+
+
+def start_run_deadline(config: RunnableConfig | None = None) -> float:
+    """Absolute deadline (epoch seconds) for a run starting now.
+
+    Args:
+        config: Node config; configurable.run_budget_s overrides the default
+
+    Returns:
+        time.time() + run budget
+    """
+    budget = _configurable(config).get("run_budget_s", RUN_BUDGET_SECONDS)
+    return time.time() + float(budget)
+
+
+def resolve_deadline(state: Any, config: RunnableConfig | None = None) -> float | None:
+    """Deadline for the current node: config override first, then state.
+
+    Returns:
+        Epoch deadline, or None if the run is unbounded
+    """
+    deadline = _configurable(config).get("run_deadline")
+    if deadline is None:
+        deadline = state.get("run_deadline")
+    return float(deadline) if deadline is not None else None
+
+
+def seconds_left(deadline: float | None) -> float | None:
+    """Seconds until `deadline` (negative if passed, None if unbounded)."""
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def deadline_exceeded(
+    deadline: float | None, margin: float = DEADLINE_MARGIN_SECONDS
+) -> bool:
+    """True when less than `margin` seconds remain before `deadline`."""
+    remaining = seconds_left(deadline)
+    return remaining is not None and remaining <= margin
@@ -0,0 +1,273 @@
+"""Deterministic enforcement of the user's excluded foods.
+
+excluded_foods reaches the LLM only as prompt text, so a violation used to
+surface in the HITL review and cost a full review + regeneration round.
+The generation pre-validation loops now check every Meal with an
+ExclusionMatcher and retry a violating meal immediately.
+
+Each user's exclusions are compiled once (get_exclusion_matcher is
+memoized) into a single regex alternation over every term:
+
+- Text is compared lowercased and without accents ("Lácteos" == "lacteos")
+- Group names expand to their members via FOOD_SYNONYMS
+  ("lácteos" -> leche, queso, yogur, ...)
+- Terms match whole words, singular or plural ("gamba" matches "gambas")
+- Compound qualifiers name another food and cancel the term: plant-based
+  dairy ("leche de avena"), gluten-free flours ("pasta de arroz") and
+  poultry cold cuts ("jamón de pavo")
+- A negated exclusion cancels it for the whole ingredient ("pan sin
+  gluten", "leche libre de lactosa"); a negated member only cancels itself
+
+Metrics:
+- exclusion_checks_total{outcome=pass|violation}
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+
+from src.nutrition_agent.models import Meal
+from src.shared.metrics import metrics
+
+
+def normalize_food(text: str) -> str:
+    """Lowercase and strip accents ("Lácteos" -> "lacteos")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).strip()
+
+
+_DAIRY = (
+    "leche",
+    "queso",
+    "yogur",
+    "yogurt",
+    "nata",
+    "mantequilla",
+    "kefir",
+    "requeson",
+    "cuajada",
+    "mozzarella",
+    "parmesano",
+    "ricotta",
+    "suero de leche",
+)
+_GLUTEN = (
+    "trigo",
+    "cebada",
+    "centeno",
+    "espelta",
+    "pan",
+    "pasta",
+    "espagueti",
+    "macarron",
+    "harina de trigo",
+    "cuscus",
+    "seitan",
+    "bulgur",
+    "galleta",
+)
+_SHELLFISH = (
+    "marisco",
+    "gamba",
+    "langostino",
+    "mejillon",
+    "almeja",
+    "calamar",
+    "pulpo",
+    "sepia",
+    "cangrejo",
+    "bogavante",
+    "vieira",
+)
+_NUTS = (
+    "almendra",
+    "nuez",
+    "nueces",
+    "avellana",
+    "anacardo",
+    "pistacho",
+    "cacahuete",
+    "mani",
+    "pinon",
+    "macadamia",
+)
+_FISH = (
+    "merluza",
+    "salmon",
+    "atun",
+    "bacalao",
+    "sardina",
+    "boqueron",
+    "caballa",
+    "dorada",
+    "lubina",
+    "rape",
+    "trucha",
+)
+_PORK = (
+    "cerdo",
+    "jamon",
+    "bacon",
+    "beicon",
+    "chorizo",
+    "panceta",
+    "salchichon",
+    "morcilla",
+)
+
+# Group name (normalized) -> member terms (normalized)
+FOOD_SYNONYMS: dict[str, tuple[str, ...]] = {
+    "lacteos": _DAIRY,
+    "lacteo": _DAIRY,
+    "lactosa": _DAIRY,
+    "lactose": _DAIRY,
+    "dairy": _DAIRY,
+    "gluten": _GLUTEN,
+    "mariscos": _SHELLFISH,
+    "marisco": _SHELLFISH,
+    "shellfish": _SHELLFISH,
+    "frutos secos": _NUTS,
+    "nueces": _NUTS,
+    "nuts": _NUTS,
+    "pescado": _FISH,
+    "fish": _FISH,
+    "cerdo": _PORK,
+    "pork": _PORK,
+    "huevo": ("huevo", "clara de huevo", "yema"),
+    "soja": ("soja", "tofu", "tempeh", "edamame"),
+}
+
+# Qualifiers that make a term another food (allowlisted compounds)
+_PLANT_SOURCES = ("soja", "almendras?", "avena", "coco", "arroz", "cacahuetes?")
+_GLUTEN_FREE_SOURCES = ("arroz", "maiz", "quinoa", "legumbres", "lentejas", "garbanzos")
+_POULTRY_SOURCES = ("pavo", "pollo")
+
+
+def _qualifier(alternation: str) -> re.Pattern[str]:
+    return re.compile(rf"\s+(?:{alternation})\b")
+
+
+# "leche de avena", "pasta de arroz", "jamon de pavo", "trigo sarraceno"
+_PLANT_QUALIFIER = _qualifier(rf"vegetal|de\s+(?:{'|'.join(_PLANT_SOURCES)})")
+_GLUTEN_FREE_QUALIFIER = _qualifier(rf"de\s+(?:{'|'.join(_GLUTEN_FREE_SOURCES)})")
+_POULTRY_QUALIFIER = _qualifier(rf"de\s+(?:{'|'.join(_POULTRY_SOURCES)})")
+_COMPOUND_QUALIFIERS: dict[str, re.Pattern[str]] = {
+    **dict.fromkeys(_DAIRY, _PLANT_QUALIFIER),
+    **dict.fromkeys(("pan", "pasta", "espagueti", "macarron"), _GLUTEN_FREE_QUALIFIER),
+    **dict.fromkeys(("trigo", "harina de trigo"), _qualifier("sarraceno")),
+    **dict.fromkeys(("jamon", "bacon", "beicon", "chorizo"), _POULTRY_QUALIFIER),
+}
+
+# "sin gluten", "libre de lactosa": the term right after it is absent
+_NEGATION = re.compile(r"\b(?:sin|libre\s+de)\s+$")
+
+
+def _singular(term: str) -> tuple[str, ...]:
+    """Singular candidates of a plural exclusion ("almendras" -> "almendra")."""
+    if term.endswith("es") and len(term) > 4:
+        return (term[:-2], term[:-1])
+    if term.endswith("s") and len(term) > 3:
+        return (term[:-1],)
+    return ()
+
+
+@dataclass(frozen=True)
+class Violation:
+    """One excluded food found in a meal.
+
+    Attributes:
+        ingredient: Ingredient name as generated
+        exclusion: User exclusion it violates (as the user wrote it)
+    """
+
+    ingredient: str
+    exclusion: str
+
+
+class ExclusionMatcher:
+    """Single compiled matcher over all terms of a user's exclusions.
+
+    Args:
+        excluded_foods: UserProfile.excluded_foods
+    """
+
+    def __init__(self, excluded_foods: tuple[str, ...] | list[str]) -> None:
+        self._exclusion_for: dict[str, str] = {}
+        # Terms naming an exclusion itself ("gluten"), not one of its members
+        self._names: set[str] = set()
+        for food in excluded_foods:
+            key = normalize_food(food)
+            if not key:
+                continue
+            self._names.update((key, *_singular(key)))
+            for term in (key, *_singular(key), *FOOD_SYNONYMS.get(key, ())):
+                self._exclusion_for.setdefault(term, food)
+        self._pattern: re.Pattern[str] | None = None
+        if self._exclusion_for:
+            # Longest first so "harina de trigo" wins over "trigo"
+            terms = sorted(self._exclusion_for, key=len, reverse=True)
+            alternation = "|".join(re.escape(term) for term in terms)
+            self._pattern = re.compile(rf"\b({alternation})(?:e?s)?\b")
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def find(self, text: str) -> str | None:
+        """Exclusion violated by `text` (e.g. an ingredient name), if any."""
+        if self._pattern is None:
+            return None
+        normalized = normalize_food(text)
+        found: list[str] = []
+        negated: set[str] = set()
+        for match in self._pattern.finditer(normalized):
+            term = match.group(1)
+            exclusion = self._exclusion_for[term]
+            if _NEGATION.search(normalized, 0, match.start()):
+                # "pan sin gluten": nothing in the ingredient is gluten
+                if term in self._names:
+                    negated.add(exclusion)
+                continue
+            qualifier = _COMPOUND_QUALIFIERS.get(term)
+            if qualifier is not None and qualifier.match(normalized, match.end()):
+                continue
+            found.append(exclusion)
+        return next((e for e in found if e not in negated), None)
+
+    def violations(self, meal: Meal) -> list[Violation]:
+        """Excluded foods among the meal's ingredients.
+
+        Records exclusion_checks_total{outcome} when the user has exclusions.
+        """
+        if self._pattern is None:
+            return []
+        found = [
+            Violation(ingredient=ingredient.nombre, exclusion=exclusion)
+            for ingredient in meal.ingredients
+            if (exclusion := self.find(ingredient.nombre)) is not None
+        ]
+        metrics.increment(
+            "exclusion_checks_total", outcome="violation" if found else "pass"
+        )
+        return found
+
+
+@lru_cache(maxsize=1024)
+def _compiled(excluded_foods: tuple[str, ...]) -> ExclusionMatcher:
+    return ExclusionMatcher(excluded_foods)
+
+
+def get_exclusion_matcher(excluded_foods: list[str]) -> ExclusionMatcher:
+    """Matcher for a user's exclusions (compiled once per distinct list)."""
+    return _compiled(tuple(excluded_foods))
+
+
+def violation_feedback(violations: list[Violation]) -> str:
+    """Retry instruction naming the excluded ingredients that were used."""
+    used = ", ".join(f"{v.ingredient} ({v.exclusion})" for v in violations)
+    return (
+        f"The previous attempt used excluded foods: {used}. "
+        "Do NOT use them or any ingredient derived from them."
+    )
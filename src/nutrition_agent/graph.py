@@ -1,11 +1,14 @@
 """LangGraph StateGraph for the Nutrition Agent (Batch Architecture).
 
 This module defines the graph structure for the Plan-and-Execute nutrition agent:
-- 6 nodes: data_collection, calculation, recipe_generation_batch,
-           recipe_generation_single, validation, meal_review_batch
+- 7 nodes: data_collection, calculation, recipe_generation_batch,
+           recipe_generation_single, recipe_generation_targeted, validation,
+           meal_review_batch
 - Conditional edges for routing based on state
 - HITL support via interrupt() in meal_review_batch
 - Validation runs BEFORE HITL so humans only review validated meals
+- calculation and validation results are cached by their state inputs
+  (see node_cache.py)
 
 Graph Flow:
     START → data_collection ←──┐ (loop if missing fields)
@@ -17,33 +20,44 @@ Graph Flow:
     recipe_generation_batch ◄──────────────────┐
                 │                              │
                 ▼                              │
-           validation ─────────────────────────┤ (multi-fail → batch)
+           validation ─────────────────────────┤ (no slot to target → batch)
                 │           │                  │
-                │      (single fail)           │
+                │      (1 slot / 2+ slots)     │
                 │           ↓                  │
-                │   recipe_generation_single ──┘
+                │   recipe_generation_single ──┤
+                │   recipe_generation_targeted ┘
                 │
-                ▼  (pass / retries exceeded)
+                ▼  (pass / retries exceeded / deadline)
        meal_review_batch
                 │
-        ┌───────┼──────────────────────┐
-        │       │                      │
-     approve  change_meal        regenerate_all
-        │       ↓                      │
-        ▼   recipe_gen_single    recipe_gen_batch
+        ┌───────┼──────────────┬───────────────────┐
+        │       │              │                   │
+     approve  change_meal   change_meals     regenerate_all
+        │       ↓              ↓                   │
+        ▼   recipe_gen_single  recipe_gen_targeted recipe_gen_batch
        END
 """
 
 from ag_ui_langgraph.agent import CompiledStateGraph
+from langchain_core.runnables import RunnableConfig
+from langgraph.cache.base import BaseCache
 from langgraph.graph import END, StateGraph
 from langgraph.types import Checkpointer
 
+from src.nutrition_agent.deadline import deadline_exceeded, resolve_deadline
+from src.nutrition_agent.node_cache import (
+    calculation_cache_key,
+    get_node_cache,
+    node_cache_policy,
+    validation_cache_key,
+)
 from src.nutrition_agent.nodes import (
     calculation,
     data_collection,
     meal_review_batch,
     recipe_generation_batch,
     recipe_generation_single,
+    recipe_generation_targeted,
     validation,
 )
 from src.nutrition_agent.state import NutritionAgentState
@@ -63,13 +77,17 @@ def route_after_data_collection(state: NutritionAgentState) -> str:
 MAX_VALIDATION_RETRIES = 2
 
 
-def route_after_validation(state: NutritionAgentState) -> str:
+def route_after_validation(
+    state: NutritionAgentState, config: RunnableConfig | None = None
+) -> str:
     """Route after validation: pass → HITL, fail → targeted regen.
 
     Returns:
-        - "meal_review_batch" if valid or retries exceeded
+        - "meal_review_batch" if valid, retries exceeded or run deadline near
+          (validation attaches degradation meal_notices for the review)
         - "recipe_generation_single" if exactly 1 meal failed
-        - "recipe_generation_batch" if multiple failures
+        - "recipe_generation_targeted" if 2+ meals failed (only those regenerate)
+        - "recipe_generation_batch" if no failing slot was identified
     """
     errors = state.get("validation_errors", [])
     retry_count = state.get("validation_retry_count", 0)
@@ -80,9 +98,16 @@ def route_after_validation(state: NutritionAgentState) -> str:
     if retry_count >= MAX_VALIDATION_RETRIES:
         return "meal_review_batch"
 
+    # Bounded latency: no time left for auto-fix, deliver the degraded plan
+    if deadline_exceeded(resolve_deadline(state, config)):
+        return "meal_review_batch"
+
     if state.get("selected_meal_to_change"):
         return "recipe_generation_single"
 
+    if state.get("failed_meals"):
+        return "recipe_generation_targeted"
+
     return "recipe_generation_batch"
 
 
@@ -92,11 +117,13 @@ def route_after_meal_review_batch(state: NutritionAgentState) -> str:
     Returns:
         - END if approved
         - "recipe_generation_single" if changing one meal
+        - "recipe_generation_targeted" if changing several meals
         - "recipe_generation_batch" if regenerating all
     """
     routes = {
         "approve": str(END),
         "change_meal": "recipe_generation_single",
+        "change_meals": "recipe_generation_targeted",
         "regenerate_all": "recipe_generation_batch",
     }
     return routes.get(state.get("review_decision") or "", str(END))
@@ -105,13 +132,22 @@ def route_after_meal_review_batch(state: NutritionAgentState) -> str:
 # Build the graph
 builder = StateGraph(NutritionAgentState)
 
-# Add nodes (6 total for batch architecture)
+# Add nodes (7 total for batch architecture)
 builder.add_node("data_collection", data_collection)
-builder.add_node("calculation", calculation)
+builder.add_node(
+    "calculation",
+    calculation,
+    cache_policy=node_cache_policy(calculation_cache_key),
+)
 builder.add_node("recipe_generation_batch", recipe_generation_batch)
 builder.add_node("recipe_generation_single", recipe_generation_single)
+builder.add_node("recipe_generation_targeted", recipe_generation_targeted)
 builder.add_node("meal_review_batch", meal_review_batch)
-builder.add_node("validation", validation)
+builder.add_node(
+    "validation",
+    validation,
+    cache_policy=node_cache_policy(validation_cache_key),
+)
 
 # Set entry point
 builder.set_entry_point("data_collection")
@@ -125,9 +161,10 @@ builder.add_conditional_edges(
 
 builder.add_edge("calculation", "recipe_generation_batch")
 
-# Both generation nodes route to validation (validation before HITL)
+# All generation nodes route to validation (validation before HITL)
 builder.add_edge("recipe_generation_batch", "validation")
 builder.add_edge("recipe_generation_single", "validation")
+builder.add_edge("recipe_generation_targeted", "validation")
 
 builder.add_conditional_edges(
     "validation",
@@ -135,6 +172,7 @@ builder.add_conditional_edges(
     {
         "meal_review_batch": "meal_review_batch",
         "recipe_generation_single": "recipe_generation_single",
+        "recipe_generation_targeted": "recipe_generation_targeted",
         "recipe_generation_batch": "recipe_generation_batch",
     },
 )
@@ -145,14 +183,25 @@ builder.add_conditional_edges(
     {
         END: END,
         "recipe_generation_single": "recipe_generation_single",
+        "recipe_generation_targeted": "recipe_generation_targeted",
         "recipe_generation_batch": "recipe_generation_batch",
     },
 )
 
 
-def make_graph(checkpointer: Checkpointer = None) -> CompiledStateGraph:
-    """Compile the nutrition agent graph with an optional checkpointer."""
-    return builder.compile(checkpointer=checkpointer)
+def make_graph(
+    checkpointer: Checkpointer = None, cache: BaseCache | None = None
+) -> CompiledStateGraph:
+    """Compile the nutrition agent graph with an optional checkpointer.
+
+    Args:
+        checkpointer: State persistence (None for langgraph dev / CLI)
+        cache: Node result cache (default: NUTRITION_NODE_CACHE_BACKEND)
+    """
+    return builder.compile(
+        checkpointer=checkpointer,
+        cache=cache if cache is not None else get_node_cache(),
+    )
 
 
 # Default for langgraph dev / CLI (mode 1: no checkpointer needed)
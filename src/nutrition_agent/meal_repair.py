@@ -0,0 +1,300 @@
+"""Local repair of structured meal output before Meal validation.
+
+The generation nodes request the Meal JSON schema as a plain dict
+(MEAL_OUTPUT_SCHEMA) so a response that breaks a Meal constraint is not
+thrown away by the structured-output parser. repair_meal() fixes the
+mechanical problems deterministically and only then validates:
+
+- total_calories: recomputed from the ingredient kcal sum (±0.5 kcal)
+- ingredients over 1500 kcal or 2000 g: split into equal portions
+- numeric strings ("330 kcal", "200g"): parsed to floats
+- title / description too short: built from the slot, title and ingredients
+- text fields too long: truncated at a word boundary
+- missing cantidad_display: "<peso_gramos>g"
+- missing or string preparation: split into steps or a default step
+- meal_time with other casing or missing: matched against MealTime
+- empty alternative: None
+
+When the requested slot is a MealSlot (a meal_distribution key), the meal is
+bound to it: `slot` is set and `meal_time` becomes the slot's category.
+
+Whatever is still invalid (no ingredients, a meal over 2000 kcal, an unknown
+meal time) is a semantic failure: pydantic's ValidationError propagates and
+the caller retries the LLM.
+
+Metrics:
+- meal_repair_total{outcome=clean|repaired|failed}
+- meal_repair_fixes_total{fix}
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from typing import Any
+
+from pydantic import ValidationError
+
+from src.nutrition_agent.models import Meal
+from src.shared.enums import MealSlot, MealTime
+from src.shared.metrics import metrics
+
+
+def _output_schema() -> dict[str, Any]:
+    """Meal JSON schema without `slot` (bound by the nodes, not the LLM)."""
+    schema = Meal.model_json_schema()
+    schema["properties"].pop("slot", None)
+    schema["$defs"].pop("MealSlot", None)
+    return schema
+
+
+# Schema passed to with_structured_output: the LLM sees the same contract as
+# Meal, but the response comes back as a dict for repair_meal()
+MEAL_OUTPUT_SCHEMA: dict[str, Any] = _output_schema()
+
+# Limits mirrored from the Meal / Ingredient field constraints
+MAX_INGREDIENT_KCAL = 1500.0
+MAX_INGREDIENT_GRAMS = 2000.0
+KCAL_SUM_TOLERANCE = 0.5
+TITLE_MIN, TITLE_MAX = 5, 150
+DESCRIPTION_MIN, DESCRIPTION_MAX = 10, 500
+NOMBRE_MAX = 100
+CANTIDAD_MAX = 50
+DEFAULT_PREPARATION = "Preparar los ingredientes y servir"
+
+_NUMBER = re.compile(r"-?\d+(?:[.,]\d+)?")
+_STEP_PREFIX = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+
+
+def _to_float(value: Any) -> tuple[Any, bool]:
+    """Parse "330 kcal" / "200,5g" into a float. Returns (value, changed)."""
+    if isinstance(value, int | float):
+        return value, False
+    if isinstance(value, str):
+        match = _NUMBER.search(value)
+        if match:
+            return float(match.group().replace(",", ".")), True
+    return value, False
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to `limit` characters, at the last word boundary when possible."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0].rstrip(" ,.;:")
+    return cut if len(cut) >= limit // 2 else text[:limit]
+
+
+def _match_meal_time(value: Any) -> str | None:
+    """Case-insensitive match against MealTime values ("snack am" -> Snack)."""
+    if not isinstance(value, str):
+        return None
+    normalized = value.strip().lower()
+    for meal_time in MealTime:
+        if normalized == meal_time.value.lower():
+            return meal_time.value
+    for meal_time in MealTime:
+        if normalized.startswith(meal_time.value.lower()):
+            return meal_time.value
+    return None
+
+
+def _split_steps(text: str) -> list[str]:
+    """Split a preparation string into steps (lines or sentences)."""
+    parts = text.splitlines() if "\n" in text else re.split(r"(?<=\.)\s+", text)
+    return [_STEP_PREFIX.sub("", part).strip() for part in parts if part.strip()]
+
+
+def _repair_ingredient(raw: Any, fixes: set[str]) -> list[Any]:
+    """Repair one ingredient; oversized ones are split into equal portions."""
+    if not isinstance(raw, dict):
+        return [raw]
+    ingredient = dict(raw)
+    for field in ("kcal", "peso_gramos"):
+        ingredient[field], changed = _to_float(ingredient.get(field))
+        if changed:
+            fixes.add("numeric_string")
+
+    nombre = ingredient.get("nombre")
+    if isinstance(nombre, str):
+        stripped = _truncate(nombre.strip(), NOMBRE_MAX)
+        if stripped != nombre:
+            ingredient["nombre"] = stripped
+            fixes.add("truncate")
+
+    cantidad = ingredient.get("cantidad_display")
+    peso = ingredient.get("peso_gramos")
+    if (not isinstance(cantidad, str) or not cantidad.strip()) and isinstance(
+        peso, float | int
+    ):
+        ingredient["cantidad_display"] = f"{peso:g}g"
+        fixes.add("default_cantidad")
+    elif isinstance(cantidad, str) and len(cantidad) > CANTIDAD_MAX:
+        ingredient["cantidad_display"] = _truncate(cantidad, CANTIDAD_MAX)
+        fixes.add("truncate")
+
+    kcal = ingredient.get("kcal")
+    if not isinstance(kcal, float | int) or not isinstance(peso, float | int):
+        return [ingredient]
+    if kcal < 0 or peso < 0:
+        return [ingredient]  # Semantic: leave it to validation
+    portions = max(
+        math.ceil(kcal / MAX_INGREDIENT_KCAL), math.ceil(peso / MAX_INGREDIENT_GRAMS)
+    )
+    if portions <= 1:
+        return [ingredient]
+
+    fixes.add("split_ingredient")
+    portion_grams = round(peso / portions, 1)
+    return [
+        {
+            **ingredient,
+            "kcal": round(kcal / portions, 1),
+            "peso_gramos": portion_grams,
+            "cantidad_display": f"{portion_grams:g}g",
+        }
+        for _ in range(portions)
+    ]
+
+
+def repair_meal_payload(
+    payload: Any, meal_time: str | None = None
+) -> tuple[Any, list[str]]:
+    """Apply the deterministic fixes to a raw meal payload.
+
+    Args:
+        payload: Structured output (dict, JSON string or Meal)
+        meal_time: Slot the meal was requested for (binds `slot` and
+            `meal_time` when it is a MealSlot)
+
+    Returns:
+        Tuple of (repaired payload, sorted names of the fixes applied).
+        Payloads that are not a JSON object are returned unchanged.
+    """
+    if isinstance(payload, Meal):
+        payload = payload.model_dump(mode="json")
+    elif isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except json.JSONDecodeError:
+            return payload, []
+    if not isinstance(payload, dict):
+        return payload, []
+
+    data = dict(payload)
+    fixes: set[str] = set()
+
+    # slot: bind the meal to the requested slot; its category is the meal_time
+    current = data.get("meal_time")
+    slot = MealSlot(meal_time) if meal_time and meal_time in MealSlot else None
+    if slot is not None:
+        data["slot"] = slot.value
+        matched: str | None = slot.meal_time.value
+    else:
+        # meal_time: normalize casing, fall back to the requested slot
+        matched = _match_meal_time(current) or _match_meal_time(meal_time)
+    if matched is not None and matched != current:
+        data["meal_time"] = matched
+        fixes.add("meal_time")
+
+    # ingredients: parse numbers, split oversized entries
+    ingredients = data.get("ingredients")
+    if isinstance(ingredients, list):
+        repaired: list[Any] = []
+        for ingredient in ingredients:
+            repaired.extend(_repair_ingredient(ingredient, fixes))
+        data["ingredients"] = repaired
+
+        kcals = [ing.get("kcal") for ing in repaired if isinstance(ing, dict)]
+        numeric = [k for k in kcals if isinstance(k, float | int)]
+        if kcals and len(numeric) == len(kcals):
+            kcal_sum = round(sum(numeric), 1)
+            total, changed = _to_float(data.get("total_calories"))
+            if changed:
+                fixes.add("numeric_string")
+            if (
+                not isinstance(total, float | int)
+                or abs(total - kcal_sum) > KCAL_SUM_TOLERANCE
+            ):
+                total = kcal_sum
+                fixes.add("total_calories")
+            data["total_calories"] = total
+
+    # title: pad short titles with the slot, truncate long ones
+    title = data.get("title")
+    title = title.strip() if isinstance(title, str) else ""
+    if len(title) < TITLE_MIN:
+        label = data.get("meal_time") or meal_time or "Comida"
+        title = f"{label} {title}".strip() if title else str(label)
+        if len(title) < TITLE_MIN:
+            title = f"{title} del dia"
+        fixes.add("title")
+    elif len(title) > TITLE_MAX:
+        title = _truncate(title, TITLE_MAX)
+        fixes.add("truncate")
+    data["title"] = title
+
+    # description: build from title + ingredient names when too short
+    description = data.get("description")
+    description = description.strip() if isinstance(description, str) else ""
+    if len(description) < DESCRIPTION_MIN:
+        names = [
+            ing["nombre"]
+            for ing in data.get("ingredients") or []
+            if isinstance(ing, dict) and isinstance(ing.get("nombre"), str)
+        ]
+        description = f"{title} con {', '.join(names)}" if names else f"{title} casero"
+        fixes.add("description")
+    if len(description) > DESCRIPTION_MAX:
+        description = _truncate(description, DESCRIPTION_MAX)
+        fixes.add("truncate")
+    data["description"] = description
+
+    # preparation: split strings into steps, drop blanks, default when empty
+    preparation = data.get("preparation")
+    if isinstance(preparation, str):
+        preparation = _split_steps(preparation)
+        fixes.add("preparation")
+    if isinstance(preparation, list):
+        steps = [s.strip() for s in preparation if isinstance(s, str) and s.strip()]
+        if len(steps) != len(preparation):
+            fixes.add("preparation")
+        preparation = steps
+    if not preparation:
+        preparation = [DEFAULT_PREPARATION]
+        fixes.add("preparation")
+    data["preparation"] = preparation
+
+    alternative = data.get("alternative")
+    if isinstance(alternative, str) and not alternative.strip():
+        data["alternative"] = None
+        fixes.add("alternative")
+
+    return data, sorted(fixes)
+
+
+def repair_meal(payload: Any, meal_time: str | None = None) -> Meal:
+    """Repair a structured meal response and validate it as a Meal.
+
+    Args:
+        payload: Structured output (dict, JSON string or Meal)
+        meal_time: Slot the meal was requested for
+
+    Returns:
+        Validated Meal (total_calories always matches the ingredient sum)
+
+    Raises:
+        ValidationError: Semantic failure that repair cannot fix; the
+            caller should retry the LLM
+    """
+    data, fixes = repair_meal_payload(payload, meal_time)
+    try:
+        meal = Meal.model_validate(data)
+    except ValidationError:
+        metrics.increment("meal_repair_total", outcome="failed")
+        raise
+    for fix in fixes:
+        metrics.increment("meal_repair_fixes_total", fix=fix)
+    metrics.increment("meal_repair_total", outcome="repaired" if fixes else "clean")
+    return meal
@@ -0,0 +1,141 @@
+"""Model routing policy: which model serves each LLM call site and meal slot.
+
+Simple work goes to a faster, cheaper model; main meals keep gpt-4o:
+
+- data_collection (profile extraction from chat): gpt-4o-mini
+- recipe_generation for snack slots (Snack AM, Snack PM, Recena): gpt-4o-mini
+- recipe_generation for every other slot: gpt-4o
+
+Routes are looked up as "<call_site>:<slot>" first, then "<call_site>",
+then the default model. After a validation failure (a pre-validation retry
+or a graph-level validation retry) the call escalates to the stronger model.
+
+Every call records per-route metrics so the policy can be tuned from data:
+- model_route_latency_seconds{route, model}
+- model_route_calls_total{route, model, outcome=pass|fail|error}
+  (pass rate = pass / all outcomes)
+
+Configuration (environment):
+    NUTRITION_MODEL_ROUTES: JSON object merged over the default routes,
+        e.g. {"recipe_generation:Snack PM": "gemini-2.5-flash"}
+    NUTRITION_ESCALATION_MODEL: Model used after a failure (default: gpt-4o)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+
+from src.shared.metrics import metrics
+
+DEFAULT_MODEL = "gpt-4o"
+ESCALATION_MODEL = "gpt-4o"
+
+DEFAULT_ROUTES: dict[str, str] = {
+    "data_collection": "gpt-4o-mini",
+    "recipe_generation": "gpt-4o",
+    "recipe_generation:Snack AM": "gpt-4o-mini",
+    "recipe_generation:Snack PM": "gpt-4o-mini",
+    "recipe_generation:Recena": "gpt-4o-mini",
+}
+
+ROUTE_OUTCOMES = ("pass", "fail", "error")
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Model selected for one call.
+
+    Attributes:
+        route: Route label for metrics ("<call_site>" or "<call_site>:<slot>")
+        model: Model name to pass to get_llm
+        escalated: Whether the stronger model replaced the routed one
+    """
+
+    route: str
+    model: str
+    escalated: bool = False
+
+
+class ModelRoutingPolicy:
+    """Maps call sites and meal slots to models.
+
+    Args:
+        routes: Route key -> model name
+        default_model: Model for call sites without a route
+        escalation_model: Model used when a call escalates
+    """
+
+    def __init__(
+        self,
+        routes: dict[str, str] | None = None,
+        default_model: str = DEFAULT_MODEL,
+        escalation_model: str = ESCALATION_MODEL,
+    ) -> None:
+        self.routes = dict(DEFAULT_ROUTES if routes is None else routes)
+        self.default_model = default_model
+        self.escalation_model = escalation_model
+
+    @classmethod
+    def from_env(cls) -> ModelRoutingPolicy:
+        """Build the policy from NUTRITION_MODEL_ROUTES / NUTRITION_ESCALATION_MODEL."""
+        routes = dict(DEFAULT_ROUTES)
+        overrides = os.getenv("NUTRITION_MODEL_ROUTES")
+        if overrides:
+            parsed = json.loads(overrides)
+            if not isinstance(parsed, dict):
+                raise ValueError("NUTRITION_MODEL_ROUTES must be a JSON object")
+            routes.update({str(k): str(v) for k, v in parsed.items()})
+        return cls(
+            routes=routes,
+            escalation_model=os.getenv("NUTRITION_ESCALATION_MODEL", ESCALATION_MODEL),
+        )
+
+    def route(
+        self, call_site: str, slot: str | None = None, *, escalate: bool = False
+    ) -> ModelRoute:
+        """Select the model for a call.
+
+        Args:
+            call_site: Logical caller (e.g. "data_collection", "recipe_generation")
+            slot: Meal slot for per-slot routes (e.g. "Snack PM")
+            escalate: Use the escalation model (after a validation failure)
+
+        Returns:
+            ModelRoute with the route label and model name
+        """
+        key = f"{call_site}:{slot}" if slot else call_site
+        model = self.routes.get(key) or self.routes.get(call_site) or self.default_model
+        if escalate and model != self.escalation_model:
+            return ModelRoute(route=key, model=self.escalation_model, escalated=True)
+        return ModelRoute(route=key, model=model)
+
+
+def record_route_result(route: ModelRoute, outcome: str, latency_s: float) -> None:
+    """Record latency and outcome of one routed call.
+
+    Args:
+        route: Route used for the call
+        outcome: "pass" (accepted), "fail" (rejected by validation) or "error"
+        latency_s: LLM call latency in seconds
+    """
+    if outcome not in ROUTE_OUTCOMES:
+        raise ValueError(f"Unknown route outcome '{outcome}'")
+    metrics.observe(
+        "model_route_latency_seconds", latency_s, route=route.route, model=route.model
+    )
+    metrics.increment(
+        "model_route_calls_total", route=route.route, model=route.model, outcome=outcome
+    )
+
+
+_policy: ModelRoutingPolicy | None = None
+
+
+def get_model_routing_policy() -> ModelRoutingPolicy:
+    """Get or create the process-wide routing policy singleton."""
+    global _policy
+    if _policy is None:
+        _policy = ModelRoutingPolicy.from_env()
+    return _policy
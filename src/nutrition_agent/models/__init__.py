@@ -10,18 +10,28 @@ from src.nutrition_agent.models.diet_plan import (
     Ingredient,
     Macronutrients,
     Meal,
+    MealCheck,
     MealNotice,
     ShoppingListItem,
+    ValidationCache,
 )
 from src.nutrition_agent.models.nutritional_targets import NutritionalTargets
-from src.nutrition_agent.models.user_profile import UserProfile
+from src.nutrition_agent.models.user_profile import (
+    REQUIRED_PROFILE_FIELDS,
+    PartialUserProfile,
+    UserProfile,
+)
 
 __all__ = [
     "UserProfile",
+    "PartialUserProfile",
+    "REQUIRED_PROFILE_FIELDS",
     "NutritionalTargets",
     "Ingredient",
     "Meal",
     "MealNotice",
+    "MealCheck",
+    "ValidationCache",
     "Macronutrients",
     "ShoppingListItem",
     "DietPlan",
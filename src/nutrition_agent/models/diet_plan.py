@@ -5,7 +5,7 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
-from src.shared.enums import MealTime
+from src.shared.enums import MealSlot, MealTime
 
 
 class Macronutrients(BaseModel):
@@ -86,6 +86,36 @@ class MealNotice(BaseModel):
     deviation_pct: float = Field(ge=0, le=100)
 
 
+class MealCheck(BaseModel):
+    """Cached per-meal budget check (see nodes/validation/incremental.py).
+
+    Reused while the meal content, its budget, the objective and the
+    tolerance rule that applied are unchanged.
+    """
+
+    budget: float
+    objective: str
+    # [relative, absolute_kcal] of the rule (empty in checks of older versions)
+    tolerance: list[float] = Field(default_factory=list)
+    kcal_sum: float
+    passed: bool
+    error_pct: float
+
+
+class ValidationCache(BaseModel):
+    """Per-meal validation results keyed by Meal content hash.
+
+    `totals` is the consolidated shopping list of the meals in `basis`
+    ("item|unit" -> quantity); it is updated by subtracting the contributions
+    of replaced meals and adding those of new meals.
+    """
+
+    checks: dict[str, MealCheck] = Field(default_factory=dict)
+    contributions: dict[str, dict[str, float]] = Field(default_factory=dict)
+    totals: dict[str, float] = Field(default_factory=dict)
+    basis: list[str] = Field(default_factory=list)
+
+
 class Ingredient(BaseModel):
     """Structured ingredient with nutritional data.
 
@@ -140,6 +170,11 @@ class Meal(BaseModel):
     Each meal includes structured ingredients with per-ingredient kcal,
     preparation steps, and caloric information.
 
+    `slot` binds the meal to its meal_distribution key (e.g. "Snack AM") and
+    is set by the generation nodes, never by the LLM. `meal_time` is only the
+    category (both snacks are MealTime.SNACK). Use `slot_key` to look up
+    budgets, notices and errors.
+
     Example:
         >>> meal = Meal(
         ...     meal_time=MealTime.DESAYUNO,
@@ -227,18 +262,32 @@ class Meal(BaseModel):
             "Filete de tilapia al horno como alternativa",
         ],
     )
+    slot: MealSlot | None = Field(
+        default=None,
+        description="Meal slot in the daily plan (meal_distribution key)",
+        examples=[MealSlot.DESAYUNO, MealSlot.SNACK_AM, MealSlot.CENA],
+    )
+
+    @property
+    def slot_key(self) -> str:
+        """meal_distribution key of this meal (meal_time for slotless meals)."""
+        return self.slot.value if self.slot is not None else self.meal_time.value
 
 
 class ShoppingListItem(BaseModel):
     """Individual shopping list item with quantity.
 
     Consolidated from all meals and used in DietPlan shopping_list.
-    Compatible with consolidate_shopping_list tool.
+    Built by consolidate_ingredients (structured) or parsed from the
+    consolidate_shopping_list tool output; `quantity` is the display string,
+    `amount` + `unit` the typed quantity.
 
     Example:
         >>> item = ShoppingListItem(
         ...     food="Huevo",
-        ...     quantity="18 unidades (1800g)"
+        ...     quantity="18 unidades (1800g)",
+        ...     amount=18.0,
+        ...     unit="unidad/es",
         ... )
     """
 
@@ -254,6 +303,17 @@ class ShoppingListItem(BaseModel):
         description="Quantity with unit (e.g., '200g', '1 litro', '6 unidades')",
         examples=["200g", "1 litro", "6 unidades", "1800g (18 unidades)"],
     )
+    amount: float | None = Field(
+        default=None,
+        ge=0,
+        description="Numeric quantity in `unit` (None when not measurable)",
+        examples=[200.0, 1000.0, 6.0],
+    )
+    unit: str | None = Field(
+        default=None,
+        description="Base unit of `amount`: 'g', 'ml' or 'unidad/es'",
+        examples=["g", "ml", "unidad/es"],
+    )
 
 
 class DietPlan(BaseModel):
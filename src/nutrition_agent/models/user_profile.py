@@ -72,3 +72,68 @@ class UserProfile(BaseModel):
         description="Number of meals per day (1-6, default: 3)",
         examples=[3, 4, 5],
     )
+
+
+# Fields the user must provide (the others have defaults)
+REQUIRED_PROFILE_FIELDS = (
+    "age",
+    "gender",
+    "weight",
+    "height",
+    "activity_level",
+    "objective",
+)
+
+
+class PartialUserProfile(BaseModel):
+    """UserProfile fields collected so far (incremental extraction).
+
+    Every field is optional with the same bounds as UserProfile. Each
+    data_collection turn extracts only what the new messages state and
+    merges it into the fields already known.
+    """
+
+    age: int | None = Field(
+        default=None, ge=18, le=100, description="User's age in years (18-100)"
+    )
+    gender: Literal["male", "female"] | None = Field(
+        default=None, description="Biological gender (male or female)"
+    )
+    weight: int | None = Field(
+        default=None, ge=30, le=300, description="Weight in kilograms (30-300 kg)"
+    )
+    height: int | None = Field(
+        default=None, ge=100, le=250, description="Height in centimeters (100-250 cm)"
+    )
+    activity_level: ActivityLevel | None = Field(
+        default=None, description="Physical activity level"
+    )
+    objective: Objective | None = Field(default=None, description="Nutrition objective")
+    diet_type: DietType | None = Field(
+        default=None, description="Diet type preference: normal or keto"
+    )
+    excluded_foods: list[str] | None = Field(
+        default=None,
+        description="Full updated list of foods to exclude (only if mentioned)",
+    )
+    number_of_meals: int | None = Field(
+        default=None, ge=1, le=6, description="Number of meals per day (1-6)"
+    )
+
+    def merge(self, update: "PartialUserProfile") -> "PartialUserProfile":
+        """Fields of `update` that are set override the known ones."""
+        return self.model_copy(update=update.model_dump(exclude_none=True))
+
+    def missing_fields(self) -> list[str]:
+        """Required fields not collected yet."""
+        return [
+            field for field in REQUIRED_PROFILE_FIELDS if getattr(self, field) is None
+        ]
+
+    def to_profile(self) -> UserProfile:
+        """Complete UserProfile (defaults for unset optional fields).
+
+        Raises:
+            ValidationError: If a required field is missing
+        """
+        return UserProfile(**self.model_dump(exclude_none=True))
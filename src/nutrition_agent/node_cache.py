@@ -0,0 +1,173 @@
+"""Result cache for the deterministic graph nodes (calculation, validation).
+
+calculation and validation are pure functions of a slice of the state, yet
+they run again on every revisit: validation after each regeneration round
+that left the plan unchanged, calculation after the profile is re-confirmed.
+Both nodes are registered with a LangGraph CachePolicy whose key is a hash
+of exactly the state they read, so a revisit with the same inputs returns
+the stored writes without running the node:
+
+- calculation: the UserProfile fields used by the formulas
+- validation: meal content hashes (meal_fingerprint), nutritional targets,
+  the profile fields it checks, meal_distribution, validation_retry_count,
+  whether the run deadline has passed, and the active tolerance rules
+
+The deadline is read from state["run_deadline"]: a per-invocation override
+(configurable.run_deadline) is not visible to cache keys.
+
+Backends (LangGraph caches, passed to builder.compile(cache=...)):
+- "memory": in-process (per gunicorn worker)
+- "sqlite": one SQLite file shared by workers on the same host
+  (needs the optional langgraph-checkpoint-sqlite package)
+- "off": nodes always run
+
+Configuration (environment):
+    NUTRITION_NODE_CACHE_BACKEND: memory | sqlite | off (default: memory)
+    NUTRITION_NODE_CACHE_PATH: SQLite file (default: .cache/node_cache.sqlite)
+    NUTRITION_NODE_CACHE_TTL_S: Entry lifetime in seconds (default: 3600)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from langgraph.cache.base import BaseCache
+from langgraph.cache.memory import InMemoryCache
+from langgraph.types import CachePolicy
+from pydantic import BaseModel
+
+from src.nutrition_agent.deadline import deadline_exceeded, resolve_deadline
+from src.nutrition_agent.models import Meal, UserProfile
+from src.nutrition_agent.nodes.validation.incremental import meal_fingerprint
+from src.nutrition_agent.tolerance import get_tolerance_policy
+
+DEFAULT_SQLITE_PATH = ".cache/node_cache.sqlite"
+DEFAULT_TTL_SECONDS = 3600
+
+# UserProfile fields read by each node
+CALCULATION_PROFILE_FIELDS = (
+    "age",
+    "gender",
+    "weight",
+    "height",
+    "activity_level",
+    "objective",
+    "diet_type",
+    "number_of_meals",
+)
+VALIDATION_PROFILE_FIELDS = ("objective", "diet_type", "number_of_meals")
+
+
+def _digest(parts: dict[str, Any]) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _dump(value: Any) -> Any:
+    """JSON-ready form of a state value (models and their dict form agree)."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
+
+def _profile_fields(state: Any, fields: tuple[str, ...]) -> dict[str, Any] | None:
+    profile = state.get("user_profile")
+    if profile is None:
+        return None
+    if isinstance(profile, dict):
+        profile = UserProfile(**profile)
+    dumped: dict[str, Any] = profile.model_dump(mode="json", include=set(fields))
+    return dumped
+
+
+def calculation_cache_key(state: Any) -> str:
+    """Cache key of the calculation node: the profile fields it uses."""
+    return _digest({"profile": _profile_fields(state, CALCULATION_PROFILE_FIELDS)})
+
+
+def validation_cache_key(state: Any) -> str:
+    """Cache key of the validation node: every state input it reads."""
+    meals = [
+        meal_fingerprint(Meal(**meal) if isinstance(meal, dict) else meal)
+        for meal in state.get("daily_meals") or []
+    ]
+    rules = {
+        key: [rule.relative, rule.absolute_kcal]
+        for key, rule in get_tolerance_policy().rules.items()
+    }
+    return _digest(
+        {
+            "meals": meals,
+            "targets": _dump(state.get("nutritional_targets")),
+            "profile": _profile_fields(state, VALIDATION_PROFILE_FIELDS),
+            "distribution": state.get("meal_distribution"),
+            "retry": state.get("validation_retry_count", 0),
+            "deadline_exceeded": deadline_exceeded(resolve_deadline(state)),
+            "tolerance": rules,
+        }
+    )
+
+
+def node_cache_policy(
+    key_func: Callable[[Any], str], ttl: int | None = None
+) -> CachePolicy:
+    """CachePolicy for a deterministic node (TTL from NUTRITION_NODE_CACHE_TTL_S)."""
+    if ttl is None:
+        ttl = int(os.getenv("NUTRITION_NODE_CACHE_TTL_S", str(DEFAULT_TTL_SECONDS)))
+    return CachePolicy(key_func=key_func, ttl=ttl)
+
+
+def build_node_cache(
+    backend: str | None = None, path: str | None = None
+) -> BaseCache | None:
+    """Build the node result cache from arguments or NUTRITION_NODE_CACHE_* env.
+
+    Returns:
+        The cache, or None when the backend is "off"
+
+    Raises:
+        ImportError: backend "sqlite" without langgraph-checkpoint-sqlite
+    """
+    backend = (backend or os.getenv("NUTRITION_NODE_CACHE_BACKEND") or "memory").lower()
+    if backend == "off":
+        return None
+    if backend == "memory":
+        return InMemoryCache()
+    if backend == "sqlite":
+        try:
+            from langgraph.cache.sqlite import (  # type: ignore[import-not-found, unused-ignore]
+                SqliteCache,
+            )
+        except ImportError as e:
+            raise ImportError(
+                "NUTRITION_NODE_CACHE_BACKEND=sqlite needs the "
+                "langgraph-checkpoint-sqlite package"
+            ) from e
+        sqlite_path = Path(
+            path or os.getenv("NUTRITION_NODE_CACHE_PATH") or DEFAULT_SQLITE_PATH
+        )
+        sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        cache: BaseCache = SqliteCache(path=str(sqlite_path))
+        return cache
+    raise ValueError(
+        f"Unknown NUTRITION_NODE_CACHE_BACKEND '{backend}' "
+        "(expected memory, sqlite or off)"
+    )
+
+
+_node_cache: BaseCache | None = None
+_node_cache_built = False
+
+
+def get_node_cache() -> BaseCache | None:
+    """Get or create the process-wide node cache (None if disabled)."""
+    global _node_cache, _node_cache_built
+    if not _node_cache_built:
+        _node_cache = build_node_cache()
+        _node_cache_built = True
+    return _node_cache
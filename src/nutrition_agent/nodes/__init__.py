@@ -4,6 +4,7 @@ Node 1: data_collection - LLM extraction of UserProfile
 Node 2: calculation - Deterministic TDEE/Macro computation
 Node 3: recipe_generation_batch - Parallel batch meal generation
 Node 3b: recipe_generation_single - Single meal regeneration for HITL
+Node 3c: recipe_generation_targeted - Regenerates only the failed meals
 Node 4: meal_review_batch - HITL batch review
 Node 5: validation - Final calorie verification and DietPlan assembly
 """
@@ -19,6 +20,9 @@ from src.nutrition_agent.nodes.recipe_generation.recipe_generation_batch import
 from src.nutrition_agent.nodes.recipe_generation.recipe_generation_single import (
     recipe_generation_single,
 )
+from src.nutrition_agent.nodes.recipe_generation.recipe_generation_targeted import (
+    recipe_generation_targeted,
+)
 from src.nutrition_agent.nodes.validation.validation import validation
 
 __all__ = [
@@ -26,6 +30,7 @@ __all__ = [
     "calculation",
     "recipe_generation_batch",
     "recipe_generation_single",
+    "recipe_generation_targeted",
     "meal_review_batch",
     "validation",
 ]
@@ -0,0 +1,279 @@
+"""Bulk nutritional targets for many profiles at once (NumPy).
+
+generate_nutritional_plan computes one profile per tool call. To pre-compute
+clinic rosters, bulk_nutritional_targets takes one array per profile field
+and computes BMR, TDEE, target calories, macros and meal distributions for
+every row in one vectorized pass.
+
+The results are identical to the scalar tools: the same factor tables
+(ACTIVITY_MULTIPLIERS, OBJECTIVE_ADJUSTMENTS, MEAL_DISTRIBUTIONS), the same
+operation order, and Python's rounding (round-half-even on the exact binary
+value) for the few values NumPy could round differently.
+
+Example:
+    >>> targets = bulk_nutritional_targets(
+    ...     age=[30, 45],
+    ...     gender=["male", "female"],
+    ...     weight=[80, 62],
+    ...     height=[180, 165],
+    ...     activity_level=["moderately_active", "sedentary"],
+    ...     objective=["maintenance", "fat_loss"],
+    ... )
+    >>> targets.record(0)  # == generate_nutritional_plan.invoke({...})
+    >>> targets.meal_distribution(1)  # == get_meal_distribution.invoke({...})
+
+Benchmark: tests/evaluation/bench_bulk_targets.py
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from src.shared.enums import ActivityLevel, DietType, Objective
+
+from .tools import ACTIVITY_MULTIPLIERS, MEAL_DISTRIBUTIONS, OBJECTIVE_ADJUSTMENTS
+
+# Same bounds as NutritionalInput / MealDistInput
+_BOUNDS = {
+    "age": (18, 100),
+    "weight": (30, 300),
+    "height": (100, 250),
+    "number_of_meals": (1, 6),
+}
+_MALE = ("male", "masculine")
+_GENDERS = (*_MALE, "female", "feminine")
+_MAX_MEALS = max(MEAL_DISTRIBUTIONS)
+
+_TARGET_FIELDS = (
+    "bmr",
+    "tdee",
+    "target_calories",
+    "protein_grams",
+    "protein_percentage",
+    "carbs_grams",
+    "carbs_percentage",
+    "fat_grams",
+    "fat_percentage",
+)
+
+
+@dataclass(frozen=True)
+class BulkTargets:
+    """Nutritional targets of N profiles, one array per field.
+
+    Attributes:
+        bmr ... fat_percentage: float64 arrays of shape (N,), rounded as in
+            generate_nutritional_plan
+        diet_type: DietType per row
+        objective: Objective per row
+        meal_slots: Slot names of each row's meal distribution
+        meal_kcal: (N, 6) float64 kcal per slot, NaN past the row's slots
+    """
+
+    bmr: NDArray[np.float64]
+    tdee: NDArray[np.float64]
+    target_calories: NDArray[np.float64]
+    protein_grams: NDArray[np.float64]
+    protein_percentage: NDArray[np.float64]
+    carbs_grams: NDArray[np.float64]
+    carbs_percentage: NDArray[np.float64]
+    fat_grams: NDArray[np.float64]
+    fat_percentage: NDArray[np.float64]
+    diet_type: list[DietType]
+    objective: list[Objective]
+    meal_slots: list[tuple[str, ...]]
+    meal_kcal: NDArray[np.float64]
+
+    def __len__(self) -> int:
+        return len(self.bmr)
+
+    def record(self, i: int) -> dict[str, Any]:
+        """Row i as generate_nutritional_plan returns it."""
+        record: dict[str, Any] = {
+            field: float(getattr(self, field)[i]) for field in _TARGET_FIELDS
+        }
+        record["diet_type"] = self.diet_type[i]
+        record["objective"] = self.objective[i]
+        return record
+
+    def meal_distribution(self, i: int) -> dict[str, float]:
+        """Row i as get_meal_distribution returns it."""
+        return {
+            slot: float(kcal)
+            for slot, kcal in zip(self.meal_slots[i], self.meal_kcal[i], strict=False)
+        }
+
+
+def _round(values: NDArray[np.float64], ndigits: int) -> NDArray[np.float64]:
+    """Round like Python's round(x, ndigits).
+
+    np.round scales by 10**ndigits before rounding, which can differ from
+    round() when the scaled value lands next to a .5 tie; those few values
+    are rounded with round().
+    """
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0**ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+
+def _codes(
+    values: ArrayLike, enum: type[Enum], name: str
+) -> tuple[NDArray[np.intp], list[Any]]:
+    """Index of each value in `enum` (raises on unknown values)."""
+    members: list[Any] = list(enum)
+    lookup = {member.value: i for i, member in enumerate(members)}
+    distinct, inverse = np.unique(
+        np.asarray(values).astype(str).reshape(-1), return_inverse=True
+    )
+    unknown = sorted(set(distinct.tolist()) - set(lookup))
+    if unknown:
+        raise ValueError(f"Invalid {name} values: {unknown}")
+    codes = np.array([lookup[v] for v in distinct.tolist()], dtype=np.intp)
+    return codes[inverse], members
+
+
+def _int_column(values: ArrayLike, name: str, size: int) -> NDArray[np.float64]:
+    column = np.asarray(values, dtype=np.float64).reshape(-1)
+    if column.shape != (size,):
+        raise ValueError(f"{name} has {column.size} rows, expected {size}")
+    if not np.all(column == np.floor(column)):
+        raise ValueError(f"{name} must be whole numbers")
+    low, high = _BOUNDS[name]
+    bad = np.flatnonzero((column < low) | (column > high))
+    if bad.size:
+        raise ValueError(f"{name} out of range [{low}, {high}] at rows {bad[:10]}")
+    return column
+
+
+def _meal_kcal(
+    target_calories: NDArray[np.float64], meals: NDArray[np.intp]
+) -> tuple[list[tuple[str, ...]], NDArray[np.float64]]:
+    """Vectorized get_meal_distribution: one pass per distribution pattern."""
+    kcal = np.full((len(target_calories), _MAX_MEALS), np.nan)
+    slot_names: dict[int, tuple[str, ...]] = {}
+    for n, distribution in MEAL_DISTRIBUTIONS.items():
+        rows = np.flatnonzero(meals == n)
+        slot_names[n] = tuple(slot.value for slot in distribution)
+        if not rows.size:
+            continue
+        total = target_calories[rows]
+        accumulated = np.zeros(rows.size)
+        percentages = list(distribution.values())
+        for j, percentage in enumerate(percentages[:-1]):
+            # round() to int is round-half-even, exactly like np.rint
+            kcal[rows, j] = np.rint(total * percentage)
+            accumulated += kcal[rows, j]
+        # Last meal gets remainder to handle decimals
+        kcal[rows, len(percentages) - 1] = _round(total - accumulated, 1)
+    return [slot_names[int(n)] for n in meals], kcal
+
+
+def bulk_nutritional_targets(
+    age: ArrayLike,
+    gender: ArrayLike,
+    weight: ArrayLike,
+    height: ArrayLike,
+    activity_level: ArrayLike,
+    objective: ArrayLike,
+    diet_type: ArrayLike | None = None,
+    number_of_meals: ArrayLike | None = None,
+) -> BulkTargets:
+    """Compute nutritional targets and meal distributions for N profiles.
+
+    Args:
+        age, weight, height: Whole numbers within the NutritionalInput bounds
+        gender: "male" | "female" | "masculine" | "feminine"
+        activity_level: ActivityLevel values
+        objective: Objective values
+        diet_type: DietType values (default: all "normal")
+        number_of_meals: Meals per day (default: all 3)
+
+    Returns:
+        BulkTargets with one row per profile
+
+    Raises:
+        ValueError: If a column has the wrong length or an invalid value
+    """
+    genders = np.asarray(gender).astype(str).reshape(-1)
+    size = genders.size
+    unknown = sorted(set(np.unique(genders).tolist()) - set(_GENDERS))
+    if unknown:
+        raise ValueError(f"Invalid gender values: {unknown}")
+    ages = _int_column(age, "age", size)
+    weights = _int_column(weight, "weight", size)
+    heights = _int_column(height, "height", size)
+    activity_codes, activities = _codes(activity_level, ActivityLevel, "activity")
+    objective_codes, objectives = _codes(objective, Objective, "objective")
+    diet_codes, diets = _codes(
+        diet_type if diet_type is not None else [DietType.NORMAL.value] * size,
+        DietType,
+        "diet_type",
+    )
+    meals = (
+        _int_column(number_of_meals, "number_of_meals", size).astype(np.intp)
+        if number_of_meals is not None
+        else np.full(size, 3, dtype=np.intp)
+    )
+    for name, codes in (
+        ("activity_level", activity_codes),
+        ("objective", objective_codes),
+        ("diet_type", diet_codes),
+    ):
+        if codes.size != size:
+            raise ValueError(f"{name} has {codes.size} rows, expected {size}")
+
+    # 1. BMR (Mifflin-St Jeor) and TDEE, same operation order as the tool
+    base = (10 * weights) + (6.25 * heights) - (5 * ages)
+    bmr = np.where(np.isin(genders, _MALE), base + 5, base - 161)
+    multipliers = np.array([ACTIVITY_MULTIPLIERS[level] for level in activities])
+    tdee = bmr * multipliers[activity_codes]
+    adjustments = np.array([OBJECTIVE_ADJUSTMENTS[obj] for obj in objectives])
+    target_calories = np.rint(tdee * adjustments[objective_codes])
+
+    # 2. Macros: keto fixed split, otherwise protein/fat indexed to weight
+    keto = np.array([diet == DietType.KETO for diet in diets])[diet_codes]
+    high_protein = np.array(
+        [obj in (Objective.FAT_LOSS, Objective.MUSCLE_GAIN) for obj in objectives]
+    )[objective_codes]
+    p_normal = weights * np.where(high_protein, 2.2, 1.6)
+    f_normal = weights * 0.9
+    remaining_cals = target_calories - (p_normal * 4) - (f_normal * 9)
+    c_normal = np.maximum(0.0, remaining_cals / 4)
+    total_macro_cals = (p_normal * 4) + (c_normal * 4) + (f_normal * 9)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        positive = total_macro_cals > 0
+        p_pct = np.where(positive, (p_normal * 4 / total_macro_cals) * 100, 0.0)
+        c_pct = np.where(positive, (c_normal * 4 / total_macro_cals) * 100, 0.0)
+        f_pct = np.where(positive, (f_normal * 9 / total_macro_cals) * 100, 0.0)
+
+    p_grams = np.where(keto, (target_calories * 0.25) / 4, p_normal)
+    f_grams = np.where(keto, (target_calories * 0.70) / 9, f_normal)
+    c_grams = np.where(keto, (target_calories * 0.05) / 4, c_normal)
+    p_pct = np.where(keto, 25.0, p_pct)
+    c_pct = np.where(keto, 5.0, c_pct)
+    f_pct = np.where(keto, 70.0, f_pct)
+
+    # 3. Meal distribution of each row's target calories
+    meal_slots, meal_kcal = _meal_kcal(target_calories, meals)
+
+    return BulkTargets(
+        bmr=_round(bmr, 2),
+        tdee=_round(tdee, 2),
+        target_calories=target_calories,
+        protein_grams=_round(p_grams, 2),
+        protein_percentage=_round(p_pct, 2),
+        carbs_grams=_round(c_grams, 2),
+        carbs_percentage=_round(c_pct, 2),
+        fat_grams=_round(f_grams, 2),
+        fat_percentage=_round(f_pct, 2),
+        diet_type=[diets[code] for code in diet_codes],
+        objective=[objectives[code] for code in objective_codes],
+        meal_slots=meal_slots,
+        meal_kcal=meal_kcal,
+    )
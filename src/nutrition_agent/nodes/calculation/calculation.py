@@ -1,26 +1,28 @@
 """Calculation node for the nutrition agent.
 
 This node performs deterministic calculations (NO LLM) to compute:
-1. BMR, TDEE, target calories (via generate_nutritional_plan tool)
+1. BMR, TDEE, target calories (via calculate_nutritional_plan)
 2. Macronutrient distribution (protein, carbs, fat)
 3. Meal calorie distribution
 
-Uses shared tools: generate_nutritional_plan, get_meal_distribution
+Calls the pure functions behind the generate_nutritional_plan and
+get_meal_distribution tools directly (no Tool.invoke overhead).
 """
 
 from typing import Any
 
 from src.nutrition_agent.models import NutritionalTargets, UserProfile
+from src.nutrition_agent.models.tools import MealDistInput
 from src.nutrition_agent.state import NutritionAgentState
 
-from .tools import generate_nutritional_plan, get_meal_distribution
+from .tools import calculate_meal_distribution, calculate_nutritional_plan
 
 
 def calculation(state: NutritionAgentState) -> dict[str, Any]:
     """Calculate nutritional targets and meal distribution.
 
-    This node is deterministic (NO LLM). It delegates calculations to
-    the shared generate_nutritional_plan tool for consistency and DRY.
+    This node is deterministic (NO LLM). It shares the calculation code of
+    the generate_nutritional_plan / get_meal_distribution tools.
 
     Args:
         state: Current agent state with user_profile
@@ -40,42 +42,44 @@ def calculation(state: NutritionAgentState) -> dict[str, Any]:
     else:
         profile = profile_data
 
-    # 1. Calculate BMR, TDEE, target calories, and macros using shared tool
-    plan_result: dict[str, Any] = generate_nutritional_plan.invoke(
-        {
-            "age": profile.age,
-            "gender": profile.gender,
-            "weight": profile.weight,
-            "height": profile.height,
-            "activity_level": profile.activity_level,
-            "objective": profile.objective,
-            "diet_type": profile.diet_type,
-        }
-    )
-
-    # 2. Handle potential errors from the tool
-    if "error" in plan_result:
-        raise ValueError(f"Nutritional plan calculation failed: {plan_result['error']}")
-
-    # 3. Build NutritionalTargets from tool output
+    # 1. Calculate BMR, TDEE, target calories, and macros. The profile is
+    # already validated (UserProfile has the tool's bounds), so the pure
+    # function is called directly instead of the tool's Runnable.invoke.
+    try:
+        plan = calculate_nutritional_plan(
+            age=profile.age,
+            gender=profile.gender,
+            weight=profile.weight,
+            height=profile.height,
+            activity_level=profile.activity_level,
+            objective=profile.objective,
+            diet_type=profile.diet_type,
+        )
+    except Exception as e:
+        # 2. Handle potential errors from the calculation
+        raise ValueError(f"Nutritional plan calculation failed: {e}") from e
+
+    # 3. Build NutritionalTargets from the calculation output
     nutritional_targets = NutritionalTargets(
-        bmr=plan_result["bmr"],
-        tdee=plan_result["tdee"],
-        target_calories=plan_result["target_calories"],
-        protein_grams=plan_result["protein_grams"],
-        protein_percentage=plan_result["protein_percentage"],
-        carbs_grams=plan_result["carbs_grams"],
-        carbs_percentage=plan_result["carbs_percentage"],
-        fat_grams=plan_result["fat_grams"],
-        fat_percentage=plan_result["fat_percentage"],
+        bmr=plan.bmr,
+        tdee=plan.tdee,
+        target_calories=plan.target_calories,
+        protein_grams=plan.protein_grams,
+        protein_percentage=plan.protein_percentage,
+        carbs_grams=plan.carbs_grams,
+        carbs_percentage=plan.carbs_percentage,
+        fat_grams=plan.fat_grams,
+        fat_percentage=plan.fat_percentage,
     )
 
-    # 4. Calculate meal distribution using shared tool
-    meal_distribution: dict[str, float] = get_meal_distribution.invoke(
-        {
-            "total_calories": plan_result["target_calories"],
-            "number_of_meals": profile.number_of_meals,
-        }
+    # 4. Calculate meal distribution. MealDistInput keeps the tool's
+    # calorie bounds (the target is computed, not user input).
+    dist_input = MealDistInput(
+        total_calories=plan.target_calories,
+        number_of_meals=profile.number_of_meals,
+    )
+    meal_distribution = calculate_meal_distribution(
+        dist_input.total_calories, dist_input.number_of_meals
     )
 
     return {
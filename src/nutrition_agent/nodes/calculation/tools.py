@@ -1,9 +1,20 @@
-"""get_meal_distribution, generate_nutritional_plan"""
+"""get_meal_distribution, generate_nutritional_plan
+
+Each tool is a thin wrapper over a pure function (calculate_meal_distribution,
+calculate_nutritional_plan). Graph nodes call the pure functions directly:
+Tool.invoke re-validates the arguments, sets up a callback manager and
+traces a run, which costs more than the arithmetic itself.
+
+The factor tables are module constants shared with the bulk (NumPy) API in
+bulk.py, so both always compute the same targets.
+"""
 
 from typing import Any
 
 from langchain_core.tools import tool
 
+from src.shared.enums import MealSlot
+
 from ...models.tools import (
     ActivityLevel,
     DietType,
@@ -13,6 +24,50 @@ from ...models.tools import (
     Objective,
 )
 
+# TDEE multiplier per activity level
+ACTIVITY_MULTIPLIERS: dict[ActivityLevel, float] = {
+    ActivityLevel.SEDENTARY: 1.2,
+    ActivityLevel.LIGHTLY_ACTIVE: 1.375,
+    ActivityLevel.MODERATELY_ACTIVE: 1.55,
+    ActivityLevel.VERY_ACTIVE: 1.725,
+    ActivityLevel.EXTRA_ACTIVE: 1.9,
+}
+
+# Objective adjustment mapping (hidden from LLM)
+OBJECTIVE_ADJUSTMENTS: dict[Objective, float] = {
+    Objective.FAT_LOSS: 0.83,
+    Objective.MUSCLE_GAIN: 1.15,
+    Objective.MAINTENANCE: 1.0,
+}
+
+# Distribution patterns (percentages) per number of meals
+MEAL_DISTRIBUTIONS: dict[int, dict[MealSlot, float]] = {
+    1: {MealSlot.OMAD: 1.0},
+    2: {MealSlot.BRUNCH: 0.5, MealSlot.CENA: 0.5},
+    3: {MealSlot.DESAYUNO: 0.3, MealSlot.COMIDA: 0.4, MealSlot.CENA: 0.3},
+    4: {
+        MealSlot.DESAYUNO: 0.25,
+        MealSlot.COMIDA: 0.35,
+        MealSlot.SNACK_PM: 0.15,
+        MealSlot.CENA: 0.25,
+    },
+    5: {
+        MealSlot.DESAYUNO: 0.25,
+        MealSlot.SNACK_AM: 0.10,
+        MealSlot.COMIDA: 0.35,
+        MealSlot.SNACK_PM: 0.10,
+        MealSlot.CENA: 0.20,
+    },
+    6: {
+        MealSlot.DESAYUNO: 0.20,
+        MealSlot.SNACK_AM: 0.10,
+        MealSlot.COMIDA: 0.30,
+        MealSlot.SNACK_PM: 0.10,
+        MealSlot.CENA: 0.20,
+        MealSlot.RECENA: 0.10,
+    },
+}
+
 
 # Business Logic (Encapsulation)
 def _calculate_bmr_mifflin(
@@ -28,14 +83,112 @@ def _calculate_bmr_mifflin(
 
 def _get_activity_multiplier(level: ActivityLevel) -> float:
     """Get TDEE multiplier for activity level."""
-    mapping = {
-        ActivityLevel.SEDENTARY: 1.2,
-        ActivityLevel.LIGHTLY_ACTIVE: 1.375,
-        ActivityLevel.MODERATELY_ACTIVE: 1.55,
-        ActivityLevel.VERY_ACTIVE: 1.725,
-        ActivityLevel.EXTRA_ACTIVE: 1.9,
-    }
-    return mapping[level]
+    return ACTIVITY_MULTIPLIERS[level]
+
+
+def calculate_nutritional_plan(
+    age: int,
+    gender: str,
+    weight: int,
+    height: int,
+    activity_level: ActivityLevel,
+    objective: Objective,
+    diet_type: DietType = DietType.NORMAL,
+) -> NutritionalPlanOutput:
+    """BMR, TDEE, target calories and macros (pure, no tool overhead).
+
+    Graph nodes call this directly with already validated inputs; the
+    generate_nutritional_plan tool wraps it for LLM use.
+
+    Raises:
+        ValueError: If the inputs produce an invalid plan
+    """
+    # 1. "Hands": Pure mathematical calculations
+    bmr = _calculate_bmr_mifflin(weight, height, age, gender)
+    tdee = bmr * _get_activity_multiplier(activity_level)
+
+    target_calories = round(tdee * OBJECTIVE_ADJUSTMENTS[objective])
+
+    # Macro logic
+    if diet_type == DietType.KETO:
+        p_grams = (target_calories * 0.25) / 4
+        f_grams = (target_calories * 0.70) / 9
+        c_grams = (target_calories * 0.05) / 4
+
+        # Percentages for keto (fixed)
+        p_pct = 25.0
+        c_pct = 5.0
+        f_pct = 70.0
+    else:
+        # Normal logic: Protein indexed to weight, rest adjusts
+        p_mult = (
+            2.2 if objective in [Objective.FAT_LOSS, Objective.MUSCLE_GAIN] else 1.6
+        )
+        p_grams = weight * p_mult
+        f_grams = weight * 0.9  # 0.9g/kg fat base
+
+        remaining_cals = target_calories - (p_grams * 4) - (f_grams * 9)
+        c_grams = max(0, remaining_cals / 4)
+
+        # Calculate percentages from actual macro grams
+        total_macro_cals = (p_grams * 4) + (c_grams * 4) + (f_grams * 9)
+        if total_macro_cals > 0:
+            p_pct = (p_grams * 4 / total_macro_cals) * 100
+            c_pct = (c_grams * 4 / total_macro_cals) * 100
+            f_pct = (f_grams * 9 / total_macro_cals) * 100
+        else:
+            p_pct = c_pct = f_pct = 0.0
+
+    # 2. Structured output (validated by Pydantic)
+    return NutritionalPlanOutput(
+        bmr=round(bmr, 2),
+        tdee=round(tdee, 2),
+        target_calories=round(target_calories, 2),
+        protein_grams=round(p_grams, 2),
+        protein_percentage=round(p_pct, 2),
+        carbs_grams=round(c_grams, 2),
+        carbs_percentage=round(c_pct, 2),
+        fat_grams=round(f_grams, 2),
+        fat_percentage=round(f_pct, 2),
+        diet_type=diet_type,
+        objective=objective,
+    )
+
+
+def calculate_meal_distribution(
+    total_calories: float, number_of_meals: int
+) -> dict[str, float]:
+    """Calories per MealSlot value (pure, no tool overhead).
+
+    Graph nodes call this directly; the get_meal_distribution tool wraps it
+    for LLM use.
+    """
+    # 1. Strategy selection
+    selected_dist = MEAL_DISTRIBUTIONS.get(number_of_meals, MEAL_DISTRIBUTIONS[6])
+
+    # 2. Calorie calculation
+    # Keys are MealSlot values: each generated meal is bound to one of them
+    result: dict[str, float] = {}
+    accumulated = 0
+
+    keys = list(selected_dist.keys())
+
+    for i, meal_name in enumerate(keys):
+        percentage = selected_dist[meal_name]
+
+        # Last meal gets remainder to handle decimals
+        if i == len(keys) - 1:
+            kcal_val = total_calories - accumulated
+        else:
+            kcal_val = round(total_calories * percentage)
+            accumulated += kcal_val
+
+        result[meal_name.value] = round(kcal_val, 1)
+
+    return result
+
+
+# Tools (LLM-facing wrappers with argument validation)
 
 
 @tool("generate_nutritional_plan", args_schema=NutritionalInput)  # type: ignore [misc]
@@ -61,64 +214,9 @@ def generate_nutritional_plan(
         On error, returns dict with "error" and "message" keys.
     """
     try:
-        # 1. "Hands": Pure mathematical calculations
-        bmr = _calculate_bmr_mifflin(weight, height, age, gender)
-        tdee = bmr * _get_activity_multiplier(activity_level)
-
-        # Objective adjustment mapping (hidden from LLM)
-        objective_adjustments = {
-            Objective.FAT_LOSS: 0.83,
-            Objective.MUSCLE_GAIN: 1.15,
-            Objective.MAINTENANCE: 1.0,
-        }
-
-        target_calories = round(tdee * objective_adjustments[objective])
-
-        # Macro logic
-        if diet_type == DietType.KETO:
-            p_grams = (target_calories * 0.25) / 4
-            f_grams = (target_calories * 0.70) / 9
-            c_grams = (target_calories * 0.05) / 4
-
-            # Percentages for keto (fixed)
-            p_pct = 25.0
-            c_pct = 5.0
-            f_pct = 70.0
-        else:
-            # Normal logic: Protein indexed to weight, rest adjusts
-            p_mult = (
-                2.2 if objective in [Objective.FAT_LOSS, Objective.MUSCLE_GAIN] else 1.6
-            )
-            p_grams = weight * p_mult
-            f_grams = weight * 0.9  # 0.9g/kg fat base
-
-            remaining_cals = target_calories - (p_grams * 4) - (f_grams * 9)
-            c_grams = max(0, remaining_cals / 4)
-
-            # Calculate percentages from actual macro grams
-            total_macro_cals = (p_grams * 4) + (c_grams * 4) + (f_grams * 9)
-            if total_macro_cals > 0:
-                p_pct = (p_grams * 4 / total_macro_cals) * 100
-                c_pct = (c_grams * 4 / total_macro_cals) * 100
-                f_pct = (f_grams * 9 / total_macro_cals) * 100
-            else:
-                p_pct = c_pct = f_pct = 0.0
-
-        # 2. Structured output (validated by Pydantic)
-        output = NutritionalPlanOutput(
-            bmr=round(bmr, 2),
-            tdee=round(tdee, 2),
-            target_calories=round(target_calories, 2),
-            protein_grams=round(p_grams, 2),
-            protein_percentage=round(p_pct, 2),
-            carbs_grams=round(c_grams, 2),
-            carbs_percentage=round(c_pct, 2),
-            fat_grams=round(f_grams, 2),
-            fat_percentage=round(f_pct, 2),
-            diet_type=diet_type,
-            objective=objective,
+        output = calculate_nutritional_plan(
+            age, gender, weight, height, activity_level, objective, diet_type
         )
-
         result: dict[str, Any] = output.model_dump()
         return result
 
@@ -140,51 +238,7 @@ def get_meal_distribution(
     Use this tool to know how many calories to assign to Breakfast,
     Lunch, Dinner, etc. based on the user's eating frequency.
     """
-    # 1. Distribution patterns (percentages)
-    distributions = {
-        1: {"Comida Unica (OMAD)": 1.0},
-        2: {"Brunch": 0.5, "Cena": 0.5},
-        3: {"Desayuno": 0.3, "Comida": 0.4, "Cena": 0.3},
-        4: {"Desayuno": 0.25, "Comida": 0.35, "Snack PM": 0.15, "Cena": 0.25},
-        5: {
-            "Desayuno": 0.25,
-            "Snack AM": 0.10,
-            "Comida": 0.35,
-            "Snack PM": 0.10,
-            "Cena": 0.20,
-        },
-        6: {
-            "Desayuno": 0.20,
-            "Snack AM": 0.10,
-            "Comida": 0.30,
-            "Snack PM": 0.10,
-            "Cena": 0.20,
-            "Recena": 0.10,
-        },
-    }
-
-    # 2. Strategy selection
-    selected_dist = distributions.get(number_of_meals, distributions[6])
-
-    # 3. Calorie calculation
-    result = {}
-    accumulated = 0
-
-    keys = list(selected_dist.keys())
-
-    for i, meal_name in enumerate(keys):
-        percentage = selected_dist[meal_name]
-
-        # Last meal gets remainder to handle decimals
-        if i == len(keys) - 1:
-            kcal_val = total_calories - accumulated
-        else:
-            kcal_val = round(total_calories * percentage)
-            accumulated += kcal_val
-
-        result[meal_name] = round(kcal_val, 1)
-
-    return result
+    return calculate_meal_distribution(total_calories, number_of_meals)
 
 
 tools = [
@@ -3,73 +3,307 @@
 This node extracts UserProfile data from the conversation using LLM
 with structured output. It validates that all required fields are
 present before allowing the workflow to proceed.
+
+Extraction is incremental: the fields found so far are kept in
+state["partial_profile"], and each turn sends the LLM only that partial
+profile plus the messages since the previous extraction (with the
+assistant question they answer). Prompt size, latency and tokens stay
+flat as the conversation grows, and the missing fields reported back are
+the ones actually not collected yet.
+
+Form fast path: a UserProfileForm submission written to
+state["profile_submission"] (CopilotKit shared state) is validated directly
+against UserProfile. A valid submission completes the profile without any
+LLM call; an invalid one keeps its valid fields and reports the rest as
+missing.
+
+Pre-check: before calling the LLM, the new user messages are scanned
+locally for profile signals (numbers, units, activity / objective
+keywords; see profile_signals.py). Turns that cannot change the profile
+(greetings, thanks, questions) skip the LLM call.
 """
 
-from langchain_core.messages import SystemMessage
+import time
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+from pydantic import ValidationError
 
-from src.nutrition_agent.models import UserProfile
-from src.nutrition_agent.prompts import DATA_COLLECTION_PROMPT
+from src.nutrition_agent.deadline import start_run_deadline
+from src.nutrition_agent.model_routing import (
+    get_model_routing_policy,
+    record_route_result,
+)
+from src.nutrition_agent.models import (
+    REQUIRED_PROFILE_FIELDS,
+    PartialUserProfile,
+    UserProfile,
+)
+from src.nutrition_agent.profile_signals import (
+    may_update_profile,
+    precheck_enabled,
+    record_precheck,
+)
+from src.nutrition_agent.prompts import PROFILE_UPDATE_PROMPT
 from src.nutrition_agent.state import NutritionAgentState
-from src.shared import get_llm
+from src.shared import (
+    Lane,
+    estimate_tokens,
+    get_llm_scheduler,
+    get_structured_llm,
+)
+from src.shared.metrics import metrics
+from src.shared.usage import start_run_id, track_usage, usage_records
 
 # Required fields that must be present for profile to be complete
-REQUIRED_FIELDS = {"age", "gender", "weight", "height", "activity_level", "objective"}
+REQUIRED_FIELDS = set(REQUIRED_PROFILE_FIELDS)
+
+
+def _new_messages(messages: list[BaseMessage], seen: int) -> list[BaseMessage]:
+    """Conversation since the last extraction, from the question it answers.
+
+    Starts at the last assistant message before the first new user message
+    ("¿Cuántos años tienes?" gives meaning to "30"). Returns [] when there
+    is no new user message.
+    """
+    if seen > len(messages):
+        # History was replaced (e.g. a new conversation): start over
+        seen = 0
+    first = next(
+        (
+            i
+            for i in range(seen, len(messages))
+            if isinstance(messages[i], HumanMessage)
+        ),
+        None,
+    )
+    if first is None:
+        return []
+    start = next(
+        (i for i in range(first - 1, -1, -1) if isinstance(messages[i], AIMessage)),
+        first,
+    )
+    return [m for m in messages[start:] if isinstance(m, (HumanMessage, AIMessage))]
+
+
+def _text(message: BaseMessage) -> str:
+    if isinstance(message.content, str):
+        return message.content
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in message.content
+    )
+
+
+def _has_profile_signal(new_messages: list[BaseMessage]) -> bool:
+    """Whether any new user message could change the profile (local check)."""
+    question = None
+    for message in new_messages:
+        if isinstance(message, AIMessage):
+            question = _text(message)
+        elif may_update_profile(_text(message), question):
+            return True
+    return False
+
+
+def _seen_after_skip(messages: list[BaseMessage], seen: int) -> int:
+    """profile_messages_seen after a turn skipped by the local pre-check.
+
+    User messages that answer an assistant question stay unseen, so the
+    next extraction sends them again with the question in case the
+    pre-check missed a value ("ninguna" to "¿Tienes alguna alergia?").
+    """
+    if seen > len(messages):
+        seen = 0
+    question = None
+    for i, message in enumerate(messages):
+        if isinstance(message, AIMessage):
+            question = _text(message)
+        elif (
+            i >= seen
+            and isinstance(message, HumanMessage)
+            and question is not None
+            and question.rstrip().endswith("?")
+        ):
+            return i
+    return len(messages)
+
+
+def _submitted_profile(
+    submission: dict[str, Any],
+) -> tuple[PartialUserProfile, UserProfile | None, set[str]]:
+    """Validate a form submission against UserProfile (no LLM).
+
+    Returns:
+        (valid fields as a partial profile, the UserProfile if the whole
+        submission is valid, names of the invalid fields)
+    """
+    try:
+        profile = UserProfile(**submission)
+    except ValidationError as e:
+        invalid = {str(error["loc"][0]) for error in e.errors() if error["loc"]}
+        valid = {
+            field: value
+            for field, value in submission.items()
+            if field in PartialUserProfile.model_fields and field not in invalid
+        }
+        return PartialUserProfile(**valid), None, invalid
+    return PartialUserProfile(**profile.model_dump()), profile, set()
+
+
+def _profile_prompt(
+    partial: PartialUserProfile, new_messages: list[BaseMessage]
+) -> list[BaseMessage]:
+    current = partial.model_dump_json(exclude_none=True)
+    return [
+        SystemMessage(content=PROFILE_UPDATE_PROMPT.format(current_profile=current)),
+        *new_messages,
+    ]
 
 
-async def data_collection(state: NutritionAgentState) -> dict:
+async def data_collection(
+    state: NutritionAgentState, config: RunnableConfig | None = None
+) -> dict:
     """Extract UserProfile from conversation using LLM structured output.
 
     This node:
+    0. Validates a form submission directly, if there is one (no LLM)
     1. Checks if user_profile already exists and is complete
-    2. If not, uses LLM to extract profile from messages
-    3. Validates that all required fields are present
-    4. Returns profile and any missing fields
+    2. If not, uses LLM to extract the fields stated in the new messages
+       (skipped when the local pre-check finds no profile data in them)
+    3. Merges them into the partial profile and computes missing fields
+    4. Returns profile (when complete) and any missing fields
+    5. Starts the run deadline once the profile is complete
+
+    Each data_collection turn starts a new run (run_id) for usage accounting.
 
     Args:
-        state: Current agent state with messages and optional existing profile
+        state: Current agent state with messages, optional existing profile
+            and optional profile_submission (UserProfileForm values)
+        config: Node config (configurable.run_budget_s overrides the budget,
+                configurable.run_id overrides the generated run id)
 
     Returns:
         dict with:
         - user_profile: Extracted UserProfile (or None if incomplete)
         - missing_fields: List of fields still needed from user
+        - partial_profile: Fields collected so far
+        - profile_messages_seen: Messages already extracted from
+        - profile_submission: None once a submission is consumed
+        - run_deadline: Deadline for the generation run (complete profile only)
+        - run_id: Id of the run started by this turn
+        - token_usage: LLM usage records of this turn
     """
-    # If profile already exists and is complete, skip extraction
-    if state.get("user_profile") is not None and not state.get("missing_fields", []):
-        return {}
-
-    # Get messages from state
+    run_id = start_run_id(config)
     messages = state.get("messages", [])
-    if not messages:
-        return {
-            "user_profile": None,
-            "missing_fields": list(REQUIRED_FIELDS),
-        }
 
-    # Use LLM with structured output to extract UserProfile
-    # llm = get_llm("gemini-2.5-flash")
-    llm = get_llm()
-    structured_llm = llm.with_structured_output(UserProfile)
+    # Handle dict from LangGraph state serialization
+    partial_data = state.get("partial_profile")
+    if isinstance(partial_data, dict):
+        partial = PartialUserProfile(**partial_data)
+    else:
+        partial = partial_data or PartialUserProfile()
 
-    try:
-        # Invoke LLM with system prompt and conversation history
-        profile = await structured_llm.ainvoke(
-            [
-                SystemMessage(content=DATA_COLLECTION_PROMPT),
-                *messages,
-            ]
-        )
-
-        # Profile successfully extracted - all fields present
+    # Form fast path: validate the submitted profile directly (no LLM)
+    submission = state.get("profile_submission")
+    if submission is not None:
+        submitted, profile, invalid = _submitted_profile(submission)
+        merged = partial.merge(submitted)
+        result: dict[str, Any] = {
+            "partial_profile": merged,
+            "profile_submission": None,
+            # The form supersedes what the chat said so far
+            "profile_messages_seen": len(messages),
+            "run_id": run_id,
+        }
+        if profile is None:
+            metrics.increment("profile_submissions_total", outcome="invalid")
+            invalid.update(merged.missing_fields())
+            missing = [f for f in PartialUserProfile.model_fields if f in invalid]
+            return {**result, "user_profile": None, "missing_fields": missing}
+        metrics.increment("profile_submissions_total", outcome="accepted")
         return {
+            **result,
             "user_profile": profile,
             "missing_fields": [],
+            "run_deadline": start_run_deadline(config),
         }
 
-    except Exception:
-        # LLM could not extract complete profile
-        # Determine which fields are missing based on partial extraction
-        # For now, return all required fields as missing
+    # If profile already exists and is complete, skip extraction
+    if state.get("user_profile") is not None and not state.get("missing_fields", []):
+        return {"run_deadline": start_run_deadline(config), "run_id": run_id}
+
+    if not messages:
         return {
             "user_profile": None,
             "missing_fields": list(REQUIRED_FIELDS),
         }
+
+    # Only messages since the previous extraction are sent to the LLM
+    new_messages = _new_messages(messages, state.get("profile_messages_seen", 0))
+    skip = not new_messages
+    if new_messages and precheck_enabled():
+        # Greetings, thanks, questions...: no profile data, no LLM call
+        skip = not _has_profile_signal(new_messages)
+        record_precheck(skipped=skip)
+    if skip:
+        # Nothing new from the user: nothing to extract
+        return {
+            "user_profile": None,
+            "missing_fields": partial.missing_fields(),
+            "profile_messages_seen": _seen_after_skip(
+                messages, state.get("profile_messages_seen", 0)
+            ),
+            "run_id": run_id,
+        }
+
+    # Use LLM with structured output to extract the new fields
+    # (model chosen by the routing policy: a fast model by default)
+    route = get_model_routing_policy().route("data_collection")
+    structured_llm = get_structured_llm(PartialUserProfile, route.model)
+
+    prompt = _profile_prompt(partial, new_messages)
+
+    started = time.monotonic()
+    with track_usage() as usage:
+        try:
+            # Invoke LLM with the partial profile and the new messages
+            # (interactive lane: the user is waiting on this turn)
+            async with get_llm_scheduler().slot(
+                Lane.INTERACTIVE, estimate_tokens(prompt, completion_tokens=200)
+            ):
+                started = time.monotonic()
+                update = await structured_llm.ainvoke(prompt)
+
+        except Exception:
+            record_route_result(route, "fail", time.monotonic() - started)
+            # Keep what was collected; the same messages are retried next turn
+            return {
+                "user_profile": None,
+                "missing_fields": partial.missing_fields(),
+                "run_id": run_id,
+                "token_usage": usage_records(
+                    usage, node="data_collection", run_id=run_id
+                ),
+            }
+
+    record_route_result(route, "pass", time.monotonic() - started)
+    merged = partial.merge(update)
+    missing = merged.missing_fields()
+    result = {
+        "missing_fields": missing,
+        "partial_profile": merged,
+        "profile_messages_seen": len(messages),
+        "run_id": run_id,
+        "token_usage": usage_records(usage, node="data_collection", run_id=run_id),
+    }
+    if missing:
+        return {**result, "user_profile": None}
+
+    # Profile complete - all required fields collected
+    return {
+        **result,
+        "user_profile": merged.to_profile(),
+        "run_deadline": start_run_deadline(config),
+    }
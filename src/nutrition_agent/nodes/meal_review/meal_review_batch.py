@@ -4,39 +4,199 @@ This node implements HITL (Human-in-the-Loop) for batch review of the
 complete daily meal plan. The user can:
 - Approve the entire plan
 - Request to change a specific meal
+- Request to change several meals at once (regenerated concurrently);
+  a request without any valid change presents the review again
 - Request to regenerate all meals
 
 Uses LangGraph's interrupt() to pause execution and wait for user input.
+While the user reads the plan, one alternative per slot can be generated
+in the background (see speculation.py) so that a change_meal without
+feedback is served instantly.
 """
 
-from __future__ import annotations
-
 from typing import Any
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.types import interrupt
 
-from src.nutrition_agent.models import Meal, MealNotice, NutritionalTargets
+from src.nutrition_agent.deadline import start_run_deadline
+from src.nutrition_agent.models import (
+    Meal,
+    MealNotice,
+    NutritionalTargets,
+    UserProfile,
+)
+from src.nutrition_agent.nodes.recipe_generation.recipe_generation_single import (
+    _generate_single_meal_with_feedback,
+)
+from src.nutrition_agent.speculation import (
+    Alternative,
+    get_alternative_cache,
+    resolve_thread_id,
+)
 from src.nutrition_agent.state import NutritionAgentState
+from src.shared import Lane
+from src.shared.metrics import metrics
+from src.shared.usage import (
+    resolve_run_id,
+    start_run_id,
+    track_usage,
+    usage_records,
+)
+
+# Feedback used to ask for an alternative when the user gave none
+ALTERNATIVE_FEEDBACK = (
+    "Propose a different dish than '{title}', with other main ingredients."
+)
+
+
+# Sent back with the review when a change_meals response has no valid change
+INVALID_CHANGES_ERROR = (
+    "change_meals needs at least one change with a slot of the plan: {slots}"
+)
 
 
-def meal_review_batch(state: NutritionAgentState) -> dict[str, Any]:
+def _parse_changes(
+    user_response: dict[str, Any], slots: list[str] | None = None
+) -> dict[str, str]:
+    """Slot -> feedback pairs of a change_meals response.
+
+    Entries without a slot, or with a slot outside `slots` (when given), are
+    ignored; several entries for the same slot have their feedback joined.
+    """
+    changes: dict[str, str] = {}
+    for change in user_response.get("changes") or []:
+        if not isinstance(change, dict):
+            continue
+        slot = change.get("slot") or change.get("meal_time")
+        if not slot or (slots and slot not in slots):
+            continue
+        feedback = (change.get("feedback") or "").strip()
+        previous = changes.get(slot)
+        changes[slot] = f"{previous}; {feedback}" if previous else feedback
+    return changes
+
+
+async def _speculate_alternatives(
+    thread_id: str,
+    slots: list[str],
+    meals: dict[str, Meal],
+    meal_distribution: dict[str, float],
+    user_profile: UserProfile,
+    nutritional_targets: NutritionalTargets,
+    run_id: str,
+) -> None:
+    """Generate one validated alternative per slot within the token budget.
+
+    Slots are generated one at a time on the bulk lane so live turns keep
+    priority; the round stops once the tokens spent reach the budget.
+    """
+    cache = get_alternative_cache()
+    meal_times = list(meal_distribution)
+    spent_tokens = 0
+    for index, slot in enumerate(slots):
+        if spent_tokens >= cache.token_budget:
+            metrics.increment(
+                "speculative_generation_total",
+                float(len(slots) - index),
+                outcome="budget",
+            )
+            return
+        with track_usage() as usage:
+            meal, error = await _generate_single_meal_with_feedback(
+                meal_time=slot,
+                target_calories=meal_distribution[slot],
+                user_profile=user_profile,
+                nutritional_targets=nutritional_targets,
+                total_meals=len(meal_times),
+                current_meal_number=meal_times.index(slot) + 1,
+                user_feedback=ALTERNATIVE_FEEDBACK.format(title=meals[slot].title),
+                lane=Lane.BULK,
+            )
+        records = usage_records(usage, node="meal_review_speculation", run_id=run_id)
+        spent_tokens += sum(record["total_tokens"] for record in records)
+        # Only alternatives that passed pre-validation are worth serving
+        if meal is None or error:
+            metrics.increment("speculative_generation_total", outcome="failed")
+            continue
+        cache.put(
+            thread_id,
+            slot,
+            Alternative(meal=meal, replaces=meals[slot].title, token_usage=records),
+        )
+        metrics.increment("speculative_generation_total", outcome="cached")
+
+
+def _start_speculation(
+    state: NutritionAgentState,
+    config: RunnableConfig | None,
+    daily_meals: list[Meal],
+    nutritional_targets: NutritionalTargets | None,
+) -> None:
+    """Start the background alternatives round for the plan under review."""
+    cache = get_alternative_cache()
+    thread_id = resolve_thread_id(config)
+    meal_distribution = state.get("meal_distribution")
+    user_profile_data = state.get("user_profile")
+    if not cache.enabled or thread_id is None or nutritional_targets is None:
+        return
+    if not meal_distribution or user_profile_data is None:
+        return
+    user_profile = (
+        UserProfile(**user_profile_data)
+        if isinstance(user_profile_data, dict)
+        else user_profile_data
+    )
+    meals = {
+        meal.slot_key: meal
+        for meal in daily_meals
+        if meal.slot_key in meal_distribution
+    }
+    run_id = resolve_run_id(state, config)
+    cache.start(
+        thread_id,
+        {slot: meal.title for slot, meal in meals.items()},
+        lambda slots: _speculate_alternatives(
+            thread_id,
+            slots,
+            meals,
+            meal_distribution,
+            user_profile,
+            nutritional_targets,
+            run_id,
+        ),
+    )
+
+
+async def meal_review_batch(
+    state: NutritionAgentState, config: RunnableConfig | None = None
+) -> dict[str, Any]:
     """Review the complete daily meal plan via HITL.
 
     This node pauses the graph execution and presents the complete
     meal plan to the user for review. The user can:
     - approve: Accept the entire plan and proceed to validation
     - change_meal: Select a specific meal to regenerate with feedback
+    - change_meals: Select several meals, each with its feedback; they are
+      regenerated concurrently and returned for a single re-review. When no
+      change names a slot of the plan, the review is interrupted again with
+      an "error" (never approved)
     - regenerate_all: Discard all meals and regenerate from scratch
 
     Args:
         state: Current agent state with daily_meals, nutritional_targets,
                and meal_generation_errors
+        config: Node config (configurable.run_budget_s overrides the budget;
+                configurable.thread_id keys the speculative alternatives)
 
     Returns:
         dict with:
-        - review_decision: "approve" | "change_meal" | "regenerate_all"
-        - selected_meal_to_change: meal_time if change_meal, else None
+        - review_decision: "approve" | "change_meal" | "change_meals" |
+          "regenerate_all"
+        - selected_meal_to_change: slot if change_meal, else None
         - user_feedback: feedback text if change_meal, else None
+        - failed_meals: slot -> feedback if change_meals
+        - run_deadline: new deadline when the decision triggers regeneration
     """
     # Get state values using dict access
     # Handle LangGraph serialization: Pydantic models become dicts after checkpointing
@@ -57,9 +217,12 @@ def meal_review_batch(state: NutritionAgentState) -> dict[str, Any]:
     }
 
     # Build interrupt payload with all relevant information
+    # Meals and notices are identified by slot (meal_distribution key)
+    slots = list(state.get("meal_distribution") or {})
     interrupt_payload = {
         "type": "meal_plan_review",
         "daily_meals": [meal.model_dump() for meal in daily_meals],
+        "slots": slots,
         "nutritional_targets": (
             nutritional_targets.model_dump() if nutritional_targets else None
         ),
@@ -69,21 +232,66 @@ def meal_review_batch(state: NutritionAgentState) -> dict[str, Any]:
             {
                 "action": "change_meal",
                 "label": "Change Specific Meal",
-                "requires": ["meal_time", "feedback"],
+                "requires": ["slot", "feedback"],
+            },
+            {
+                "action": "change_meals",
+                "label": "Change Several Meals",
+                "requires": ["changes"],
             },
             {"action": "regenerate_all", "label": "Regenerate All Meals"},
         ],
     }
 
+    # Use the user's reading time: prepare alternatives in the background
+    # (idempotent: this node runs again when the graph resumes)
+    _start_speculation(state, config, daily_meals, nutritional_targets)
+
     # Pause execution and wait for user decision
     # The interrupt() call will pause the graph and return control to the client
     # The client will resume with a Command containing the user's decision
     user_response = interrupt(interrupt_payload)
 
     # Parse user response
-    # Expected format: {"action": str, "meal_time": str?, "feedback": str?}
+    # Expected format: {"action": str, "slot": str?, "feedback": str?,
+    #                   "changes": [{"slot": str, "feedback": str}]?}
+    # ("meal_time" is still accepted for the slot, from older clients)
     action = user_response.get("action", "approve")
 
+    # A change_meals without any valid change is never taken as an approval:
+    # the same review is presented again with the error
+    while action == "change_meals" and not _parse_changes(user_response, slots):
+        metrics.increment("meal_review_invalid_changes_total")
+        user_response = interrupt(
+            {
+                **interrupt_payload,
+                "error": INVALID_CHANGES_ERROR.format(slots=", ".join(slots)),
+            }
+        )
+        action = user_response.get("action", "approve")
+
+    if action == "change_meals":
+        changes = _parse_changes(user_response, slots)
+        if len(changes) == 1:
+            # A single change is the regular change_meal path
+            [(slot, feedback)] = changes.items()
+            action = "change_meal"
+            user_response = {"slot": slot, "feedback": feedback}
+        elif changes:
+            return {
+                "review_decision": "change_meals",
+                "selected_meal_to_change": None,
+                "user_feedback": None,
+                "failed_meals": changes,
+                "run_deadline": start_run_deadline(config),
+                "run_id": start_run_id(config),
+            }
+
+    # Alternatives are only served to change_meal: drop them otherwise
+    thread_id = resolve_thread_id(config)
+    if thread_id is not None and action not in ("change_meal", "change_meals"):
+        get_alternative_cache().discard(thread_id)
+
     if action == "approve":
         return {
             "review_decision": "approve",
@@ -93,14 +301,21 @@ def meal_review_batch(state: NutritionAgentState) -> dict[str, Any]:
     elif action == "change_meal":
         return {
             "review_decision": "change_meal",
-            "selected_meal_to_change": user_response.get("meal_time"),
+            "selected_meal_to_change": (
+                user_response.get("slot") or user_response.get("meal_time")
+            ),
             "user_feedback": user_response.get("feedback"),
+            # Resuming after HITL starts a new run with a fresh time budget
+            "run_deadline": start_run_deadline(config),
+            "run_id": start_run_id(config),
         }
     elif action == "regenerate_all":
         return {
             "review_decision": "regenerate_all",
             "selected_meal_to_change": None,
             "user_feedback": None,
+            "run_deadline": start_run_deadline(config),
+            "run_id": start_run_id(config),
         }
     else:
         # Unknown action, default to approve
@@ -0,0 +1,244 @@
+"""Shared attempt loop of the recipe generation nodes.
+
+recipe_generation_batch (daily plan) and recipe_generation_single (HITL
+change, validation auto-fix) generate a meal the same way and differ only
+in the special instructions of the prompt. Each attempt:
+
+1. Stops early when the run deadline is near (best candidate is kept)
+2. Routes to a model (escalating after any failed attempt)
+3. States the kcal target corrected by the calibrator (not for the last
+   meal, which must close the daily budget exactly)
+4. Calls the LLM through the scheduler and repairs mechanical schema errors
+5. Retries immediately when excluded foods are used
+6. Accepts the meal when it is within the tolerance policy of the real target
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.nutrition_agent.calibration import (
+    get_kcal_calibrator,
+    record_first_attempt,
+)
+from src.nutrition_agent.deadline import DEADLINE_MARGIN_SECONDS, seconds_left
+from src.nutrition_agent.exclusions import (
+    Violation,
+    get_exclusion_matcher,
+    violation_feedback,
+)
+from src.nutrition_agent.meal_repair import MEAL_OUTPUT_SCHEMA, repair_meal
+from src.nutrition_agent.model_routing import (
+    ModelRoute,
+    get_model_routing_policy,
+    record_route_result,
+)
+from src.nutrition_agent.models import Meal, NutritionalTargets, UserProfile
+from src.nutrition_agent.prompts import RECIPE_GENERATION_PROMPT
+from src.nutrition_agent.tolerance import get_tolerance_policy
+from src.shared import (
+    Lane,
+    estimate_tokens,
+    get_llm_scheduler,
+    get_structured_llm,
+)
+
+# Constants for pre-validation (tolerances: see tolerance.py)
+MAX_ATTEMPTS = 3
+
+
+def build_recipe_prompt(
+    meal_time: str,
+    stated_kcal: float,
+    user_profile: UserProfile,
+    nutritional_targets: NutritionalTargets,
+    total_meals: int,
+    special_instructions: str,
+) -> str:
+    """RECIPE_GENERATION_PROMPT for one meal stating `stated_kcal`."""
+    return RECIPE_GENERATION_PROMPT.format(
+        objective=user_profile.objective.value,
+        diet_type=user_profile.diet_type.value,
+        excluded_foods=", ".join(user_profile.excluded_foods) or "ninguno",
+        daily_target_calories=round(nutritional_targets.target_calories, 1),
+        daily_protein_grams=round(nutritional_targets.protein_grams, 1),
+        daily_carbs_grams=round(nutritional_targets.carbs_grams, 1),
+        daily_fat_grams=round(nutritional_targets.fat_grams, 1),
+        meal_time=meal_time,
+        target_calories=round(stated_kcal, 1),
+        total_meals=total_meals,
+        special_instructions=special_instructions,
+    )
+
+
+async def generate_meal(
+    meal_time: str,
+    target_calories: float,
+    user_profile: UserProfile,
+    nutritional_targets: NutritionalTargets,
+    total_meals: int,
+    instructions: Callable[[float], str],
+    is_last_meal: bool = False,
+    deadline: float | None = None,
+    escalate: bool = False,
+    lane: Lane = Lane.INTERACTIVE,
+) -> tuple[Meal | None, str | None]:
+    """Generate one meal with the pre-validation retry loop.
+
+    Args:
+        meal_time: The meal slot (e.g., "Desayuno", "Snack AM", "Cena")
+        target_calories: Real target calories for this meal
+        user_profile: User's dietary profile
+        nutritional_targets: Calculated nutritional targets
+        total_meals: Total number of meals in the day
+        instructions: Special instructions of the prompt for a stated target
+        is_last_meal: Last meal of the day (stricter tolerance, no calibration)
+        deadline: Run deadline (epoch seconds); when it is near, outstanding
+            attempts are cancelled and the best candidate is returned
+        escalate: Start with the escalation model (graph-level validation
+            retry); retries after a failed attempt always escalate
+        lane: Scheduler lane of the LLM calls
+
+    Returns:
+        Tuple of (Meal or None, error message or None)
+    """
+    # Last meal closes the daily budget: stricter tolerance scope
+    tolerance_scope = "last_meal" if is_last_meal else "meal"
+    tolerance_policy = get_tolerance_policy()
+    best_meal: Meal | None = None
+    best_error = float("inf")
+
+    # Compiled once per exclusion list; violations are retried immediately
+    exclusion_matcher = get_exclusion_matcher(user_profile.excluded_foods)
+    violations: list[Violation] = []
+    exclusion_feedback: str | None = None
+
+    def _build_prompt(stated_kcal: float) -> str:
+        special_instructions = instructions(stated_kcal)
+        if exclusion_feedback:
+            special_instructions = f"{special_instructions}\n\n{exclusion_feedback}"
+        return build_recipe_prompt(
+            meal_time,
+            stated_kcal,
+            user_profile,
+            nutritional_targets,
+            total_meals,
+            special_instructions,
+        )
+
+    policy = get_model_routing_policy()
+    calibrator = get_kcal_calibrator()
+    structured_llms: dict[str, Any] = {}
+    scheduler = get_llm_scheduler()
+
+    async def _invoke(route: ModelRoute, prompt: str) -> tuple[Meal, float]:
+        if route.model not in structured_llms:
+            structured_llms[route.model] = get_structured_llm(
+                MEAL_OUTPUT_SCHEMA, route.model
+            )
+        async with scheduler.slot(lane, estimate_tokens(prompt)):
+            started = time.monotonic()
+            raw = await structured_llms[route.model].ainvoke(prompt)
+            latency_s = time.monotonic() - started
+        # Fix mechanical schema violations locally; semantic ones raise
+        return repair_meal(raw, meal_time), latency_s
+
+    attempts_made = 0
+    deadline_hit = False
+    for attempt in range(MAX_ATTEMPTS):
+        # Stop retrying when the run deadline is near: keep the best candidate
+        remaining = seconds_left(deadline)
+        if remaining is not None and remaining <= DEADLINE_MARGIN_SECONDS:
+            deadline_hit = True
+            break
+        attempts_made += 1
+        # Escalate to the stronger model after any failed attempt
+        route = policy.route(
+            "recipe_generation", meal_time, escalate=escalate or attempt > 0
+        )
+        # State the target corrected for this model's learned bias in the slot.
+        # The last meal closes the budget exactly: its target is never adjusted
+        stated_kcal = (
+            target_calories
+            if is_last_meal
+            else calibrator.stated_target(route.model, meal_time, target_calories)
+        )
+        started = time.monotonic()
+        try:
+            # 1. Generate meal via LLM (cancelled if it outlives the deadline)
+            meal, latency_s = await asyncio.wait_for(
+                _invoke(route, _build_prompt(stated_kcal)),
+                timeout=(
+                    None if remaining is None else remaining - DEADLINE_MARGIN_SECONDS
+                ),
+            )
+
+            # 2. total_calories already matches the ingredient sum (repair_meal)
+            actual_kcal = meal.total_calories
+            if not is_last_meal:
+                calibrator.record(route.model, meal_time, stated_kcal, actual_kcal)
+
+            # 3. Excluded foods: never keep a violating meal, retry now
+            violations = exclusion_matcher.violations(meal)
+            if violations:
+                if attempt == 0:
+                    record_first_attempt(route.model, meal_time, False)
+                record_route_result(route, "fail", latency_s)
+                exclusion_feedback = violation_feedback(violations)
+                continue
+
+            # 4. Check tolerance against the real (uncalibrated) target
+            check = tolerance_policy.check(
+                actual_kcal,
+                target_calories,
+                tolerance_scope,
+                slot=meal_time,
+                objective=user_profile.objective.value,
+            )
+            if attempt == 0:
+                record_first_attempt(route.model, meal_time, check.passed)
+            if check.passed:
+                record_route_result(route, "pass", latency_s)
+                return (meal, None)  # Success
+            record_route_result(route, "fail", latency_s)
+
+            # Track best attempt
+            if check.error_pct < best_error:
+                best_error = check.error_pct
+                best_meal = meal
+
+        except TimeoutError:
+            # Only the deadline wait_for above raises it: provider timeouts
+            # are ProviderTimeoutError and retried as errors below
+            deadline_hit = True
+            break
+        except Exception as e:
+            record_route_result(route, "error", time.monotonic() - started)
+            if attempt == 0:
+                record_first_attempt(route.model, meal_time, False)
+            if attempt == MAX_ATTEMPTS - 1 and best_meal is None:
+                return (None, f"Generation failed: {str(e)}")
+
+    if deadline_hit:
+        # Degraded: run deadline cut the retry loop short
+        if best_meal is None:
+            return (None, f"Deadline reached after {attempts_made} attempts")
+        return (
+            best_meal,
+            f"Deadline reached after {attempts_made} attempts. "
+            f"Best error: {best_error * 100:.1f}%",
+        )
+
+    if best_meal is None and violations:
+        used = ", ".join(v.ingredient for v in violations)
+        return (
+            None,
+            f"Failed after {MAX_ATTEMPTS} attempts: excluded foods used ({used})",
+        )
+
+    # Return best attempt with error message
+    error_msg = (
+        f"Failed after {MAX_ATTEMPTS} attempts. Best error: {best_error * 100:.1f}%"
+    )
+    return (best_meal, error_msg)
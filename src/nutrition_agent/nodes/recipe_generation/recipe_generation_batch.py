@@ -4,8 +4,9 @@ This node generates ALL daily meals in parallel using a hybrid strategy:
 1. Generate meals 1 to N-1 in parallel via asyncio.gather()
 2. Generate last meal sequentially with exact remaining budget
 
-Each meal goes through a pre-validation loop (max 3 attempts, ±5% tolerance)
-using the calculate_recipe_nutrition tool for RAG-based validation.
+Each meal goes through the pre-validation loop shared with
+recipe_generation_single (generation.py: max 3 attempts, tolerance.py policy,
+excluded foods checked by exclusions.py).
 
 This approach provides:
 - ~60% latency reduction vs sequential generation
@@ -13,29 +14,25 @@ This approach provides:
 - Pre-validated meals for human review
 """
 
-from __future__ import annotations
-
 import asyncio
 from typing import Any
 
 from dotenv import load_dotenv
+from langchain_core.runnables import RunnableConfig
 
+from src.nutrition_agent.deadline import resolve_deadline
 from src.nutrition_agent.models import Meal, NutritionalTargets, UserProfile
 from src.nutrition_agent.prompts import (
     LAST_MEAL_INSTRUCTION,
-    RECIPE_GENERATION_PROMPT,
     REGULAR_MEAL_INSTRUCTION,
 )
 from src.nutrition_agent.state import NutritionAgentState
-from src.shared import get_llm
-from src.shared.tools import sum_ingredients_kcal
+from src.shared import Lane
+from src.shared.usage import resolve_run_id, track_usage, usage_records
 
-load_dotenv()
+from .generation import generate_meal
 
-# Constants for pre-validation
-MAX_ATTEMPTS = 3
-REGULAR_TOLERANCE = 0.05  # ±5% for regular meals
-LAST_MEAL_TOLERANCE = 0.02  # ±2% for last meal (stricter)
+load_dotenv()
 
 
 async def _generate_single_meal_with_validation(
@@ -47,6 +44,8 @@ async def _generate_single_meal_with_validation(
     current_meal_number: int,
     is_last_meal: bool,
     consumed_kcal: float | None = None,
+    deadline: float | None = None,
+    escalate: bool = False,
 ) -> tuple[Meal | None, str | None]:
     """Generate a single meal with pre-validation loop.
 
@@ -59,127 +58,54 @@ async def _generate_single_meal_with_validation(
         current_meal_number: 1-indexed position of this meal
         is_last_meal: Whether this is the last meal of the day
         consumed_kcal: Calories consumed by previous meals (for last meal only)
+        deadline: Run deadline (epoch seconds); when it is near, outstanding
+            attempts are cancelled and the best candidate is returned
+        escalate: Start with the escalation model (graph-level validation
+            retry); retries after a failed attempt always escalate
 
     Returns:
         Tuple of (Meal or None, error message or None)
     """
-    tolerance = LAST_MEAL_TOLERANCE if is_last_meal else REGULAR_TOLERANCE
-    best_meal: Meal | None = None
-    best_error = float("inf")
-
-    # Build prompt with context
-    if is_last_meal and consumed_kcal is not None:
-        remaining_budget = nutritional_targets.target_calories - consumed_kcal
-        special_instructions = LAST_MEAL_INSTRUCTION.format(
-            consumed_kcal=round(consumed_kcal, 1),
-            remaining_budget=round(remaining_budget, 1),
-        )
-    else:
-        special_instructions = REGULAR_MEAL_INSTRUCTION.format(
+
+    def _instructions(stated_kcal: float) -> str:
+        if is_last_meal and consumed_kcal is not None:
+            return LAST_MEAL_INSTRUCTION.format(
+                consumed_kcal=round(consumed_kcal, 1),
+                remaining_budget=round(stated_kcal, 1),
+            )
+        return REGULAR_MEAL_INSTRUCTION.format(
             current_meal_number=current_meal_number,
             total_meals=total_meals,
-            target_calories=round(target_calories, 1),
+            target_calories=round(stated_kcal, 1),
         )
 
-    excluded_foods_str = ", ".join(user_profile.excluded_foods) or "ninguno"
-    prompt = RECIPE_GENERATION_PROMPT.format(
-        objective=user_profile.objective.value,
-        diet_type=user_profile.diet_type.value,
-        excluded_foods=excluded_foods_str,
-        daily_target_calories=round(nutritional_targets.target_calories, 1),
-        daily_protein_grams=round(nutritional_targets.protein_grams, 1),
-        daily_carbs_grams=round(nutritional_targets.carbs_grams, 1),
-        daily_fat_grams=round(nutritional_targets.fat_grams, 1),
+    # Bulk lane: yields to interactive turns
+    return await generate_meal(
         meal_time=meal_time,
-        target_calories=round(target_calories, 1),
+        target_calories=target_calories,
+        user_profile=user_profile,
+        nutritional_targets=nutritional_targets,
         total_meals=total_meals,
-        special_instructions=special_instructions,
-    )
-
-    llm = get_llm("gpt-4o")
-    structured_llm = llm.with_structured_output(Meal)
-
-    for attempt in range(MAX_ATTEMPTS):
-        try:
-            # 1. Generate meal via LLM
-            meal: Meal = await structured_llm.ainvoke(prompt)
-
-            # 2. Validate ingredient kcal sum vs total_calories
-            ingredient_kcals = [ing.kcal for ing in meal.ingredients]
-            validation_result = sum_ingredients_kcal.invoke(
-                {
-                    "ingredients": ingredient_kcals,
-                    "expected_kcal_sum": meal.total_calories,
-                }
-            )
-
-            if "Correction required" in validation_result:
-                actual_kcal = sum(ingredient_kcals)
-            else:
-                actual_kcal = meal.total_calories
-
-            # 3. Check tolerance
-            error_pct = abs(actual_kcal - target_calories) / target_calories
-            if error_pct <= tolerance:
-                meal.total_calories = actual_kcal
-                return (meal, None)  # Success
-
-            # Track best attempt
-            if error_pct < best_error:
-                best_error = error_pct
-                best_meal = meal
-                best_meal.total_calories = actual_kcal
-
-        except Exception as e:
-            # Log error but continue trying
-            if attempt == MAX_ATTEMPTS - 1 and best_meal is None:
-                return (None, f"Generation failed: {str(e)}")
-
-    # Return best attempt with error message
-    error_msg = (
-        f"Failed after {MAX_ATTEMPTS} attempts. Best error: {best_error * 100:.1f}%"
+        instructions=_instructions,
+        is_last_meal=is_last_meal,
+        deadline=deadline,
+        escalate=escalate,
+        lane=Lane.BULK,
     )
-    return (best_meal, error_msg)
-
-
-async def recipe_generation_batch(state: NutritionAgentState) -> dict[str, Any]:
-    """Generate all daily meals using hybrid parallel strategy.
 
-    This node uses asyncio.gather() to generate N-1 meals in parallel,
-    then generates the last meal sequentially with exact remaining budget.
 
-    Args:
-        state: Current agent state with meal_distribution, user_profile,
-               and nutritional_targets
+async def _generate_daily_meals(
+    meal_distribution: dict[str, float],
+    user_profile: UserProfile,
+    nutritional_targets: NutritionalTargets,
+    deadline: float | None,
+    escalate: bool = False,
+) -> dict[str, Any]:
+    """Hybrid parallel generation: N-1 meals in parallel, last meal sequential.
 
     Returns:
-        dict with:
-        - daily_meals: List of generated Meal objects
-        - meal_generation_errors: Dict mapping meal_time to error message
+        dict with daily_meals and meal_generation_errors
     """
-    meal_distribution = state.get("meal_distribution")
-    if meal_distribution is None:
-        raise ValueError("meal_distribution is required for recipe generation")
-
-    # Handle LangGraph serialization: Pydantic models become dicts after checkpointing
-    user_profile_data = state.get("user_profile")
-    if user_profile_data is None:
-        raise ValueError("user_profile is required for recipe generation")
-    user_profile = (
-        UserProfile(**user_profile_data)
-        if isinstance(user_profile_data, dict)
-        else user_profile_data
-    )
-
-    nutritional_targets_data = state.get("nutritional_targets")
-    if nutritional_targets_data is None:
-        raise ValueError("nutritional_targets is required for recipe generation")
-    nutritional_targets = (
-        NutritionalTargets(**nutritional_targets_data)
-        if isinstance(nutritional_targets_data, dict)
-        else nutritional_targets_data
-    )
-
     meal_times = list(meal_distribution.keys())
     total_meals = len(meal_times)
 
@@ -197,6 +123,8 @@ async def recipe_generation_batch(state: NutritionAgentState) -> dict[str, Any]:
             current_meal_number=1,
             is_last_meal=True,
             consumed_kcal=0.0,
+            deadline=deadline,
+            escalate=escalate,
         )
         meal, error = result
         daily_meals = [meal] if meal else []
@@ -214,6 +142,8 @@ async def recipe_generation_batch(state: NutritionAgentState) -> dict[str, Any]:
             total_meals=total_meals,
             current_meal_number=idx + 1,
             is_last_meal=False,
+            deadline=deadline,
+            escalate=escalate,
         )
         parallel_tasks.append(task)
 
@@ -237,6 +167,8 @@ async def recipe_generation_batch(state: NutritionAgentState) -> dict[str, Any]:
         current_meal_number=total_meals,
         is_last_meal=True,
         consumed_kcal=consumed_kcal,
+        deadline=deadline,
+        escalate=escalate,
     )
 
     # 4. Combine results and handle errors
@@ -252,3 +184,60 @@ async def recipe_generation_batch(state: NutritionAgentState) -> dict[str, Any]:
         "daily_meals": daily_meals,
         "meal_generation_errors": meal_generation_errors,
     }
+
+
+async def recipe_generation_batch(
+    state: NutritionAgentState, config: RunnableConfig | None = None
+) -> dict[str, Any]:
+    """Generate all daily meals using hybrid parallel strategy.
+
+    This node uses asyncio.gather() to generate N-1 meals in parallel,
+    then generates the last meal sequentially with exact remaining budget.
+
+    Args:
+        state: Current agent state with meal_distribution, user_profile,
+               nutritional_targets and run_deadline
+        config: Node config (configurable.run_deadline overrides state)
+
+    Returns:
+        dict with:
+        - daily_meals: List of generated Meal objects
+        - meal_generation_errors: Dict mapping meal_time to error message
+        - token_usage: LLM usage records of this node
+    """
+    meal_distribution = state.get("meal_distribution")
+    if meal_distribution is None:
+        raise ValueError("meal_distribution is required for recipe generation")
+
+    # Handle LangGraph serialization: Pydantic models become dicts after checkpointing
+    user_profile_data = state.get("user_profile")
+    if user_profile_data is None:
+        raise ValueError("user_profile is required for recipe generation")
+    user_profile = (
+        UserProfile(**user_profile_data)
+        if isinstance(user_profile_data, dict)
+        else user_profile_data
+    )
+
+    nutritional_targets_data = state.get("nutritional_targets")
+    if nutritional_targets_data is None:
+        raise ValueError("nutritional_targets is required for recipe generation")
+    nutritional_targets = (
+        NutritionalTargets(**nutritional_targets_data)
+        if isinstance(nutritional_targets_data, dict)
+        else nutritional_targets_data
+    )
+
+    deadline = resolve_deadline(state, config)
+    # Auto-fix after a failed validation: route every slot to the stronger model
+    escalate = state.get("validation_retry_count", 0) > 0
+    with track_usage() as usage:
+        result = await _generate_daily_meals(
+            meal_distribution, user_profile, nutritional_targets, deadline, escalate
+        )
+    result["token_usage"] = usage_records(
+        usage,
+        node="recipe_generation_batch",
+        run_id=resolve_run_id(state, config),
+    )
+    return result
@@ -4,25 +4,26 @@ This node regenerates a SINGLE specific meal after the user requests
 a change during HITL review. It replaces the meal in the daily_meals list
 and returns control to meal_review_batch for re-review.
 
+When the user asks for a change without feedback and the alternative
+prepared during the review is still valid (see speculation.py), it is
+served from the cache without calling the LLM.
+
 Used when: review_decision == "change_meal"
 """
 
-from __future__ import annotations
-
 from typing import Any
 
+from langchain_core.runnables import RunnableConfig
+
+from src.nutrition_agent.deadline import resolve_deadline
 from src.nutrition_agent.models import Meal, NutritionalTargets, UserProfile
-from src.nutrition_agent.prompts import (
-    RECIPE_GENERATION_PROMPT,
-    REGULAR_MEAL_INSTRUCTION,
-)
+from src.nutrition_agent.prompts import REGULAR_MEAL_INSTRUCTION
+from src.nutrition_agent.speculation import get_alternative_cache, resolve_thread_id
 from src.nutrition_agent.state import NutritionAgentState
-from src.shared import get_llm
-from src.shared.tools import sum_ingredients_kcal
+from src.shared import Lane
+from src.shared.usage import resolve_run_id, track_usage, usage_records
 
-# Constants for pre-validation (same as batch)
-MAX_ATTEMPTS = 3
-REGULAR_TOLERANCE = 0.05  # ±5%
+from .generation import generate_meal
 
 
 async def _generate_single_meal_with_feedback(
@@ -33,11 +34,15 @@ async def _generate_single_meal_with_feedback(
     total_meals: int,
     current_meal_number: int,
     user_feedback: str | None = None,
+    deadline: float | None = None,
+    escalate: bool = False,
+    lane: Lane = Lane.INTERACTIVE,
 ) -> tuple[Meal | None, str | None]:
     """Generate a single meal with optional user feedback for guidance.
 
-    Similar to the helper in recipe_generation_batch, but incorporates
-    user feedback into the prompt when regenerating.
+    Runs the shared attempt loop (generation.py) like the helper in
+    recipe_generation_batch, but incorporates user feedback into the prompt
+    when regenerating.
 
     Args:
         meal_time: The meal time (e.g., "Desayuno", "Comida", "Cena")
@@ -47,89 +52,47 @@ async def _generate_single_meal_with_feedback(
         total_meals: Total number of meals in the day
         current_meal_number: 1-indexed position of this meal
         user_feedback: Optional user feedback to guide regeneration
+        deadline: Run deadline (epoch seconds); when it is near, outstanding
+            attempts are cancelled and the best candidate is returned
+        escalate: Start with the escalation model (graph-level validation
+            retry); retries after a failed attempt always escalate
+        lane: Scheduler lane (interactive for HITL changes, bulk for
+            validation auto-fix)
 
     Returns:
         Tuple of (Meal or None, error message or None)
     """
-    best_meal: Meal | None = None
-    best_error = float("inf")
 
-    # Build special instructions with user feedback
-    base_instruction = REGULAR_MEAL_INSTRUCTION.format(
-        current_meal_number=current_meal_number,
-        total_meals=total_meals,
-        target_calories=round(target_calories, 1),
-    )
-
-    if user_feedback:
-        special_instructions = (
-            f"{base_instruction}\n\n"
-            f"USER FEEDBACK (must be incorporated):\n{user_feedback}"
+    def _instructions(stated_kcal: float) -> str:
+        base_instruction = REGULAR_MEAL_INSTRUCTION.format(
+            current_meal_number=current_meal_number,
+            total_meals=total_meals,
+            target_calories=round(stated_kcal, 1),
         )
-    else:
-        special_instructions = base_instruction
-
-    excluded_foods_str = ", ".join(user_profile.excluded_foods) or "ninguno"
-    prompt = RECIPE_GENERATION_PROMPT.format(
-        objective=user_profile.objective.value,
-        diet_type=user_profile.diet_type.value,
-        excluded_foods=excluded_foods_str,
-        daily_target_calories=round(nutritional_targets.target_calories, 1),
-        daily_protein_grams=round(nutritional_targets.protein_grams, 1),
-        daily_carbs_grams=round(nutritional_targets.carbs_grams, 1),
-        daily_fat_grams=round(nutritional_targets.fat_grams, 1),
-        meal_time=meal_time,
-        target_calories=round(target_calories, 1),
-        total_meals=total_meals,
-        special_instructions=special_instructions,
-    )
-
-    llm = get_llm("gpt-4o")
-    structured_llm = llm.with_structured_output(Meal)
-
-    for attempt in range(MAX_ATTEMPTS):
-        try:
-            # 1. Generate meal via LLM
-            meal: Meal = await structured_llm.ainvoke(prompt)
-
-            # 2. Validate ingredient kcal sum vs total_calories
-            ingredient_kcals = [ing.kcal for ing in meal.ingredients]
-            validation_result = sum_ingredients_kcal.invoke(
-                {
-                    "ingredients": ingredient_kcals,
-                    "expected_kcal_sum": meal.total_calories,
-                }
+        # Build special instructions with user feedback
+        if user_feedback:
+            return (
+                f"{base_instruction}\n\n"
+                f"USER FEEDBACK (must be incorporated):\n{user_feedback}"
             )
+        return base_instruction
 
-            if "Correction required" in validation_result:
-                actual_kcal = sum(ingredient_kcals)
-            else:
-                actual_kcal = meal.total_calories
-
-            # 3. Check tolerance
-            error_pct = abs(actual_kcal - target_calories) / target_calories
-            if error_pct <= REGULAR_TOLERANCE:
-                meal.total_calories = actual_kcal
-                return (meal, None)  # Success
-
-            # Track best attempt
-            if error_pct < best_error:
-                best_error = error_pct
-                best_meal = meal
-                best_meal.total_calories = actual_kcal
-
-        except Exception as e:
-            if attempt == MAX_ATTEMPTS - 1 and best_meal is None:
-                return (None, f"Generation failed: {str(e)}")
-
-    # Return best attempt with error message
-    error_msg = (
-        f"Failed after {MAX_ATTEMPTS} attempts. Best error: {best_error * 100:.1f}%"
+    return await generate_meal(
+        meal_time=meal_time,
+        target_calories=target_calories,
+        user_profile=user_profile,
+        nutritional_targets=nutritional_targets,
+        total_meals=total_meals,
+        instructions=_instructions,
+        deadline=deadline,
+        escalate=escalate,
+        lane=lane,
     )
-    return (best_meal, error_msg)
 
 
-async def recipe_generation_single(state: NutritionAgentState) -> dict[str, Any]:
+async def recipe_generation_single(
+    state: NutritionAgentState, config: RunnableConfig | None = None
+) -> dict[str, Any]:
     """Regenerate a single meal after user requests a change.
 
     This node is used when the user selects "change_meal" during HITL review.
@@ -140,12 +103,16 @@ async def recipe_generation_single(state: NutritionAgentState) -> dict[str, Any]
     Args:
         state: Current agent state with daily_meals, selected_meal_to_change,
                user_feedback, meal_distribution, user_profile, nutritional_targets
+               and run_deadline
+        config: Node config (configurable.run_deadline overrides state;
+                configurable.thread_id keys the speculative alternatives)
 
     Returns:
         dict with:
         - daily_meals: Updated list with regenerated meal
         - review_decision: None (reset for re-review)
         - meal_generation_errors: Updated errors dict
+        - token_usage: LLM usage records of this node
     """
     selected_meal_to_change = state.get("selected_meal_to_change")
     if selected_meal_to_change is None:
@@ -188,31 +155,70 @@ async def recipe_generation_single(state: NutritionAgentState) -> dict[str, Any]
     # Get target calories for this meal
     target_calories = meal_distribution[meal_time_to_change]
 
-    # Generate new meal with user feedback
-    user_feedback = state.get("user_feedback")
-    new_meal, error = await _generate_single_meal_with_feedback(
-        meal_time=meal_time_to_change,
-        target_calories=target_calories,
-        user_profile=user_profile,
-        nutritional_targets=nutritional_targets,
-        total_meals=total_meals,
-        current_meal_number=meal_index + 1,
-        user_feedback=user_feedback,
-    )
-
-    # Update daily_meals list
     # Handle LangGraph serialization: Pydantic models become dicts after checkpointing
     daily_meals_data = state.get("daily_meals", [])
     updated_meals = [Meal(**m) if isinstance(m, dict) else m for m in daily_meals_data]
+
+    # HITL change without feedback: serve the alternative prepared during review
+    user_feedback = state.get("user_feedback")
+    alternative = None
+    cache = get_alternative_cache()
+    thread_id = resolve_thread_id(config)
+    if (
+        cache.enabled
+        and thread_id is not None
+        and state.get("review_decision") == "change_meal"
+        and not (user_feedback or "").strip()
+    ):
+        current_meal = next(
+            (m for m in updated_meals if m.slot_key == meal_time_to_change), None
+        )
+        if current_meal is not None:
+            alternative = cache.take(thread_id, meal_time_to_change, current_meal.title)
+
+    new_meal: Meal | None
+    error: str | None
+    if alternative is not None:
+        new_meal, error = alternative.meal, None
+        token_usage = list(alternative.token_usage)
+    else:
+        # Generate new meal with user feedback
+        with track_usage() as usage:
+            new_meal, error = await _generate_single_meal_with_feedback(
+                meal_time=meal_time_to_change,
+                target_calories=target_calories,
+                user_profile=user_profile,
+                nutritional_targets=nutritional_targets,
+                total_meals=total_meals,
+                current_meal_number=meal_index + 1,
+                user_feedback=user_feedback,
+                deadline=resolve_deadline(state, config),
+                # Auto-fix after a failed validation: use the stronger model
+                escalate=state.get("validation_retry_count", 0) > 0,
+            )
+        token_usage = usage_records(
+            usage,
+            node="recipe_generation_single",
+            run_id=resolve_run_id(state, config),
+        )
+
+    # Update daily_meals list
     if new_meal is not None:
         # Find and replace the meal in the list
         for i, meal in enumerate(updated_meals):
-            if meal.meal_time.value == meal_time_to_change:
+            if meal.slot_key == meal_time_to_change:
                 updated_meals[i] = new_meal
                 break
         else:
-            # Meal not found (shouldn't happen), append
+            # Slot had no meal (generation failed earlier): insert in slot order
             updated_meals.append(new_meal)
+            updated_meals.sort(
+                key=lambda m: (
+                    meal_times.index(m.slot_key)
+                    if m.slot_key in meal_times
+                    else total_meals
+                )
+            )
 
     # Update errors
     updated_errors = dict(state.get("meal_generation_errors", {}))  # Copy
@@ -227,4 +233,5 @@ async def recipe_generation_single(state: NutritionAgentState) -> dict[str, Any]
         "meal_generation_errors": updated_errors,
         "selected_meal_to_change": None,  # Clear selection
         "user_feedback": None,  # Clear feedback
+        "token_usage": token_usage,
     }
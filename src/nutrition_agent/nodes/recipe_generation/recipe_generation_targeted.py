@@ -0,0 +1,174 @@
+"""Targeted regeneration node for the nutrition agent.
+
+When validation finds several meals off budget, or the user asks to change
+several meals in one HITL review, this node regenerates ONLY those slots
+and keeps every other meal:
+
+1. Failed slots other than the last one are regenerated in parallel, each
+   with its validation feedback and its meal_distribution budget
+2. If the last slot failed, it is regenerated afterwards with the exact
+   remaining daily budget (kept + regenerated meals), as in the batch node
+
+Used when: validation reports 2+ failed slots, or
+           review_decision == "change_meals" (state["failed_meals"])
+
+Metrics:
+- targeted_regeneration_meals_total{kind=regenerated|kept}
+"""
+
+import asyncio
+from collections.abc import Awaitable
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+
+from src.nutrition_agent.deadline import resolve_deadline
+from src.nutrition_agent.models import Meal, NutritionalTargets, UserProfile
+from src.nutrition_agent.state import NutritionAgentState
+from src.shared import Lane
+from src.shared.metrics import metrics
+from src.shared.usage import resolve_run_id, track_usage, usage_records
+
+from .recipe_generation_single import _generate_single_meal_with_feedback
+
+
+async def recipe_generation_targeted(
+    state: NutritionAgentState, config: RunnableConfig | None = None
+) -> dict[str, Any]:
+    """Regenerate only the slots listed in failed_meals.
+
+    Args:
+        state: Current agent state with failed_meals, review_decision,
+               daily_meals, meal_distribution, user_profile,
+               nutritional_targets and run_deadline
+        config: Node config (configurable.run_deadline overrides state)
+
+    Returns:
+        dict with:
+        - daily_meals: Kept and regenerated meals in slot order
+        - meal_generation_errors: Updated errors dict
+        - failed_meals: {} (validation recomputes it)
+        - review_decision: None (reset for re-review)
+        - token_usage: LLM usage records of this node
+    """
+    failed_meals: dict[str, str] = dict(state.get("failed_meals") or {})
+    if not failed_meals:
+        raise ValueError("failed_meals is required for targeted regeneration")
+    meal_distribution = state.get("meal_distribution")
+    if meal_distribution is None:
+        raise ValueError("meal_distribution is required for targeted regeneration")
+
+    # Handle LangGraph serialization: Pydantic models become dicts after checkpointing
+    user_profile_data = state.get("user_profile")
+    if user_profile_data is None:
+        raise ValueError("user_profile is required for targeted regeneration")
+    user_profile = (
+        UserProfile(**user_profile_data)
+        if isinstance(user_profile_data, dict)
+        else user_profile_data
+    )
+
+    nutritional_targets_data = state.get("nutritional_targets")
+    if nutritional_targets_data is None:
+        raise ValueError("nutritional_targets is required for targeted regeneration")
+    nutritional_targets = (
+        NutritionalTargets(**nutritional_targets_data)
+        if isinstance(nutritional_targets_data, dict)
+        else nutritional_targets_data
+    )
+
+    daily_meals_data = state.get("daily_meals", [])
+    daily_meals = [Meal(**m) if isinstance(m, dict) else m for m in daily_meals_data]
+
+    meal_times = list(meal_distribution.keys())
+    total_meals = len(meal_times)
+    unknown = [slot for slot in failed_meals if slot not in meal_distribution]
+    if unknown:
+        raise ValueError(f"Failed slots not found in distribution: {unknown}")
+
+    kept = {
+        meal.slot_key: meal for meal in daily_meals if meal.slot_key not in failed_meals
+    }
+    deadline = resolve_deadline(state, config)
+    # Auto-fix after a failed validation: use the stronger model
+    escalate = state.get("validation_retry_count", 0) > 0
+    # HITL changes: the user is waiting; auto-fix yields to interactive turns
+    user_request = state.get("review_decision") == "change_meals"
+    lane = Lane.INTERACTIVE if user_request else Lane.BULK
+
+    def _regenerate(
+        slot: str, target_calories: float
+    ) -> Awaitable[tuple[Meal | None, str | None]]:
+        return _generate_single_meal_with_feedback(
+            meal_time=slot,
+            target_calories=target_calories,
+            user_profile=user_profile,
+            nutritional_targets=nutritional_targets,
+            total_meals=total_meals,
+            current_meal_number=meal_times.index(slot) + 1,
+            user_feedback=failed_meals[slot],
+            deadline=deadline,
+            escalate=escalate,
+            lane=lane,
+        )
+
+    last_slot = meal_times[-1]
+    parallel_slots = [
+        slot for slot in meal_times if slot in failed_meals and slot != last_slot
+    ]
+
+    results: dict[str, tuple[Meal | None, str | None]] = {}
+    with track_usage() as usage:
+        # 1. Failed slots except the last one, in PARALLEL
+        parallel_results = await asyncio.gather(
+            *(_regenerate(slot, meal_distribution[slot]) for slot in parallel_slots)
+        )
+        results.update(zip(parallel_slots, parallel_results, strict=True))
+
+        # 2. Last slot: close the day with the exact remaining budget
+        if last_slot in failed_meals:
+            consumed_kcal = sum(
+                meal.total_calories for slot, meal in kept.items() if slot != last_slot
+            ) + sum(
+                meal.total_calories for meal, _ in results.values() if meal is not None
+            )
+            results[last_slot] = await _regenerate(
+                last_slot, nutritional_targets.target_calories - consumed_kcal
+            )
+    token_usage = usage_records(
+        usage,
+        node="recipe_generation_targeted",
+        run_id=resolve_run_id(state, config),
+    )
+
+    # Keep passing meals; a failed slot keeps its old meal if regeneration failed
+    old_meals = {meal.slot_key: meal for meal in daily_meals}
+    updated_errors = dict(state.get("meal_generation_errors", {}))  # Copy
+    updated_meals: list[Meal] = []
+    for slot in meal_times:
+        if slot in results:
+            new_meal, error = results[slot]
+            if error:
+                updated_errors[slot] = error
+            else:
+                updated_errors.pop(slot, None)
+            meal = new_meal or old_meals.get(slot)
+        else:
+            meal = kept.get(slot)
+        if meal is not None:
+            updated_meals.append(meal)
+
+    metrics.increment(
+        "targeted_regeneration_meals_total", float(len(results)), kind="regenerated"
+    )
+    metrics.increment(
+        "targeted_regeneration_meals_total", float(len(kept)), kind="kept"
+    )
+
+    return {
+        "daily_meals": updated_meals,
+        "meal_generation_errors": updated_errors,
+        "failed_meals": {},
+        "review_decision": None,  # Reset for re-review
+        "token_usage": token_usage,
+    }
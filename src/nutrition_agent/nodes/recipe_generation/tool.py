@@ -12,6 +12,10 @@ from langchain_core.tools import tool
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 
+from src.shared.cassette import cassette_llm_kwargs, cassette_mode, wrap_retriever
+from src.shared.llm_cache import get_response_cache
+from src.shared.scheduler import Lane, estimate_tokens, get_llm_scheduler
+
 from ...models.tools import (
     IngredientInput,
     NutriFacts,
@@ -70,7 +74,11 @@ class ResourceLoader:
     @staticmethod
     def _init_extractor_sync() -> RunnableSerializable[dict, Any]:
         """Blocking init — runs in thread pool via asyncio.to_thread."""
-        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        # Deterministic lookup: opt in to the exact-match response cache
+        llm_kwargs: dict[str, Any] = {"cache": get_response_cache()}
+        # Record/replay overrides the response cache (see shared/cassette.py)
+        llm_kwargs.update(cassette_llm_kwargs())
+        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, **llm_kwargs)
 
         prompt = ChatPromptTemplate.from_template(
             """Analyze the context. Extract data for: '{ingredient_name}'.
@@ -85,7 +93,15 @@ class ResourceLoader:
         if cls._retriever is None:
             async with cls._retriever_lock:
                 if cls._retriever is None:
-                    cls._retriever = await asyncio.to_thread(cls._init_retriever_sync)
+                    # Replay serves recorded documents: Pinecone is not needed
+                    live = (
+                        None
+                        if cassette_mode() == "replay"
+                        else await asyncio.to_thread(cls._init_retriever_sync)
+                    )
+                    cls._retriever = wrap_retriever(
+                        live, namespace=os.getenv("PINECONE_INDEX_NAME", "pinecone")
+                    )
         return cls._retriever
 
     @classmethod
@@ -163,10 +179,14 @@ async def _process_ingredient_task(ing: IngredientInput) -> ProcessedItem:
             # Select best-matching doc from k=5 candidates
             best_doc = _select_best_doc(ing.nombre, docs)
 
-            # 2. Extraction
-            raw_data = await extractor.ainvoke(
-                {"ingredient_name": ing.nombre, "context": best_doc.page_content}
-            )
+            # 2. Extraction (bulk lane: shares the process-wide LLM budget)
+            async with get_llm_scheduler().slot(
+                Lane.BULK,
+                estimate_tokens(best_doc.page_content, completion_tokens=100),
+            ):
+                raw_data = await extractor.ainvoke(
+                    {"ingredient_name": ing.nombre, "context": best_doc.page_content}
+                )
 
             # 3. Calculation
             factor = ing.peso_gramos / 100.0
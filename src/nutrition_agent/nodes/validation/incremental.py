@@ -0,0 +1,144 @@
+"""Incremental validation: per-meal results cached by Meal content hash.
+
+validation runs after every generation node. After recipe_generation_single
+or recipe_generation_targeted replaces some meals, the other meals are
+unchanged, so their budget checks and shopping-list contributions are
+reused from state["validation_cache"] (a ValidationCache):
+
+- checks: fingerprint -> MealCheck (reused while budget, objective and the
+  tolerance rule of the meal match)
+- contributions: fingerprint -> that meal's ingredient_totals
+- totals: consolidated list of the meals in `basis`, updated by subtracting
+  the replaced meals' contributions and adding the new meals'
+
+Entries of meals no longer in the plan are pruned on every run.
+
+Metrics:
+- validation_meals_total{outcome=reused|computed}
+"""
+
+import hashlib
+from collections import Counter
+
+from src.nutrition_agent.models import Meal, MealCheck, ValidationCache
+from src.nutrition_agent.tolerance import get_tolerance_policy
+from src.shared.metrics import metrics
+
+from .tools import ingredient_totals
+
+
+def meal_fingerprint(meal: Meal) -> str:
+    """Content hash of a meal (slot, recipe and ingredients)."""
+    return hashlib.sha256(meal.model_dump_json().encode()).hexdigest()[:16]
+
+
+def _key(item: str, unit: str) -> str:
+    return f"{item}|{unit}"
+
+
+def _split(key: str) -> tuple[str, str]:
+    item, unit = key.rsplit("|", 1)
+    return item, unit
+
+
+def check_meal(
+    cache: ValidationCache,
+    fingerprint: str,
+    meal: Meal,
+    budget: float,
+    objective: str,
+) -> MealCheck:
+    """Budget check of one meal, reused from the cache when still valid."""
+    policy = get_tolerance_policy()
+    _, rule = policy.rule_for("meal", meal.slot_key, objective)
+    tolerance = [rule.relative, rule.absolute_kcal]
+    cached = cache.checks.get(fingerprint)
+    if (
+        cached is not None
+        and cached.budget == budget
+        and cached.objective == objective
+        and cached.tolerance == tolerance
+    ):
+        metrics.increment("validation_meals_total", outcome="reused")
+        return cached
+
+    kcal_sum = sum(ing.kcal for ing in meal.ingredients)
+    result = policy.check(
+        kcal_sum, budget, "meal", slot=meal.slot_key, objective=objective
+    )
+    check = MealCheck(
+        budget=budget,
+        objective=objective,
+        tolerance=tolerance,
+        kcal_sum=kcal_sum,
+        passed=result.passed,
+        error_pct=result.error_pct,
+    )
+    cache.checks[fingerprint] = check
+    metrics.increment("validation_meals_total", outcome="computed")
+    return check
+
+
+def _contributions(
+    cache: ValidationCache, fingerprint: str, meal: Meal
+) -> dict[str, float]:
+    contribution = cache.contributions.get(fingerprint)
+    if contribution is None:
+        contribution = {
+            _key(item, unit): qty
+            for (item, unit), qty in ingredient_totals(meal.ingredients).items()
+        }
+        cache.contributions[fingerprint] = contribution
+    return contribution
+
+
+def update_shopping_totals(
+    cache: ValidationCache, meals: list[tuple[str, Meal]]
+) -> dict[tuple[str, str], float]:
+    """Bring cache.totals up to date with the current plan.
+
+    Args:
+        cache: Validation cache (updated in place)
+        meals: (fingerprint, meal) for every meal of the current plan
+
+    Returns:
+        (item, unit) totals, as ingredient_totals over every current meal
+    """
+    by_fingerprint = dict(meals)
+    current = Counter(fingerprint for fingerprint, _ in meals)
+    previous = Counter(cache.basis)
+    removed = previous - current
+    if any(fingerprint not in cache.contributions for fingerprint in previous):
+        # Inconsistent cache (e.g. written by an older version): rebuild
+        cache.totals, removed, previous = {}, Counter(), Counter()
+
+    totals = cache.totals
+    touched: set[str] = set()
+    for fingerprint, count in removed.items():
+        for key, qty in cache.contributions[fingerprint].items():
+            totals[key] = totals.get(key, 0.0) - qty * count
+            touched.add(key)
+    for fingerprint, count in (current - previous).items():
+        meal = by_fingerprint[fingerprint]
+        for key, qty in _contributions(cache, fingerprint, meal).items():
+            totals[key] = totals.get(key, 0.0) + qty * count
+
+    # Keys only the removed meals had disappear from the list
+    for key in touched:
+        if not any(key in cache.contributions[fp] for fp in current):
+            del totals[key]
+
+    cache.basis = list(current.elements())
+    return {_split(key): qty for key, qty in totals.items()}
+
+
+def prune(cache: ValidationCache, fingerprints: set[str]) -> None:
+    """Drop cached results of meals that are no longer in the plan."""
+    cache.checks = {
+        fp: check for fp, check in cache.checks.items() if fp in fingerprints
+    }
+    cache.contributions = {
+        fp: contribution
+        for fp, contribution in cache.contributions.items()
+        if fp in fingerprints
+    }
@@ -0,0 +1,177 @@
+"""Unit-aware quantities for shopping list consolidation.
+
+Shopping list totals are numeric amounts in one of three base units:
+
+    g          mass
+    ml         volume
+    unidad/es  count
+
+The same food often reaches the list in two units ("Huevo 2 unidades" in
+one meal, "Huevo 100g" in another). merge_units converts such lines into
+one unit using a per-food table of unit weights (egg = 50 g) and densities
+(milk = 1.03 g/ml). Lines that cannot be converted stay separate.
+
+FOOD_CONVERSIONS is compiled once into a single regex that matches the
+head of an ingredient name (longest term first: "leche de almendra" before
+"leche"); lookups are memoized per name.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from src.nutrition_agent.exclusions import normalize_food
+
+GRAMS = "g"
+MILLILITERS = "ml"
+UNITS = "unidad/es"
+
+# Base unit -> dimension
+DIMENSIONS: dict[str, str] = {GRAMS: "mass", MILLILITERS: "volume", UNITS: "count"}
+
+
+@dataclass(frozen=True)
+class Conversion:
+    """How to convert a food's count or volume to grams.
+
+    Attributes:
+        grams_per_unit: Weight of one unit (one egg, one banana)
+        grams_per_ml: Density
+    """
+
+    grams_per_unit: float | None = None
+    grams_per_ml: float | None = None
+
+
+# Normalized food term (as normalize_food returns it) -> Conversion
+FOOD_CONVERSIONS: dict[str, Conversion] = {
+    # Counted foods (edible weight of a medium piece)
+    "huevo": Conversion(grams_per_unit=50.0),
+    "clara de huevo": Conversion(grams_per_unit=33.0),
+    "yema de huevo": Conversion(grams_per_unit=17.0),
+    "platano": Conversion(grams_per_unit=120.0),
+    "banana": Conversion(grams_per_unit=120.0),
+    "manzana": Conversion(grams_per_unit=180.0),
+    "pera": Conversion(grams_per_unit=170.0),
+    "naranja": Conversion(grams_per_unit=200.0),
+    "mandarina": Conversion(grams_per_unit=80.0),
+    "kiwi": Conversion(grams_per_unit=75.0),
+    "limon": Conversion(grams_per_unit=100.0),
+    "tomate": Conversion(grams_per_unit=120.0),
+    "cebolla": Conversion(grams_per_unit=150.0),
+    "zanahoria": Conversion(grams_per_unit=80.0),
+    "patata": Conversion(grams_per_unit=170.0),
+    "pimiento": Conversion(grams_per_unit=150.0),
+    "calabacin": Conversion(grams_per_unit=250.0),
+    "pepino": Conversion(grams_per_unit=300.0),
+    "aguacate": Conversion(grams_per_unit=200.0),
+    "diente de ajo": Conversion(grams_per_unit=5.0),
+    "ajo": Conversion(grams_per_unit=5.0),
+    "tortilla de trigo": Conversion(grams_per_unit=40.0),
+    "rebanada de pan": Conversion(grams_per_unit=30.0),
+    "yogur": Conversion(grams_per_unit=125.0, grams_per_ml=1.04),
+    "yogurt": Conversion(grams_per_unit=125.0, grams_per_ml=1.04),
+    # Liquids
+    "leche": Conversion(grams_per_ml=1.03),
+    "leche de almendra": Conversion(grams_per_ml=1.01),
+    "leche de avena": Conversion(grams_per_ml=1.02),
+    "leche de soja": Conversion(grams_per_ml=1.02),
+    "bebida vegetal": Conversion(grams_per_ml=1.02),
+    "kefir": Conversion(grams_per_ml=1.03),
+    "nata": Conversion(grams_per_ml=1.0),
+    "aceite": Conversion(grams_per_ml=0.92),
+    "aceite de oliva": Conversion(grams_per_ml=0.91),
+    "agua": Conversion(grams_per_ml=1.0),
+    "caldo": Conversion(grams_per_ml=1.0),
+    "vinagre": Conversion(grams_per_ml=1.01),
+    "zumo": Conversion(grams_per_ml=1.04),
+    "jugo": Conversion(grams_per_ml=1.04),
+    "salsa de soja": Conversion(grams_per_ml=1.2),
+    "miel": Conversion(grams_per_ml=1.42),
+    "sirope": Conversion(grams_per_ml=1.33),
+    "clara de huevo liquida": Conversion(grams_per_ml=1.03),
+}
+
+# Longest first so "leche de almendra" wins over "leche"
+_FOOD_RE = re.compile(
+    r"("
+    + "|".join(
+        re.escape(term) for term in sorted(FOOD_CONVERSIONS, key=len, reverse=True)
+    )
+    + r")(?:e?s)?\b"
+)
+
+
+@lru_cache(maxsize=4096)
+def conversion_for(item: str) -> Conversion | None:
+    """Conversion of the food an ingredient name starts with, if known."""
+    match = _FOOD_RE.match(normalize_food(item))
+    return FOOD_CONVERSIONS[match.group(1)] if match else None
+
+
+def to_grams(amount: float, unit: str, conversion: Conversion | None) -> float | None:
+    """Amount in grams, or None if the food has no conversion for `unit`."""
+    if unit == GRAMS:
+        return amount
+    factor = _grams_per(unit, conversion)
+    return amount * factor if factor else None
+
+
+def from_grams(grams: float, unit: str, conversion: Conversion | None) -> float | None:
+    """Grams expressed in `unit`, or None if the food has no conversion."""
+    if unit == GRAMS:
+        return grams
+    factor = _grams_per(unit, conversion)
+    return grams / factor if factor else None
+
+
+def _grams_per(unit: str, conversion: Conversion | None) -> float | None:
+    if conversion is None:
+        return None
+    if unit == UNITS:
+        return conversion.grams_per_unit
+    if unit == MILLILITERS:
+        return conversion.grams_per_ml
+    return None
+
+
+def _target_unit(units: set[str], conversion: Conversion) -> str:
+    """Unit a shopper buys the food in: pieces, then volume, then weight."""
+    if UNITS in units and conversion.grams_per_unit:
+        return UNITS
+    if MILLILITERS in units and conversion.grams_per_ml:
+        return MILLILITERS
+    return GRAMS
+
+
+def merge_units(
+    totals: dict[tuple[str, str], float],
+) -> dict[tuple[str, str], float]:
+    """Merge the lines of a food that appear in several units.
+
+    Args:
+        totals: (item, base unit) -> amount, as ingredient_totals returns
+
+    Returns:
+        Totals with at most one line per food and dimension it can be
+        converted to; unconvertible lines (and "varios") are kept as they are
+    """
+    units_by_item: dict[str, set[str]] = {}
+    for item, unit in totals:
+        if unit in DIMENSIONS:
+            units_by_item.setdefault(item, set()).add(unit)
+
+    merged: dict[tuple[str, str], float] = {}
+    for (item, unit), amount in totals.items():
+        units = units_by_item.get(item, set())
+        conversion = conversion_for(item) if len(units) > 1 else None
+        if conversion is not None:
+            target = _target_unit(units, conversion)
+            grams = to_grams(amount, unit, conversion)
+            converted = (
+                from_grams(grams, target, conversion) if grams is not None else None
+            )
+            if converted is not None:
+                unit, amount = target, converted
+        merged[(item, unit)] = merged.get((item, unit), 0.0) + amount
+    return merged
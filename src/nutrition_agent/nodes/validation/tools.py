@@ -1,10 +1,23 @@
-"""consolidate_shopping_list, sum_total_kcal"""
+"""consolidate_ingredients, consolidate_shopping_list, sum_total_kcal
+
+consolidate_ingredients is the structured API used by the validation node:
+it takes Ingredient objects and returns typed ShoppingListItems. The
+consolidate_shopping_list tool wraps consolidate_raw_ingredients, a string
+adapter over the same consolidation. aggregate_shopping_lists sums finished lists
+(weekly / household plans) on their numeric amounts.
+
+Lines of the same food in different units are merged (see quantities.py).
+"""
 
 import re
+from collections.abc import Iterable
+from functools import lru_cache
 
 from langchain_core.tools import tool
 
+from ...models import Ingredient, ShoppingListItem
 from ...models.tools import ConsolidateInput, SumTotalInput
+from .quantities import DIMENSIONS, merge_units
 
 
 @tool("sum_total_kcal", args_schema=SumTotalInput)  # type: ignore [misc]
@@ -22,91 +35,136 @@ def sum_total_kcal(kcals_meals: list[float]) -> str:
 
 
 # Ingredient parsing helpers
+#
+# All patterns are compiled once at import, and parse results are memoized:
+# the same ingredient strings recur across validation retries and across
+# users. Benchmark: tests/evaluation/bench_ingredient_parser.py
+
+# Parsed strings kept in the LRU memo of each parser
+_PARSE_CACHE_SIZE = 8192
 
 # Known units whitelist — prevents "ml" from being split into "m" + item "l"
 _KNOWN_UNITS = r"(?:gramos|kilogramos|kilos|litros|unidades|unidad|gr|kg|ml|g|l)"
 
 # Pattern: a number followed immediately (optionally with spaces) by a known unit
 # Works anywhere in the string — handles both "200g Pollo" and "Avena 80g"
-_QTY_UNIT_RE = re.compile(
+_QUANTITY_RE = re.compile(
     rf"(?P<qty>\d+(?:\.\d+)?)\s*(?P<unit>{_KNOWN_UNITS})\b",
     re.IGNORECASE,
 )
 
 # Pattern: fraction like "1/2" followed by a known unit
-_FRAC_UNIT_RE = re.compile(
+_FRACTION_RE = re.compile(
     rf"(?P<num>\d+)\s*/\s*(?P<den>\d+)\s*(?P<unit>{_KNOWN_UNITS})\b",
     re.IGNORECASE,
 )
 
+# Unit -> (scale to base unit, base unit)
+_UNIT_BASE: dict[str, tuple[float, str]] = {
+    "kg": (1000.0, "g"),
+    "kilos": (1000.0, "g"),
+    "kilogramos": (1000.0, "g"),
+    "g": (1.0, "g"),
+    "gr": (1.0, "g"),
+    "gramos": (1.0, "g"),
+    "l": (1000.0, "ml"),
+    "litros": (1000.0, "ml"),
+    "ml": (1.0, "ml"),
+    "unidad": (1.0, "unidad/es"),
+    "unidades": (1.0, "unidad/es"),
+}
+
+# Name cleanup patterns (applied in this order)
+_EMPTY_PARENS_RE = re.compile(r"\(\s*\)")
+_TRAILING_NOTE_RE = re.compile(r"\([^)]*\)\s*$")
+_EDGE_DE_RE = re.compile(r"^\s*de\s+|\s+de\s*$", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def _normalize_unit(raw_unit: str, qty: float) -> tuple[float, str]:
     """Normalize unit to base (g / ml / unidad) and scale qty."""
     u = raw_unit.lower()
-    if u in ("kg", "kilos", "kilogramos"):
-        return qty * 1000, "g"
-    if u in ("gr", "gramos"):
-        return qty, "g"
-    if u == "g":
-        return qty, "g"
-    if u in ("l", "litros"):
-        return qty * 1000, "ml"
-    if u == "ml":
-        return qty, "ml"
-    if u in ("unidad", "unidades"):
-        return qty, "unidad/es"
-    return qty, u
+    scale, unit = _UNIT_BASE.get(u, (1.0, u))
+    return qty * scale, unit
 
 
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
 def _clean_item_name(name: str) -> str:
     """Clean up the item name after quantity extraction."""
     # Remove empty parentheses left over after extracting qty from inside parens
-    name = re.sub(r"\(\s*\)", "", name)
+    name = _EMPTY_PARENS_RE.sub("", name)
     # Remove trailing parenthesized cooking notes like "(al grill, sin piel)"
-    name = re.sub(r"\([^)]*\)\s*$", "", name)
+    name = _TRAILING_NOTE_RE.sub("", name)
     # Remove leading/trailing "de "
-    name = re.sub(r"^\s*de\s+", "", name, flags=re.IGNORECASE)
-    name = re.sub(r"\s+de\s*$", "", name, flags=re.IGNORECASE)
+    name = _EDGE_DE_RE.sub("", name)
     # Collapse whitespace
-    name = re.sub(r"\s+", " ", name).strip()
-    return name
+    return _WHITESPACE_RE.sub(" ", name).strip()
 
 
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _match_quantity(text: str) -> tuple[float, str, int, int] | None:
+    """Find the quantity in `text` as (qty, base unit, start, end), or None.
+
+    A fraction + unit anywhere in the string wins over any plain quantity
+    ("2 tazas (1/2 kg)" is 500 g); otherwise the leftmost qty + unit.
+    """
+    # Fraction first: the plain pattern would eat its denominator
+    fraction = _FRACTION_RE.search(text) if "/" in text else None
+    if fraction is not None:
+        num = float(fraction.group("num"))
+        den = float(fraction.group("den"))
+        qty, unit = _normalize_unit(
+            fraction.group("unit"), num / den if den != 0 else num
+        )
+        return qty, unit, fraction.start(), fraction.end()
+
+    match = _QUANTITY_RE.search(text)
+    if match is None:
+        return None
+    qty, unit = _normalize_unit(match.group("unit"), float(match.group("qty")))
+    return qty, unit, match.start(), match.end()
+
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
 def _parse_ingredient(raw: str) -> tuple[float, str, str]:
     """Parse an ingredient string into (qty, unit, item_name).
 
     Tries multiple patterns in priority order:
-    1. qty + known unit anywhere in string (e.g., "Avena 80g" or "200g Pollo")
-    2. Fraction + known unit (e.g., "Limón 1/2 unidad")
+    1. Fraction + known unit (e.g., "Limón 1/2 unidad")
+    2. qty + known unit anywhere in string (e.g., "Avena 80g" or "200g Pollo")
     3. Fallback: no quantity detected
     """
     text = raw.strip()
+    found = _match_quantity(text)
+    if found is None:
+        # Fallback: no parseable quantity
+        return 0.0, "varios", _clean_item_name(text).lower()
+    qty, unit, start, end = found
+    item = _clean_item_name(text[:start] + text[end:])
+    return qty, unit, item.lower()
+
 
-    # Try fraction pattern first (less common, but must be checked before int pattern
-    # eats the numerator)
-    frac_match = _FRAC_UNIT_RE.search(text)
-    if frac_match:
-        num = float(frac_match.group("num"))
-        den = float(frac_match.group("den"))
-        qty = num / den if den != 0 else num
-        raw_unit = frac_match.group("unit")
-        qty, unit = _normalize_unit(raw_unit, qty)
-        item = text[: frac_match.start()] + text[frac_match.end() :]
-        item = _clean_item_name(item)
-        return qty, unit, item.lower()
-
-    # Try numeric qty + known unit
-    qty_match = _QTY_UNIT_RE.search(text)
-    if qty_match:
-        qty = float(qty_match.group("qty"))
-        raw_unit = qty_match.group("unit")
-        qty, unit = _normalize_unit(raw_unit, qty)
-        item = text[: qty_match.start()] + text[qty_match.end() :]
-        item = _clean_item_name(item)
-        return qty, unit, item.lower()
-
-    # Fallback: no parseable quantity
-    return 0.0, "varios", _clean_item_name(text).lower()
+def _ingredient_quantity(ingredient: Ingredient) -> tuple[float, str]:
+    """Quantity of a structured Ingredient in base units.
+
+    ml and unidades come from cantidad_display ("200ml", "3 unidades (150g)");
+    everything else (grams, "1 cucharada", "al gusto") uses peso_gramos.
+    """
+    found = _match_quantity(ingredient.cantidad_display)
+    if found is not None and found[1] != "g":
+        return found[0], found[1]
+    if ingredient.peso_gramos > 0:
+        return ingredient.peso_gramos, "g"
+    return 0.0, "varios"
+
+
+def _accumulate(
+    consolidated: dict[tuple[str, str], float], item: str, unit: str, qty: float
+) -> None:
+    """Add one ingredient to the (item, unit) totals."""
+    # Unique composite key: ("pollo", "g") != ("pollo", "unidad/es")
+    key = (item, unit)
+    consolidated[key] = consolidated.get(key, 0.0) + (1.0 if unit == "varios" else qty)
 
 
 def _fmt_qty(qty: float, unit: str) -> str:
@@ -116,49 +174,125 @@ def _fmt_qty(qty: float, unit: str) -> str:
     return f"{num}{sep}{unit}"
 
 
-# Tool: consolidate_shopping_list
+# Structured consolidation
 
 
-@tool("consolidate_shopping_list", args_schema=ConsolidateInput)  # type: ignore [misc]
-def consolidate_shopping_list(ingredients_raw: list[str]) -> str:
-    """
-    Consolidates a list of raw ingredients into a clean shopping list.
+def ingredient_totals(
+    ingredients: Iterable[Ingredient],
+) -> dict[tuple[str, str], float]:
+    """Sum structured Ingredients per (cleaned name, base unit).
 
-    Use this tool when you have ingredients from multiple recipes
-    and need to generate a unified shopping list.
+    Unmeasurable items ("varios") count occurrences instead of quantity.
+    Totals of several ingredient lists can be added or subtracted key by key
+    (see incremental.py).
     """
-    consolidated: dict[str, float] = {}
-
-    for raw_item in ingredients_raw:
-        qty, unit, item_name = _parse_ingredient(raw_item)
+    consolidated: dict[tuple[str, str], float] = {}
+    for ingredient in ingredients:
+        qty, unit = _ingredient_quantity(ingredient)
+        item = _clean_item_name(ingredient.nombre).lower()
+        _accumulate(consolidated, item or ingredient.nombre.strip().lower(), unit, qty)
+    return consolidated
 
-        if not item_name:
-            item_name = raw_item.strip().lower()
 
-        # Unique composite key: "pollo (g)" != "pollo (unidad)"
-        key = f"{item_name} ({unit})"
+def shopping_list_items(
+    consolidated: dict[tuple[str, str], float],
+) -> list[ShoppingListItem]:
+    """Typed shopping list items from (item, unit) totals, sorted by food.
 
+    Lines of the same food in different units are merged first.
+    """
+    items: list[ShoppingListItem] = []
+    for (item, unit), total_qty in sorted(merge_units(consolidated).items()):
         if unit == "varios":
-            consolidated[key] = consolidated.get(key, 0.0) + 1.0
+            items.append(
+                ShoppingListItem(food=item.title(), quantity="cantidad no especificada")
+            )
         else:
-            consolidated[key] = consolidated.get(key, 0.0) + qty
+            items.append(
+                ShoppingListItem(
+                    food=item.title(),
+                    quantity=_fmt_qty(round(total_qty, 2), unit),
+                    amount=round(total_qty, 2),
+                    unit=unit,
+                )
+            )
+    return items
+
+
+def consolidate_ingredients(
+    ingredients: Iterable[Ingredient],
+) -> list[ShoppingListItem]:
+    """Consolidate structured Ingredients into typed shopping list items.
+
+    Items with the same cleaned name and base unit are summed. No strings
+    are parsed except cantidad_display for ml / unidades.
+
+    Args:
+        ingredients: Ingredients of every meal in the plan
+
+    Returns:
+        ShoppingListItems sorted by food, with `amount` in `unit`
+        (g / ml / unidad/es); unmeasurable items have amount=None
+    """
+    return shopping_list_items(ingredient_totals(ingredients))
 
-    # Output generation — format: "- Item Name: 200g"
-    # This format is compatible with _parse_shopping_list in validation.py
-    final_list = []
-    for key, total_qty in consolidated.items():
-        try:
-            name_part, unit_part = key.rsplit(" (", 1)
-            unit_clean = unit_part.replace(")", "")
 
-            if unit_clean == "varios":
-                formatted_item = f"- {name_part.title()}"
+def aggregate_shopping_lists(
+    shopping_lists: Iterable[Iterable[ShoppingListItem]],
+) -> list[ShoppingListItem]:
+    """Sum several shopping lists (e.g. the days of a weekly plan).
+
+    Works on the numeric `amount` / `unit` of each item; no display string is
+    parsed. Items without amount are listed once.
+
+    Args:
+        shopping_lists: Shopping lists built by consolidate_ingredients
+
+    Returns:
+        One consolidated list, with lines of a food merged across units
+    """
+    consolidated: dict[tuple[str, str], float] = {}
+    for shopping_list in shopping_lists:
+        for item in shopping_list:
+            if item.amount is not None and item.unit in DIMENSIONS:
+                _accumulate(consolidated, item.food.lower(), item.unit, item.amount)
             else:
-                qty_str = _fmt_qty(total_qty, unit_clean)
-                formatted_item = f"- {name_part.title()}: {qty_str}"
+                consolidated[(item.food.lower(), "varios")] = 1.0
+    return shopping_list_items(consolidated)
+
+
+def consolidate_raw_ingredients(ingredients_raw: Iterable[str]) -> str:
+    """Shopping list text ("- Item: 200g" lines) from raw ingredient strings.
 
-            final_list.append(formatted_item)
-        except ValueError:
-            final_list.append(f"- {key}")
+    Pure function behind the consolidate_shopping_list tool, for callers
+    that do not need Tool.invoke argument validation and tracing.
+    """
+    consolidated: dict[tuple[str, str], float] = {}
+
+    for raw_item in ingredients_raw:
+        qty, unit, item_name = _parse_ingredient(raw_item)
+        _accumulate(consolidated, item_name or raw_item.strip().lower(), unit, qty)
+
+    # Output generation — format: "- Item Name: 200g"
+    final_list = []
+    for (item_name, unit), total_qty in merge_units(consolidated).items():
+        if unit == "varios":
+            final_list.append(f"- {item_name.title()}")
+        else:
+            final_list.append(f"- {item_name.title()}: {_fmt_qty(total_qty, unit)}")
 
     return "\n".join(sorted(final_list))
+
+
+# Tool: consolidate_shopping_list
+
+
+@tool("consolidate_shopping_list", args_schema=ConsolidateInput)  # type: ignore [misc]
+def consolidate_shopping_list(ingredients_raw: list[str]) -> str:
+    """
+    Consolidates a list of raw ingredients into a clean shopping list.
+
+    Use this tool when you have ingredients from multiple recipes
+    and need to generate a unified shopping list.
+    """
+    return consolidate_raw_ingredients(ingredients_raw)
@@ -2,81 +2,105 @@
 
 This node performs deterministic validation (NO LLM) to:
 1. Sum total calories from daily_meals
-2. Verify global total against target (±5% tolerance)
-3. Verify per-meal ingredient kcal sum against budget from meal_distribution (±5%)
-4. Output routing hints for targeted single-meal regeneration
+2. Verify global total against target (TolerancePolicy "daily" scope)
+3. Verify per-meal ingredient kcal sum against budget from meal_distribution
+   (TolerancePolicy "meal" scope: relative band with per-slot absolute floor)
+4. Output routing hints for targeted regeneration (one slot or several)
 5. Build final DietPlan with consolidated shopping list
+6. Attach degradation notices when the run deadline cuts auto-fix short
 
-Uses tools: consolidate_shopping_list
-"""
+Validation is incremental: per-meal checks and shopping-list contributions
+are cached in state["validation_cache"] by meal content hash, so after a
+targeted regeneration only the new meals are checked and consolidated
+(see incremental.py).
 
-from __future__ import annotations
+Uses tools: ingredient_totals / shopping_list_items (structured shopping list)
+"""
 
-import re
 from typing import Any
 
+from langchain_core.runnables import RunnableConfig
+
+from src.nutrition_agent.deadline import deadline_exceeded, resolve_deadline
 from src.nutrition_agent.models import (
     DietPlan,
-    Ingredient,
     Macronutrients,
     Meal,
     MealNotice,
     NutritionalTargets,
-    ShoppingListItem,
     UserProfile,
+    ValidationCache,
 )
 from src.nutrition_agent.state import NutritionAgentState
+from src.nutrition_agent.tolerance import get_tolerance_policy
 
-from .tools import consolidate_shopping_list
+from .incremental import check_meal, meal_fingerprint, prune, update_shopping_totals
+from .tools import shopping_list_items
 
-# Tolerance for calorie validation
-CALORIE_TOLERANCE = 0.05  # ±5%
+# Calorie tolerances come from the TolerancePolicy (see tolerance.py)
 WARNING_THRESHOLD = 0.02  # ±2% — below this, no notice
 
+# Notices shown in HITL when the run deadline skips auto-fix retries
+DEGRADED_NOTICE_PREFIX = "Sin tiempo para reintentar: "
+DEGRADED_MISSING_MEAL_MSG = "Sin tiempo para generar esta comida; solicita un cambio."
 
-def _ingredients_to_raw_strings(
-    ingredients: list[Ingredient],
-) -> list[str]:
-    """Convert structured Ingredients to raw strings for consolidate_shopping_list.
-
-    Uses cantidad_display to preserve the correct unit (g, ml, unidades)
-    instead of hardcoding grams. Strips parenthetical weight context
-    (e.g. "3 unidades (150g)" → "3 unidades") so the consolidation regex
-    matches the first qty+unit cleanly.
 
-    Args:
-        ingredients: List of Ingredient objects
+def _degradation_notices(
+    meal_notices: dict[str, MealNotice],
+    failed_meal_times: list[str],
+    daily_meals: list[Meal],
+    meal_distribution: dict[str, float] | None,
+) -> dict[str, MealNotice]:
+    """Describe a degraded plan (deadline reached) for the HITL review.
 
-    Returns:
-        List of strings like "200g Espinaca", "200ml Leche", "3 unidades Huevo"
+    Failed meals keep their deviation but are flagged as delivered without
+    retries; budgeted meals that were never generated get their own notice.
     """
-    result = []
-    for ing in ingredients:
-        display = re.sub(r"\s*\([^)]*\)", "", ing.cantidad_display).strip()
-        result.append(f"{display} {ing.nombre}")
-    return result
+    notices = dict(meal_notices)
+    for meal_time in failed_meal_times:
+        notice = notices[meal_time]
+        notices[meal_time] = MealNotice(
+            severity="error",
+            message=f"{DEGRADED_NOTICE_PREFIX}{notice.message}",
+            deviation_pct=notice.deviation_pct,
+        )
+    generated = {meal.slot_key for meal in daily_meals}
+    for meal_time in meal_distribution or {}:
+        if meal_time not in generated:
+            notices[meal_time] = MealNotice(
+                severity="error",
+                message=DEGRADED_MISSING_MEAL_MSG,
+                deviation_pct=100.0,
+            )
+    return notices
 
 
-def validation(state: NutritionAgentState) -> dict[str, Any]:
+def validation(
+    state: NutritionAgentState, config: RunnableConfig | None = None
+) -> dict[str, Any]:
     """Validate the complete meal plan and build final DietPlan.
 
     This node is deterministic (NO LLM). It:
     1. Sums calories from all daily_meals
-    2. Compares against target_calories (±5% tolerance)
+    2. Compares against target_calories (tolerance policy)
     3. Builds DietPlan with consolidated shopping list if valid
     4. Returns validation_errors if calorie mismatch
 
     Args:
         state: Current agent state with daily_meals, nutritional_targets,
-               and user_profile
+               user_profile and run_deadline
+        config: Node config (configurable.run_deadline overrides state)
 
     Returns:
         dict with:
         - validation_errors: List of error messages (empty if valid)
         - final_diet_plan: DietPlan if valid, None otherwise
         - validation_retry_count: Incremented on failure, reset to 0 on success
-        - selected_meal_to_change: meal_time if exactly 1 meal failed budget
+        - selected_meal_to_change: slot if exactly 1 meal must be regenerated
         - user_feedback: Feedback string for targeted regeneration
+        - failed_meals: Slot -> feedback when 2+ meals must be regenerated
+        - meal_notices: Per-meal notices (degradation notices if deadline near)
+        - validation_cache: Per-meal results for the next validation run
     """
     # Handle LangGraph serialization: Pydantic models become dicts after checkpointing
     daily_meals_data = state.get("daily_meals", [])
@@ -111,35 +135,52 @@ def validation(state: NutritionAgentState) -> dict[str, Any]:
         else user_profile_data
     )
 
+    # Per-meal results of previous runs (copied: never mutate the input state)
+    cache_data = state.get("validation_cache")
+    if isinstance(cache_data, dict):
+        cache = ValidationCache(**cache_data)
+    elif cache_data is not None:
+        cache = cache_data.model_copy(deep=True)
+    else:
+        cache = ValidationCache()
+    fingerprints = [meal_fingerprint(meal) for meal in daily_meals]
+
     validation_errors: list[str] = []
+    tolerance_policy = get_tolerance_policy()
+    objective = user_profile.objective.value
 
     # 1. Calculate total calories from all meals
     total_calories = sum(meal.total_calories for meal in daily_meals)
     target_calories = nutritional_targets.target_calories
 
     # 2. Check calorie tolerance
-    error_pct = abs(total_calories - target_calories) / target_calories
-    if error_pct > CALORIE_TOLERANCE:
+    daily_check = tolerance_policy.check(
+        total_calories, target_calories, "daily", objective=objective
+    )
+    if not daily_check.passed:
         validation_errors.append(
             f"Total calories ({total_calories:.1f}) differ from target "
-            f"({target_calories:.1f}) by {error_pct * 100:.1f}% (max allowed: 5%)"
+            f"({target_calories:.1f}) by {daily_check.error_pct * 100:.1f}% "
+            f"(max allowed: {daily_check.allowed_kcal:.1f} kcal)"
         )
 
     # 3. Per-meal ingredient kcal sum vs budget from meal_distribution
-    failed_meals: list[tuple[str, str]] = []  # (meal_time, feedback_msg)
+    failed_meals: dict[str, str] = {}  # slot -> feedback_msg
     meal_notices: dict[str, MealNotice] = {}
     meal_distribution = state.get("meal_distribution")
     if meal_distribution:
-        for meal in daily_meals:
-            budget = meal_distribution.get(meal.meal_time.value)
+        for meal, fingerprint in zip(daily_meals, fingerprints, strict=True):
+            budget = meal_distribution.get(meal.slot_key)
             if budget is None:
                 validation_errors.append(
-                    f"Meal '{meal.title}' ({meal.meal_time.value}): "
+                    f"Meal '{meal.title}' ({meal.slot_key}): "
                     f"no budget found in meal_distribution"
                 )
                 continue
-            ingredient_kcals_sum = sum(ing.kcal for ing in meal.ingredients)
-            meal_error_pct = abs(ingredient_kcals_sum - budget) / budget
+            # Reused from the cache unless the meal (or its budget) changed
+            meal_check = check_meal(cache, fingerprint, meal, budget, objective)
+            ingredient_kcals_sum = meal_check.kcal_sum
+            meal_error_pct = meal_check.error_pct
             direction = "por debajo" if ingredient_kcals_sum < budget else "por encima"
             pct = meal_error_pct * 100
             notice_msg = (
@@ -147,7 +188,7 @@ def validation(state: NutritionAgentState) -> dict[str, Any]:
                 f"({ingredient_kcals_sum:.1f} vs "
                 f"{budget:.1f} kcal)"
             )
-            if meal_error_pct > CALORIE_TOLERANCE:
+            if not meal_check.passed:
                 feedback = (
                     f"ingredient kcal sum "
                     f"{ingredient_kcals_sum:.1f} vs "
@@ -157,16 +198,16 @@ def validation(state: NutritionAgentState) -> dict[str, Any]:
                     f"{budget:.1f} kcal."
                 )
                 validation_errors.append(
-                    f"Meal '{meal.title}' ({meal.meal_time.value}): {feedback}"
+                    f"Meal '{meal.title}' ({meal.slot_key}): {feedback}"
                 )
-                failed_meals.append((meal.meal_time.value, feedback))
-                meal_notices[meal.meal_time.value] = MealNotice(
+                failed_meals[meal.slot_key] = feedback
+                meal_notices[meal.slot_key] = MealNotice(
                     severity="error",
                     message=notice_msg,
                     deviation_pct=round(pct, 1),
                 )
             elif meal_error_pct >= WARNING_THRESHOLD:
-                meal_notices[meal.meal_time.value] = MealNotice(
+                meal_notices[meal.slot_key] = MealNotice(
                     severity="warning",
                     message=notice_msg,
                     deviation_pct=round(pct, 1),
@@ -180,37 +221,55 @@ def validation(state: NutritionAgentState) -> dict[str, Any]:
             f"Expected {expected_meals} meals but got {actual_meals}"
         )
 
+    # 5. Update shopping list totals on every run, so the next run only
+    #    consolidates the meals that changed (subtract old, add new)
+    shopping_totals = update_shopping_totals(
+        cache, list(zip(fingerprints, daily_meals, strict=True))
+    )
+    prune(cache, set(fingerprints))
+
     # If validation errors, return with routing hints for targeted regeneration
     if validation_errors:
         retry_count = state.get("validation_retry_count", 0)
+        if deadline_exceeded(resolve_deadline(state, config)):
+            # route_after_validation skips auto-fix: explain it in the review
+            meal_notices = _degradation_notices(
+                meal_notices,
+                list(failed_meals),
+                daily_meals,
+                meal_distribution,
+            )
         result: dict[str, Any] = {
             "validation_errors": validation_errors,
             "final_diet_plan": None,
             "validation_retry_count": retry_count + 1,
             "meal_notices": meal_notices,
+            "validation_cache": cache,
         }
-        # Targeted regeneration: exactly 1 meal failed budget check
-        if len(failed_meals) == 1:
-            result["selected_meal_to_change"] = failed_meals[0][0]
-            result["user_feedback"] = failed_meals[0][1]
+        # Slots to regenerate: budget failures plus slots with no meal
+        to_regenerate = dict(failed_meals)
+        generated = {meal.slot_key for meal in daily_meals}
+        for slot, budget in (meal_distribution or {}).items():
+            if slot not in generated:
+                to_regenerate[slot] = (
+                    f"No meal was generated for this slot. Target {budget:.1f} kcal."
+                )
+        # Targeted regeneration: exactly 1 slot → single, 2+ → targeted
+        if len(to_regenerate) == 1:
+            [(slot, feedback)] = to_regenerate.items()
+            result["selected_meal_to_change"] = slot
+            result["user_feedback"] = feedback
+            result["failed_meals"] = {}
         else:
             result["selected_meal_to_change"] = None
             result["user_feedback"] = None
+            result["failed_meals"] = to_regenerate
         return result
 
-    # 5. Consolidate shopping list from all meals
-    all_ingredients: list[str] = []
-    for meal in daily_meals:
-        all_ingredients.extend(_ingredients_to_raw_strings(meal.ingredients))
-
-    shopping_list_raw = consolidate_shopping_list.invoke(
-        {"ingredients_raw": all_ingredients}
-    )
-
-    # Parse shopping list result (tool returns string with consolidated items)
-    shopping_list = _parse_shopping_list(shopping_list_raw)
+    # 6. Shopping list from the consolidated totals (structured, no string parsing)
+    shopping_list = shopping_list_items(shopping_totals)
 
-    # 6. Build final DietPlan
+    # 7. Build final DietPlan
     diet_type_label = (
         "Cetogénica"
         if user_profile.diet_type.value == "keto"
@@ -244,45 +303,6 @@ def validation(state: NutritionAgentState) -> dict[str, Any]:
         "meal_notices": meal_notices,
         "selected_meal_to_change": None,
         "user_feedback": None,
+        "failed_meals": {},
+        "validation_cache": cache,
     }
-
-
-def _parse_shopping_list(raw_result: str) -> list[ShoppingListItem]:
-    """Parse consolidated shopping list string into ShoppingListItem list.
-
-    Args:
-        raw_result: String from consolidate_shopping_list tool
-                   Format: "- Item: quantity\\n- Item: quantity\\n..."
-
-    Returns:
-        List of ShoppingListItem objects
-    """
-    items: list[ShoppingListItem] = []
-
-    if not raw_result or raw_result.startswith("Error"):
-        return items
-
-    for line in raw_result.strip().split("\n"):
-        line = line.strip()
-        if not line or not line.startswith("- "):
-            continue
-
-        # Remove "- " prefix
-        line = line[2:]
-
-        # Try to split by ": " to get food and quantity
-        if ": " in line:
-            parts = line.split(": ", 1)
-            food = parts[0].strip()
-            quantity = (
-                parts[1].strip() if len(parts) > 1 else "cantidad no especificada"
-            )
-        else:
-            # No separator, use entire line as food
-            food = line
-            quantity = "cantidad no especificada"
-
-        if food:
-            items.append(ShoppingListItem(food=food, quantity=quantity))
-
-    return items
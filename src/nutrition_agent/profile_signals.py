@@ -0,0 +1,224 @@
+"""Local pre-check of chat messages for profile data (no LLM).
+
+Many data_collection turns are greetings, thanks or questions ("hola",
+"gracias", "¿qué es el TDEE?") that cannot change the profile, yet each one
+cost a structured-output LLM call. may_update_profile looks for the cheap
+signals every profile value needs and data_collection skips the LLM when
+none of the new user messages has one:
+
+- Any digit (age, kg, cm, number of meals) or a spelled-out number up to
+  one hundred ("veinticinco", "setenta y dos")
+- Keyword stems per field, compared lowercased and without accents
+  ("años", "kilos", "mido", "sedentario", "me muevo poco", "tonificar",
+  "keto", "alergia", "comidas", ...)
+- A yes/no answer to an assistant question ("sí" to "¿Prefieres keto?")
+
+The check only has to be conservative: a false positive costs the LLM call
+that every turn used to make, a false negative loses data. When in doubt
+a term is included.
+
+Metrics:
+- profile_precheck_total{outcome=skipped|extract}
+- profile_precheck_skip_rate (gauge: skipped / checked, this worker)
+
+Configuration:
+    NUTRITION_PROFILE_PRECHECK: on | off (default: on)
+"""
+
+from __future__ import annotations
+
+import os
+import re
+
+from src.nutrition_agent.exclusions import normalize_food
+from src.shared.metrics import metrics
+
+# Keyword stems per UserProfile field (normalized: lowercase, no accents).
+# Stems match at the start of a word: "activ" matches "activa", "actividad".
+PROFILE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "age": ("edad", "cumpl", "year"),
+    "weight": ("kilo", "peso", "libra", "pound"),
+    "height": ("metro", "mido", "mide", "altura", "estatura", "feet"),
+    "gender": (
+        "hombre",
+        "mujer",
+        "masculin",
+        "femenin",
+        "varon",
+        "chico",
+        "chica",
+        "male",
+        "female",
+    ),
+    "activity_level": (
+        "sedentari",
+        "activ",
+        "ejercicio",
+        "deporte",
+        "entren",
+        "gimnasio",
+        "gym",
+        "corr",
+        "camin",
+        "nado",
+        "natacion",
+        "bici",
+        "oficina",
+        "trabaj",
+        "liger",
+        "moder",
+        "intens",
+        "poco",
+    ),
+    "objective": (
+        "perder",
+        "bajar",
+        "adelgaz",
+        "grasa",
+        "defin",
+        "ganar",
+        "subir",
+        "muscul",
+        "masa",
+        "volumen",
+        "tonific",
+        "manten",
+        "lose",
+        "gain",
+        "maintain",
+    ),
+    "diet_type": ("keto", "cetogenic", "low carb", "dieta normal"),
+    "excluded_foods": (
+        "alergi",
+        "alergic",
+        "allerg",
+        "intoleran",
+        "celiac",
+        "vegan",
+        "vegetarian",
+        "no como",
+        "no tomo",
+        "no me gusta",
+        "evit",
+        "odio",
+        "exclu",
+        "quit",
+    ),
+    "number_of_meals": (
+        "comida",
+        "veces",
+        "desayun",
+        "almuerz",
+        "merienda",
+        "cena",
+        "snack",
+        "ayun",
+        "omad",
+        "meal",
+    ),
+}
+
+# Spelled-out numbers written as one word ("diecinueve", "veinticinco")
+NUMBER_STEMS: tuple[str, ...] = ("dieci", "veinti")
+
+# Short terms matched as whole words only ("sin" but not "sincero"),
+# including the other spelled-out numbers up to one hundred ("treinta y
+# cinco" matches on "treinta"). The articles "un" / "una" are left out:
+# "una vez al dia" still matches on "vez".
+PROFILE_WORDS: tuple[str, ...] = (
+    "ano",
+    "anos",
+    "old",
+    "kg",
+    "kgs",
+    "lb",
+    "lbs",
+    "cm",
+    "ft",
+    "man",
+    "woman",
+    "sin",
+    "vez",
+    "uno",
+    "dos",
+    "tres",
+    "cuatro",
+    "cinco",
+    "seis",
+    "siete",
+    "ocho",
+    "nueve",
+    "diez",
+    "once",
+    "doce",
+    "trece",
+    "catorce",
+    "quince",
+    "veinte",
+    "treinta",
+    "cuarenta",
+    "cincuenta",
+    "sesenta",
+    "setenta",
+    "ochenta",
+    "noventa",
+    "cien",
+    "ciento",
+)
+
+
+def _alternation(terms: set[str] | tuple[str, ...]) -> str:
+    # Longest first so a stem never shadows a longer term
+    return "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+
+
+_SIGNAL_RE = re.compile(
+    r"\d"
+    + r"|\b(?:"
+    + _alternation(
+        {stem for stems in PROFILE_KEYWORDS.values() for stem in stems}
+        | set(NUMBER_STEMS)
+    )
+    + r")"
+    + r"|\b(?:"
+    + _alternation(PROFILE_WORDS)
+    + r")\b"
+)
+
+# Replies that confirm or reject a value the assistant proposed
+_YES_NO_RE = re.compile(
+    r"^\W*(?:si|no|vale|claro|correcto|exacto|eso es|de acuerdo|ok|yes|sure)\b"
+)
+
+
+def may_update_profile(text: str, question: str | None = None) -> bool:
+    """Whether a user message could add or change a profile field.
+
+    Args:
+        text: User message
+        question: Assistant message it answers, if any
+
+    Returns:
+        False only when the message has no profile signal at all
+    """
+    normalized = normalize_food(text)
+    if _SIGNAL_RE.search(normalized):
+        return True
+    return bool(
+        question and question.rstrip().endswith("?") and _YES_NO_RE.match(normalized)
+    )
+
+
+def precheck_enabled() -> bool:
+    """NUTRITION_PROFILE_PRECHECK is not "off"."""
+    return os.getenv("NUTRITION_PROFILE_PRECHECK", "on").lower() != "off"
+
+
+def record_precheck(skipped: bool) -> None:
+    """Count one pre-check and update this worker's skip rate gauge."""
+    metrics.increment(
+        "profile_precheck_total", outcome="skipped" if skipped else "extract"
+    )
+    skips = metrics.counter_value("profile_precheck_total", outcome="skipped")
+    extracts = metrics.counter_value("profile_precheck_total", outcome="extract")
+    metrics.set_gauge("profile_precheck_skip_rate", skips / (skips + extracts))
@@ -2,6 +2,7 @@
 
 Exports:
     DATA_COLLECTION_PROMPT: For conversational UserProfile extraction
+    PROFILE_UPDATE_PROMPT: For incremental extraction of new profile fields
     RECIPE_GENERATION_PROMPT: For parallel batch meal generation
     LAST_MEAL_INSTRUCTION: For last meal with exact budget (stricter tolerance)
     REGULAR_MEAL_INSTRUCTION: For regular meals (standard tolerance)
@@ -11,7 +12,10 @@ Architecture: Parallel Batch Generation (v2)
 - No sequential context accumulation (O(n) vs O(n²) tokens)
 """
 
-from src.nutrition_agent.prompts.data_collection import DATA_COLLECTION_PROMPT
+from src.nutrition_agent.prompts.data_collection import (
+    DATA_COLLECTION_PROMPT,
+    PROFILE_UPDATE_PROMPT,
+)
 from src.nutrition_agent.prompts.recipe_generation import (
     LAST_MEAL_INSTRUCTION,
     RECIPE_GENERATION_PROMPT,
@@ -20,6 +24,7 @@ from src.nutrition_agent.prompts.recipe_generation import (
 
 __all__ = [
     "DATA_COLLECTION_PROMPT",
+    "PROFILE_UPDATE_PROMPT",
     "RECIPE_GENERATION_PROMPT",
     "LAST_MEAL_INSTRUCTION",
     "REGULAR_MEAL_INSTRUCTION",
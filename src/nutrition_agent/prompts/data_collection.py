@@ -33,3 +33,28 @@ Optional fields: diet_type (default: normal), excluded_foods (default: []),
 number_of_meals (default: 3)
 
 """
+
+# Incremental extraction: the LLM sees the fields known so far and only the
+# messages since the previous turn, and returns only what they state.
+PROFILE_UPDATE_PROMPT = """\
+You are a nutrition assistant collecting user profile data.
+
+Profile fields collected so far (JSON):
+{current_profile}
+
+From the new messages below, extract ONLY the profile fields the user
+states or corrects:
+- age (int, 18-100), gender ("male" or "female"), weight (int, kg, 30-300),
+  height (int, cm, 100-250)
+- activity_level: sedentary, lightly_active, moderately_active,
+  very_active, extra_active
+- objective: fat_loss, muscle_gain, maintenance
+- diet_type: "normal" or "keto"
+- excluded_foods: the FULL updated list (known foods plus new ones, minus
+  any the user no longer wants excluded)
+- number_of_meals (1-6)
+
+Leave every other field null. Do not repeat known values unless the user
+changes them. Convert units (lb, ft/in) to kg and cm. If a value is out of
+range or ambiguous, leave it null.
+"""
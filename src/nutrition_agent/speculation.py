@@ -0,0 +1,215 @@
+"""Speculative meal alternatives prepared while the user reviews the plan.
+
+meal_review_batch pauses the graph with interrupt() and the user usually
+reads the plan for a minute or more. While they do, a background task
+pre-generates one validated alternative per slot (bulk lane, within a
+token budget) and stores it here, keyed by (thread_id, slot). When the
+user resumes with change_meal and no specific feedback,
+recipe_generation_single serves the cached alternative instead of calling
+the LLM.
+
+An alternative is only served while the meal it was generated to replace
+is still the meal of that slot (matched by title); stale entries are
+dropped when the next review round starts.
+
+The cache lives in the worker process, like the LLM scheduler: a thread
+resumed on another worker simply misses and regenerates as before.
+
+Metrics:
+- speculative_alternatives_total{outcome=hit|miss|stale}
+- speculative_generation_total{outcome=cached|failed|budget}
+
+Configuration (environment):
+    NUTRITION_SPECULATIVE_ALTERNATIVES: on | off (default: off)
+    NUTRITION_SPECULATION_TOKEN_BUDGET: tokens per review round (default: 12000)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+
+from src.nutrition_agent.models import Meal
+from src.shared.metrics import metrics
+from src.shared.usage import UsageRecord
+
+DEFAULT_TOKEN_BUDGET = 12_000
+# Threads whose alternatives are kept (least recently reviewed evicted first)
+MAX_THREADS = 512
+
+
+@dataclass(frozen=True)
+class Alternative:
+    """Pre-generated replacement for the meal of one slot.
+
+    Attributes:
+        meal: Validated alternative meal (bound to the slot)
+        replaces: Title of the meal it was generated to replace
+        token_usage: Usage records of its generation (billed when served)
+    """
+
+    meal: Meal
+    replaces: str
+    token_usage: list[UsageRecord] = field(default_factory=list)
+
+
+class AlternativeCache:
+    """Per-thread alternatives and the background tasks that produce them.
+
+    Args:
+        enabled: When False, start() never schedules speculation
+        token_budget: Token budget of one speculation round
+        max_threads: Threads kept before the least recent is evicted
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        max_threads: int = MAX_THREADS,
+    ) -> None:
+        self.enabled = enabled
+        self.token_budget = token_budget
+        self.max_threads = max_threads
+        self._entries: OrderedDict[str, dict[str, Alternative]] = OrderedDict()
+        self._tasks: dict[str, tuple[tuple[Any, ...], asyncio.Task[None]]] = {}
+
+    @classmethod
+    def from_env(cls) -> AlternativeCache:
+        """Build the cache from NUTRITION_SPECULATIVE_ALTERNATIVES / _TOKEN_BUDGET."""
+        return cls(
+            enabled=os.getenv("NUTRITION_SPECULATIVE_ALTERNATIVES", "off").lower()
+            == "on",
+            token_budget=int(
+                os.getenv("NUTRITION_SPECULATION_TOKEN_BUDGET")
+                or str(DEFAULT_TOKEN_BUDGET)
+            ),
+        )
+
+    def put(self, thread_id: str, slot: str, alternative: Alternative) -> None:
+        """Store the alternative of one slot."""
+        self._touch(thread_id)[slot] = alternative
+
+    def take(self, thread_id: str, slot: str, replaces: str) -> Alternative | None:
+        """Pop the alternative of a slot if it still replaces `replaces`.
+
+        Args:
+            thread_id: Conversation thread
+            slot: Meal slot (meal_distribution key)
+            replaces: Title of the meal currently in the slot
+
+        Returns:
+            The cached Alternative, or None on a miss or stale entry
+        """
+        alternative = self._entries.get(thread_id, {}).pop(slot, None)
+        if alternative is None:
+            outcome = "miss"
+        elif alternative.replaces != replaces:
+            alternative, outcome = None, "stale"
+        else:
+            outcome = "hit"
+        metrics.increment("speculative_alternatives_total", outcome=outcome)
+        return alternative
+
+    def missing_slots(self, thread_id: str, plan: dict[str, str]) -> list[str]:
+        """Slots of `plan` (slot -> meal title) without a valid alternative.
+
+        Entries for meals that are no longer in the plan are dropped.
+        """
+        entries = self._entries.get(thread_id, {})
+        for slot in [s for s, alt in entries.items() if plan.get(s) != alt.replaces]:
+            del entries[slot]
+        return [slot for slot in plan if slot not in entries]
+
+    def start(
+        self,
+        thread_id: str,
+        plan: dict[str, str],
+        speculate: Callable[[list[str]], Coroutine[Any, Any, None]],
+    ) -> bool:
+        """Schedule speculation for the slots of `plan` still missing.
+
+        Idempotent per plan: the review node runs again when the graph
+        resumes, and the running (or finished) round is kept. A new plan
+        cancels the previous round.
+
+        Args:
+            thread_id: Conversation thread
+            plan: Slot -> title of the meals under review
+            speculate: Coroutine factory generating alternatives for slots
+
+        Returns:
+            True if a background task was scheduled
+        """
+        if not self.enabled:
+            return False
+        plan_key = tuple(plan.items())
+        current = self._tasks.get(thread_id)
+        if current is not None and current[0] == plan_key:
+            return False
+        self._cancel(thread_id)
+        slots = self.missing_slots(thread_id, plan)
+        if not slots:
+            return False
+        try:
+            task = asyncio.get_running_loop().create_task(speculate(slots))
+        except RuntimeError:
+            return False  # No event loop (sync invocation): nothing to overlap
+        task.add_done_callback(_log_failure)
+        self._tasks[thread_id] = (plan_key, task)
+        self._touch(thread_id)
+        return True
+
+    def discard(self, thread_id: str) -> None:
+        """Cancel the thread's speculation and drop its alternatives."""
+        self._cancel(thread_id)
+        self._entries.pop(thread_id, None)
+
+    def reset(self) -> None:
+        """Cancel every task and forget every alternative (used by tests)."""
+        for thread_id in list(self._tasks):
+            self._cancel(thread_id)
+        self._entries.clear()
+
+    def _touch(self, thread_id: str) -> dict[str, Alternative]:
+        """Mark a thread as most recent, evicting the least recent ones."""
+        entries = self._entries.setdefault(thread_id, {})
+        self._entries.move_to_end(thread_id)
+        while len(self._entries) > self.max_threads:
+            evicted, _ = self._entries.popitem(last=False)
+            self._cancel(evicted)
+        return entries
+
+    def _cancel(self, thread_id: str) -> None:
+        current = self._tasks.pop(thread_id, None)
+        if current is not None:
+            current[1].cancel()
+
+
+def _log_failure(task: asyncio.Task[None]) -> None:
+    """Consume the task result so a failed round is counted, not raised."""
+    if not task.cancelled() and task.exception() is not None:
+        metrics.increment("speculative_generation_total", outcome="failed")
+
+
+def resolve_thread_id(config: RunnableConfig | None = None) -> str | None:
+    """Thread id of the current run (configurable.thread_id), if any."""
+    thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+    return str(thread_id) if thread_id else None
+
+
+_cache: AlternativeCache | None = None
+
+
+def get_alternative_cache() -> AlternativeCache:
+    """Get or create the process-wide alternative cache singleton."""
+    global _cache
+    if _cache is None:
+        _cache = AlternativeCache.from_env()
+    return _cache
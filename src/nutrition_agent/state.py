@@ -16,7 +16,8 @@ Architecture: Parallel Batch Generation (v2)
 
 from __future__ import annotations
 
-from typing import Literal
+import operator
+from typing import Annotated, Any, Literal
 
 from copilotkit.langgraph import CopilotKitState
 from pydantic import Field
@@ -26,8 +27,11 @@ from src.nutrition_agent.models import (
     Meal,
     MealNotice,
     NutritionalTargets,
+    PartialUserProfile,
     UserProfile,
+    ValidationCache,
 )
+from src.shared.usage import UsageRecord
 
 
 class NutritionAgentState(CopilotKitState):
@@ -40,21 +44,38 @@ class NutritionAgentState(CopilotKitState):
     Attributes:
         user_profile: Collected user data (age, weight, goals, etc.)
         missing_fields: Fields still needed from user
+        partial_profile: Profile fields extracted so far (incremental
+            extraction merges each turn's new fields into it)
+        profile_messages_seen: Number of messages already extracted from
+        profile_submission: UserProfileForm values sent by the frontend
+            (validated directly against UserProfile, without the LLM)
         nutritional_targets: Calculated TDEE and macros
-        meal_distribution: Calorie budget per meal time
+        meal_distribution: Calorie budget per meal slot (MealSlot values)
         daily_meals: All meals generated in parallel batch
-        meal_generation_errors: Errors per meal_time during generation
+        meal_generation_errors: Errors per meal slot during generation
         review_decision: User's HITL decision for complete plan
         user_feedback: Optional feedback when user requests meal change
-        selected_meal_to_change: MealTime to regenerate (if change_meal)
+        selected_meal_to_change: Meal slot to regenerate (if change_meal)
         validation_errors: Errors found during final validation
         validation_retry_count: Auto-fix attempts before routing to HITL
+        failed_meals: Slot -> feedback of meals to regenerate together
+            (validation failures or a change_meals review)
+        validation_cache: Per-meal validation results keyed by meal content
+            hash (incremental validation)
         final_diet_plan: The complete validated plan
+        run_deadline: Wall-clock deadline (epoch seconds) of the current run
+        run_id: Id of the current run (usage accounting)
+        token_usage: LLM usage records of every run in the thread (append-only)
     """
 
     # Phase 1: Data Collection
     user_profile: UserProfile | None = None
     missing_fields: list[str] = Field(default_factory=list)
+    # Incremental extraction: only messages[profile_messages_seen:] are sent
+    partial_profile: PartialUserProfile | None = None
+    profile_messages_seen: int = 0
+    # Form fast path: set by the UI, consumed (reset to None) by data_collection
+    profile_submission: dict[str, Any] | None = None
 
     # Phase 2: Calculation
     nutritional_targets: NutritionalTargets | None = None
@@ -63,21 +84,39 @@ class NutritionAgentState(CopilotKitState):
     # Phase 3: Recipe Generation (PARALLEL BATCH)
     # All meals generated in a single parallel batch via asyncio.gather()
     daily_meals: list[Meal] = Field(default_factory=list)
-    # Errors per meal_time if pre-validation fails after max attempts
+    # Errors per meal slot if pre-validation fails after max attempts
     meal_generation_errors: dict[str, str] = Field(default_factory=dict)
 
     # Phase 4: HITL Review (BATCH REVIEW - single review of complete plan)
     # User reviews ALL meals at once and decides:
     # - approve: Accept entire plan, proceed to validation
     # - change_meal: Regenerate one specific meal
+    # - change_meals: Regenerate several meals concurrently (failed_meals)
     # - regenerate_all: Discard and regenerate all meals
-    review_decision: Literal["approve", "change_meal", "regenerate_all"] | None = None
+    review_decision: (
+        Literal["approve", "change_meal", "change_meals", "regenerate_all"] | None
+    ) = None
     user_feedback: str | None = None
-    # Which meal_time to change (only used if review_decision == "change_meal")
+    # Which meal slot to change (only used if review_decision == "change_meal")
     selected_meal_to_change: str | None = None
 
     # Phase 5: Validation
     validation_errors: list[str] = Field(default_factory=list)
     validation_retry_count: int = 0
+    # Slots to regenerate with their feedback (targeted regeneration of 2+
+    # meals): filled by validation failures or a change_meals review
+    failed_meals: dict[str, str] = Field(default_factory=dict)
     meal_notices: dict[str, MealNotice] = Field(default_factory=dict)
+    # Checks and shopping contributions of unchanged meals are reused
+    validation_cache: ValidationCache | None = None
     final_diet_plan: DietPlan | None = None
+
+    # Run control: time budget of the current run (see deadline.py)
+    # Set when a run starts generating (data_collection / HITL resume)
+    run_deadline: float | None = None
+    # Usage accounting (see src/shared/usage.py)
+    # New run_id whenever a run starts; records are appended by LLM nodes
+    run_id: str | None = None
+    token_usage: Annotated[list[UsageRecord], operator.add] = Field(
+        default_factory=list
+    )
@@ -0,0 +1,204 @@
+"""Calorie tolerance policy with relative bands and absolute floors.
+
+A purely relative tolerance is too tight for small meals: ±5% of a 150 kcal
+snack is 7.5 kcal, which the LLM misses constantly for no nutritional
+benefit. Each rule therefore combines a relative band and an absolute floor:
+
+    allowed_kcal = max(relative * target, absolute_kcal)
+
+Scopes:
+- meal: regular meals in generation and per-meal checks in validation
+- last_meal: the meal that closes the daily budget (stricter)
+- daily: the daily total in validation
+
+Rules are looked up most specific first:
+"<scope>:<slot>:<objective>", "<scope>:<slot>", "<scope>:<objective>",
+"<scope>". Slots are meal_distribution keys (e.g. "Snack AM"); objectives
+are Objective values (e.g. "fat_loss").
+
+Metrics (to tune the floors from data):
+- tolerance_checks_total{rule, scope, outcome=pass|fail|saved}
+  (saved = accepted only thanks to the absolute floor, i.e. one retry saved)
+
+Configuration:
+    NUTRITION_TOLERANCE_RULES: JSON object merged over the default rules,
+        e.g. {"meal:Snack PM": {"relative": 0.05, "absolute_kcal": 40}}
+    set_tolerance_policy(): replace the process-wide policy at runtime
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any
+
+from src.shared.metrics import metrics
+
+TOLERANCE_SCOPES = ("meal", "last_meal", "daily")
+
+
+@dataclass(frozen=True)
+class ToleranceRule:
+    """Allowed calorie deviation for one scope.
+
+    Attributes:
+        relative: Fraction of the target (0.05 = ±5%)
+        absolute_kcal: Minimum allowed deviation in kcal (floor)
+    """
+
+    relative: float
+    absolute_kcal: float = 0.0
+
+    def allowed_kcal(self, target_kcal: float) -> float:
+        """Allowed deviation in kcal for `target_kcal`."""
+        return max(self.relative * abs(target_kcal), self.absolute_kcal)
+
+
+DEFAULT_RULES: dict[str, ToleranceRule] = {
+    "meal": ToleranceRule(relative=0.05, absolute_kcal=20.0),
+    "last_meal": ToleranceRule(relative=0.02, absolute_kcal=15.0),
+    "daily": ToleranceRule(relative=0.05),
+    # Small slots: the relative band alone is a few kcal wide
+    "meal:Snack": ToleranceRule(relative=0.05, absolute_kcal=30.0),
+    "meal:Snack AM": ToleranceRule(relative=0.05, absolute_kcal=30.0),
+    "meal:Snack PM": ToleranceRule(relative=0.05, absolute_kcal=30.0),
+    "meal:Recena": ToleranceRule(relative=0.05, absolute_kcal=30.0),
+}
+
+
+@dataclass(frozen=True)
+class ToleranceCheck:
+    """Result of one tolerance check.
+
+    Attributes:
+        passed: Deviation within the allowed band
+        rule: Key of the rule that applied
+        deviation_kcal: |actual - target|
+        error_pct: Deviation as a fraction of the target
+        allowed_kcal: Allowed deviation in kcal
+    """
+
+    passed: bool
+    rule: str
+    deviation_kcal: float
+    error_pct: float
+    allowed_kcal: float
+
+
+def _parse_rule(value: Any) -> ToleranceRule:
+    if isinstance(value, int | float):
+        return ToleranceRule(relative=float(value))
+    if isinstance(value, dict):
+        return ToleranceRule(
+            relative=float(value["relative"]),
+            absolute_kcal=float(value.get("absolute_kcal", 0.0)),
+        )
+    raise ValueError(f"Invalid tolerance rule: {value!r}")
+
+
+class TolerancePolicy:
+    """Maps (scope, slot, objective) to tolerance rules.
+
+    Args:
+        rules: Rule key -> ToleranceRule (must define every scope)
+    """
+
+    def __init__(self, rules: dict[str, ToleranceRule] | None = None) -> None:
+        self.rules = dict(DEFAULT_RULES if rules is None else rules)
+        missing = [scope for scope in TOLERANCE_SCOPES if scope not in self.rules]
+        if missing:
+            raise ValueError(f"Tolerance policy missing scopes: {missing}")
+
+    @classmethod
+    def from_env(cls) -> TolerancePolicy:
+        """Build the policy from NUTRITION_TOLERANCE_RULES."""
+        rules = dict(DEFAULT_RULES)
+        overrides = os.getenv("NUTRITION_TOLERANCE_RULES")
+        if overrides:
+            parsed = json.loads(overrides)
+            if not isinstance(parsed, dict):
+                raise ValueError("NUTRITION_TOLERANCE_RULES must be a JSON object")
+            rules.update({str(k): _parse_rule(v) for k, v in parsed.items()})
+        return cls(rules)
+
+    def rule_for(
+        self, scope: str, slot: str | None = None, objective: str | None = None
+    ) -> tuple[str, ToleranceRule]:
+        """Most specific rule for a check.
+
+        Returns:
+            Tuple of (rule key, ToleranceRule)
+        """
+        if scope not in TOLERANCE_SCOPES:
+            raise ValueError(f"Unknown tolerance scope '{scope}'")
+        candidates = []
+        if slot and objective:
+            candidates.append(f"{scope}:{slot}:{objective}")
+        if slot:
+            candidates.append(f"{scope}:{slot}")
+        if objective:
+            candidates.append(f"{scope}:{objective}")
+        for key in candidates:
+            if key in self.rules:
+                return key, self.rules[key]
+        return scope, self.rules[scope]
+
+    def check(
+        self,
+        actual_kcal: float,
+        target_kcal: float,
+        scope: str,
+        slot: str | None = None,
+        objective: str | None = None,
+    ) -> ToleranceCheck:
+        """Check `actual_kcal` against `target_kcal` and record the outcome.
+
+        Args:
+            actual_kcal: Calories produced
+            target_kcal: Calories budgeted
+            scope: "meal", "last_meal" or "daily"
+            slot: Meal slot (meal_distribution key)
+            objective: User objective value
+
+        Returns:
+            ToleranceCheck with the verdict and the rule that applied
+        """
+        key, rule = self.rule_for(scope, slot, objective)
+        deviation = abs(actual_kcal - target_kcal)
+        error_pct = deviation / target_kcal if target_kcal else float("inf")
+        allowed = rule.allowed_kcal(target_kcal)
+        passed = deviation <= allowed
+        if not passed:
+            outcome = "fail"
+        elif deviation > rule.relative * abs(target_kcal):
+            outcome = "saved"  # Relative band alone would have retried
+        else:
+            outcome = "pass"
+        metrics.increment(
+            "tolerance_checks_total", rule=key, scope=scope, outcome=outcome
+        )
+        return ToleranceCheck(
+            passed=passed,
+            rule=key,
+            deviation_kcal=deviation,
+            error_pct=error_pct,
+            allowed_kcal=allowed,
+        )
+
+
+_policy: TolerancePolicy | None = None
+
+
+def get_tolerance_policy() -> TolerancePolicy:
+    """Get or create the process-wide tolerance policy singleton."""
+    global _policy
+    if _policy is None:
+        _policy = TolerancePolicy.from_env()
+    return _policy
+
+
+def set_tolerance_policy(policy: TolerancePolicy | None) -> None:
+    """Replace the process-wide policy (None reloads it from the environment)."""
+    global _policy
+    _policy = policy
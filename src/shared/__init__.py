@@ -1,11 +1,37 @@
 # File: src/shared/__init__.py
 """Shared utilities for nutrition agents."""
 
-from src.shared.enums import ActivityLevel, DietType, MealTime, Objective
-from src.shared.llm import get_llm
+from src.shared.cassette import (
+    CassetteLLMCache,
+    CassetteMissError,
+    CassetteRetriever,
+    cassette_mode,
+)
+from src.shared.enums import ActivityLevel, DietType, MealSlot, MealTime, Objective
+from src.shared.llm import get_llm, get_structured_llm
+from src.shared.llm_cache import (
+    InMemoryLRUCache,
+    SQLiteLLMCache,
+    build_response_cache,
+    get_response_cache,
+)
+from src.shared.metrics import MetricsRegistry, metrics
+from src.shared.scheduler import (
+    Lane,
+    LLMScheduler,
+    estimate_tokens,
+    get_llm_scheduler,
+)
 from src.shared.tools import (
     sum_ingredients_kcal,
 )
+from src.shared.usage import (
+    UsageRecord,
+    estimate_cost_usd,
+    summarize_usage,
+    track_usage,
+    usage_records,
+)
 
 __all__ = [
     # Enums
@@ -13,8 +39,34 @@ __all__ = [
     "Objective",
     "DietType",
     "MealTime",
+    "MealSlot",
     # LLM
     "get_llm",
+    "get_structured_llm",
+    # LLM response cache
+    "InMemoryLRUCache",
+    "SQLiteLLMCache",
+    "build_response_cache",
+    "get_response_cache",
+    # Record/replay cassettes
+    "CassetteLLMCache",
+    "CassetteMissError",
+    "CassetteRetriever",
+    "cassette_mode",
+    # Metrics
+    "MetricsRegistry",
+    "metrics",
+    # LLM scheduling
+    "Lane",
+    "LLMScheduler",
+    "estimate_tokens",
+    "get_llm_scheduler",
+    # Usage accounting
+    "UsageRecord",
+    "estimate_cost_usd",
+    "summarize_usage",
+    "track_usage",
+    "usage_records",
     # Tools
     "sum_ingredients_kcal",
     # Auxiliary classes
@@ -0,0 +1,325 @@
+"""Record/replay cassettes for LLM and retriever calls.
+
+End-to-end runs of the nutrition graph (and the scripts in tests/evaluation)
+need live OpenAI and Pinecone access: slow, costly and non-deterministic.
+A cassette captures every response once and serves it back offline:
+
+- record: calls go to the live services; each response is written to
+  <dir>/<kind>/<request hash>.json together with the observed latency
+- replay: responses are served from the cassette files; a request without
+  a recording raises CassetteMissError (never falls through to the network)
+- off: no interception (default)
+
+Intercepted call sites:
+- get_llm(...) chat models and the RAG extractor chain, through LangChain's
+  cache hook (request hash = llm_string + serialized messages, so the model,
+  its params and the structured-output schema are all part of the key)
+- the Pinecone retriever, wrapped in CassetteRetriever (hash = namespace +
+  query); in replay mode Pinecone is never initialized
+
+Configuration (environment):
+    NUTRITION_CASSETTE_MODE: off | record | replay (default: off)
+    NUTRITION_CASSETTE_DIR: Cassette directory (default: tests/cassettes)
+    NUTRITION_CASSETTE_LATENCY: Simulated latency in replay mode. Seconds
+        per call, or "recorded" to replay the recorded latencies (default: 0)
+
+Usage:
+    NUTRITION_CASSETTE_MODE=record python tests/evaluation/eval_recipe_generation.py
+    NUTRITION_CASSETTE_MODE=replay python -m pytest -q tests/...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import warnings
+from pathlib import Path
+from typing import Any
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.load import Serializable, dumpd, load
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+from langchain_core.retrievers import BaseRetriever
+
+from src.shared.llm_cache import portable_generations
+
+CASSETTE_MODES = ("off", "record", "replay")
+DEFAULT_CASSETTE_DIR = "tests/cassettes"
+# Placeholder credential: replayed clients must never reach the network
+REPLAY_API_KEY = "cassette-replay"
+
+_RECORDED_TYPES: list[type[Serializable]] = [ChatGeneration, Generation, AIMessage]
+
+
+class CassetteMissError(LookupError):
+    """Replay mode found no recording for a request."""
+
+
+def cassette_mode() -> str:
+    """Current mode from NUTRITION_CASSETTE_MODE (read on every call)."""
+    mode = (os.getenv("NUTRITION_CASSETTE_MODE") or "off").lower()
+    if mode not in CASSETTE_MODES:
+        raise ValueError(
+            f"Unknown NUTRITION_CASSETTE_MODE '{mode}' (expected off, record or replay)"
+        )
+    return mode
+
+
+def cassette_dir() -> Path:
+    """Cassette directory from NUTRITION_CASSETTE_DIR."""
+    return Path(os.getenv("NUTRITION_CASSETTE_DIR") or DEFAULT_CASSETTE_DIR)
+
+
+def request_hash(*parts: str) -> str:
+    """Stable hash of the parts identifying a request."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class _Cassette:
+    """Shared file layout and latency handling for one kind of call."""
+
+    def __init__(
+        self,
+        kind: str,
+        mode: str,
+        directory: str | Path,
+        latency: str | float = 0.0,
+    ) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Cassette mode must be record or replay, got '{mode}'")
+        self.kind = kind
+        self.mode = mode
+        self.directory = Path(directory) / kind
+        self.latency = latency
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def write(self, key: str, latency_s: float, payload: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {"kind": self.kind, "latency_s": round(latency_s, 4), **payload}
+        self.path(key).write_text(json.dumps(entry, ensure_ascii=False, indent=1))
+
+    def read(self, key: str) -> dict[str, Any]:
+        path = self.path(key)
+        if not path.exists():
+            raise CassetteMissError(
+                f"No {self.kind} recording for request {key[:12]} in "
+                f"{self.directory}; re-run with NUTRITION_CASSETTE_MODE=record"
+            )
+        entry: dict[str, Any] = json.loads(path.read_text())
+        return entry
+
+    def replay_delay(self, entry: dict[str, Any]) -> float:
+        if self.latency == "recorded":
+            return float(entry.get("latency_s", 0.0))
+        return float(self.latency)
+
+
+class CassetteLLMCache(BaseCache):
+    """LangChain cache hook that records or replays chat model responses.
+
+    In record mode every lookup misses (the live call runs) and the response
+    is written on update. In replay mode every lookup must hit.
+
+    Args:
+        mode: "record" or "replay"
+        directory: Cassette root directory
+        latency: Replay delay in seconds, or "recorded"
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        directory: str | Path = DEFAULT_CASSETTE_DIR,
+        latency: str | float = 0.0,
+    ) -> None:
+        self.cassette = _Cassette("llm", mode, directory, latency)
+        self._started: dict[str, float] = {}
+
+    @property
+    def mode(self) -> str:
+        return self.cassette.mode
+
+    def _load(self, prompt: str, llm_string: str) -> tuple[RETURN_VAL_TYPE, float]:
+        entry = self.cassette.read(request_hash(llm_string, prompt))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            generations = load(entry["response"], allowed_objects=_RECORDED_TYPES)
+        return generations, self.cassette.replay_delay(entry)
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        if self.mode == "record":
+            self._started[request_hash(llm_string, prompt)] = time.monotonic()
+            return None
+        generations, delay = self._load(prompt, llm_string)
+        if delay:
+            time.sleep(delay)
+        return generations
+
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        if self.mode == "record":
+            return self.lookup(prompt, llm_string)
+        generations, delay = self._load(prompt, llm_string)
+        if delay:
+            await asyncio.sleep(delay)
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if self.mode != "record":
+            return
+        key = request_hash(llm_string, prompt)
+        started = self._started.pop(key, None)
+        latency_s = time.monotonic() - started if started is not None else 0.0
+        self.cassette.write(
+            key,
+            latency_s,
+            {
+                "llm_string": llm_string,
+                "prompt": prompt,
+                "response": dumpd(portable_generations(return_val)),
+            },
+        )
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        self.update(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        for path in self.cassette.directory.glob("*.json"):
+            path.unlink()
+
+
+class CassetteRetriever(BaseRetriever):
+    """Retriever wrapper that records or replays retrieved documents.
+
+    Attributes:
+        inner: Live retriever (may be None in replay mode)
+        namespace: Identifies the index / search settings in the request hash
+        mode: "record" or "replay"
+        directory: Cassette root directory
+        latency: Replay delay in seconds, or "recorded"
+    """
+
+    inner: BaseRetriever | None = None
+    namespace: str = "retriever"
+    mode: str = "replay"
+    directory: str = DEFAULT_CASSETTE_DIR
+    latency: str | float = 0.0
+
+    @property
+    def _cassette(self) -> _Cassette:
+        return _Cassette("retriever", self.mode, self.directory, self.latency)
+
+    def _require_inner(self) -> BaseRetriever:
+        if self.inner is None:
+            raise ValueError("CassetteRetriever in record mode needs a live retriever")
+        return self.inner
+
+    def _record(
+        self, key: str, query: str, docs: list[Document], started: float
+    ) -> None:
+        self._cassette.write(
+            key,
+            time.monotonic() - started,
+            {
+                "query": query,
+                "documents": [
+                    {"page_content": d.page_content, "metadata": d.metadata}
+                    for d in docs
+                ],
+            },
+        )
+
+    def _replay(self, key: str) -> tuple[list[Document], float]:
+        cassette = self._cassette
+        entry = cassette.read(key)
+        docs = [Document(**d) for d in entry["documents"]]
+        return docs, cassette.replay_delay(entry)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        key = request_hash(self.namespace, query)
+        if self.mode == "record":
+            started = time.monotonic()
+            docs = self._require_inner().invoke(query)
+            self._record(key, query, docs, started)
+            return docs
+        docs, delay = self._replay(key)
+        if delay:
+            time.sleep(delay)
+        return docs
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        key = request_hash(self.namespace, query)
+        if self.mode == "record":
+            started = time.monotonic()
+            docs = await self._require_inner().ainvoke(query)
+            self._record(key, query, docs, started)
+            return docs
+        docs, delay = self._replay(key)
+        if delay:
+            await asyncio.sleep(delay)
+        return docs
+
+
+def _latency_from_env() -> str | float:
+    latency = os.getenv("NUTRITION_CASSETTE_LATENCY") or "0"
+    return "recorded" if latency == "recorded" else float(latency)
+
+
+def get_cassette_cache() -> CassetteLLMCache | None:
+    """Cassette LLM cache for the current mode (None when off)."""
+    mode = cassette_mode()
+    if mode == "off":
+        return None
+    return CassetteLLMCache(mode, cassette_dir(), _latency_from_env())
+
+
+def cassette_llm_kwargs() -> dict[str, Any]:
+    """Extra chat model kwargs that route calls through the cassette.
+
+    Returns:
+        {} when off; {"cache": ...} in record mode; in replay mode also a
+        placeholder api_key so clients build without real credentials
+    """
+    cassette = get_cassette_cache()
+    if cassette is None:
+        return {}
+    if cassette.mode == "replay":
+        return {"cache": cassette, "api_key": REPLAY_API_KEY}
+    return {"cache": cassette}
+
+
+def wrap_retriever(
+    retriever: BaseRetriever | None, namespace: str
+) -> BaseRetriever | None:
+    """Wrap a retriever in a CassetteRetriever when cassettes are on."""
+    mode = cassette_mode()
+    if mode == "off":
+        return retriever
+    return CassetteRetriever(
+        inner=retriever,
+        namespace=namespace,
+        mode=mode,
+        directory=str(cassette_dir()),
+        latency=_latency_from_env(),
+    )
@@ -37,3 +37,37 @@ class MealTime(StrEnum):
     COMIDA = "Comida"
     CENA = "Cena"
     SNACK = "Snack"
+
+
+class MealSlot(StrEnum):
+    """Posición de una comida en el día (claves de meal_distribution).
+
+    A diferencia de MealTime, distingue los dos snacks y los planes de
+    1, 2 y 6 comidas. Cada slot pertenece a una categoría MealTime.
+    """
+
+    OMAD = "Comida Unica (OMAD)"
+    BRUNCH = "Brunch"
+    DESAYUNO = "Desayuno"
+    SNACK_AM = "Snack AM"
+    COMIDA = "Comida"
+    SNACK_PM = "Snack PM"
+    CENA = "Cena"
+    RECENA = "Recena"
+
+    @property
+    def meal_time(self) -> MealTime:
+        """Categoría MealTime del slot (ej: Snack AM -> Snack)."""
+        return _SLOT_MEAL_TIMES[self]
+
+
+_SLOT_MEAL_TIMES: dict[MealSlot, MealTime] = {
+    MealSlot.OMAD: MealTime.COMIDA,
+    MealSlot.BRUNCH: MealTime.ALMUERZO,
+    MealSlot.DESAYUNO: MealTime.DESAYUNO,
+    MealSlot.SNACK_AM: MealTime.SNACK,
+    MealSlot.COMIDA: MealTime.COMIDA,
+    MealSlot.SNACK_PM: MealTime.SNACK,
+    MealSlot.CENA: MealTime.CENA,
+    MealSlot.RECENA: MealTime.SNACK,
+}
@@ -0,0 +1,146 @@
+"""Cross-provider fallback and hedging for LLM requests.
+
+A HedgedRunnable sends a request to the primary runnable first. The same
+request goes to the secondary runnable (usually another provider) when the
+primary:
+
+- fails (provider error, invalid structured output), or
+- times out (timeout_s), or
+- has not answered after hedge_delay_s (a hedge: both run concurrently)
+
+Whichever valid response arrives first wins and the other call is
+cancelled. Only when both fail is the primary's error raised. A provider
+call that exceeds timeout_s raises ProviderTimeoutError, never the builtin
+TimeoutError, so callers can tell it apart from their own run deadline.
+
+Metrics:
+- llm_hedge_triggered_total{reason=slow|error}
+- llm_hedge_winner_total{provider=primary|secondary}
+
+Usage:
+    hedged = HedgedRunnable(
+        primary=get_llm("gpt-4o").with_structured_output(Meal),
+        secondary=get_llm("gemini-2.5-flash").with_structured_output(Meal),
+    )
+    meal = await hedged.ainvoke(prompt)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.shared.metrics import metrics
+
+# Start the secondary request when the primary is slower than this
+DEFAULT_HEDGE_DELAY_S = 10.0
+# Give up on a single provider call after this long
+DEFAULT_TIMEOUT_S = 45.0
+
+
+class ProviderTimeoutError(Exception):
+    """A single provider call exceeded HedgedRunnable.timeout_s."""
+
+
+class HedgedRunnable(Runnable[Any, Any]):
+    """Primary/secondary runnable pair with fallback and hedging.
+
+    Args:
+        primary: Runnable tried first
+        secondary: Runnable used on primary failure, timeout or slowness
+        hedge_delay_s: Seconds before a slow primary is hedged
+        timeout_s: Timeout for each provider call
+    """
+
+    def __init__(
+        self,
+        primary: Runnable[Any, Any],
+        secondary: Runnable[Any, Any],
+        hedge_delay_s: float = DEFAULT_HEDGE_DELAY_S,
+        timeout_s: float = DEFAULT_TIMEOUT_S,
+    ) -> None:
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_delay_s = hedge_delay_s
+        self.timeout_s = timeout_s
+
+    def invoke(
+        self, input: Any, config: RunnableConfig | None = None, **kwargs: Any
+    ) -> Any:
+        """Sync path: plain fallback (no hedging without an event loop)."""
+        try:
+            result = self.primary.invoke(input, config, **kwargs)
+        except Exception as primary_error:
+            metrics.increment("llm_hedge_triggered_total", reason="error")
+            try:
+                result = self.secondary.invoke(input, config, **kwargs)
+            except Exception:
+                raise primary_error  # noqa: B904
+            metrics.increment("llm_hedge_winner_total", provider="secondary")
+            return result
+        metrics.increment("llm_hedge_winner_total", provider="primary")
+        return result
+
+    async def _attempt(
+        self,
+        runnable: Runnable[Any, Any],
+        input: Any,
+        config: RunnableConfig | None,
+        **kwargs: Any,
+    ) -> Any:
+        try:
+            return await asyncio.wait_for(
+                runnable.ainvoke(input, config, **kwargs), timeout=self.timeout_s
+            )
+        except TimeoutError as e:
+            raise ProviderTimeoutError(
+                f"Provider call timed out after {self.timeout_s}s"
+            ) from e
+
+    async def ainvoke(
+        self, input: Any, config: RunnableConfig | None = None, **kwargs: Any
+    ) -> Any:
+        """Race primary and (when needed) secondary; first valid result wins."""
+        primary = asyncio.create_task(
+            self._attempt(self.primary, input, config, **kwargs)
+        )
+        providers: dict[asyncio.Task[Any], str] = {primary: "primary"}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay_s)
+            errors: list[BaseException] = []
+            if done:
+                error = primary.exception()
+                if error is None:
+                    metrics.increment("llm_hedge_winner_total", provider="primary")
+                    return primary.result()
+                errors.append(error)
+                metrics.increment("llm_hedge_triggered_total", reason="error")
+            else:
+                metrics.increment("llm_hedge_triggered_total", reason="slow")
+
+            secondary = asyncio.create_task(
+                self._attempt(self.secondary, input, config, **kwargs)
+            )
+            providers[secondary] = "secondary"
+            pending = {task for task in providers if not task.done()}
+            while pending:
+                finished, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Prefer the primary when both finish in the same tick
+                for task in sorted(finished, key=lambda t: providers[t]):
+                    error = task.exception()
+                    if error is None:
+                        metrics.increment(
+                            "llm_hedge_winner_total", provider=providers[task]
+                        )
+                        return task.result()
+                    errors.append(error)
+            # Both failed: surface the primary's error
+            raise primary.exception() or errors[0]
+        finally:
+            for task in providers:
+                if not task.done():
+                    task.cancel()
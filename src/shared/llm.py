@@ -1,36 +1,132 @@
-# File: src/shared/llm.py
-"""LLM factory with Helicone proxy for observability."""
+"""LLM factory with Helicone proxy for observability.
+
+Cross-provider fallback (configuration via environment):
+    LLM_FALLBACK_MODEL: Secondary model for get_structured_llm, on another
+        provider (e.g. gemini-2.5-flash for gpt-4o). Empty = no fallback
+    LLM_HEDGE_DELAY_S: Seconds before a slow primary is hedged (default: 10)
+    LLM_PROVIDER_TIMEOUT_S: Timeout per provider call (default: 45)
+"""
 
 import os
+from typing import Any
 
 from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 
+from src.shared.cassette import cassette_llm_kwargs
+from src.shared.hedging import (
+    DEFAULT_HEDGE_DELAY_S,
+    DEFAULT_TIMEOUT_S,
+    HedgedRunnable,
+)
+from src.shared.llm_cache import get_response_cache
+
 
-def get_llm(model: str = "gpt-4o") -> BaseChatModel:
+def get_llm(
+    model: str = "gpt-4o",
+    *,
+    temperature: float | None = None,
+    cache: bool = False,
+) -> BaseChatModel:
     """
     Returns LLM instance with Helicone proxy for OpenAI models.
 
     Args:
         model: Model name (gpt-4o, gpt-4o-mini, gemini-2.5-flash)
+        temperature: Sampling temperature (None keeps the provider default;
+                     Gemini always runs at 0)
+        cache: Opt in to the exact-match response cache (see llm_cache.py).
+               Only allowed for deterministic calls (temperature 0).
 
     Returns:
         Configured ChatOpenAI or ChatGoogleGenerativeAI instance
 
+    Raises:
+        ValueError: If cache is requested for a non-deterministic call
+
     Note:
         - OpenAI models: routed through Helicone proxy
         - Gemini models: direct connection (Helicone not supported)
+        - NUTRITION_CASSETTE_MODE=record|replay routes calls through the
+          cassette layer instead of the response cache (see cassette.py)
     """
     helicone_api_key = os.getenv("HELICONE_API_KEY")
+    is_gemini = model.startswith("gemini")
 
-    if model.startswith("gemini"):
+    extra: dict[str, Any] = {}
+    if cache:
+        if not is_gemini and temperature != 0:
+            raise ValueError("Response cache requires temperature=0")
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            extra["cache"] = response_cache
+    extra.update(cassette_llm_kwargs())
+
+    if is_gemini:
         # Gemini: direct connection (no Helicone support)
-        return ChatGoogleGenerativeAI(model=model, temperature=0)
+        return ChatGoogleGenerativeAI(model=model, temperature=0, **extra)
+
+    if temperature is not None:
+        extra["temperature"] = temperature
 
     # OpenAI: proxy via Helicone for observability
     return ChatOpenAI(
         model=model,
         base_url="https://oai.helicone.ai/v1",
         default_headers={"Helicone-Auth": f"Bearer {helicone_api_key}"},
+        **extra,
+    )
+
+
+def _provider(model: str) -> str:
+    return "google" if model.startswith("gemini") else "openai"
+
+
+def get_structured_llm(
+    schema: Any,
+    model: str = "gpt-4o",
+    *,
+    fallback_model: str | None = None,
+    hedge_delay_s: float | None = None,
+    timeout_s: float | None = None,
+) -> Runnable[Any, Any]:
+    """
+    Returns a structured-output runnable with cross-provider fallback.
+
+    Args:
+        schema: Pydantic model for with_structured_output
+        model: Primary model name
+        fallback_model: Secondary model (default: LLM_FALLBACK_MODEL)
+        hedge_delay_s: Hedge delay (default: LLM_HEDGE_DELAY_S)
+        timeout_s: Timeout per provider call (default: LLM_PROVIDER_TIMEOUT_S)
+
+    Returns:
+        get_llm(model).with_structured_output(schema), wrapped in a
+        HedgedRunnable when a fallback model on another provider is set
+
+    Note:
+        A fallback on the same provider as the primary is ignored: it would
+        share the primary's incidents and rate limits.
+    """
+    primary = get_llm(model).with_structured_output(schema)
+
+    if fallback_model is None:
+        fallback_model = os.getenv("LLM_FALLBACK_MODEL", "")
+    if not fallback_model or _provider(fallback_model) == _provider(model):
+        return primary
+
+    if hedge_delay_s is None:
+        hedge_delay_s = float(
+            os.getenv("LLM_HEDGE_DELAY_S") or str(DEFAULT_HEDGE_DELAY_S)
+        )
+    if timeout_s is None:
+        timeout_s = float(os.getenv("LLM_PROVIDER_TIMEOUT_S") or str(DEFAULT_TIMEOUT_S))
+
+    return HedgedRunnable(
+        primary=primary,
+        secondary=get_llm(fallback_model).with_structured_output(schema),
+        hedge_delay_s=hedge_delay_s,
+        timeout_s=timeout_s,
     )
@@ -0,0 +1,332 @@
+"""Exact-match response cache for deterministic (temperature 0) LLM calls.
+
+The RAG extractor runs gpt-4o-mini at temperature 0 with the same
+(ingredient, context) input over and over. A cache hit returns the stored
+generation and skips the LLM round trip entirely.
+
+Caches implement LangChain's BaseCache and are attached per call site via
+the chat model's `cache=` field (opt-in, never global):
+
+    llm = get_llm("gpt-4o-mini", temperature=0, cache=True)
+
+LangChain builds the lookup from the serialized messages (message ids
+stripped) and the llm_string, which holds the model name, its invocation
+params and any bound tools / structured-output schema. Both are hashed into
+a single key, so a schema change never serves a stale answer.
+
+Backends:
+- "memory": in-process LRU (per gunicorn worker)
+- "sqlite": on-disk LRU shared by workers on the same host
+- "off": no caching
+
+Metrics:
+- llm_cache_requests_total{cache, result=hit|miss}
+- llm_cache_hit_rate{cache} (gauge)
+- llm_cache_entries{cache} (gauge)
+- llm_cache_evictions_total{cache}
+
+Configuration (environment):
+    LLM_CACHE_BACKEND: memory | sqlite | off (default: memory)
+    LLM_CACHE_MAX_ENTRIES: Size cap per backend (default: 10000)
+    LLM_CACHE_PATH: SQLite file (default: .cache/llm_cache.sqlite)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import Serializable, dumps, loads
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+from pydantic import BaseModel
+
+from src.shared.metrics import metrics
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_SQLITE_PATH = ".cache/llm_cache.sqlite"
+# Only generations are ever deserialized from the SQLite file
+_CACHED_TYPES: list[type[Serializable]] = [ChatGeneration, Generation, AIMessage]
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    """Stable key for (serialized messages, model + params + schema)."""
+    digest = hashlib.sha256()
+    digest.update(llm_string.encode())
+    digest.update(b"\x00")
+    digest.update(prompt.encode())
+    return digest.hexdigest()
+
+
+def portable_generations(return_val: RETURN_VAL_TYPE) -> list[Generation]:
+    """Generations safe to serialize with langchain_core.load.dumps.
+
+    ChatOpenAI structured output stores the parsed Pydantic object in
+    additional_kwargs["parsed"], which dumps cannot serialize. It is stored
+    as a plain dict instead (the output parser accepts both).
+    """
+    portable: list[Generation] = []
+    for generation in return_val:
+        if not isinstance(generation, ChatGeneration):
+            portable.append(generation)
+            continue
+        message = generation.message
+        parsed = message.additional_kwargs.get("parsed")
+        if isinstance(parsed, BaseModel):
+            additional_kwargs = {
+                **message.additional_kwargs,
+                "parsed": parsed.model_dump(mode="json"),
+            }
+            generation = generation.model_copy(
+                update={
+                    "message": message.model_copy(
+                        update={"additional_kwargs": additional_kwargs}
+                    )
+                }
+            )
+        portable.append(generation)
+    return portable
+
+
+class _CacheStats:
+    """Hit/miss bookkeeping published to the metrics registry."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            hit_rate = self.hits / (self.hits + self.misses)
+        result = "hit" if hit else "miss"
+        metrics.increment("llm_cache_requests_total", cache=self.name, result=result)
+        metrics.set_gauge("llm_cache_hit_rate", hit_rate, cache=self.name)
+
+    @property
+    def hit_rate(self) -> float:
+        with self._lock:
+            total = self.hits + self.misses
+            return self.hits / total if total else 0.0
+
+
+class InMemoryLRUCache(BaseCache):
+    """In-process LRU response cache.
+
+    Args:
+        max_entries: Entries kept before evicting the least recently used
+        name: Label for metrics
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, name: str = "memory"):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.stats = _CacheStats(name)
+        self._entries: OrderedDict[str, RETURN_VAL_TYPE] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        # Truthy even when empty: chat models only use a truthy `cache`
+        return True
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        self.stats.record(hit=value is not None)
+        return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = return_val
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            size = len(self._entries)
+        if evicted:
+            metrics.increment(
+                "llm_cache_evictions_total", evicted, cache=self.stats.name
+            )
+        metrics.set_gauge("llm_cache_entries", size, cache=self.stats.name)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+        metrics.set_gauge("llm_cache_entries", 0, cache=self.stats.name)
+
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        self.update(prompt, llm_string, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        self.clear()
+
+
+class SQLiteLLMCache(BaseCache):
+    """On-disk LRU response cache (one SQLite file, size-capped).
+
+    Generations are stored with langchain_core.load.dumps so structured
+    output (tool calls) round-trips. The least recently used entries are
+    deleted whenever the table grows past `max_entries`.
+
+    Args:
+        path: SQLite database file (parent directories are created)
+        max_entries: Entries kept before evicting the least recently used
+        name: Label for metrics
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_SQLITE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        name: str = "sqlite",
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.stats = _CacheStats(name)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_last_used"
+                " ON llm_cache (last_used)"
+            )
+
+    def __bool__(self) -> bool:
+        # Truthy even when empty: chat models only use a truthy `cache`
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(
+                self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            )
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = cache_key(prompt, llm_string)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE llm_cache SET last_used = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+        value = None
+        if row is not None:
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", LangChainBetaWarning)
+                    value = loads(row[0], allowed_objects=_CACHED_TYPES)
+            except Exception:
+                # Entry written by an incompatible langchain version: treat as miss
+                value = None
+        self.stats.record(hit=value is not None)
+        return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = cache_key(prompt, llm_string)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, last_used)"
+                " VALUES (?, ?, ?)",
+                (key, dumps(portable_generations(return_val)), time.time()),
+            )
+            size = int(
+                self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            )
+            evicted = max(0, size - self.max_entries)
+            if evicted:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    " SELECT key FROM llm_cache ORDER BY last_used ASC LIMIT ?)",
+                    (evicted,),
+                )
+        if evicted:
+            metrics.increment(
+                "llm_cache_evictions_total", evicted, cache=self.stats.name
+            )
+        metrics.set_gauge("llm_cache_entries", size - evicted, cache=self.stats.name)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+        metrics.set_gauge("llm_cache_entries", 0, cache=self.stats.name)
+
+
+def build_response_cache(
+    backend: str | None = None,
+    max_entries: int | None = None,
+    path: str | None = None,
+) -> BaseCache | None:
+    """Build a response cache from arguments or LLM_CACHE_* env vars.
+
+    Returns:
+        The cache, or None when the backend is "off"
+    """
+    backend = (backend or os.getenv("LLM_CACHE_BACKEND") or "memory").lower()
+    if max_entries is None:
+        max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+
+    if backend == "off":
+        return None
+    if backend == "memory":
+        return InMemoryLRUCache(max_entries=max_entries)
+    if backend == "sqlite":
+        return SQLiteLLMCache(
+            path=path or os.getenv("LLM_CACHE_PATH") or DEFAULT_SQLITE_PATH,
+            max_entries=max_entries,
+        )
+    raise ValueError(
+        f"Unknown LLM_CACHE_BACKEND '{backend}' (expected memory, sqlite or off)"
+    )
+
+
+_response_cache: BaseCache | None = None
+_response_cache_built = False
+
+
+def get_response_cache() -> BaseCache | None:
+    """Get or create the process-wide response cache (None if disabled)."""
+    global _response_cache, _response_cache_built
+    if not _response_cache_built:
+        _response_cache = build_response_cache()
+        _response_cache_built = True
+    return _response_cache
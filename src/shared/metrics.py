@@ -0,0 +1,129 @@
+"""In-process metrics registry for nutrition agent telemetry.
+
+Lightweight counters, gauges and histogram summaries keyed by metric name
+and labels. Each gunicorn worker keeps its own registry; the FastAPI app
+exposes a snapshot at GET /metrics.
+
+Usage:
+    from src.shared.metrics import metrics
+
+    metrics.increment("llm_requests_total", lane="bulk")
+    metrics.observe("llm_scheduler_wait_seconds", 0.42, lane="bulk")
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, str]) -> LabelKey:
+    """Normalize labels into a hashable, order-independent key."""
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+@dataclass
+class _Summary:
+    """Running histogram summary (count, sum, min, max)."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "min": round(self.minimum, 6) if self.count else 0.0,
+            "max": round(self.maximum, 6) if self.count else 0.0,
+            "mean": round(self.total / self.count, 6) if self.count else 0.0,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and histogram summaries."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._gauges: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, _Summary]] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Add `value` to the counter `name` for the given labels."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """Set the gauge `name` to `value` for the given labels."""
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record one observation (e.g. a latency) in histogram `name`."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            series.setdefault(key, _Summary()).add(value)
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        """Current value of a counter series (0.0 if never incremented)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def histogram_summary(self, name: str, **labels: str) -> dict[str, float]:
+        """Summary of a histogram series (zeros if never observed)."""
+        with self._lock:
+            summary = self._histograms.get(name, {}).get(_label_key(labels))
+            return (summary or _Summary()).as_dict()
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serializable view of every metric series."""
+        with self._lock:
+            return {
+                "counters": {
+                    name: [
+                        {"labels": dict(key), "value": value}
+                        for key, value in series.items()
+                    ]
+                    for name, series in self._counters.items()
+                },
+                "gauges": {
+                    name: [
+                        {"labels": dict(key), "value": value}
+                        for key, value in series.items()
+                    ]
+                    for name, series in self._gauges.items()
+                },
+                "histograms": {
+                    name: [
+                        {"labels": dict(key), **summary.as_dict()}
+                        for key, summary in series.items()
+                    ]
+                    for name, series in self._histograms.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """Drop all series (used by tests)."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -0,0 +1,237 @@
+"""Process-wide LLM request scheduler with rate-limit awareness.
+
+Every session fans out its own asyncio.gather() of LLM calls. Without
+coordination, concurrent sessions hit the OpenAI/Helicone rate limits at the
+same time and every plan slows down together. This scheduler admits calls
+against requests-per-minute (RPM) and tokens-per-minute (TPM) budgets and
+queues the rest by priority lane:
+
+- Lane.INTERACTIVE: user-facing turns (data_collection, recipe_generation_single)
+- Lane.BULK: background work (recipe_generation_batch, RAG extractor)
+
+When a call fails with a rate-limit error carrying a Retry-After header, the
+whole scheduler pauses for that long instead of letting every waiter retry.
+
+Configuration (environment, 0 = unlimited):
+    LLM_REQUESTS_PER_MINUTE: RPM budget for this worker process
+    LLM_TOKENS_PER_MINUTE: TPM budget for this worker process
+
+Usage:
+    async with get_llm_scheduler().slot(Lane.BULK, estimate_tokens(prompt)):
+        meal = await structured_llm.ainvoke(prompt)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any
+
+from src.shared.metrics import metrics
+
+# Rough chars-per-token ratio for budget estimation (OpenAI tokenizers ≈ 4)
+_CHARS_PER_TOKEN = 4
+# Completion budget assumed when the caller does not provide one
+DEFAULT_COMPLETION_TOKENS = 800
+# How often queued (non-head) waiters re-check their position
+_POLL_INTERVAL_S = 0.05
+
+
+class Lane(IntEnum):
+    """Priority lanes (lower value is served first)."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+def estimate_tokens(
+    prompt: Any, completion_tokens: int = DEFAULT_COMPLETION_TOKENS
+) -> int:
+    """Estimate total tokens for a call from its prompt size.
+
+    Args:
+        prompt: Prompt string or list of messages (anything with str())
+        completion_tokens: Expected completion length
+
+    Returns:
+        Estimated prompt + completion tokens
+    """
+    if isinstance(prompt, list):
+        text = "".join(str(getattr(m, "content", m)) for m in prompt)
+    else:
+        text = str(prompt)
+    return len(text) // _CHARS_PER_TOKEN + completion_tokens
+
+
+def _retry_after_seconds(exc: BaseException) -> float | None:
+    """Extract Retry-After (seconds) from a provider error, if present.
+
+    Walks the exception chain because LangChain wrappers may re-raise the
+    original openai.RateLimitError as __cause__.
+    """
+    current: BaseException | None = exc
+    while current is not None:
+        response = getattr(current, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            retry_after_ms = headers.get("retry-after-ms")
+            if retry_after_ms:
+                try:
+                    return float(retry_after_ms) / 1000.0
+                except ValueError:
+                    pass
+            retry_after = headers.get("retry-after")
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    try:
+                        retry_at = parsedate_to_datetime(retry_after)
+                    except (TypeError, ValueError):
+                        return None
+                    wait_s: float = retry_at.timestamp() - time.time()
+                    return max(0.0, wait_s)
+        current = current.__cause__
+    return None
+
+
+class LLMScheduler:
+    """Admission control for LLM calls against RPM/TPM budgets.
+
+    Admitted calls are recorded in a sliding window. Waiters are ordered by
+    (lane, arrival) so interactive work always overtakes queued bulk work.
+
+    Args:
+        requests_per_minute: RPM budget (0 = unlimited)
+        tokens_per_minute: TPM budget (0 = unlimited)
+        window_s: Sliding window length in seconds (60 for per-minute budgets)
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        window_s: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window_s = window_s
+        self._clock = clock
+        self._admitted: deque[tuple[float, int]] = deque()  # (timestamp, tokens)
+        self._waiting: list[tuple[int, int]] = []  # heap of (lane, seq)
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+
+    @classmethod
+    def from_env(cls) -> LLMScheduler:
+        """Build a scheduler from LLM_REQUESTS_PER_MINUTE / LLM_TOKENS_PER_MINUTE."""
+        return cls(
+            requests_per_minute=int(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")),
+            tokens_per_minute=int(os.getenv("LLM_TOKENS_PER_MINUTE", "0")),
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls currently waiting for admission."""
+        return len(self._waiting)
+
+    def pause_for(self, seconds: float) -> None:
+        """Stop admitting calls for `seconds` (e.g. from a Retry-After header)."""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def _prune(self, now: float) -> None:
+        while self._admitted and self._admitted[0][0] <= now - self.window_s:
+            self._admitted.popleft()
+
+    def _admission_delay(self, tokens: int) -> float:
+        """Seconds until a call of `tokens` fits the budgets (0 = admit now)."""
+        now = self._clock()
+        if self._paused_until > now:
+            return self._paused_until - now
+
+        self._prune(now)
+        delays = [0.0]
+
+        if self.requests_per_minute and len(self._admitted) >= self.requests_per_minute:
+            overflow = len(self._admitted) - self.requests_per_minute
+            delays.append(self._admitted[overflow][0] + self.window_s - now)
+
+        if self.tokens_per_minute and self._admitted:
+            used = sum(t for _, t in self._admitted)
+            excess = used + tokens - self.tokens_per_minute
+            # Wait until enough old calls leave the window to free `excess` tokens
+            for ts, t in self._admitted:
+                if excess <= 0:
+                    break
+                excess -= t
+                delays.append(ts + self.window_s - now)
+
+        return max(delays)
+
+    async def _acquire(self, lane: Lane, tokens: int) -> float:
+        """Wait for admission; returns seconds spent queued."""
+        start = self._clock()
+        ticket = (int(lane), next(self._seq))
+        heapq.heappush(self._waiting, ticket)
+        try:
+            while True:
+                if self._waiting[0] == ticket:
+                    delay = self._admission_delay(tokens)
+                    if delay <= 0:
+                        heapq.heappop(self._waiting)
+                        self._admitted.append((self._clock(), tokens))
+                        return self._clock() - start
+                    await asyncio.sleep(min(delay, self.window_s))
+                else:
+                    await asyncio.sleep(_POLL_INTERVAL_S)
+        except BaseException:
+            # Cancelled while queued: drop our ticket so others can proceed
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+            raise
+
+    @asynccontextmanager
+    async def slot(
+        self, lane: Lane = Lane.BULK, estimated_tokens: int = 0
+    ) -> AsyncIterator[None]:
+        """Hold an admitted slot for one LLM call.
+
+        Records queue wait time as `llm_scheduler_wait_seconds{lane}` and
+        pauses the scheduler when the call fails with a Retry-After header.
+        """
+        lane_label = lane.name.lower()
+        metrics.set_gauge("llm_scheduler_queue_depth", self.queue_depth + 1)
+        waited = await self._acquire(lane, estimated_tokens)
+        metrics.observe("llm_scheduler_wait_seconds", waited, lane=lane_label)
+        metrics.increment("llm_scheduler_admitted_total", lane=lane_label)
+        metrics.set_gauge("llm_scheduler_queue_depth", self.queue_depth)
+        try:
+            yield
+        except Exception as e:
+            retry_after = _retry_after_seconds(e)
+            if retry_after is not None:
+                self.pause_for(retry_after)
+                metrics.increment("llm_scheduler_retry_after_total", lane=lane_label)
+            raise
+
+
+_scheduler: LLMScheduler | None = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get or create the process-wide scheduler singleton."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler.from_env()
+    return _scheduler
@@ -0,0 +1,173 @@
+"""Token and cost accounting for LLM calls.
+
+Each LLM node wraps its calls in track_usage(), which collects the
+usage_metadata of every chat model call made in that context (including
+calls inside asyncio.gather tasks). The node converts the result into
+UsageRecord dicts and appends them to state["token_usage"], so usage is
+persisted with the thread by the checkpointer. Every record also feeds
+the metrics registry:
+
+- llm_tokens_total{node, model, kind=input|output}
+- llm_cost_usd_total{node, model}
+
+Usage:
+    with track_usage() as usage:
+        meal = await structured_llm.ainvoke(prompt)
+    records = usage_records(usage, node="recipe_generation_batch", run_id=run_id)
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypedDict
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tracers.context import register_configure_hook
+
+from src.shared.metrics import metrics
+
+# USD per 1M tokens (input, output). Matched by longest model-name prefix,
+# so dated snapshots like "gpt-4o-2024-08-06" resolve to "gpt-4o".
+PRICES_PER_MILLION_TOKENS: dict[str, tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gemini-2.5-flash": (0.30, 2.50),
+}
+
+
+class UsageRecord(TypedDict):
+    """Token usage of one model within one node execution."""
+
+    run_id: str
+    node: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    total_tokens: int
+    cost_usd: float
+
+
+# Registered once: LangChain attaches the current handler to every run
+_usage_handler_var: ContextVar[UsageMetadataCallbackHandler | None] = ContextVar(
+    "nutrition_usage_handler", default=None
+)
+register_configure_hook(_usage_handler_var, inheritable=True)
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageMetadataCallbackHandler]:
+    """Collect usage_metadata of all chat model calls made in this context."""
+    handler = UsageMetadataCallbackHandler()
+    token = _usage_handler_var.set(handler)
+    try:
+        yield handler
+    finally:
+        _usage_handler_var.reset(token)
+
+
+def estimate_cost_usd(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of a call (0.0 for models without a known price)."""
+    matches = [name for name in PRICES_PER_MILLION_TOKENS if model.startswith(name)]
+    if not matches:
+        return 0.0
+    input_price, output_price = PRICES_PER_MILLION_TOKENS[max(matches, key=len)]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def new_run_id() -> str:
+    """Short unique id for a run."""
+    return uuid.uuid4().hex[:12]
+
+
+def start_run_id(config: RunnableConfig | None = None) -> str:
+    """Run id for a run starting now (configurable.run_id wins if provided)."""
+    run_id = ((config or {}).get("configurable") or {}).get("run_id")
+    return str(run_id) if run_id else new_run_id()
+
+
+def resolve_run_id(state: Any, config: RunnableConfig | None = None) -> str:
+    """Run id of the current node: configurable.run_id, then state["run_id"]."""
+    run_id = ((config or {}).get("configurable") or {}).get("run_id")
+    if not run_id:
+        run_id = state.get("run_id")
+    return str(run_id) if run_id else "unknown"
+
+
+def usage_records(
+    handler: UsageMetadataCallbackHandler, node: str, run_id: str
+) -> list[UsageRecord]:
+    """Convert collected usage into records and publish token/cost metrics."""
+    records: list[UsageRecord] = []
+    for model, usage in handler.usage_metadata.items():
+        input_tokens = int(usage.get("input_tokens", 0))
+        output_tokens = int(usage.get("output_tokens", 0))
+        cost = estimate_cost_usd(model, input_tokens, output_tokens)
+        records.append(
+            UsageRecord(
+                run_id=run_id,
+                node=node,
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=int(
+                    usage.get("total_tokens", input_tokens + output_tokens)
+                ),
+                cost_usd=round(cost, 6),
+            )
+        )
+        metrics.increment(
+            "llm_tokens_total", input_tokens, node=node, model=model, kind="input"
+        )
+        metrics.increment(
+            "llm_tokens_total", output_tokens, node=node, model=model, kind="output"
+        )
+        metrics.increment("llm_cost_usd_total", cost, node=node, model=model)
+    return records
+
+
+def _empty_totals() -> dict[str, Any]:
+    return {
+        "calls": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "cost_usd": 0.0,
+    }
+
+
+def _add(totals: dict[str, Any], record: UsageRecord) -> None:
+    totals["calls"] += 1
+    totals["input_tokens"] += record["input_tokens"]
+    totals["output_tokens"] += record["output_tokens"]
+    totals["total_tokens"] += record["total_tokens"]
+    totals["cost_usd"] = round(totals["cost_usd"] + record["cost_usd"], 6)
+
+
+def summarize_usage(records: Iterable[UsageRecord]) -> dict[str, Any]:
+    """Aggregate usage records per node, per run and per model.
+
+    Returns:
+        dict with "total", "by_node", "by_model" and "by_run" (each run with
+        its own "total" and "by_node"). "calls" counts node executions
+        (per model) that made LLM calls.
+    """
+    summary: dict[str, Any] = {
+        "total": _empty_totals(),
+        "by_node": {},
+        "by_model": {},
+        "by_run": {},
+    }
+    for record in records:
+        _add(summary["total"], record)
+        _add(summary["by_node"].setdefault(record["node"], _empty_totals()), record)
+        _add(summary["by_model"].setdefault(record["model"], _empty_totals()), record)
+        run = summary["by_run"].setdefault(
+            record["run_id"], {"total": _empty_totals(), "by_node": {}}
+        )
+        _add(run["total"], record)
+        _add(run["by_node"].setdefault(record["node"], _empty_totals()), record)
+    return summary
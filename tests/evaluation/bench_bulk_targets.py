@@ -0,0 +1,99 @@
+"""Benchmark of bulk_nutritional_targets against the scalar tools.
+
+Computes targets and meal distributions for a seeded synthetic roster:
+- loop: generate_nutritional_plan.invoke + get_meal_distribution.invoke
+  per profile (what pre-computing a roster costs today)
+- bulk: one bulk_nutritional_targets call over column arrays
+
+Every row of the bulk result is checked against the loop output.
+
+Run: python tests/evaluation/bench_bulk_targets.py [--n 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.nutrition_agent.nodes.calculation.bulk import (  # noqa: E402
+    bulk_nutritional_targets,
+)
+from src.nutrition_agent.nodes.calculation.tools import (  # noqa: E402
+    generate_nutritional_plan,
+    get_meal_distribution,
+)
+from src.shared.enums import ActivityLevel, DietType, Objective  # noqa: E402
+
+
+def make_roster(n: int, seed: int = 42) -> dict[str, list[Any]]:
+    """Column arrays of n random valid profiles."""
+    rng = random.Random(seed)  # noqa: S311
+    return {
+        "age": [rng.randint(18, 100) for _ in range(n)],
+        "gender": [rng.choice(["male", "female"]) for _ in range(n)],
+        "weight": [rng.randint(45, 160) for _ in range(n)],
+        "height": [rng.randint(145, 205) for _ in range(n)],
+        "activity_level": [rng.choice(list(ActivityLevel)).value for _ in range(n)],
+        "objective": [rng.choice(list(Objective)).value for _ in range(n)],
+        "diet_type": [rng.choice(list(DietType)).value for _ in range(n)],
+        "number_of_meals": [rng.randint(1, 6) for _ in range(n)],
+    }
+
+
+def run_loop(roster: dict[str, list[Any]]) -> list[tuple[dict, dict]]:
+    """One tool call per profile, as the calculation node does."""
+    results = []
+    for i in range(len(roster["age"])):
+        plan = generate_nutritional_plan.invoke(
+            {field: roster[field][i] for field in roster if field != "number_of_meals"}
+        )
+        distribution = get_meal_distribution.invoke(
+            {
+                "total_calories": plan["target_calories"],
+                "number_of_meals": roster["number_of_meals"][i],
+            }
+        )
+        results.append((plan, distribution))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=20_000, help="roster size")
+    args = parser.parse_args()
+
+    roster = make_roster(args.n)
+    print(f"Roster: {args.n:,} profiles")
+
+    start = time.perf_counter()
+    expected = run_loop(roster)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    targets = bulk_nutritional_targets(**roster)
+    bulk_s = time.perf_counter() - start
+
+    mismatches = sum(
+        plan != targets.record(i) or distribution != targets.meal_distribution(i)
+        for i, (plan, distribution) in enumerate(expected)
+    )
+
+    print(f"{'method':<8}{'total s':>10}{'µs/profile':>12}{'speedup':>10}")
+    for name, seconds in (("loop", loop_s), ("bulk", bulk_s)):
+        print(
+            f"{name:<8}{seconds:>10.3f}{seconds / args.n * 1e6:>12.2f}"
+            f"{loop_s / seconds:>9.1f}x"
+        )
+    print(f"Mismatches vs scalar tools: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
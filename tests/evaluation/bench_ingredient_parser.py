@@ -0,0 +1,213 @@
+"""Benchmark of the ingredient string parser used by consolidate_shopping_list.
+
+Compares the previous implementation (uncompiled re.sub calls, no memo)
+against the current _parse_ingredient on a seeded synthetic corpus, and
+checks that they all produce the same results. The corpus includes strings
+with several quantities and with a fraction after a plain number ("2 tazas
+(1/2 kg)"), where the fraction must keep its precedence.
+
+The corpus mimics weekly / household plans: a limited vocabulary of
+ingredients, quantities and notes, so strings recur as they do across
+validation retries and users.
+
+- compiled: current precompiled parser with every memo bypassed
+  (parses all strings, like a corpus without repeats)
+- cold: memo cleared before the run (each distinct string parsed once,
+  repeats already served from the memo)
+- warm: second run over the same corpus (served from the memo)
+
+Run: python tests/evaluation/bench_ingredient_parser.py [--n 100000]
+"""
+
+import argparse
+import importlib
+import random
+import re
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.nutrition_agent.nodes.validation.tools import (  # noqa: E402
+    _KNOWN_UNITS,
+    _clean_item_name,
+    _match_quantity,
+    _parse_ingredient,
+)
+
+# SYNTHETIC CORPUS
+
+ITEMS = [
+    "Pechuga de pollo",
+    "Avena",
+    "Arroz integral",
+    "Leche semidesnatada",
+    "Aceite de oliva virgen extra",
+    "Huevo",
+    "Plátano",
+    "Lentejas cocidas",
+    "Merluza",
+    "Tomate",
+    "Pan integral",
+    "Yogur natural",
+    "Espinacas",
+    "Limón",
+    "Queso fresco",
+]
+UNITS = ["g", "gr", "gramos", "kg", "ml", "l", "unidad", "unidades"]
+NOTES = ["", " (al grill)", " (sin piel, a la plancha)", " (cocido)"]
+
+
+def make_corpus(n: int, seed: int = 42) -> list[str]:
+    """Generate n ingredient strings in the shapes the LLM produces."""
+    rng = random.Random(seed)  # noqa: S311
+    corpus = []
+    for _ in range(n):
+        item = rng.choice(ITEMS)
+        unit = rng.choice(UNITS)
+        qty = rng.choice(["1/2", "1", "2", "80", "150", "200", "0.5", "1.5"])
+        note = rng.choice(NOTES)
+        shape = rng.randrange(7)
+        if shape == 0:
+            corpus.append(f"{qty}{unit} {item}{note}")
+        elif shape == 1:
+            corpus.append(f"{item} {qty} {unit}{note}")
+        elif shape == 2:
+            corpus.append(f"{qty} {unit} de {item.lower()}")
+        elif shape == 3:
+            corpus.append(f"{item} ({qty}{unit})")
+        elif shape == 4:
+            # Several quantities: "2 unidades Huevo (120g)"
+            extra = rng.choice(["80g", "150 gr", "200ml", "1/2 kg", "1.5 l"])
+            corpus.append(f"{qty} {unit} {item} ({extra})")
+        elif shape == 5:
+            # Plain number before a fraction: "2 tazas Avena (1/2 kg)"
+            count = rng.choice(["1", "2", "3"])
+            corpus.append(f"{count} tazas {item} ({rng.choice(['1/2', '3/4'])} {unit})")
+        else:
+            corpus.append(f"{item} al gusto")
+    return corpus
+
+
+# PREVIOUS IMPLEMENTATION (reference)
+
+_LEGACY_QTY_UNIT = rf"(?P<qty>\d+(?:\.\d+)?)\s*(?P<unit>{_KNOWN_UNITS})\b"
+_LEGACY_FRAC_UNIT = rf"(?P<num>\d+)\s*/\s*(?P<den>\d+)\s*(?P<unit>{_KNOWN_UNITS})\b"
+
+
+def _legacy_normalize_unit(raw_unit: str, qty: float) -> tuple[float, str]:
+    u = raw_unit.lower()
+    if u in ("kg", "kilos", "kilogramos"):
+        return qty * 1000, "g"
+    if u in ("gr", "gramos", "g"):
+        return qty, "g"
+    if u in ("l", "litros"):
+        return qty * 1000, "ml"
+    if u == "ml":
+        return qty, "ml"
+    if u in ("unidad", "unidades"):
+        return qty, "unidad/es"
+    return qty, u
+
+
+def _legacy_clean_item_name(name: str) -> str:
+    name = re.sub(r"\(\s*\)", "", name)
+    name = re.sub(r"\([^)]*\)\s*$", "", name)
+    name = re.sub(r"^\s*de\s+", "", name, flags=re.IGNORECASE)
+    name = re.sub(r"\s+de\s*$", "", name, flags=re.IGNORECASE)
+    return re.sub(r"\s+", " ", name).strip()
+
+
+def legacy_parse_ingredient(raw: str) -> tuple[float, str, str]:
+    """Parser as it was before precompiling and memoizing."""
+    text = raw.strip()
+    frac = re.search(_LEGACY_FRAC_UNIT, text, flags=re.IGNORECASE)
+    if frac:
+        num, den = float(frac.group("num")), float(frac.group("den"))
+        qty, unit = _legacy_normalize_unit(
+            frac.group("unit"), num / den if den != 0 else num
+        )
+        item = _legacy_clean_item_name(text[: frac.start()] + text[frac.end() :])
+        return qty, unit, item.lower()
+    match = re.search(_LEGACY_QTY_UNIT, text, flags=re.IGNORECASE)
+    if match:
+        qty, unit = _legacy_normalize_unit(
+            match.group("unit"), float(match.group("qty"))
+        )
+        item = _legacy_clean_item_name(text[: match.start()] + text[match.end() :])
+        return qty, unit, item.lower()
+    return 0.0, "varios", _legacy_clean_item_name(text).lower()
+
+
+# BENCHMARK
+
+
+def _clear_memo() -> None:
+    for parser in (_parse_ingredient, _match_quantity, _clean_item_name):
+        parser.cache_clear()
+
+
+@contextmanager
+def _no_memo() -> Iterator[Callable[[str], tuple]]:
+    """Unmemoized _parse_ingredient (its helpers' memos bypassed too)."""
+    tools = importlib.import_module("src.nutrition_agent.nodes.validation.tools")
+    tools._match_quantity = _match_quantity.__wrapped__
+    tools._clean_item_name = _clean_item_name.__wrapped__
+    try:
+        yield _parse_ingredient.__wrapped__
+    finally:
+        tools._match_quantity = _match_quantity
+        tools._clean_item_name = _clean_item_name
+
+
+def _timed(parse: Callable[[str], tuple], corpus: list[str]) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = [parse(raw) for raw in corpus]
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=100_000, help="corpus size")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.n)
+    print(f"Corpus: {len(corpus):,} strings ({len(set(corpus)):,} distinct)")
+
+    legacy_s, expected = _timed(legacy_parse_ingredient, corpus)
+    with _no_memo() as parse:
+        compiled_s, compiled = _timed(parse, corpus)
+    _clear_memo()
+    cold_s, cold = _timed(_parse_ingredient, corpus)
+    warm_s, warm = _timed(_parse_ingredient, corpus)
+
+    mismatches = sum(
+        a != b
+        for results in (compiled, cold, warm)
+        for a, b in zip(expected, results, strict=True)
+    )
+
+    print(f"{'parser':<10}{'total s':>10}{'µs/item':>10}{'speedup':>10}")
+    for name, seconds in (
+        ("legacy", legacy_s),
+        ("compiled", compiled_s),
+        ("cold", cold_s),
+        ("warm", warm_s),
+    ):
+        print(
+            f"{name:<10}{seconds:>10.3f}{seconds / len(corpus) * 1e6:>10.2f}"
+            f"{legacy_s / seconds:>9.1f}x"
+        )
+    print(f"Cache: {_parse_ingredient.cache_info()}")
+    print(f"Mismatches vs legacy: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark of Tool.invoke overhead for the deterministic tools.
+
+Times each tool through Tool.invoke (argument schema validation, callback
+manager setup, run tracing) against a direct call of the pure function it
+wraps, then the calculation node as it was (two Tool.invoke calls) against
+the current node (direct calls).
+
+Results are checked to be identical.
+
+Run: python tests/evaluation/bench_tool_overhead.py [--n 20000]
+"""
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.nutrition_agent.models import NutritionalTargets, UserProfile  # noqa: E402
+from src.nutrition_agent.nodes.calculation.calculation import (  # noqa: E402
+    calculation,
+)
+from src.nutrition_agent.nodes.calculation.tools import (  # noqa: E402
+    calculate_meal_distribution,
+    calculate_nutritional_plan,
+    generate_nutritional_plan,
+    get_meal_distribution,
+)
+from src.nutrition_agent.nodes.validation.tools import (  # noqa: E402
+    consolidate_raw_ingredients,
+    consolidate_shopping_list,
+)
+
+PROFILE = {
+    "age": 34,
+    "gender": "female",
+    "weight": 62,
+    "height": 165,
+    "activity_level": "moderately_active",
+    "objective": "fat_loss",
+    "diet_type": "normal",
+    "excluded_foods": [],
+    "number_of_meals": 4,
+}
+PLAN_ARGS = {
+    field: PROFILE[field]
+    for field in (
+        "age",
+        "gender",
+        "weight",
+        "height",
+        "activity_level",
+        "objective",
+        "diet_type",
+    )
+}
+DIST_ARGS = {"total_calories": 1850.0, "number_of_meals": 4}
+RAW_INGREDIENTS = [
+    "200g Pechuga de pollo",
+    "Huevo 2 unidades",
+    "100g Huevo",
+    "250ml Leche",
+    "1/2 taza de avena (40g)",
+    "10ml Aceite de oliva",
+    "Sal",
+]
+
+
+def legacy_calculation(state: dict[str, Any]) -> dict[str, Any]:
+    """The calculation node before the direct-call path (Tool.invoke)."""
+    profile = UserProfile(**state["user_profile"])
+    plan_result = generate_nutritional_plan.invoke(
+        {
+            "age": profile.age,
+            "gender": profile.gender,
+            "weight": profile.weight,
+            "height": profile.height,
+            "activity_level": profile.activity_level,
+            "objective": profile.objective,
+            "diet_type": profile.diet_type,
+        }
+    )
+    if "error" in plan_result:
+        raise ValueError(plan_result["error"])
+    nutritional_targets = NutritionalTargets(
+        **{k: v for k, v in plan_result.items() if k not in ("diet_type", "objective")}
+    )
+    meal_distribution = get_meal_distribution.invoke(
+        {
+            "total_calories": plan_result["target_calories"],
+            "number_of_meals": profile.number_of_meals,
+        }
+    )
+    return {
+        "nutritional_targets": nutritional_targets,
+        "meal_distribution": meal_distribution,
+    }
+
+
+def _timed(fn: Callable[[], Any], n: int) -> tuple[float, Any]:
+    result = fn()  # warm-up (imports, schema caches)
+    start = time.perf_counter()
+    for _ in range(n):
+        result = fn()
+    return (time.perf_counter() - start) / n * 1e6, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=20000, help="calls per case")
+    args = parser.parse_args()
+    state = {"user_profile": PROFILE}
+
+    cases: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        (
+            "generate_nutritional_plan",
+            lambda: generate_nutritional_plan.invoke(PLAN_ARGS),
+            lambda: calculate_nutritional_plan(**PLAN_ARGS).model_dump(),
+        ),
+        (
+            "get_meal_distribution",
+            lambda: get_meal_distribution.invoke(DIST_ARGS),
+            lambda: calculate_meal_distribution(**DIST_ARGS),
+        ),
+        (
+            "consolidate_shopping_list",
+            lambda: consolidate_shopping_list.invoke(
+                {"ingredients_raw": RAW_INGREDIENTS}
+            ),
+            lambda: consolidate_raw_ingredients(RAW_INGREDIENTS),
+        ),
+        (
+            "calculation node",
+            lambda: legacy_calculation(state),
+            lambda: calculation(state),
+        ),
+    ]
+
+    print(f"{args.n:,} calls per case")
+    print(f"{'case':<28}{'invoke µs':>11}{'direct µs':>11}{'saved µs':>10}")
+    mismatches = 0
+    for name, via_tool, direct in cases:
+        tool_us, tool_result = _timed(via_tool, args.n)
+        direct_us, direct_result = _timed(direct, args.n)
+        mismatches += tool_result != direct_result
+        print(
+            f"{name:<28}{tool_us:>11.1f}{direct_us:>11.1f}{tool_us - direct_us:>10.1f}"
+        )
+    print(f"Mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Fake LLMs for node tests (no network).
+
+FakeLLM mimics the structured-output runnable used by the nodes:
+get_structured_llm(Schema, model).ainvoke(prompt) (and the equivalent
+get_llm(model).with_structured_output(Schema)).
+Each scripted response is returned in order; a response may be a delay
+(seconds to sleep before answering), an exception to raise, or a value.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.nutrition_agent.models import (
+    Ingredient,
+    Meal,
+    NutritionalTargets,
+    UserProfile,
+)
+from src.shared.enums import ActivityLevel, MealSlot, MealTime, Objective
+
+
+@dataclass
+class Scripted:
+    """One scripted LLM response."""
+
+    value: Any = None
+    delay: float = 0.0
+    error: Exception | None = None
+
+
+@dataclass
+class FakeLLM:
+    """Scripted stand-in for a chat model with structured output."""
+
+    responses: list[Scripted] = field(default_factory=list)
+    prompts: list[Any] = field(default_factory=list)
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> FakeLLM:
+        return self
+
+    async def ainvoke(self, prompt: Any, *args: Any, **kwargs: Any) -> Any:
+        self.prompts.append(prompt)
+        response = self.responses.pop(0)
+        if response.delay:
+            await asyncio.sleep(response.delay)
+        if response.error is not None:
+            raise response.error
+        return response.value
+
+
+def make_meal(
+    meal_time: MealTime = MealTime.DESAYUNO,
+    kcal: float = 600.0,
+    title: str = "Comida de prueba",
+    slot: MealSlot | None = None,
+) -> Meal:
+    """Meal whose single ingredient matches total_calories."""
+    return Meal(
+        meal_time=slot.meal_time if slot is not None else meal_time,
+        slot=slot,
+        title=title,
+        description="Descripcion de prueba para tests de nodos",
+        total_calories=kcal,
+        ingredients=[
+            Ingredient(
+                nombre="Ingrediente",
+                cantidad_display="100g",
+                peso_gramos=100.0,
+                kcal=kcal,
+            )
+        ],
+        preparation=["Paso 1"],
+    )
+
+
+def make_profile() -> UserProfile:
+    """Complete profile for a 3-meal maintenance plan."""
+    return UserProfile(
+        age=30,
+        gender="male",
+        weight=80,
+        height=180,
+        activity_level=ActivityLevel.MODERATELY_ACTIVE,
+        objective=Objective.MAINTENANCE,
+        number_of_meals=3,
+    )
+
+
+def make_targets(target_calories: float = 2000.0) -> NutritionalTargets:
+    """Targets matching make_profile() with a 30/40/30 macro split."""
+    return NutritionalTargets(
+        bmr=1500.0,
+        tdee=2325.0,
+        target_calories=target_calories,
+        protein_grams=round(target_calories * 0.30 / 4, 1),
+        protein_percentage=30.0,
+        carbs_grams=round(target_calories * 0.40 / 4, 1),
+        carbs_percentage=40.0,
+        fat_grams=round(target_calories * 0.30 / 9, 1),
+        fat_percentage=30.0,
+    )
@@ -0,0 +1,214 @@
+"""Unit tests for online kcal bias calibration.
+
+Covers:
+- Running bias estimate per (model, slot) and the warm-up period
+- Stated target correction and its clamp
+- Generation states the calibrated target but accepts on the real one
+- The last meal states the real remaining budget and is not recorded
+- Feedback regeneration (recipe_generation_single) shares the loop
+- First-attempt pass rate metric
+"""
+
+import asyncio
+import importlib
+
+import pytest
+
+from src.nutrition_agent.calibration import KcalCalibrator
+from src.nutrition_agent.model_routing import ModelRoutingPolicy
+from src.shared.metrics import metrics
+from tests.nodes.fakes import (
+    FakeLLM,
+    Scripted,
+    make_meal,
+    make_profile,
+    make_targets,
+)
+
+batch_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_batch"
+)
+single_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_single"
+)
+generation_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.generation"
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+def _warm(calibrator: KcalCalibrator, ratio: float, samples: int = 3) -> None:
+    for _ in range(samples):
+        calibrator.record("gpt-4o", "Cena", 600.0, 600.0 * ratio)
+
+
+class TestCalibrator:
+    def test_no_adjustment_before_min_samples(self) -> None:
+        calibrator = KcalCalibrator()
+        _warm(calibrator, 1.1, samples=2)
+        assert calibrator.bias("gpt-4o", "Cena") == 1.0
+        assert calibrator.stated_target("gpt-4o", "Cena", 600.0) == 600.0
+
+    def test_overshooting_slot_states_lower_target(self) -> None:
+        calibrator = KcalCalibrator()
+        _warm(calibrator, 1.1)
+        assert calibrator.bias("gpt-4o", "Cena") == pytest.approx(1.1)
+        assert calibrator.stated_target("gpt-4o", "Cena", 600.0) == pytest.approx(
+            600.0 / 1.1
+        )
+        # Other models and slots keep their own estimate
+        assert calibrator.stated_target("gpt-4o-mini", "Cena", 600.0) == 600.0
+        assert calibrator.stated_target("gpt-4o", "Comida", 600.0) == 600.0
+
+    def test_ewma_update(self) -> None:
+        calibrator = KcalCalibrator(alpha=0.5)
+        _warm(calibrator, 1.0)
+        calibrator.record("gpt-4o", "Cena", 600.0, 720.0)
+        assert calibrator.bias("gpt-4o", "Cena") == pytest.approx(1.1)
+
+    def test_adjustment_clamped(self) -> None:
+        calibrator = KcalCalibrator()
+        _warm(calibrator, 0.5)
+        assert calibrator.stated_target("gpt-4o", "Cena", 600.0) == pytest.approx(690.0)
+
+    def test_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("NUTRITION_KCAL_CALIBRATION", "off")
+        calibrator = KcalCalibrator.from_env()
+        _warm(calibrator, 1.1)
+        assert calibrator.stated_target("gpt-4o", "Cena", 600.0) == 600.0
+
+    def test_bias_gauge(self) -> None:
+        calibrator = KcalCalibrator()
+        _warm(calibrator, 1.1, samples=1)
+        snapshot = metrics.snapshot()["gauges"]["kcal_calibration_bias"]
+        assert snapshot == [
+            {"labels": {"model": "gpt-4o", "slot": "Cena"}, "value": pytest.approx(1.1)}
+        ]
+
+    def test_invalid_alpha(self) -> None:
+        with pytest.raises(ValueError):
+            KcalCalibrator(alpha=0.0)
+
+
+class TestGeneration:
+    """The prompt states the calibrated target; acceptance uses the real one."""
+
+    def _patch(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        fake: FakeLLM,
+        calibrator: KcalCalibrator,
+    ) -> None:
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", lambda *a, **k: fake
+        )
+        monkeypatch.setattr(
+            generation_module, "get_model_routing_policy", ModelRoutingPolicy
+        )
+        monkeypatch.setattr(
+            generation_module, "get_kcal_calibrator", lambda: calibrator
+        )
+
+    def _generate(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        fake: FakeLLM,
+        calibrator: KcalCalibrator,
+        is_last_meal: bool = False,
+        consumed_kcal: float | None = None,
+    ) -> tuple:
+        self._patch(monkeypatch, fake, calibrator)
+        return asyncio.run(
+            batch_module._generate_single_meal_with_validation(
+                meal_time="Cena",
+                target_calories=600.0,
+                user_profile=make_profile(),
+                nutritional_targets=make_targets(),
+                total_meals=3,
+                current_meal_number=3,
+                is_last_meal=is_last_meal,
+                consumed_kcal=consumed_kcal,
+            )
+        )
+
+    def test_calibrated_prompt(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calibrator = KcalCalibrator()
+        _warm(calibrator, 1.1)
+        fake = FakeLLM([Scripted(make_meal(kcal=610.0))])
+
+        meal, error = self._generate(monkeypatch, fake, calibrator)
+
+        assert error is None and meal is not None
+        assert "(545.5 kcal)" in fake.prompts[0]
+        assert (
+            metrics.counter_value(
+                "meal_first_attempt_total", model="gpt-4o", slot="Cena", outcome="pass"
+            )
+            == 1
+        )
+
+    def test_feedback_regeneration_shares_calibration(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calibrator = KcalCalibrator()
+        _warm(calibrator, 1.1)
+        fake = FakeLLM([Scripted(make_meal(kcal=610.0))])
+        self._patch(monkeypatch, fake, calibrator)
+
+        meal, error = asyncio.run(
+            single_module._generate_single_meal_with_feedback(
+                meal_time="Cena",
+                target_calories=600.0,
+                user_profile=make_profile(),
+                nutritional_targets=make_targets(),
+                total_meals=3,
+                current_meal_number=3,
+                user_feedback="Sin pescado",
+            )
+        )
+
+        assert error is None and meal is not None
+        assert "(545.5 kcal)" in fake.prompts[0]
+        assert "Sin pescado" in fake.prompts[0]
+
+    def test_last_meal_not_calibrated(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calibrator = KcalCalibrator()
+        _warm(calibrator, 1.1)
+        bias = calibrator.bias("gpt-4o", "Cena")
+        fake = FakeLLM([Scripted(make_meal(kcal=610.0))])
+
+        self._generate(
+            monkeypatch, fake, calibrator, is_last_meal=True, consumed_kcal=1400.0
+        )
+
+        # One target in the whole prompt: the real remaining budget
+        prompt = fake.prompts[0]
+        assert "THIS meal: 600.0 kcal" in prompt
+        assert "EXACTLY 600.0 kcal" in prompt
+        assert "545.5" not in prompt
+        assert calibrator.bias("gpt-4o", "Cena") == bias
+
+    def test_first_attempt_failure_counted_once(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        calibrator = KcalCalibrator()
+        fake = FakeLLM(
+            [Scripted(make_meal(kcal=800.0)), Scripted(make_meal(kcal=600.0))]
+        )
+
+        meal, error = self._generate(monkeypatch, fake, calibrator)
+
+        assert error is None
+        labels = {"model": "gpt-4o", "slot": "Cena"}
+        assert (
+            metrics.counter_value("meal_first_attempt_total", outcome="fail", **labels)
+            == 1
+        )
+        assert (
+            metrics.counter_value("meal_first_attempt_total", outcome="pass", **labels)
+            == 0
+        )
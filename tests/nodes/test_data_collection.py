@@ -0,0 +1,213 @@
+"""Unit tests for incremental profile extraction in data_collection.
+
+Covers:
+- Fields found in a turn are kept; missing_fields lists only the rest
+- Later turns send only the new messages plus the partial profile
+- A failed extraction keeps the partial profile and retries the messages
+- Turns without a new user message do not call the LLM
+- A valid form submission completes the profile without the LLM
+"""
+
+import asyncio
+import importlib
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from src.nutrition_agent.model_routing import ModelRoutingPolicy
+from src.nutrition_agent.models import PartialUserProfile, UserProfile
+from src.shared.enums import ActivityLevel, Objective
+from src.shared.metrics import metrics
+from tests.nodes.fakes import FakeLLM, Scripted
+
+dc_module = importlib.import_module(
+    "src.nutrition_agent.nodes.data_collection.data_collection"
+)
+
+
+@pytest.fixture
+def patch_llm(monkeypatch: pytest.MonkeyPatch) -> Any:
+    def _patch(*responses: Scripted) -> FakeLLM:
+        fake = FakeLLM(list(responses))
+        monkeypatch.setattr(
+            dc_module, "get_structured_llm", lambda schema, model="", **kw: fake
+        )
+        monkeypatch.setattr(dc_module, "get_model_routing_policy", ModelRoutingPolicy)
+        return fake
+
+    return _patch
+
+
+def _run(state: dict[str, Any]) -> dict[str, Any]:
+    return asyncio.run(dc_module.data_collection(state))
+
+
+FIRST_TURN = [HumanMessage(content="Hola, tengo 30 años y peso 70 kg")]
+FIRST_UPDATE = PartialUserProfile(age=30, weight=70)
+
+
+class TestIncrementalExtraction:
+    def test_partial_fields_are_kept(self, patch_llm: Any) -> None:
+        patch_llm(Scripted(FIRST_UPDATE))
+
+        result = _run({"messages": FIRST_TURN})
+
+        assert result["user_profile"] is None
+        assert result["partial_profile"] == FIRST_UPDATE
+        assert result["missing_fields"] == [
+            "gender",
+            "height",
+            "activity_level",
+            "objective",
+        ]
+        assert result["profile_messages_seen"] == 1
+
+    def test_second_turn_sends_only_new_messages(self, patch_llm: Any) -> None:
+        fake = patch_llm(
+            Scripted(
+                PartialUserProfile(
+                    gender="male",
+                    height=178,
+                    activity_level=ActivityLevel.SEDENTARY,
+                    objective=Objective.FAT_LOSS,
+                )
+            )
+        )
+        question = AIMessage(content="¿Cuánto mides y cuál es tu objetivo?")
+        answer = HumanMessage(content="Hombre, 178 cm, sedentario, perder grasa")
+
+        result = _run(
+            {
+                "messages": [*FIRST_TURN, question, answer],
+                "partial_profile": FIRST_UPDATE.model_dump(),
+                "profile_messages_seen": 1,
+            }
+        )
+
+        system, *sent = fake.prompts[0]
+        assert isinstance(system, SystemMessage)
+        assert '"age":30' in system.content
+        assert sent == [question, answer]
+        assert result["missing_fields"] == []
+        assert result["user_profile"] == UserProfile(
+            age=30,
+            gender="male",
+            weight=70,
+            height=178,
+            activity_level=ActivityLevel.SEDENTARY,
+            objective=Objective.FAT_LOSS,
+        )
+        assert "run_deadline" in result
+
+    def test_failed_extraction_keeps_partial(self, patch_llm: Any) -> None:
+        patch_llm(Scripted(error=ValueError("bad output")))
+        messages = [*FIRST_TURN, HumanMessage(content="Mido 1,78")]
+
+        result = _run(
+            {
+                "messages": messages,
+                "partial_profile": FIRST_UPDATE,
+                "profile_messages_seen": 1,
+            }
+        )
+
+        assert result["user_profile"] is None
+        assert "age" not in result["missing_fields"]
+        assert "profile_messages_seen" not in result
+
+    def test_no_new_user_message_skips_llm(self, patch_llm: Any) -> None:
+        fake = patch_llm()
+        messages = [*FIRST_TURN, AIMessage(content="¿Y tu altura?")]
+
+        result = _run(
+            {
+                "messages": messages,
+                "partial_profile": FIRST_UPDATE,
+                "profile_messages_seen": 1,
+            }
+        )
+
+        assert fake.prompts == []
+        assert result["missing_fields"] == FIRST_UPDATE.missing_fields()
+        assert result["profile_messages_seen"] == 2
+
+
+FORM = {
+    "age": 41,
+    "gender": "female",
+    "weight": 64,
+    "height": 168,
+    "activity_level": "lightly_active",
+    "objective": "maintenance",
+    "diet_type": "normal",
+    "excluded_foods": ["gluten"],
+    "number_of_meals": 4,
+}
+
+
+class TestFormSubmission:
+    @pytest.fixture(autouse=True)
+    def _reset_metrics(self) -> None:
+        metrics.reset()
+
+    def test_valid_submission_skips_llm(self, patch_llm: Any) -> None:
+        fake = patch_llm()
+
+        result = _run({"messages": FIRST_TURN, "profile_submission": FORM})
+
+        assert fake.prompts == []
+        assert result["user_profile"] == UserProfile(**FORM)
+        assert result["missing_fields"] == []
+        assert result["profile_submission"] is None
+        assert result["profile_messages_seen"] == 1
+        assert "run_deadline" in result
+        assert (
+            metrics.counter_value("profile_submissions_total", outcome="accepted")
+            == 1.0
+        )
+
+    def test_submission_replaces_complete_profile(self, patch_llm: Any) -> None:
+        patch_llm()
+        old = UserProfile(**{**FORM, "weight": 70})
+
+        result = _run({"messages": [], "user_profile": old, "profile_submission": FORM})
+
+        assert result["user_profile"].weight == 64
+
+    def test_invalid_submission_reports_fields(self, patch_llm: Any) -> None:
+        fake = patch_llm()
+        form = {**FORM, "age": 12, "number_of_meals": 9}
+        del form["height"]
+
+        result = _run({"messages": [], "profile_submission": form})
+
+        assert fake.prompts == []
+        assert result["user_profile"] is None
+        assert result["missing_fields"] == ["age", "height", "number_of_meals"]
+        assert result["partial_profile"].weight == 64
+        assert (
+            metrics.counter_value("profile_submissions_total", outcome="invalid") == 1.0
+        )
+
+
+class TestPartialUserProfile:
+    def test_merge_overrides_set_fields_only(self) -> None:
+        merged = FIRST_UPDATE.merge(PartialUserProfile(weight=72, height=180))
+
+        assert (merged.age, merged.weight, merged.height) == (30, 72, 180)
+
+    def test_to_profile_applies_defaults(self) -> None:
+        partial = FIRST_UPDATE.merge(
+            PartialUserProfile(
+                gender="female",
+                height=165,
+                activity_level=ActivityLevel.VERY_ACTIVE,
+                objective=Objective.MAINTENANCE,
+            )
+        )
+
+        profile = partial.to_profile()
+
+        assert profile.number_of_meals == 3
+        assert profile.excluded_foods == []
@@ -0,0 +1,182 @@
+"""Unit tests for the per-run deadline and graceful degradation.
+
+Covers:
+- Generation helpers cancel outstanding attempts and return best candidate
+- A provider timeout is retried, not mistaken for the run deadline
+- route_after_validation goes straight to HITL when the deadline is near
+- validation attaches degradation meal_notices
+"""
+
+import asyncio
+import importlib
+import time
+
+import pytest
+
+from src.nutrition_agent.deadline import (
+    DEADLINE_MARGIN_SECONDS,
+    deadline_exceeded,
+    resolve_deadline,
+    start_run_deadline,
+)
+from src.nutrition_agent.graph import route_after_validation
+from src.nutrition_agent.nodes.validation.validation import (
+    DEGRADED_MISSING_MEAL_MSG,
+    DEGRADED_NOTICE_PREFIX,
+    validation,
+)
+from src.shared.enums import MealTime
+from src.shared.hedging import ProviderTimeoutError
+from tests.nodes.fakes import (
+    FakeLLM,
+    Scripted,
+    make_meal,
+    make_profile,
+    make_targets,
+)
+
+batch_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_batch"
+)
+generation_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.generation"
+)
+
+
+def _generate(fake: FakeLLM, deadline: float | None) -> tuple:
+    return asyncio.run(
+        batch_module._generate_single_meal_with_validation(
+            meal_time="Desayuno",
+            target_calories=600.0,
+            user_profile=make_profile(),
+            nutritional_targets=make_targets(),
+            total_meals=3,
+            current_meal_number=1,
+            is_last_meal=False,
+            deadline=deadline,
+        )
+    )
+
+
+class TestDeadlineHelpers:
+    def test_config_overrides_state(self) -> None:
+        state = {"run_deadline": 100.0}
+        assert resolve_deadline(state) == 100.0
+        config = {"configurable": {"run_deadline": 200.0}}
+        assert resolve_deadline(state, config) == 200.0
+        assert resolve_deadline({}) is None
+
+    def test_run_budget_override(self) -> None:
+        deadline = start_run_deadline({"configurable": {"run_budget_s": 30}})
+        assert 29 <= deadline - time.time() <= 30
+
+    def test_exceeded(self) -> None:
+        assert deadline_exceeded(None) is False
+        assert deadline_exceeded(time.time() + DEADLINE_MARGIN_SECONDS - 1)
+        assert not deadline_exceeded(time.time() + 60)
+
+
+class TestGenerationHelperDeadline:
+    """Retries stop at the deadline and the best candidate is returned."""
+
+    def test_slow_attempt_cancelled_without_candidate(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = FakeLLM([Scripted(make_meal(kcal=600.0), delay=5.0)])
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", lambda *a, **k: fake
+        )
+
+        start = time.time()
+        meal, error = _generate(fake, time.time() + DEADLINE_MARGIN_SECONDS + 0.2)
+
+        assert time.time() - start < 2.0
+        assert meal is None
+        assert error is not None and "Deadline reached" in error
+
+    def test_returns_best_candidate(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = FakeLLM(
+            [
+                Scripted(make_meal(kcal=700.0)),  # 16.7% off: kept as best
+                Scripted(make_meal(kcal=600.0), delay=5.0),  # cancelled
+            ]
+        )
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", lambda *a, **k: fake
+        )
+
+        meal, error = _generate(fake, time.time() + DEADLINE_MARGIN_SECONDS + 0.3)
+
+        assert meal is not None and meal.total_calories == 700.0
+        assert error is not None and "Deadline reached after 2 attempts" in error
+
+    def test_no_deadline_keeps_full_retry_loop(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = FakeLLM([Scripted(make_meal(kcal=700.0)) for _ in range(3)])
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", lambda *a, **k: fake
+        )
+
+        meal, error = _generate(fake, None)
+
+        assert meal is not None
+        assert error is not None and "Failed after 3 attempts" in error
+
+    def test_provider_timeout_is_retried(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = FakeLLM(
+            [
+                Scripted(error=ProviderTimeoutError("primary timed out")),
+                Scripted(make_meal(kcal=600.0)),
+            ]
+        )
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", lambda *a, **k: fake
+        )
+
+        meal, error = _generate(fake, time.time() + 60)
+
+        assert meal is not None and error is None
+        assert len(fake.prompts) == 2
+
+
+class TestRouteAfterValidationDeadline:
+    def test_deadline_near_goes_to_review(self) -> None:
+        state = {
+            "validation_errors": ["Meal 'X' (Cena): off budget"],
+            "validation_retry_count": 0,
+            "selected_meal_to_change": "Cena",
+            "run_deadline": time.time(),
+        }
+        assert route_after_validation(state) == "meal_review_batch"
+
+    def test_time_left_keeps_auto_fix(self) -> None:
+        state = {
+            "validation_errors": ["Meal 'X' (Cena): off budget"],
+            "validation_retry_count": 0,
+            "selected_meal_to_change": "Cena",
+            "run_deadline": time.time() + 60,
+        }
+        assert route_after_validation(state) == "recipe_generation_single"
+
+
+class TestValidationDegradationNotices:
+    def test_failed_and_missing_meals_flagged(self) -> None:
+        state = {
+            "daily_meals": [
+                make_meal(MealTime.DESAYUNO, 600.0),
+                make_meal(MealTime.COMIDA, 500.0),  # 37.5% under budget
+            ],
+            "nutritional_targets": make_targets(),
+            "user_profile": make_profile(),
+            "meal_distribution": {"Desayuno": 600.0, "Comida": 800.0, "Cena": 600.0},
+            "run_deadline": time.time(),
+        }
+
+        result = validation(state)
+
+        notices = result["meal_notices"]
+        assert notices["Comida"].message.startswith(DEGRADED_NOTICE_PREFIX)
+        assert notices["Cena"].message == DEGRADED_MISSING_MEAL_MSG
+        assert notices["Cena"].deviation_pct == 100.0
+        assert "Desayuno" not in notices
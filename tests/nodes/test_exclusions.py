@@ -0,0 +1,158 @@
+"""Unit tests for excluded-food enforcement.
+
+Covers:
+- Matching: accents, plurals, synonym groups, plant-based qualifiers
+- Negations ("sin gluten") and allowlisted compounds ("pasta de arroz")
+- One compiled matcher per exclusion list
+- Generation retries a violating meal immediately
+"""
+
+import asyncio
+import importlib
+
+import pytest
+
+from src.nutrition_agent.exclusions import ExclusionMatcher, get_exclusion_matcher
+from src.nutrition_agent.model_routing import ModelRoutingPolicy
+from src.nutrition_agent.models import Ingredient
+from src.shared.metrics import metrics
+from tests.nodes.fakes import (
+    FakeLLM,
+    Scripted,
+    make_meal,
+    make_profile,
+    make_targets,
+)
+
+batch_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_batch"
+)
+generation_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.generation"
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+def _meal_with(nombre: str, kcal: float = 600.0):
+    return make_meal(kcal=kcal).model_copy(
+        update={
+            "ingredients": [
+                Ingredient(
+                    nombre=nombre,
+                    cantidad_display="100g",
+                    peso_gramos=100.0,
+                    kcal=kcal,
+                )
+            ]
+        }
+    )
+
+
+class TestMatcher:
+    @pytest.mark.parametrize(
+        ("nombre", "expected"),
+        [
+            ("Leche entera", "Lácteos"),
+            ("Yogures griegos", "Lácteos"),
+            ("Queso fresco batido", "Lácteos"),
+            ("Leche de avena", None),
+            ("Bebida de soja", None),
+            ("Almendras laminadas", "frutos secos"),
+            ("Mantequilla de cacahuete", "frutos secos"),
+            ("Pechuga de pollo", None),
+        ],
+    )
+    def test_synonym_groups(self, nombre: str, expected: str | None) -> None:
+        matcher = ExclusionMatcher(["Lácteos", "frutos secos"])
+        assert matcher.find(nombre) == expected
+
+    def test_plain_food_singular_and_plural(self) -> None:
+        matcher = ExclusionMatcher(["champiñones"])
+        assert matcher.find("Champiñón laminado") == "champiñones"
+        assert matcher.find("Champinones") == "champiñones"
+
+    def test_whole_words_only(self) -> None:
+        matcher = ExclusionMatcher(["gluten"])
+        assert matcher.find("Pan integral") == "gluten"
+        assert matcher.find("Panceta") is None
+
+    @pytest.mark.parametrize(
+        ("nombre", "exclusions", "expected"),
+        [
+            ("Pan sin gluten", ["gluten"], None),
+            ("Pasta sin gluten", ["gluten"], None),
+            ("Pan sin gluten", ["pan"], "pan"),
+            ("Leche sin lactosa", ["lactosa"], None),
+            ("Leche sin lactosa", ["Lácteos"], "Lácteos"),
+            ("Yogur libre de lactosa", ["lactosa"], None),
+            ("Ensalada sin queso con leche", ["Lácteos"], "Lácteos"),
+            ("Ensalada sin queso", ["Lácteos"], None),
+        ],
+    )
+    def test_negation(
+        self, nombre: str, exclusions: list[str], expected: str | None
+    ) -> None:
+        assert ExclusionMatcher(exclusions).find(nombre) == expected
+
+    @pytest.mark.parametrize(
+        ("nombre", "exclusions", "expected"),
+        [
+            ("Pasta de arroz", ["gluten"], None),
+            ("Pasta de trigo", ["gluten"], "gluten"),
+            ("Macarrones de lentejas", ["gluten"], None),
+            ("Harina de trigo sarraceno", ["gluten"], None),
+            ("Jamón de pavo", ["cerdo"], None),
+            ("Jamón de pavo", ["jamón"], None),
+            ("Jamón serrano", ["cerdo"], "cerdo"),
+        ],
+    )
+    def test_compound_allowlist(
+        self, nombre: str, exclusions: list[str], expected: str | None
+    ) -> None:
+        assert ExclusionMatcher(exclusions).find(nombre) == expected
+
+    def test_no_exclusions(self) -> None:
+        matcher = ExclusionMatcher([])
+        assert not matcher
+        assert matcher.violations(_meal_with("Queso")) == []
+
+    def test_compiled_once_per_list(self) -> None:
+        assert get_exclusion_matcher(["gluten"]) is get_exclusion_matcher(["gluten"])
+
+
+class TestGeneration:
+    def test_violation_retried_immediately(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = FakeLLM(
+            [Scripted(_meal_with("Queso curado")), Scripted(_meal_with("Pollo"))]
+        )
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", lambda *a, **k: fake
+        )
+        monkeypatch.setattr(
+            generation_module, "get_model_routing_policy", ModelRoutingPolicy
+        )
+        profile = make_profile().model_copy(update={"excluded_foods": ["lácteos"]})
+
+        meal, error = asyncio.run(
+            batch_module._generate_single_meal_with_validation(
+                meal_time="Comida",
+                target_calories=600.0,
+                user_profile=profile,
+                nutritional_targets=make_targets(),
+                total_meals=3,
+                current_meal_number=2,
+                is_last_meal=False,
+            )
+        )
+
+        assert error is None
+        assert meal.ingredients[0].nombre == "Pollo"
+        assert len(fake.prompts) == 2
+        assert "Queso curado (lácteos)" in fake.prompts[1]
+        assert metrics.counter_value("exclusion_checks_total", outcome="violation") == 1
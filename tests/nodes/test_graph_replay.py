@@ -0,0 +1,211 @@
+"""Graph-level replay of a recorded cassette (no network).
+
+The fixture in tests/cassettes/graph_replay holds the LLM responses of one
+run of make_graph(): a chat message with the full profile goes through
+data_collection, calculation, recipe_generation_batch and validation, and
+stops at the meal_review_batch interrupt.
+
+Covers:
+- The recorded run replays end to end through the compiled graph
+- Replaying twice gives the same plan
+- A request without a recording raises instead of reaching the network
+
+Re-record the fixture (offline, scripted responses) with:
+    python -m tests.nodes.test_graph_replay
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_openai import ChatOpenAI
+from langgraph.cache.memory import InMemoryCache
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.nutrition_agent import calibration, model_routing, tolerance
+from src.nutrition_agent.graph import make_graph
+from src.nutrition_agent.models import PartialUserProfile
+from src.shared.cassette import CassetteMissError
+from src.shared.llm import get_structured_llm
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / "cassettes" / "graph_replay"
+
+PROFILE_MESSAGE = (
+    "Tengo 30 años, soy hombre, peso 80 kg y mido 180 cm. "
+    "Hago ejercicio moderado, quiero mantener mi peso y hacer 3 comidas al día."
+)
+
+# Values the fixture was recorded with: they are part of every request hash
+FIXTURE_ENV = {
+    "NUTRITION_CASSETTE_DIR": str(FIXTURE_DIR),
+    "HELICONE_API_KEY": "graph-replay",
+    "LLM_FALLBACK_MODEL": "",
+}
+UNSET_ENV = (
+    "NUTRITION_CASSETTE_LATENCY",
+    "NUTRITION_KCAL_CALIBRATION",
+    "NUTRITION_KCAL_CALIBRATION_ALPHA",
+    "NUTRITION_MODEL_ROUTES",
+    "NUTRITION_ESCALATION_MODEL",
+    "NUTRITION_TOLERANCE_RULES",
+    "NUTRITION_SPECULATIVE_ALTERNATIVES",
+)
+
+RECORDED_PROFILE = PartialUserProfile(
+    age=30,
+    gender="male",
+    weight=80,
+    height=180,
+    activity_level="moderately_active",
+    objective="maintenance",
+    number_of_meals=3,
+)
+
+
+def _fresh_singletons(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Calibration, routing and tolerance shape the prompts: start from defaults
+    monkeypatch.setattr(calibration, "_calibrator", None)
+    monkeypatch.setattr(model_routing, "_policy", None)
+    monkeypatch.setattr(tolerance, "_policy", None)
+
+
+def _use_cassette(monkeypatch: pytest.MonkeyPatch, mode: str) -> None:
+    monkeypatch.setenv("NUTRITION_CASSETTE_MODE", mode)
+    for name, value in FIXTURE_ENV.items():
+        monkeypatch.setenv(name, value)
+    for name in UNSET_ENV:
+        monkeypatch.delenv(name, raising=False)
+    _fresh_singletons(monkeypatch)
+
+
+async def _run_until_review(thread_id: str = "replay-1") -> dict[str, Any]:
+    graph = make_graph(MemorySaver(), cache=InMemoryCache())
+    config = {"configurable": {"thread_id": thread_id}}
+    return await graph.ainvoke(
+        {"messages": [HumanMessage(content=PROFILE_MESSAGE)]}, config
+    )
+
+
+def _plan(result: dict[str, Any]) -> list[tuple[str, float]]:
+    return [(meal.title, meal.total_calories) for meal in result["daily_meals"]]
+
+
+class TestGraphReplay:
+    def test_recorded_run_reaches_review(self, monkeypatch: pytest.MonkeyPatch):
+        _use_cassette(monkeypatch, "replay")
+
+        result = asyncio.run(_run_until_review())
+
+        assert result["user_profile"].age == 30
+        assert result["validation_errors"] == []
+        assert [meal.meal_time.value for meal in result["daily_meals"]] == [
+            "Desayuno",
+            "Comida",
+            "Cena",
+        ]
+        total = sum(meal.total_calories for meal in result["daily_meals"])
+        assert total == pytest.approx(
+            result["nutritional_targets"].target_calories, rel=0.02
+        )
+        (review,) = result["__interrupt__"]
+        assert review.value["type"] == "meal_plan_review"
+
+    def test_replay_is_deterministic(self, monkeypatch: pytest.MonkeyPatch):
+        _use_cassette(monkeypatch, "replay")
+        first = asyncio.run(_run_until_review("replay-1"))
+        _fresh_singletons(monkeypatch)
+        second = asyncio.run(_run_until_review("replay-2"))
+
+        assert _plan(first) == _plan(second)
+
+    def test_unrecorded_request_raises(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        _use_cassette(monkeypatch, "replay")
+        monkeypatch.setenv("NUTRITION_CASSETTE_DIR", str(tmp_path))
+
+        with pytest.raises(CassetteMissError):
+            get_structured_llm(PartialUserProfile, "gpt-4o-mini").invoke(
+                PROFILE_MESSAGE
+            )
+
+
+# --- Recording (offline) -----------------------------------------------------
+
+
+def _scripted_message(prompt: str) -> AIMessage:
+    """Response a well-behaved model would give to a graph prompt."""
+    meal_time = re.search(r"- Meal Time: (.+)", prompt)
+    if meal_time is None:
+        # data_collection: the profile stated in PROFILE_MESSAGE
+        parsed = RECORDED_PROFILE
+        return AIMessage(
+            content=parsed.model_dump_json(exclude_none=True),
+            additional_kwargs={"parsed": parsed},
+        )
+    target = re.search(r"Target Calories for THIS meal: ([\d.]+) kcal", prompt)
+    assert target is not None
+    kcal = float(target.group(1))
+    main_kcal = round(kcal * 0.7, 1)
+    meal = {
+        "meal_time": meal_time.group(1).strip(),
+        "title": f"{meal_time.group(1).strip()} de pollo con arroz",
+        "description": "Pollo a la plancha con arroz integral y verduras",
+        "total_calories": round(kcal, 1),
+        "ingredients": [
+            {
+                "nombre": "Pechuga de pollo",
+                "cantidad_display": "150g",
+                "peso_gramos": 150.0,
+                "kcal": main_kcal,
+            },
+            {
+                "nombre": "Arroz integral",
+                "cantidad_display": "80g",
+                "peso_gramos": 80.0,
+                "kcal": round(kcal - main_kcal, 1),
+            },
+        ],
+        "preparation": ["Cocinar el arroz", "Hacer el pollo a la plancha"],
+    }
+    return AIMessage(content=json.dumps(meal, ensure_ascii=False))
+
+
+async def _scripted_agenerate(
+    self: ChatOpenAI,
+    messages: list[BaseMessage],
+    stop: list[str] | None = None,
+    run_manager: Any = None,
+    **kwargs: Any,
+) -> ChatResult:
+    prompt = "\n".join(str(message.content) for message in messages)
+    return ChatResult(generations=[ChatGeneration(message=_scripted_message(prompt))])
+
+
+def record_fixture() -> None:
+    """Re-record tests/cassettes/graph_replay with scripted responses."""
+    monkeypatch = pytest.MonkeyPatch()
+    try:
+        shutil.rmtree(FIXTURE_DIR, ignore_errors=True)
+        _use_cassette(monkeypatch, "record")
+        # Responses are scripted: the client is built but never called
+        monkeypatch.setenv("OPENAI_API_KEY", "scripted")
+        monkeypatch.setattr(ChatOpenAI, "_agenerate", _scripted_agenerate)
+        result = asyncio.run(_run_until_review())
+        print(f"Recorded {len(list(FIXTURE_DIR.glob('llm/*.json')))} responses:")
+        for title, kcal in _plan(result):
+            print(f"  {title}: {kcal} kcal")
+    finally:
+        monkeypatch.undo()
+
+
+if __name__ == "__main__":
+    record_fixture()
@@ -0,0 +1,142 @@
+"""Unit tests for incremental validation (validation_cache).
+
+Covers:
+- A second run over the same plan reuses every per-meal check
+- After one meal is replaced only that meal is recomputed
+- The incrementally updated shopping list equals a full consolidation
+- A changed budget invalidates the cached check
+- A changed tolerance policy invalidates the cached check
+"""
+
+from typing import Any
+
+import pytest
+
+from src.nutrition_agent import tolerance
+from src.nutrition_agent.models import Ingredient, Meal
+from src.nutrition_agent.nodes.validation.tools import consolidate_ingredients
+from src.nutrition_agent.nodes.validation.validation import validation
+from src.nutrition_agent.tolerance import (
+    DEFAULT_RULES,
+    TolerancePolicy,
+    ToleranceRule,
+)
+from src.shared.enums import MealSlot
+from src.shared.metrics import metrics
+from tests.nodes.fakes import make_meal, make_profile, make_targets
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+def _meal(slot: MealSlot, kcal: float, food: str) -> Meal:
+    ingredients = [
+        Ingredient(
+            nombre=food, cantidad_display="100g", peso_gramos=100.0, kcal=kcal / 2
+        ),
+        Ingredient(
+            nombre="Aceite de oliva",
+            cantidad_display="10ml",
+            peso_gramos=9.0,
+            kcal=kcal / 2,
+        ),
+    ]
+    meal = make_meal(slot=slot, kcal=kcal, title=f"{food} {slot.value}")
+    return meal.model_copy(update={"ingredients": ingredients})
+
+
+def _state(**overrides: Any) -> dict[str, Any]:
+    state: dict[str, Any] = {
+        "daily_meals": [
+            _meal(MealSlot.DESAYUNO, 600.0, "Avena"),
+            _meal(MealSlot.COMIDA, 800.0, "Pollo"),
+            _meal(MealSlot.CENA, 600.0, "Merluza"),
+        ],
+        "meal_distribution": {"Desayuno": 600.0, "Comida": 800.0, "Cena": 600.0},
+        "user_profile": make_profile(),
+        "nutritional_targets": make_targets(),
+    }
+    state.update(overrides)
+    return state
+
+
+def _counts() -> tuple[float, float]:
+    return (
+        metrics.counter_value("validation_meals_total", outcome="reused"),
+        metrics.counter_value("validation_meals_total", outcome="computed"),
+    )
+
+
+class TestIncrementalValidation:
+    def test_unchanged_plan_reuses_every_check(self) -> None:
+        first = validation(_state())
+        validation(_state(validation_cache=first["validation_cache"]))
+
+        assert _counts() == (3.0, 3.0)
+
+    def test_replaced_meal_is_the_only_one_recomputed(self) -> None:
+        first = validation(_state())
+        meals = _state()["daily_meals"]
+        meals[2] = _meal(MealSlot.CENA, 600.0, "Salmon")
+
+        result = validation(
+            _state(daily_meals=meals, validation_cache=first["validation_cache"])
+        )
+
+        assert _counts() == (2.0, 4.0)
+        shopping_list = result["final_diet_plan"].shopping_list
+        expected = consolidate_ingredients(
+            ingredient for meal in meals for ingredient in meal.ingredients
+        )
+        assert shopping_list == expected
+        foods = {item.food for item in shopping_list}
+        assert "Salmon" in foods and "Merluza" not in foods
+        assert len(result["validation_cache"].checks) == 3
+
+    def test_changed_budget_invalidates_check(self) -> None:
+        first = validation(_state())
+        distribution = {"Desayuno": 700.0, "Comida": 700.0, "Cena": 600.0}
+
+        result = validation(
+            _state(
+                meal_distribution=distribution,
+                validation_cache=first["validation_cache"],
+            )
+        )
+
+        assert _counts() == (1.0, 5.0)
+        assert set(result["failed_meals"]) == {"Desayuno", "Comida"}
+
+    def test_changed_tolerance_policy_invalidates_check(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(tolerance, "_policy", TolerancePolicy(dict(DEFAULT_RULES)))
+        meals = _state()["daily_meals"]
+        meals[0] = _meal(MealSlot.DESAYUNO, 640.0, "Avena")
+        first = validation(_state(daily_meals=meals))
+        assert first["selected_meal_to_change"] == "Desayuno"
+
+        # ±10% per meal: the 6.7% deviation of Desayuno now passes
+        rules = {**DEFAULT_RULES, "meal": ToleranceRule(relative=0.10)}
+        monkeypatch.setattr(tolerance, "_policy", TolerancePolicy(rules))
+        result = validation(
+            _state(daily_meals=meals, validation_cache=first["validation_cache"])
+        )
+
+        assert _counts() == (0.0, 6.0)
+        assert result["validation_errors"] == []
+        checks = result["validation_cache"].checks.values()
+        assert all(check.tolerance == [0.10, 0.0] for check in checks)
+
+    def test_input_state_cache_not_mutated(self) -> None:
+        first = validation(_state())
+        cache = first["validation_cache"]
+        basis = list(cache.basis)
+        meals = _state()["daily_meals"]
+        meals[0] = _meal(MealSlot.DESAYUNO, 600.0, "Tostada")
+
+        validation(_state(daily_meals=meals, validation_cache=cache))
+
+        assert cache.basis == basis
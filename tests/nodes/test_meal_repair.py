@@ -0,0 +1,214 @@
+"""Unit tests for local repair of structured meal output.
+
+Covers:
+- Deterministic fixes (totals, splits, defaults, truncation, numeric strings)
+- Semantic failures still raise ValidationError
+- Repair metrics
+- Generation retries the LLM only when repair cannot fix the output
+"""
+
+import asyncio
+import importlib
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from src.nutrition_agent.meal_repair import (
+    DEFAULT_PREPARATION,
+    repair_meal,
+    repair_meal_payload,
+)
+from src.nutrition_agent.model_routing import ModelRoutingPolicy
+from src.shared.enums import MealTime
+from src.shared.metrics import metrics
+from tests.nodes.fakes import (
+    FakeLLM,
+    Scripted,
+    make_meal,
+    make_profile,
+    make_targets,
+)
+
+batch_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_batch"
+)
+generation_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.generation"
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+def _payload(**overrides: Any) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "meal_time": "Comida",
+        "title": "Pollo con arroz",
+        "description": "Pechuga de pollo a la plancha con arroz blanco",
+        "total_calories": 600.0,
+        "ingredients": [
+            {
+                "nombre": "Pechuga de pollo",
+                "cantidad_display": "200g",
+                "peso_gramos": 200.0,
+                "kcal": 330.0,
+            },
+            {
+                "nombre": "Arroz blanco",
+                "cantidad_display": "200g",
+                "peso_gramos": 200.0,
+                "kcal": 270.0,
+            },
+        ],
+        "preparation": ["Cocinar el arroz", "Asar el pollo"],
+        "alternative": None,
+    }
+    payload.update(overrides)
+    return payload
+
+
+class TestRepair:
+    def test_clean_payload_untouched(self) -> None:
+        data, fixes = repair_meal_payload(_payload())
+        assert fixes == []
+        assert data == _payload()
+
+    def test_total_recomputed_from_ingredients(self) -> None:
+        meal = repair_meal(_payload(total_calories=750.0))
+        assert meal.total_calories == 600.0
+
+    def test_total_within_half_kcal_kept(self) -> None:
+        meal = repair_meal(_payload(total_calories=600.4))
+        assert meal.total_calories == 600.4
+
+    def test_oversized_ingredient_split(self) -> None:
+        ingredients = [
+            {
+                "nombre": "Pasta cocida",
+                "cantidad_display": "1200g",
+                "peso_gramos": 1200.0,
+                "kcal": 1800.0,
+            }
+        ]
+        meal = repair_meal(_payload(ingredients=ingredients, total_calories=1800.0))
+        assert [ing.kcal for ing in meal.ingredients] == [900.0, 900.0]
+        assert [ing.peso_gramos for ing in meal.ingredients] == [600.0, 600.0]
+        assert meal.total_calories == 1800.0
+
+    def test_numeric_strings_parsed(self) -> None:
+        payload = _payload(total_calories="600 kcal")
+        payload["ingredients"][0]["kcal"] = "330 kcal"
+        payload["ingredients"][0]["peso_gramos"] = "200g"
+        meal = repair_meal(payload)
+        assert meal.ingredients[0].kcal == 330.0
+        assert meal.total_calories == 600.0
+
+    def test_short_title_and_description(self) -> None:
+        meal = repair_meal(_payload(title="Pollo", description="Rico"))
+        assert meal.title == "Pollo"
+        meal = repair_meal(_payload(title="Bol", description=""))
+        assert meal.title == "Comida Bol"
+        assert meal.description == "Comida Bol con Pechuga de pollo, Arroz blanco"
+
+    def test_long_title_truncated(self) -> None:
+        meal = repair_meal(_payload(title="Pollo " * 40))
+        assert 5 <= len(meal.title) <= 150
+
+    def test_preparation_defaults(self) -> None:
+        payload = _payload()
+        del payload["preparation"]
+        assert repair_meal(payload).preparation == [DEFAULT_PREPARATION]
+
+        meal = repair_meal(_payload(preparation="1. Cocinar\n2. Servir"))
+        assert meal.preparation == ["Cocinar", "Servir"]
+
+    def test_missing_cantidad_display(self) -> None:
+        payload = _payload()
+        del payload["ingredients"][1]["cantidad_display"]
+        assert repair_meal(payload).ingredients[1].cantidad_display == "200g"
+
+    def test_meal_time_normalized(self) -> None:
+        assert repair_meal(_payload(meal_time="cena")).meal_time == MealTime.CENA
+        payload = _payload()
+        del payload["meal_time"]
+        assert repair_meal(payload, "Snack PM").meal_time == MealTime.SNACK
+
+    def test_json_string_and_meal_inputs(self) -> None:
+        meal = make_meal(kcal=500.0)
+        assert repair_meal(meal.model_dump_json()) == meal
+        assert repair_meal(meal) == meal
+
+
+class TestSemanticFailures:
+    def test_no_ingredients(self) -> None:
+        with pytest.raises(ValidationError):
+            repair_meal(_payload(ingredients=[]))
+        assert metrics.counter_value("meal_repair_total", outcome="failed") == 1
+
+    def test_meal_over_limit(self) -> None:
+        ingredients = [
+            {
+                "nombre": "Aceite",
+                "cantidad_display": "300g",
+                "peso_gramos": 300.0,
+                "kcal": 2652.0,
+            }
+        ]
+        with pytest.raises(ValidationError):
+            repair_meal(_payload(ingredients=ingredients))
+
+
+class TestMetrics:
+    def test_outcomes_and_fixes(self) -> None:
+        repair_meal(_payload())
+        repair_meal(_payload(total_calories=750.0, title="Bol"))
+
+        assert metrics.counter_value("meal_repair_total", outcome="clean") == 1
+        assert metrics.counter_value("meal_repair_total", outcome="repaired") == 1
+        assert (
+            metrics.counter_value("meal_repair_fixes_total", fix="total_calories") == 1
+        )
+        assert metrics.counter_value("meal_repair_fixes_total", fix="title") == 1
+
+
+class TestGeneration:
+    """Repairable output is accepted; only semantic failures are retried."""
+
+    def _generate(self, monkeypatch: pytest.MonkeyPatch, fake: FakeLLM) -> tuple:
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", lambda schema, model, **kw: fake
+        )
+        monkeypatch.setattr(
+            generation_module, "get_model_routing_policy", ModelRoutingPolicy
+        )
+        return asyncio.run(
+            batch_module._generate_single_meal_with_validation(
+                meal_time="Comida",
+                target_calories=600.0,
+                user_profile=make_profile(),
+                nutritional_targets=make_targets(),
+                total_meals=3,
+                current_meal_number=2,
+                is_last_meal=False,
+            )
+        )
+
+    def test_repaired_without_retry(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = FakeLLM([Scripted(_payload(title="Bol", total_calories=900.0))])
+
+        meal, error = self._generate(monkeypatch, fake)
+
+        assert error is None
+        assert meal.total_calories == 600.0
+        assert len(fake.prompts) == 1
+
+    def test_semantic_failure_retried(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = FakeLLM([Scripted(_payload(ingredients=[])), Scripted(_payload())])
+
+        meal, error = self._generate(monkeypatch, fake)
+
+        assert error is None and meal is not None
+        assert len(fake.prompts) == 2
@@ -0,0 +1,126 @@
+"""Unit tests for meal-slot identity across the graph.
+
+Covers:
+- Every meal_distribution key is a MealSlot with a MealTime category
+- Generated meals are bound to their slot
+- validation budgets plans with two snacks per slot
+- recipe_generation_single replaces the meal of the selected slot
+"""
+
+import asyncio
+import importlib
+
+import pytest
+
+from src.nutrition_agent.meal_repair import MEAL_OUTPUT_SCHEMA, repair_meal
+from src.nutrition_agent.model_routing import ModelRoutingPolicy
+from src.nutrition_agent.nodes.calculation.tools import get_meal_distribution
+from src.nutrition_agent.nodes.validation.validation import validation
+from src.shared.enums import MealSlot, MealTime
+from tests.nodes.fakes import (
+    FakeLLM,
+    Scripted,
+    make_meal,
+    make_profile,
+    make_targets,
+)
+
+single_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_single"
+)
+generation_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.generation"
+)
+
+FIVE_MEALS = {
+    "Desayuno": 500.0,
+    "Snack AM": 200.0,
+    "Comida": 700.0,
+    "Snack PM": 200.0,
+    "Cena": 400.0,
+}
+
+
+def _five_meal_plan(snack_pm_kcal: float = 200.0) -> list:
+    return [
+        make_meal(slot=MealSlot.DESAYUNO, kcal=500.0),
+        make_meal(slot=MealSlot.SNACK_AM, kcal=200.0),
+        make_meal(slot=MealSlot.COMIDA, kcal=700.0),
+        make_meal(slot=MealSlot.SNACK_PM, kcal=snack_pm_kcal),
+        make_meal(slot=MealSlot.CENA, kcal=400.0),
+    ]
+
+
+def _state(daily_meals: list) -> dict:
+    return {
+        "daily_meals": daily_meals,
+        "nutritional_targets": make_targets(),
+        "user_profile": make_profile().model_copy(update={"number_of_meals": 5}),
+        "meal_distribution": FIVE_MEALS,
+    }
+
+
+class TestMealSlot:
+    @pytest.mark.parametrize("number_of_meals", range(1, 7))
+    def test_distribution_keys_are_slots(self, number_of_meals: int) -> None:
+        result = get_meal_distribution.invoke(
+            {"total_calories": 2000.0, "number_of_meals": number_of_meals}
+        )
+        for key in result:
+            assert isinstance(MealSlot(key).meal_time, MealTime)
+
+    def test_snacks_share_category(self) -> None:
+        assert MealSlot.SNACK_AM.meal_time == MealTime.SNACK
+        assert MealSlot.SNACK_PM.meal_time == MealTime.SNACK
+
+    def test_slot_key_falls_back_to_meal_time(self) -> None:
+        assert make_meal(MealTime.CENA).slot_key == "Cena"
+        assert make_meal(slot=MealSlot.SNACK_AM).slot_key == "Snack AM"
+
+
+class TestBinding:
+    def test_repair_binds_slot(self) -> None:
+        raw = make_meal(MealTime.DESAYUNO).model_dump(mode="json")
+        raw.pop("slot")
+        meal = repair_meal(raw, "Snack PM")
+        assert meal.slot == MealSlot.SNACK_PM
+        assert meal.meal_time == MealTime.SNACK
+
+    def test_llm_schema_has_no_slot(self) -> None:
+        assert "slot" not in MEAL_OUTPUT_SCHEMA["properties"]
+
+
+class TestValidation:
+    def test_two_snacks_budgeted_per_slot(self) -> None:
+        result = validation(_state(_five_meal_plan()))
+
+        assert result["validation_errors"] == []
+        assert result["final_diet_plan"] is not None
+
+    def test_failed_snack_targets_its_slot(self) -> None:
+        result = validation(_state(_five_meal_plan(snack_pm_kcal=300.0)))
+
+        assert result["selected_meal_to_change"] == "Snack PM"
+        assert set(result["meal_notices"]) == {"Snack PM"}
+
+
+class TestSingleRegeneration:
+    def test_replaces_selected_slot(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = FakeLLM([Scripted(make_meal(kcal=200.0, title="Snack nuevo"))])
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", lambda *a, **k: fake
+        )
+        monkeypatch.setattr(
+            generation_module, "get_model_routing_policy", ModelRoutingPolicy
+        )
+        state = {
+            **_state(_five_meal_plan(snack_pm_kcal=300.0)),
+            "selected_meal_to_change": "Snack PM",
+        }
+
+        result = asyncio.run(single_module.recipe_generation_single(state))
+
+        meals = result["daily_meals"]
+        assert [meal.slot_key for meal in meals] == list(FIVE_MEALS)
+        assert meals[3].title == "Snack nuevo"
+        assert meals[1].title != "Snack nuevo"
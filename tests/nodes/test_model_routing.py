@@ -0,0 +1,183 @@
+"""Unit tests for the model routing policy.
+
+Covers:
+- Per call site and per slot model selection with fallbacks
+- Environment overrides (NUTRITION_MODEL_ROUTES / NUTRITION_ESCALATION_MODEL)
+- Escalation to the stronger model after a failed attempt
+- Per-route latency and pass/fail metrics
+"""
+
+import asyncio
+import importlib
+
+import pytest
+
+from src.nutrition_agent.model_routing import (
+    ModelRoute,
+    ModelRoutingPolicy,
+    record_route_result,
+)
+from src.shared.metrics import metrics
+from tests.nodes.fakes import (
+    FakeLLM,
+    Scripted,
+    make_meal,
+    make_profile,
+    make_targets,
+)
+
+batch_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_batch"
+)
+generation_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.generation"
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+def _generate(meal_time: str, escalate: bool = False) -> tuple:
+    return asyncio.run(
+        batch_module._generate_single_meal_with_validation(
+            meal_time=meal_time,
+            target_calories=600.0,
+            user_profile=make_profile(),
+            nutritional_targets=make_targets(),
+            total_meals=4,
+            current_meal_number=3,
+            is_last_meal=False,
+            escalate=escalate,
+        )
+    )
+
+
+class TestPolicy:
+    """Routes resolve slot, then call site, then the default model."""
+
+    def test_default_routes(self) -> None:
+        policy = ModelRoutingPolicy()
+        assert policy.route("data_collection").model == "gpt-4o-mini"
+        assert policy.route("recipe_generation", "Snack PM").model == "gpt-4o-mini"
+        assert policy.route("recipe_generation", "Comida").model == "gpt-4o"
+        assert policy.route("unknown_site").model == "gpt-4o"
+
+    def test_route_label(self) -> None:
+        route = ModelRoutingPolicy().route("recipe_generation", "Cena")
+        assert route == ModelRoute(route="recipe_generation:Cena", model="gpt-4o")
+
+    def test_escalation(self) -> None:
+        policy = ModelRoutingPolicy()
+        route = policy.route("recipe_generation", "Snack AM", escalate=True)
+        assert route.model == "gpt-4o"
+        assert route.escalated
+        # Already on the strong model: nothing to escalate
+        assert not policy.route("recipe_generation", "Cena", escalate=True).escalated
+
+    def test_env_overrides(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(
+            "NUTRITION_MODEL_ROUTES", '{"recipe_generation:Cena": "gemini-2.5-flash"}'
+        )
+        monkeypatch.setenv("NUTRITION_ESCALATION_MODEL", "gpt-4.1")
+        policy = ModelRoutingPolicy.from_env()
+
+        assert policy.route("recipe_generation", "Cena").model == "gemini-2.5-flash"
+        assert policy.route("data_collection").model == "gpt-4o-mini"
+        assert policy.route("data_collection", escalate=True).model == "gpt-4.1"
+
+    def test_env_overrides_must_be_object(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("NUTRITION_MODEL_ROUTES", '["gpt-4o"]')
+        with pytest.raises(ValueError):
+            ModelRoutingPolicy.from_env()
+
+
+class TestGenerationRouting:
+    """Generation helpers use the routed model and escalate on failure."""
+
+    def _patch(self, monkeypatch: pytest.MonkeyPatch, fake: FakeLLM) -> list[str]:
+        models: list[str] = []
+
+        def _get_structured_llm(schema, model: str = "gpt-4o", **kwargs) -> FakeLLM:
+            models.append(model)
+            return fake
+
+        monkeypatch.setattr(
+            generation_module, "get_structured_llm", _get_structured_llm
+        )
+        monkeypatch.setattr(
+            generation_module, "get_model_routing_policy", ModelRoutingPolicy
+        )
+        return models
+
+    def test_snack_uses_fast_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        models = self._patch(monkeypatch, FakeLLM([Scripted(make_meal(kcal=600.0))]))
+
+        meal, error = _generate("Snack PM")
+
+        assert error is None
+        assert models == ["gpt-4o-mini"]
+        assert (
+            metrics.counter_value(
+                "model_route_calls_total",
+                route="recipe_generation:Snack PM",
+                model="gpt-4o-mini",
+                outcome="pass",
+            )
+            == 1
+        )
+
+    def test_escalates_after_failed_attempt(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = FakeLLM(
+            [Scripted(make_meal(kcal=900.0)), Scripted(make_meal(kcal=600.0))]
+        )
+        models = self._patch(monkeypatch, fake)
+
+        meal, error = _generate("Snack PM")
+
+        assert error is None and meal is not None
+        assert models == ["gpt-4o-mini", "gpt-4o"]
+        labels = {"route": "recipe_generation:Snack PM"}
+        assert (
+            metrics.counter_value(
+                "model_route_calls_total", model="gpt-4o-mini", outcome="fail", **labels
+            )
+            == 1
+        )
+        assert (
+            metrics.counter_value(
+                "model_route_calls_total", model="gpt-4o", outcome="pass", **labels
+            )
+            == 1
+        )
+
+    def test_graph_retry_starts_escalated(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        models = self._patch(monkeypatch, FakeLLM([Scripted(make_meal(kcal=600.0))]))
+
+        _generate("Snack PM", escalate=True)
+
+        assert models == ["gpt-4o"]
+
+
+class TestMetrics:
+    def test_latency_and_outcomes(self) -> None:
+        route = ModelRoute(route="data_collection", model="gpt-4o-mini")
+        record_route_result(route, "pass", 0.4)
+        record_route_result(route, "fail", 0.6)
+
+        summary = metrics.histogram_summary(
+            "model_route_latency_seconds", route="data_collection", model="gpt-4o-mini"
+        )
+        assert summary["count"] == 2
+        assert summary["mean"] == pytest.approx(0.5)
+
+    def test_unknown_outcome(self) -> None:
+        with pytest.raises(ValueError):
+            record_route_result(ModelRoute(route="x", model="y"), "timeout", 1.0)
@@ -0,0 +1,120 @@
+"""Unit tests for the calculation / validation node result cache.
+
+Covers:
+- Keys depend only on the state each node reads
+- Models and their checkpointed dict form produce the same key
+- Backend selection
+"""
+
+import sys
+import time
+from typing import Any
+
+import pytest
+from langgraph.cache.memory import InMemoryCache
+
+from src.nutrition_agent.node_cache import (
+    build_node_cache,
+    calculation_cache_key,
+    validation_cache_key,
+)
+from src.shared.enums import MealSlot
+from tests.nodes.fakes import make_meal, make_profile, make_targets
+
+
+def _state(**overrides: Any) -> dict[str, Any]:
+    state: dict[str, Any] = {
+        "daily_meals": [
+            make_meal(slot=MealSlot.DESAYUNO, kcal=600.0, title="Tostadas"),
+            make_meal(slot=MealSlot.COMIDA, kcal=800.0, title="Lentejas"),
+            make_meal(slot=MealSlot.CENA, kcal=600.0, title="Merluza"),
+        ],
+        "meal_distribution": {"Desayuno": 600.0, "Comida": 800.0, "Cena": 600.0},
+        "user_profile": make_profile(),
+        "nutritional_targets": make_targets(),
+        "validation_retry_count": 0,
+    }
+    state.update(overrides)
+    return state
+
+
+class TestCalculationKey:
+    def test_ignores_fields_calculation_does_not_read(self) -> None:
+        profile = make_profile()
+        other = profile.model_copy(update={"excluded_foods": ["gluten"]})
+
+        assert calculation_cache_key(
+            {"user_profile": profile}
+        ) == calculation_cache_key({"user_profile": other})
+
+    def test_changes_with_weight(self) -> None:
+        profile = make_profile()
+        heavier = profile.model_copy(update={"weight": 90})
+
+        assert calculation_cache_key(
+            {"user_profile": profile}
+        ) != calculation_cache_key({"user_profile": heavier})
+
+    def test_dict_and_model_agree(self) -> None:
+        profile = make_profile()
+
+        assert calculation_cache_key(
+            {"user_profile": profile}
+        ) == calculation_cache_key({"user_profile": profile.model_dump()})
+
+
+class TestValidationKey:
+    def test_same_inputs_same_key(self) -> None:
+        assert validation_cache_key(_state()) == validation_cache_key(_state())
+
+    def test_checkpointed_dicts_same_key(self) -> None:
+        state = _state()
+        dumped = {
+            **state,
+            "daily_meals": [meal.model_dump() for meal in state["daily_meals"]],
+            "nutritional_targets": state["nutritional_targets"].model_dump(),
+            "user_profile": state["user_profile"].model_dump(),
+        }
+
+        assert validation_cache_key(dumped) == validation_cache_key(state)
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"validation_retry_count": 1},
+            {"meal_distribution": {"Desayuno": 500.0, "Comida": 900.0, "Cena": 600.0}},
+            {"run_deadline": time.time() - 1},
+        ],
+    )
+    def test_inputs_change_key(self, overrides: dict[str, Any]) -> None:
+        assert validation_cache_key(_state(**overrides)) != validation_cache_key(
+            _state()
+        )
+
+    def test_replaced_meal_changes_key(self) -> None:
+        meals = _state()["daily_meals"]
+        meals[2] = make_meal(slot=MealSlot.CENA, kcal=600.0, title="Salmon")
+
+        assert validation_cache_key(_state(daily_meals=meals)) != (
+            validation_cache_key(_state())
+        )
+
+
+class TestBackends:
+    def test_off_disables_cache(self) -> None:
+        assert build_node_cache("off") is None
+
+    def test_memory_backend(self) -> None:
+        assert isinstance(build_node_cache("memory"), InMemoryCache)
+
+    def test_unknown_backend_rejected(self) -> None:
+        with pytest.raises(ValueError, match="NUTRITION_NODE_CACHE_BACKEND"):
+            build_node_cache("redis")
+
+    def test_sqlite_backend_needs_optional_package(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setitem(sys.modules, "langgraph.cache.sqlite", None)
+
+        with pytest.raises(ImportError, match="langgraph-checkpoint-sqlite"):
+            build_node_cache("sqlite")
@@ -0,0 +1,179 @@
+"""Unit tests for the local profile pre-check (profile_signals.py).
+
+Covers:
+- Messages with profile data are sent to the LLM, small talk is not
+- Every spelled-out number from one to one hundred is a signal
+- Yes/no replies to an assistant question are sent to the LLM
+- data_collection skips the LLM and reports the skip rate
+- Skipped answers to an assistant question are sent with the next extraction
+- NUTRITION_PROFILE_PRECHECK=off always calls the LLM
+"""
+
+import asyncio
+import importlib
+from typing import Any
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.nutrition_agent.model_routing import ModelRoutingPolicy
+from src.nutrition_agent.models import PartialUserProfile
+from src.nutrition_agent.profile_signals import may_update_profile
+from src.shared.metrics import metrics
+from tests.nodes.fakes import FakeLLM, Scripted
+
+dc_module = importlib.import_module(
+    "src.nutrition_agent.nodes.data_collection.data_collection"
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Tengo 34 años",
+        "treinta años",
+        "Peso setenta kilos",
+        "mido 1,80",
+        "Soy mujer",
+        "Trabajo en una oficina y no hago deporte",
+        "Quiero perder grasa",
+        "Prefiero keto",
+        "Soy alérgico a los frutos secos",
+        "sin lactosa, por favor",
+        "Hago tres comidas al día",
+        "Tengo veinticinco",
+        "diecinueve",
+        "once",
+        "Me muevo poco",
+        "Actividad ligera, a veces moderada",
+        "Entreno intenso",
+        "Quiero tonificar",
+    ],
+)
+def test_profile_data_is_detected(text: str) -> None:
+    assert may_update_profile(text)
+
+
+_UNITS = ["uno", "dos", "tres", "cuatro", "cinco", "seis", "siete", "ocho", "nueve"]
+_TENS = ["treinta", "cuarenta", "cincuenta", "sesenta", "setenta", "ochenta", "noventa"]
+SPELLED_NUMBERS = [
+    *_UNITS,
+    *["diez", "once", "doce", "trece", "catorce", "quince"],
+    *["dieciséis", "diecisiete", "dieciocho", "diecinueve", "veinte"],
+    *[f"veinti{unit}" for unit in _UNITS],
+    *[f"{tens} y {unit}" if unit else tens for tens in _TENS for unit in ["", *_UNITS]],
+    "cien",
+]
+
+
+def test_spelled_numbers_are_detected() -> None:
+    assert len(SPELLED_NUMBERS) == 100
+    assert [n for n in SPELLED_NUMBERS if not may_update_profile(n)] == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Hola",
+        "¡Gracias!",
+        "¿Qué es el TDEE?",
+        "Perfecto, nada más",
+        "Mañana te cuento",
+    ],
+)
+def test_small_talk_is_skipped(text: str) -> None:
+    assert not may_update_profile(text)
+
+
+def test_yes_no_answer_to_question() -> None:
+    assert may_update_profile("Sí", question="¿Prefieres una dieta keto?")
+    assert not may_update_profile("Sí", question="Perfecto.")
+
+
+def _patch(monkeypatch: pytest.MonkeyPatch, *responses: Scripted) -> FakeLLM:
+    fake = FakeLLM(list(responses))
+    monkeypatch.setattr(
+        dc_module, "get_structured_llm", lambda schema, model="", **kw: fake
+    )
+    monkeypatch.setattr(dc_module, "get_model_routing_policy", ModelRoutingPolicy)
+    return fake
+
+
+def _turn(text: str, question: str = "Genial. ¿Cuánto pesas?") -> dict[str, Any]:
+    state = {
+        "messages": [
+            HumanMessage(content="Tengo 30 años"),
+            AIMessage(content=question),
+            HumanMessage(content=text),
+        ],
+        "partial_profile": PartialUserProfile(age=30),
+        "profile_messages_seen": 2,
+    }
+    return asyncio.run(dc_module.data_collection(state))
+
+
+class TestDataCollectionPrecheck:
+    def test_small_talk_skips_llm(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = _patch(monkeypatch)
+
+        result = _turn("Gracias", question="Genial, ya tengo tu edad.")
+
+        assert fake.prompts == []
+        assert result["profile_messages_seen"] == 3
+        assert "age" not in result["missing_fields"]
+        assert metrics.counter_value("profile_precheck_total", outcome="skipped") == 1
+
+    def test_skipped_answer_stays_unseen(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = _patch(monkeypatch, Scripted(PartialUserProfile(weight=70)))
+        question = AIMessage(content="Genial. ¿Cuánto pesas?")
+        answer = HumanMessage(content="Antes, ¿qué es el TDEE?")
+
+        skipped = _turn(answer.content)
+        assert skipped["profile_messages_seen"] == 2
+
+        state = {
+            "messages": [
+                HumanMessage(content="Tengo 30 años"),
+                question,
+                answer,
+                AIMessage(content="El gasto energético diario. ¿Y tu peso?"),
+                HumanMessage(content="70 kilos"),
+            ],
+            "partial_profile": PartialUserProfile(age=30),
+            "profile_messages_seen": skipped["profile_messages_seen"],
+        }
+        asyncio.run(dc_module.data_collection(state))
+
+        _, *sent = fake.prompts[0]
+        assert sent[:2] == [question, answer]
+
+    def test_profile_data_reaches_llm(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        fake = _patch(monkeypatch, Scripted(PartialUserProfile(weight=70)))
+
+        result = _turn("70 kilos")
+
+        assert len(fake.prompts) == 1
+        assert result["partial_profile"].weight == 70
+        assert metrics.counter_value("profile_precheck_total", outcome="extract") == 1
+
+    def test_skip_rate_gauge(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _patch(monkeypatch, Scripted(PartialUserProfile(weight=70)))
+
+        _turn("Hola")
+        _turn("70 kilos")
+
+        gauges = metrics.snapshot()["gauges"]["profile_precheck_skip_rate"]
+        assert gauges[0]["value"] == pytest.approx(0.5)
+
+    def test_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("NUTRITION_PROFILE_PRECHECK", "off")
+        fake = _patch(monkeypatch, Scripted(PartialUserProfile()))
+
+        _turn("Hola")
+
+        assert len(fake.prompts) == 1
@@ -0,0 +1,172 @@
+"""Unit tests for speculative alternatives prepared during HITL review.
+
+Covers:
+- AlternativeCache hit / miss / stale lookups
+- One speculation round per plan (the review node runs again on resume)
+- change_meal without feedback is served from the cache, no LLM call
+- Token budget and discard on approve
+"""
+
+import asyncio
+import importlib
+from typing import Any
+
+import pytest
+
+from src.nutrition_agent import speculation
+from src.nutrition_agent.speculation import Alternative, AlternativeCache
+from src.shared.enums import MealSlot
+from src.shared.metrics import metrics
+from tests.nodes.fakes import make_meal, make_profile, make_targets
+
+review_module = importlib.import_module(
+    "src.nutrition_agent.nodes.meal_review.meal_review_batch"
+)
+single_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_single"
+)
+
+CONFIG = {"configurable": {"thread_id": "thread-1"}}
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> AlternativeCache:
+    enabled = AlternativeCache(enabled=True)
+    monkeypatch.setattr(speculation, "_cache", enabled)
+    return enabled
+
+
+def _state(**overrides: Any) -> dict[str, Any]:
+    state: dict[str, Any] = {
+        "daily_meals": [
+            make_meal(slot=MealSlot.DESAYUNO, kcal=600.0, title="Tostadas"),
+            make_meal(slot=MealSlot.COMIDA, kcal=800.0, title="Lentejas"),
+            make_meal(slot=MealSlot.CENA, kcal=600.0, title="Merluza"),
+        ],
+        "meal_distribution": {"Desayuno": 600.0, "Comida": 800.0, "Cena": 600.0},
+        "user_profile": make_profile(),
+        "nutritional_targets": make_targets(),
+    }
+    state.update(overrides)
+    return state
+
+
+class _FakeGenerator:
+    """Stand-in for _generate_single_meal_with_feedback (records calls)."""
+
+    def __init__(self) -> None:
+        self.calls: list[dict[str, Any]] = []
+
+    async def __call__(self, **kwargs: Any) -> tuple:
+        self.calls.append(kwargs)
+        slot = MealSlot(kwargs["meal_time"])
+        return make_meal(
+            slot=slot, kcal=kwargs["target_calories"], title="Otra receta"
+        ), None
+
+
+async def _review(cache: AlternativeCache) -> dict:
+    """Run the review node and wait for its speculation round."""
+    result = await review_module.meal_review_batch(_state(), CONFIG)
+    await asyncio.gather(*(task for _, task in cache._tasks.values()))
+    return result
+
+
+def _patch(monkeypatch: pytest.MonkeyPatch, response: dict) -> _FakeGenerator:
+    fake = _FakeGenerator()
+    monkeypatch.setattr(review_module, "_generate_single_meal_with_feedback", fake)
+    monkeypatch.setattr(review_module, "interrupt", lambda payload: response)
+    return fake
+
+
+class TestAlternativeCache:
+    def test_hit_miss_and_stale(self) -> None:
+        cache = AlternativeCache(enabled=True)
+        meal = make_meal(slot=MealSlot.CENA, title="Otra receta")
+        cache.put("t", "Cena", Alternative(meal=meal, replaces="Merluza"))
+
+        assert cache.take("t", "Cena", "Merluza") == Alternative(meal, "Merluza")
+        assert cache.take("t", "Cena", "Merluza") is None
+        cache.put("t", "Cena", Alternative(meal=meal, replaces="Merluza"))
+        assert cache.take("t", "Cena", "Salmon") is None
+
+        for outcome in ("hit", "miss", "stale"):
+            assert (
+                metrics.counter_value("speculative_alternatives_total", outcome=outcome)
+                == 1
+            )
+
+    def test_disabled_never_starts(self) -> None:
+        cache = AlternativeCache(enabled=False)
+        assert not cache.start("t", {"Cena": "Merluza"}, lambda slots: None)
+
+
+class TestSpeculation:
+    def test_one_round_per_plan(
+        self, monkeypatch: pytest.MonkeyPatch, cache: AlternativeCache
+    ) -> None:
+        fake = _patch(monkeypatch, {"action": "change_meal", "slot": "Cena"})
+
+        async def main() -> None:
+            await _review(cache)
+            # Resume re-runs the node: no second round for the same plan
+            await _review(cache)
+
+        asyncio.run(main())
+
+        assert [call["meal_time"] for call in fake.calls] == [
+            "Desayuno",
+            "Comida",
+            "Cena",
+        ]
+        assert "Merluza" in fake.calls[2]["user_feedback"]
+
+    def test_change_without_feedback_served_from_cache(
+        self, monkeypatch: pytest.MonkeyPatch, cache: AlternativeCache
+    ) -> None:
+        _patch(monkeypatch, {"action": "change_meal", "slot": "Cena"})
+
+        async def not_called(**kwargs: Any) -> tuple:
+            raise AssertionError("LLM must not be called on a cache hit")
+
+        monkeypatch.setattr(
+            single_module, "_generate_single_meal_with_feedback", not_called
+        )
+
+        async def main() -> dict:
+            review = await _review(cache)
+            return await single_module.recipe_generation_single(
+                _state(**review), CONFIG
+            )
+
+        result = asyncio.run(main())
+
+        assert result["daily_meals"][2].title == "Otra receta"
+        assert result["daily_meals"][0].title == "Tostadas"
+
+    def test_token_budget_stops_round(
+        self, monkeypatch: pytest.MonkeyPatch, cache: AlternativeCache
+    ) -> None:
+        cache.token_budget = 0
+        fake = _patch(monkeypatch, {"action": "change_meal", "slot": "Cena"})
+
+        asyncio.run(_review(cache))
+
+        assert fake.calls == []
+        assert (
+            metrics.counter_value("speculative_generation_total", outcome="budget") == 3
+        )
+
+    def test_approve_discards_alternatives(
+        self, monkeypatch: pytest.MonkeyPatch, cache: AlternativeCache
+    ) -> None:
+        _patch(monkeypatch, {"action": "approve"})
+
+        asyncio.run(_review(cache))
+
+        assert cache.take("thread-1", "Cena", "Merluza") is None
@@ -0,0 +1,246 @@
+"""Unit tests for targeted regeneration of failed meals.
+
+Covers:
+- validation reports every failed slot with its feedback
+- Only failed slots are regenerated; passing meals are kept untouched
+- The last slot closes the day with the exact remaining budget
+- route_after_validation sends 2+ failures to targeted regeneration
+- A change_meals review regenerates several slots in one round
+- A change_meals review without a valid change is asked again
+"""
+
+import asyncio
+import importlib
+from typing import Any
+
+import pytest
+
+from src.nutrition_agent.graph import (
+    route_after_meal_review_batch,
+    route_after_validation,
+)
+from src.nutrition_agent.nodes.validation.validation import validation
+from src.shared import Lane
+from src.shared.enums import MealSlot
+from src.shared.metrics import metrics
+from tests.nodes.fakes import make_meal, make_profile, make_targets
+
+review_module = importlib.import_module(
+    "src.nutrition_agent.nodes.meal_review.meal_review_batch"
+)
+targeted_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.recipe_generation_targeted"
+)
+
+DISTRIBUTION = {"Desayuno": 600.0, "Comida": 800.0, "Cena": 600.0}
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+def _state(**overrides: Any) -> dict[str, Any]:
+    state: dict[str, Any] = {
+        "daily_meals": [
+            make_meal(slot=MealSlot.DESAYUNO, kcal=400.0, title="Desayuno malo"),
+            make_meal(slot=MealSlot.COMIDA, kcal=800.0, title="Comida buena"),
+            make_meal(slot=MealSlot.CENA, kcal=400.0, title="Cena mala"),
+        ],
+        "meal_distribution": DISTRIBUTION,
+        "user_profile": make_profile(),
+        "nutritional_targets": make_targets(),
+        "failed_meals": {"Desayuno": "Sube a 600 kcal", "Cena": "Sube a 600 kcal"},
+        "validation_retry_count": 1,
+    }
+    state.update(overrides)
+    return state
+
+
+class _FakeGenerator:
+    """Stand-in for _generate_single_meal_with_feedback (records calls)."""
+
+    def __init__(self, kcal: dict[str, float]) -> None:
+        self.kcal = kcal
+        self.calls: list[dict[str, Any]] = []
+
+    async def __call__(self, **kwargs: Any) -> tuple:
+        self.calls.append(kwargs)
+        slot = kwargs["meal_time"]
+        return (
+            make_meal(slot=MealSlot(slot), kcal=self.kcal[slot], title=f"{slot} nuevo"),
+            None,
+        )
+
+
+def _run(monkeypatch: pytest.MonkeyPatch, fake: _FakeGenerator, **state: Any):
+    monkeypatch.setattr(targeted_module, "_generate_single_meal_with_feedback", fake)
+    return asyncio.run(targeted_module.recipe_generation_targeted(_state(**state)))
+
+
+class TestValidationReportsFailures:
+    def test_failed_slots_with_feedback(self) -> None:
+        state = _state(failed_meals={}, validation_retry_count=0)
+
+        result = validation(state)
+
+        assert set(result["failed_meals"]) == {"Desayuno", "Cena"}
+        assert result["selected_meal_to_change"] is None
+
+    def test_missing_slot_regenerated(self) -> None:
+        meals = _state()["daily_meals"][:2]
+        state = _state(daily_meals=meals, failed_meals={}, validation_retry_count=0)
+
+        result = validation(state)
+
+        assert "Cena" in result["failed_meals"]
+        assert "No meal was generated" in result["failed_meals"]["Cena"]
+
+
+class TestTargetedRegeneration:
+    def test_only_failed_slots_regenerated(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = _FakeGenerator({"Desayuno": 600.0, "Cena": 600.0})
+
+        result = _run(monkeypatch, fake)
+
+        assert [call["meal_time"] for call in fake.calls] == ["Desayuno", "Cena"]
+        titles = [meal.title for meal in result["daily_meals"]]
+        assert titles == ["Desayuno nuevo", "Comida buena", "Cena nuevo"]
+        assert result["failed_meals"] == {}
+        assert fake.calls[0]["user_feedback"] == "Sube a 600 kcal"
+        assert all(call["lane"] == Lane.BULK for call in fake.calls)
+        assert all(call["escalate"] for call in fake.calls)
+        assert (
+            metrics.counter_value("targeted_regeneration_meals_total", kind="kept") == 1
+        )
+
+    def test_last_slot_gets_remaining_budget(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = _FakeGenerator({"Desayuno": 650.0, "Cena": 550.0})
+
+        _run(monkeypatch, fake)
+
+        assert fake.calls[0]["target_calories"] == 600.0
+        # 2000 - (800 kept Comida + 650 new Desayuno)
+        assert fake.calls[1]["target_calories"] == 550.0
+
+    def test_failed_generation_keeps_old_meal(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def failing(**kwargs: Any) -> tuple:
+            return None, "Failed after 3 attempts"
+
+        result = _run(monkeypatch, failing)  # type: ignore[arg-type]
+
+        assert len(result["daily_meals"]) == 3
+        assert set(result["meal_generation_errors"]) == {"Desayuno", "Cena"}
+
+
+class TestRouting:
+    def test_multiple_failures_route_to_targeted(self) -> None:
+        state = {
+            "validation_errors": ["a", "b"],
+            "validation_retry_count": 1,
+            "selected_meal_to_change": None,
+            "failed_meals": {"Desayuno": "x", "Cena": "y"},
+        }
+        assert route_after_validation(state) == "recipe_generation_targeted"
+
+    def test_no_failing_slot_routes_to_batch(self) -> None:
+        state = {
+            "validation_errors": ["Daily total off"],
+            "validation_retry_count": 1,
+            "selected_meal_to_change": None,
+            "failed_meals": {},
+        }
+        assert route_after_validation(state) == "recipe_generation_batch"
+
+
+class TestChangeMealsReview:
+    def _review(self, monkeypatch: pytest.MonkeyPatch, response: dict) -> dict:
+        monkeypatch.setattr(review_module, "interrupt", lambda payload: response)
+        return asyncio.run(review_module.meal_review_batch(_state(failed_meals={})))
+
+    def test_several_changes_in_one_round(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        result = self._review(
+            monkeypatch,
+            {
+                "action": "change_meals",
+                "changes": [
+                    {"slot": "Desayuno", "feedback": "Sin huevo"},
+                    {"slot": "Cena", "feedback": "Algo ligero"},
+                    {"slot": "Cena", "feedback": "Con pescado"},
+                ],
+            },
+        )
+
+        assert result["review_decision"] == "change_meals"
+        assert result["failed_meals"] == {
+            "Desayuno": "Sin huevo",
+            "Cena": "Algo ligero; Con pescado",
+        }
+        assert route_after_meal_review_batch(result) == "recipe_generation_targeted"
+
+    def test_single_change_uses_change_meal(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        result = self._review(
+            monkeypatch,
+            {"action": "change_meals", "changes": [{"slot": "Cena", "feedback": "x"}]},
+        )
+
+        assert result["review_decision"] == "change_meal"
+        assert result["selected_meal_to_change"] == "Cena"
+        assert route_after_meal_review_batch(result) == "recipe_generation_single"
+
+    @pytest.mark.parametrize(
+        "changes",
+        [
+            None,
+            [],
+            [{"slot": "Merienda", "feedback": "x"}, {"feedback": "y"}, "Cena"],
+        ],
+    )
+    def test_no_valid_change_asks_again(
+        self, monkeypatch: pytest.MonkeyPatch, changes: list | None
+    ) -> None:
+        payloads: list[dict] = []
+        responses = [
+            {"action": "change_meals", "changes": changes},
+            {"action": "change_meals", "changes": [{"slot": "Cena", "feedback": "x"}]},
+        ]
+
+        def _interrupt(payload: dict) -> dict:
+            payloads.append(payload)
+            return responses.pop(0)
+
+        monkeypatch.setattr(review_module, "interrupt", _interrupt)
+        result = asyncio.run(review_module.meal_review_batch(_state(failed_meals={})))
+
+        assert "error" not in payloads[0]
+        assert "Desayuno, Comida, Cena" in payloads[1]["error"]
+        assert payloads[1]["daily_meals"] == payloads[0]["daily_meals"]
+        assert result["review_decision"] == "change_meal"
+        assert result["selected_meal_to_change"] == "Cena"
+        assert metrics.counter_value("meal_review_invalid_changes_total") == 1
+
+    def test_user_changes_run_on_interactive_lane(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fake = _FakeGenerator({"Desayuno": 600.0, "Cena": 600.0})
+
+        result = _run(
+            monkeypatch,
+            fake,
+            review_decision="change_meals",
+            validation_retry_count=0,
+        )
+
+        assert all(call["lane"] == Lane.INTERACTIVE for call in fake.calls)
+        assert not any(call["escalate"] for call in fake.calls)
+        assert result["review_decision"] is None
@@ -0,0 +1,132 @@
+"""Unit tests for the calorie tolerance policy.
+
+Covers:
+- Relative bands with absolute floors
+- Rule lookup by scope, slot and objective
+- Environment overrides and runtime replacement
+- Saved-retry metrics
+- Absolute floors in the validation node
+"""
+
+import pytest
+
+from src.nutrition_agent.models import Ingredient, Meal
+from src.nutrition_agent.nodes.validation.validation import validation
+from src.nutrition_agent.tolerance import (
+    TolerancePolicy,
+    ToleranceRule,
+    get_tolerance_policy,
+    set_tolerance_policy,
+)
+from src.shared.enums import MealTime
+from src.shared.metrics import metrics
+from tests.nodes.fakes import make_profile, make_targets
+
+
+@pytest.fixture(autouse=True)
+def _reset() -> None:
+    metrics.reset()
+    set_tolerance_policy(None)
+
+
+class TestRules:
+    def test_absolute_floor_for_small_targets(self) -> None:
+        rule = ToleranceRule(relative=0.05, absolute_kcal=30.0)
+        assert rule.allowed_kcal(150.0) == 30.0
+        assert rule.allowed_kcal(1000.0) == 50.0
+
+    def test_lookup_most_specific_first(self) -> None:
+        policy = TolerancePolicy(
+            {
+                "meal": ToleranceRule(0.05),
+                "last_meal": ToleranceRule(0.02),
+                "daily": ToleranceRule(0.05),
+                "meal:fat_loss": ToleranceRule(0.03),
+                "meal:Cena": ToleranceRule(0.04),
+                "meal:Cena:fat_loss": ToleranceRule(0.01),
+            }
+        )
+        assert policy.rule_for("meal", "Cena", "fat_loss")[0] == "meal:Cena:fat_loss"
+        assert policy.rule_for("meal", "Cena", "maintenance")[0] == "meal:Cena"
+        assert policy.rule_for("meal", "Comida", "fat_loss")[0] == "meal:fat_loss"
+        assert policy.rule_for("meal", "Comida")[0] == "meal"
+
+    def test_missing_scope_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            TolerancePolicy({"meal": ToleranceRule(0.05)})
+
+    def test_unknown_scope(self) -> None:
+        with pytest.raises(ValueError):
+            TolerancePolicy().rule_for("weekly")
+
+
+class TestConfiguration:
+    def test_env_overrides(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(
+            "NUTRITION_TOLERANCE_RULES",
+            '{"meal:Snack PM": {"relative": 0.1, "absolute_kcal": 40}, "daily": 0.03}',
+        )
+        policy = TolerancePolicy.from_env()
+        assert policy.rules["meal:Snack PM"] == ToleranceRule(0.1, 40.0)
+        assert policy.rules["daily"] == ToleranceRule(0.03)
+
+    def test_runtime_replacement(self) -> None:
+        rules = {**TolerancePolicy().rules, "daily": ToleranceRule(0.1)}
+        custom = TolerancePolicy(rules)
+        set_tolerance_policy(custom)
+        assert get_tolerance_policy() is custom
+
+
+class TestMetrics:
+    def test_saved_retries_counted(self) -> None:
+        policy = TolerancePolicy()
+        # 150 kcal snack, 20 kcal off: 13% relative, within the 30 kcal floor
+        assert policy.check(170.0, 150.0, "meal", slot="Snack PM").passed
+        assert not policy.check(200.0, 150.0, "meal", slot="Snack PM").passed
+        assert policy.check(602.0, 600.0, "meal", slot="Comida").passed
+
+        def count(rule: str, outcome: str) -> float:
+            return metrics.counter_value(
+                "tolerance_checks_total", rule=rule, scope="meal", outcome=outcome
+            )
+
+        assert count("meal:Snack PM", "saved") == 1
+        assert count("meal:Snack PM", "fail") == 1
+        assert count("meal", "pass") == 1
+
+
+class TestValidationNode:
+    def _meal(self, meal_time: MealTime, kcal: float) -> Meal:
+        return Meal(
+            meal_time=meal_time,
+            title="Comida de prueba",
+            description="Descripcion de prueba para tests de tolerancia",
+            total_calories=kcal,
+            ingredients=[
+                Ingredient(
+                    nombre="Ingrediente",
+                    cantidad_display="100g",
+                    peso_gramos=100.0,
+                    kcal=kcal,
+                )
+            ],
+            preparation=["Paso 1"],
+        )
+
+    def test_small_snack_within_floor(self) -> None:
+        targets = make_targets(target_calories=1650.0)
+        state = {
+            "daily_meals": [
+                self._meal(MealTime.DESAYUNO, 750.0),
+                self._meal(MealTime.SNACK, 170.0),  # 13% off a 150 kcal budget
+                self._meal(MealTime.CENA, 750.0),
+            ],
+            "nutritional_targets": targets,
+            "user_profile": make_profile(),
+            "meal_distribution": {"Desayuno": 750.0, "Snack": 150.0, "Cena": 750.0},
+        }
+
+        result = validation(state)
+
+        assert result["validation_errors"] == []
+        assert result["meal_notices"]["Snack"].severity == "warning"
@@ -277,8 +277,8 @@ class TestValidationMealCountMismatch:
         assert len(count_errors) == 1
 
 
-class TestValidationMultipleMealsFailRoutesToBatch:
-    """When 2+ meals fail budget check → no targeted regen (batch route)."""
+class TestValidationMultipleMealsFailRoutesToTargeted:
+    """When 2+ meals fail budget check → failed_meals (targeted regen route)."""
 
     def test_two_meals_off(self) -> None:
         """Desayuno and Cena both off → selected_meal_to_change is None."""
@@ -300,9 +300,10 @@ class TestValidationMultipleMealsFailRoutesToBatch:
 
         assert result["final_diet_plan"] is None
         assert len(result["validation_errors"]) >= 2
-        # Multiple failures → no targeted regen
+        # Multiple failures → every failed slot regenerated, Comida kept
         assert result["selected_meal_to_change"] is None
         assert result["user_feedback"] is None
+        assert set(result["failed_meals"]) == {"Desayuno", "Cena"}
         assert result["validation_retry_count"] == 1
 
 
@@ -0,0 +1,200 @@
+"""Unit tests for the record/replay cassette layer.
+
+Tests recording and replaying without network including:
+- Chat model responses recorded once and replayed without a live call
+- Replay misses raise instead of reaching the network
+- Simulated latency (fixed and recorded)
+- Retriever documents recorded and replayed (no live retriever in replay)
+- RAG extractor chain and retriever end to end through ResourceLoader
+- get_llm builds replay clients without credentials
+"""
+
+import asyncio
+import importlib
+import time
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.retrievers import BaseRetriever
+from langchain_openai import ChatOpenAI
+
+from src.nutrition_agent.models.tools import NutriFacts
+from src.shared.cassette import (
+    CassetteLLMCache,
+    CassetteMissError,
+    CassetteRetriever,
+    cassette_mode,
+)
+from src.shared.llm import get_llm
+
+tool_module = importlib.import_module(
+    "src.nutrition_agent.nodes.recipe_generation.tool"
+)
+
+
+class _ListRetriever(BaseRetriever):
+    """Live retriever stand-in that counts calls."""
+
+    documents: list[Document]
+    calls: int = 0
+
+    def _get_relevant_documents(self, query, *, run_manager) -> list[Document]:
+        self.calls += 1
+        return self.documents
+
+
+def _fake_model(cache, *answers: str) -> GenericFakeChatModel:
+    return GenericFakeChatModel(
+        messages=iter([AIMessage(content=a) for a in answers]), cache=cache
+    )
+
+
+@pytest.fixture
+def reset_resource_loader():
+    tool_module.ResourceLoader._retriever = None
+    tool_module.ResourceLoader._extractor_llm = None
+    yield
+    tool_module.ResourceLoader._retriever = None
+    tool_module.ResourceLoader._extractor_llm = None
+
+
+class TestLLMCassette:
+    """Chat model responses round-trip through cassette files."""
+
+    def test_record_then_replay(self, tmp_path) -> None:
+        recorder = _fake_model(CassetteLLMCache("record", tmp_path), "respuesta")
+        assert recorder.invoke("hola").content == "respuesta"
+
+        # No scripted answers left: any live call would fail
+        player = _fake_model(CassetteLLMCache("replay", tmp_path))
+        assert player.invoke("hola").content == "respuesta"
+        assert len(list((tmp_path / "llm").glob("*.json"))) == 1
+
+    def test_replay_miss_raises(self, tmp_path) -> None:
+        player = _fake_model(CassetteLLMCache("replay", tmp_path))
+        with pytest.raises(CassetteMissError, match="NUTRITION_CASSETTE_MODE"):
+            player.invoke("sin grabar")
+
+    def test_fixed_replay_latency(self, tmp_path) -> None:
+        _fake_model(CassetteLLMCache("record", tmp_path), "r").invoke("hola")
+        player = _fake_model(CassetteLLMCache("replay", tmp_path, latency=0.05))
+
+        async def _run() -> float:
+            start = time.monotonic()
+            await player.ainvoke("hola")
+            return time.monotonic() - start
+
+        assert asyncio.run(_run()) >= 0.05
+
+    def test_recorded_latency(self, tmp_path) -> None:
+        cache = CassetteLLMCache("record", tmp_path)
+        assert cache.lookup("p", "llm") is None
+        time.sleep(0.02)
+        generation = ChatGeneration(message=AIMessage(content="x"))
+        cache.update("p", "llm", [generation])
+
+        player = CassetteLLMCache("replay", tmp_path, latency="recorded")
+        start = time.monotonic()
+        assert player.lookup("p", "llm")[0].message.content == "x"
+        assert time.monotonic() - start >= 0.02
+
+
+class TestRetrieverCassette:
+    """Retrieved documents round-trip through cassette files."""
+
+    def test_record_then_replay(self, tmp_path) -> None:
+        live = _ListRetriever(
+            documents=[Document(page_content="Manzana 52 kcal", metadata={"id": 1})]
+        )
+        recorder = CassetteRetriever(
+            inner=live, namespace="idx", mode="record", directory=str(tmp_path)
+        )
+        asyncio.run(recorder.ainvoke("manzana"))
+
+        player = CassetteRetriever(namespace="idx", directory=str(tmp_path))
+        docs = asyncio.run(player.ainvoke("manzana"))
+
+        assert live.calls == 1
+        assert docs == [Document(page_content="Manzana 52 kcal", metadata={"id": 1})]
+
+    def test_namespace_is_part_of_key(self, tmp_path) -> None:
+        live = _ListRetriever(documents=[])
+        CassetteRetriever(
+            inner=live, namespace="idx-a", mode="record", directory=str(tmp_path)
+        ).invoke("manzana")
+
+        with pytest.raises(CassetteMissError):
+            CassetteRetriever(namespace="idx-b", directory=str(tmp_path)).invoke(
+                "manzana"
+            )
+
+
+class TestConfiguration:
+    """A single env var switches call sites into cassette mode."""
+
+    def test_invalid_mode(self, monkeypatch) -> None:
+        monkeypatch.setenv("NUTRITION_CASSETTE_MODE", "live")
+        with pytest.raises(ValueError):
+            cassette_mode()
+
+    def test_get_llm_replay_needs_no_credentials(self, monkeypatch, tmp_path) -> None:
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setenv("NUTRITION_CASSETTE_MODE", "replay")
+        monkeypatch.setenv("NUTRITION_CASSETTE_DIR", str(tmp_path))
+
+        llm = get_llm("gpt-4o")
+
+        assert isinstance(llm.cache, CassetteLLMCache)
+        assert llm.cache.mode == "replay"
+
+    def test_extractor_and_retriever_end_to_end(
+        self, monkeypatch, tmp_path, reset_resource_loader
+    ) -> None:
+        monkeypatch.setenv("NUTRITION_CASSETTE_DIR", str(tmp_path))
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        facts_json = '{"food_name": "Manzana", "calories_100g": 52, "notes": ""}'
+
+        async def _live_generate(self, messages, *args, **kwargs) -> ChatResult:
+            # ChatOpenAI structured output attaches the parsed Pydantic object
+            facts = NutriFacts.model_validate_json(facts_json)
+            message = AIMessage(content=facts_json, additional_kwargs={"parsed": facts})
+            return ChatResult(generations=[ChatGeneration(message=message)])
+
+        async def _run() -> tuple[list[Document], object]:
+            retriever = await tool_module.ResourceLoader.get_retriever()
+            extractor = await tool_module.ResourceLoader.get_extractor_chain()
+            docs = await retriever.ainvoke("manzana")
+            facts = await extractor.ainvoke(
+                {"ingredient_name": "manzana", "context": docs[0].page_content}
+            )
+            return docs, facts
+
+        # Record: "live" services are stand-ins
+        monkeypatch.setenv("NUTRITION_CASSETTE_MODE", "record")
+        monkeypatch.setattr(ChatOpenAI, "_agenerate", _live_generate)
+        live = _ListRetriever(documents=[Document(page_content="Manzana 52 kcal")])
+        monkeypatch.setattr(
+            tool_module.ResourceLoader,
+            "_init_retriever_sync",
+            staticmethod(lambda: live),
+        )
+        recorded = asyncio.run(_run())
+
+        # Replay: no credentials, no live retriever, no live LLM
+        tool_module.ResourceLoader._retriever = None
+        tool_module.ResourceLoader._extractor_llm = None
+        monkeypatch.setenv("NUTRITION_CASSETTE_MODE", "replay")
+        monkeypatch.delenv("OPENAI_API_KEY")
+
+        async def _no_network(self, *args, **kwargs) -> ChatResult:
+            raise AssertionError("replay must not call the LLM")
+
+        monkeypatch.setattr(ChatOpenAI, "_agenerate", _no_network)
+        replayed = asyncio.run(_run())
+
+        assert live.calls == 1
+        assert replayed == recorded
+        assert replayed[1].calories_100g == 52
@@ -0,0 +1,168 @@
+"""Unit tests for cross-provider fallback and hedging.
+
+Tests the primary/secondary race with scripted runnables (no LLM) including:
+- Fast primary wins without touching the secondary
+- Primary error or timeout falls back to the secondary
+- Slow primary is hedged; the first valid response wins, the loser is cancelled
+- Both failing surfaces the primary's error
+- Provider timeouts raise ProviderTimeoutError, not TimeoutError
+- get_structured_llm only hedges across providers
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import BaseModel
+
+from src.shared.hedging import HedgedRunnable, ProviderTimeoutError
+from src.shared.llm import get_structured_llm
+from src.shared.metrics import metrics
+
+
+class _Answer(BaseModel):
+    text: str
+
+
+def _scripted(
+    value: str, delay: float = 0.0, error: Exception | None = None
+) -> tuple[Runnable, list[str]]:
+    """Runnable answering `value` after `delay`; records started/cancelled."""
+    events: list[str] = []
+
+    async def _run(_: object) -> str:
+        events.append("started")
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        if error is not None:
+            raise error
+        return value
+
+    return RunnableLambda(lambda _: value, afunc=_run), events
+
+
+def _hedged(primary: Runnable, secondary: Runnable, **kwargs) -> HedgedRunnable:
+    kwargs.setdefault("hedge_delay_s", 0.1)
+    kwargs.setdefault("timeout_s", 2.0)
+    return HedgedRunnable(primary, secondary, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+class TestFallback:
+    """Errors and timeouts move the request to the secondary."""
+
+    def test_fast_primary_wins(self) -> None:
+        primary, _ = _scripted("openai")
+        secondary, secondary_events = _scripted("gemini")
+
+        assert asyncio.run(_hedged(primary, secondary).ainvoke("p")) == "openai"
+        assert secondary_events == []
+        assert metrics.counter_value("llm_hedge_winner_total", provider="primary") == 1
+
+    def test_primary_error_falls_back_immediately(self) -> None:
+        primary, _ = _scripted("", error=RuntimeError("503 from provider"))
+        secondary, _ = _scripted("gemini")
+        hedged = _hedged(primary, secondary, hedge_delay_s=5.0)
+
+        start = time.monotonic()
+        assert asyncio.run(hedged.ainvoke("p")) == "gemini"
+        assert time.monotonic() - start < 1.0
+        assert metrics.counter_value("llm_hedge_triggered_total", reason="error") == 1
+
+    def test_primary_timeout_falls_back(self) -> None:
+        primary, primary_events = _scripted("openai", delay=5.0)
+        secondary, _ = _scripted("gemini", delay=0.05)
+        hedged = _hedged(primary, secondary, hedge_delay_s=5.0, timeout_s=0.2)
+
+        assert asyncio.run(hedged.ainvoke("p")) == "gemini"
+        assert "cancelled" in primary_events
+
+    def test_both_timeouts_raise_provider_timeout(self) -> None:
+        primary, _ = _scripted("openai", delay=5.0)
+        secondary, _ = _scripted("gemini", delay=5.0)
+        hedged = _hedged(primary, secondary, hedge_delay_s=5.0, timeout_s=0.1)
+
+        # Not the builtin TimeoutError callers use for their run deadline
+        with pytest.raises(ProviderTimeoutError) as exc_info:
+            asyncio.run(hedged.ainvoke("p"))
+        assert not isinstance(exc_info.value, TimeoutError)
+
+    def test_both_fail_raises_primary_error(self) -> None:
+        primary, _ = _scripted("", error=RuntimeError("primary down"))
+        secondary, _ = _scripted("", error=ValueError("secondary down"))
+
+        with pytest.raises(RuntimeError, match="primary down"):
+            asyncio.run(_hedged(primary, secondary).ainvoke("p"))
+
+    def test_sync_fallback(self) -> None:
+        primary = RunnableLambda(lambda _: (_ for _ in ()).throw(RuntimeError("x")))
+        secondary = RunnableLambda(lambda _: "gemini")
+
+        assert _hedged(primary, secondary).invoke("p") == "gemini"
+
+
+class TestHedging:
+    """A slow primary is raced against the secondary."""
+
+    def test_secondary_wins_and_primary_cancelled(self) -> None:
+        primary, primary_events = _scripted("openai", delay=1.0)
+        secondary, _ = _scripted("gemini", delay=0.05)
+
+        start = time.monotonic()
+        assert asyncio.run(_hedged(primary, secondary).ainvoke("p")) == "gemini"
+        assert time.monotonic() - start < 0.8
+        assert primary_events == ["started", "cancelled"]
+        assert metrics.counter_value("llm_hedge_triggered_total", reason="slow") == 1
+        assert (
+            metrics.counter_value("llm_hedge_winner_total", provider="secondary") == 1
+        )
+
+    def test_primary_can_still_win_after_hedge(self) -> None:
+        primary, _ = _scripted("openai", delay=0.2)
+        secondary, secondary_events = _scripted("gemini", delay=1.0)
+
+        assert asyncio.run(_hedged(primary, secondary).ainvoke("p")) == "openai"
+        assert secondary_events == ["started", "cancelled"]
+
+    def test_invalid_fast_response_does_not_win(self) -> None:
+        primary, _ = _scripted("openai", delay=0.3)
+        secondary, _ = _scripted("", delay=0.05, error=ValueError("bad schema"))
+
+        assert asyncio.run(_hedged(primary, secondary).ainvoke("p")) == "openai"
+
+
+class TestGetStructuredLLM:
+    """Hedging is configured per environment and only across providers."""
+
+    def test_no_fallback_by_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.delenv("LLM_FALLBACK_MODEL", raising=False)
+
+        assert not isinstance(get_structured_llm(_Answer, "gpt-4o"), HedgedRunnable)
+
+    def test_same_provider_fallback_ignored(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        llm = get_structured_llm(_Answer, "gpt-4o", fallback_model="gpt-4o-mini")
+        assert not isinstance(llm, HedgedRunnable)
+
+    def test_cross_provider_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.setenv("GOOGLE_API_KEY", "test")
+        monkeypatch.setenv("LLM_FALLBACK_MODEL", "gemini-2.5-flash")
+        monkeypatch.setenv("LLM_HEDGE_DELAY_S", "3")
+
+        llm = get_structured_llm(_Answer, "gpt-4o", timeout_s=20)
+
+        assert isinstance(llm, HedgedRunnable)
+        assert llm.hedge_delay_s == 3.0
+        assert llm.timeout_s == 20
@@ -0,0 +1,192 @@
+"""Unit tests for the exact-match LLM response cache.
+
+Tests caching with fake chat models (no network) including:
+- Repeated identical calls served from cache (no second LLM call)
+- Bound tools / schema and model params are part of the key
+- LRU eviction at the size cap (memory and SQLite)
+- SQLite entries survive a new cache instance (tool calls and parsed
+  structured output round-trip)
+- Hit/miss metrics and hit rate
+- get_llm opt-in only for temperature 0
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+import src.shared.llm as llm_module
+from src.nutrition_agent.models.tools import NutriFacts
+from src.shared.llm import get_llm
+from src.shared.llm_cache import (
+    InMemoryLRUCache,
+    SQLiteLLMCache,
+    build_response_cache,
+)
+from src.shared.metrics import metrics
+
+
+def _fake_model(cache, *answers: str) -> GenericFakeChatModel:
+    return GenericFakeChatModel(
+        messages=iter([AIMessage(content=a) for a in answers]), cache=cache
+    )
+
+
+def _generation(text: str) -> list[ChatGeneration]:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+class TestInMemoryLRUCache:
+    """Identical calls hit the cache; the LRU cap evicts old entries."""
+
+    def test_second_identical_call_is_served_from_cache(self) -> None:
+        cache = InMemoryLRUCache(max_entries=10)
+        # Only one scripted answer: a second LLM call would raise StopIteration
+        model = _fake_model(cache, "primera")
+
+        async def _run() -> tuple[str, str]:
+            first = await model.ainvoke("manzana")
+            second = await model.ainvoke("manzana")
+            return first.content, second.content
+
+        assert asyncio.run(_run()) == ("primera", "primera")
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_different_input_misses(self) -> None:
+        cache = InMemoryLRUCache(max_entries=10)
+        model = _fake_model(cache, "a", "b")
+
+        assert model.invoke("manzana").content == "a"
+        assert model.invoke("pera").content == "b"
+        assert cache.stats.hits == 0
+
+    def test_bound_schema_is_part_of_key(self) -> None:
+        cache = InMemoryLRUCache(max_entries=10)
+        model = _fake_model(cache, "sin tools", "con tools")
+        tool = {"type": "function", "function": {"name": "NutriFacts"}}
+
+        assert model.invoke("manzana").content == "sin tools"
+        assert model.bind(tools=[tool]).invoke("manzana").content == "con tools"
+
+    def test_lru_eviction(self) -> None:
+        cache = InMemoryLRUCache(max_entries=2)
+        cache.update("a", "llm", _generation("A"))
+        cache.update("b", "llm", _generation("B"))
+        assert cache.lookup("a", "llm") is not None  # "a" now most recent
+        cache.update("c", "llm", _generation("C"))
+
+        assert cache.lookup("b", "llm") is None
+        assert cache.lookup("a", "llm") is not None
+        assert len(cache) == 2
+        assert metrics.counter_value("llm_cache_evictions_total", cache="memory") == 1
+
+    def test_invalid_size(self) -> None:
+        with pytest.raises(ValueError):
+            InMemoryLRUCache(max_entries=0)
+
+
+class TestSQLiteLLMCache:
+    """On-disk cache persists entries and respects its size cap."""
+
+    def test_persists_across_instances(self, tmp_path) -> None:
+        path = tmp_path / "llm_cache.sqlite"
+        message = AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "NutriFacts", "args": {"calories_100g": 52}, "id": "call_1"}
+            ],
+        )
+        SQLiteLLMCache(path).update("p", "llm", [ChatGeneration(message=message)])
+
+        cached = SQLiteLLMCache(path).lookup("p", "llm")
+
+        assert cached is not None
+        assert cached[0].message.tool_calls[0]["args"] == {"calories_100g": 52}
+
+    def test_parsed_structured_output_round_trips(self, tmp_path) -> None:
+        facts = NutriFacts(food_name="Manzana", calories_100g=52, notes="")
+        message = AIMessage(content="{}", additional_kwargs={"parsed": facts})
+        cache = SQLiteLLMCache(tmp_path / "c.sqlite")
+        cache.update("p", "llm", [ChatGeneration(message=message)])
+
+        cached = cache.lookup("p", "llm")
+
+        assert cached[0].message.additional_kwargs["parsed"] == facts.model_dump()
+
+    def test_lru_eviction(self, tmp_path) -> None:
+        cache = SQLiteLLMCache(tmp_path / "c.sqlite", max_entries=2)
+        cache.update("a", "llm", _generation("A"))
+        cache.update("b", "llm", _generation("B"))
+        assert cache.lookup("a", "llm") is not None
+        cache.update("c", "llm", _generation("C"))
+
+        assert len(cache) == 2
+        assert cache.lookup("b", "llm") is None
+        assert cache.lookup("a", "llm") is not None
+
+    def test_chat_model_hit(self, tmp_path) -> None:
+        cache = SQLiteLLMCache(tmp_path / "c.sqlite")
+        model = _fake_model(cache, "unica")
+
+        assert model.invoke("manzana").content == "unica"
+        assert model.invoke("manzana").content == "unica"
+        assert cache.stats.hit_rate == pytest.approx(0.5)
+
+
+class TestMetrics:
+    """Hit rates are published to the metrics registry."""
+
+    def test_hit_and_miss_counters(self) -> None:
+        cache = InMemoryLRUCache(name="extractor")
+        cache.lookup("p", "llm")
+        cache.update("p", "llm", _generation("A"))
+        cache.lookup("p", "llm")
+        cache.lookup("p", "llm")
+
+        assert (
+            metrics.counter_value(
+                "llm_cache_requests_total", cache="extractor", result="hit"
+            )
+            == 2
+        )
+        assert (
+            metrics.counter_value(
+                "llm_cache_requests_total", cache="extractor", result="miss"
+            )
+            == 1
+        )
+        gauges = metrics.snapshot()["gauges"]["llm_cache_hit_rate"]
+        assert gauges[0]["value"] == pytest.approx(2 / 3)
+
+
+class TestConfiguration:
+    """Backends from env and get_llm opt-in."""
+
+    def test_build_backends(self, tmp_path) -> None:
+        assert build_response_cache("off") is None
+        assert isinstance(build_response_cache("memory"), InMemoryLRUCache)
+        sqlite_cache = build_response_cache("sqlite", path=str(tmp_path / "x.db"))
+        assert isinstance(sqlite_cache, SQLiteLLMCache)
+        with pytest.raises(ValueError):
+            build_response_cache("redis")
+
+    def test_get_llm_requires_temperature_zero(self, monkeypatch) -> None:
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        with pytest.raises(ValueError, match="temperature=0"):
+            get_llm("gpt-4o-mini", cache=True)
+
+    def test_get_llm_attaches_cache(self, monkeypatch) -> None:
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        cache = InMemoryLRUCache()
+        monkeypatch.setattr(llm_module, "get_response_cache", lambda: cache)
+
+        assert get_llm("gpt-4o-mini", temperature=0, cache=True).cache is cache
+        assert get_llm("gpt-4o-mini", temperature=0).cache is None
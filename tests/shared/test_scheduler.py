@@ -0,0 +1,173 @@
+"""Unit tests for the process-wide LLM scheduler.
+
+Tests admission control (no LLM) including:
+- RPM and TPM budgets queue calls beyond the limit
+- Interactive lane overtakes queued bulk work
+- Retry-After headers pause admissions
+- Queue wait time exposed as a metric
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.shared.metrics import metrics
+from src.shared.scheduler import (
+    Lane,
+    LLMScheduler,
+    _retry_after_seconds,
+    estimate_tokens,
+)
+
+
+class _RateLimitError(Exception):
+    """Mimics openai.RateLimitError (exposes response.headers)."""
+
+    def __init__(self, headers: dict[str, str]) -> None:
+        super().__init__("Rate limit reached")
+        self.response = SimpleNamespace(headers=headers)
+
+
+class TestBudgets:
+    """Calls beyond RPM/TPM budgets wait for the sliding window."""
+
+    def test_unlimited_admits_immediately(self) -> None:
+        scheduler = LLMScheduler()
+
+        async def _run() -> None:
+            for _ in range(20):
+                async with scheduler.slot(Lane.BULK, 10_000):
+                    pass
+
+        asyncio.run(_run())
+        assert scheduler.queue_depth == 0
+
+    def test_rpm_budget_queues_excess(self) -> None:
+        scheduler = LLMScheduler(requests_per_minute=2, window_s=0.2)
+
+        async def _run() -> float:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(3):
+                async with scheduler.slot(Lane.BULK):
+                    pass
+            return loop.time() - start
+
+        elapsed = asyncio.run(_run())
+        # Third call must wait for the first to leave the 0.2s window
+        assert elapsed >= 0.15
+
+    def test_tpm_budget_queues_excess(self) -> None:
+        scheduler = LLMScheduler(tokens_per_minute=1000, window_s=0.2)
+
+        async def _run() -> float:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            async with scheduler.slot(Lane.BULK, 800):
+                pass
+            async with scheduler.slot(Lane.BULK, 800):
+                pass
+            return loop.time() - start
+
+        assert asyncio.run(_run()) >= 0.15
+
+    def test_oversized_call_admitted_on_empty_window(self) -> None:
+        """A single call larger than the TPM budget must not deadlock."""
+        scheduler = LLMScheduler(tokens_per_minute=100, window_s=0.2)
+
+        async def _run() -> None:
+            async with scheduler.slot(Lane.BULK, 5000):
+                pass
+
+        asyncio.run(asyncio.wait_for(_run(), timeout=1.0))
+
+
+class TestPriorityLanes:
+    """Interactive work is admitted before queued bulk work."""
+
+    def test_interactive_overtakes_bulk(self) -> None:
+        scheduler = LLMScheduler(requests_per_minute=1, window_s=0.2)
+        order: list[str] = []
+
+        async def _call(name: str, lane: Lane) -> None:
+            async with scheduler.slot(lane):
+                order.append(name)
+
+        async def _run() -> None:
+            await _call("first", Lane.BULK)  # fills the window
+            bulk = asyncio.create_task(_call("bulk", Lane.BULK))
+            await asyncio.sleep(0.01)
+            interactive = asyncio.create_task(_call("interactive", Lane.INTERACTIVE))
+            await asyncio.gather(bulk, interactive)
+
+        asyncio.run(_run())
+        assert order == ["first", "interactive", "bulk"]
+
+    def test_cancelled_waiter_leaves_queue(self) -> None:
+        scheduler = LLMScheduler(requests_per_minute=1, window_s=0.2)
+
+        async def _run() -> None:
+            async with scheduler.slot(Lane.BULK):
+                pass
+            waiter = asyncio.create_task(scheduler.slot(Lane.BULK).__aenter__())
+            await asyncio.sleep(0.01)
+            assert scheduler.queue_depth == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        asyncio.run(_run())
+        assert scheduler.queue_depth == 0
+
+
+class TestRetryAfter:
+    """Rate-limit errors with Retry-After pause the scheduler."""
+
+    def test_parses_seconds_and_ms(self) -> None:
+        assert _retry_after_seconds(_RateLimitError({"retry-after": "2"})) == 2.0
+        assert _retry_after_seconds(_RateLimitError({"retry-after-ms": "1500"})) == 1.5
+        assert _retry_after_seconds(ValueError("boom")) is None
+
+    def test_follows_exception_cause(self) -> None:
+        wrapped = RuntimeError("wrapped")
+        wrapped.__cause__ = _RateLimitError({"retry-after": "3"})
+        assert _retry_after_seconds(wrapped) == 3.0
+
+    def test_error_pauses_admissions(self) -> None:
+        scheduler = LLMScheduler()
+
+        async def _run() -> float:
+            loop = asyncio.get_running_loop()
+            with pytest.raises(_RateLimitError):
+                async with scheduler.slot(Lane.INTERACTIVE):
+                    raise _RateLimitError({"retry-after": "0.2"})
+            start = loop.time()
+            async with scheduler.slot(Lane.INTERACTIVE):
+                pass
+            return loop.time() - start
+
+        assert asyncio.run(_run()) >= 0.15
+
+
+class TestMetrics:
+    """Queue wait time is recorded per lane."""
+
+    def test_wait_time_observed(self) -> None:
+        metrics.reset()
+        scheduler = LLMScheduler()
+
+        async def _run() -> None:
+            async with scheduler.slot(Lane.INTERACTIVE):
+                pass
+
+        asyncio.run(_run())
+        summary = metrics.histogram_summary(
+            "llm_scheduler_wait_seconds", lane="interactive"
+        )
+        assert summary["count"] == 1
+        assert metrics.counter_value("llm_scheduler_admitted_total", lane="interactive")
+
+    def test_estimate_tokens(self) -> None:
+        assert estimate_tokens("x" * 400, completion_tokens=0) == 100
+        assert estimate_tokens([SimpleNamespace(content="x" * 40)], 10) == 20
@@ -0,0 +1,192 @@
+"""Unit tests for token and cost accounting.
+
+Tests usage collection with fake chat models (no network) including:
+- track_usage collects usage_metadata across asyncio.gather tasks
+- Nested contexts do not leak usage into each other
+- Cost estimation by model-name prefix
+- usage_records publishes token/cost metrics
+- summarize_usage aggregates per node, model and run
+- Run id resolution (config override, state, fallback)
+"""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.shared.metrics import metrics
+from src.shared.usage import (
+    UsageRecord,
+    estimate_cost_usd,
+    resolve_run_id,
+    start_run_id,
+    summarize_usage,
+    track_usage,
+    usage_records,
+)
+
+
+def _fake_model(model: str, input_tokens: int, output_tokens: int, calls: int = 1):
+    """Chat model answering `calls` times with fixed usage metadata."""
+    messages = [
+        AIMessage(
+            content="ok",
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            response_metadata={"model_name": model},
+        )
+        for _ in range(calls)
+    ]
+    return GenericFakeChatModel(messages=iter(messages))
+
+
+def _record(run_id: str, node: str, model: str, tokens: int, cost: float):
+    return UsageRecord(
+        run_id=run_id,
+        node=node,
+        model=model,
+        input_tokens=tokens,
+        output_tokens=0,
+        total_tokens=tokens,
+        cost_usd=cost,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> None:
+    metrics.reset()
+
+
+class TestTrackUsage:
+    """track_usage collects usage of every call made in its context."""
+
+    def test_collects_calls_across_gather(self) -> None:
+        model = _fake_model("gpt-4o-2024-08-06", 100, 20, calls=3)
+
+        async def _run() -> dict:
+            with track_usage() as usage:
+                await asyncio.gather(*(model.ainvoke("hola") for _ in range(3)))
+            return usage.usage_metadata
+
+        collected = asyncio.run(_run())
+        assert collected["gpt-4o-2024-08-06"]["input_tokens"] == 300
+        assert collected["gpt-4o-2024-08-06"]["output_tokens"] == 60
+
+    def test_separate_contexts_do_not_leak(self) -> None:
+        first = _fake_model("gpt-4o", 10, 1)
+        second = _fake_model("gpt-4o-mini", 50, 5)
+
+        async def _run() -> tuple[dict, dict]:
+            with track_usage() as usage_a:
+                await first.ainvoke("a")
+            with track_usage() as usage_b:
+                await second.ainvoke("b")
+            return usage_a.usage_metadata, usage_b.usage_metadata
+
+        usage_a, usage_b = asyncio.run(_run())
+        assert list(usage_a) == ["gpt-4o"]
+        assert list(usage_b) == ["gpt-4o-mini"]
+
+    def test_calls_outside_context_are_not_collected(self) -> None:
+        model = _fake_model("gpt-4o", 10, 1, calls=2)
+
+        async def _run() -> dict:
+            with track_usage() as usage:
+                pass
+            await model.ainvoke("fuera")
+            return usage.usage_metadata
+
+        assert asyncio.run(_run()) == {}
+
+
+class TestCost:
+    """Cost estimation uses the longest matching price prefix."""
+
+    def test_dated_snapshot_uses_base_price(self) -> None:
+        # gpt-4o: $2.50 / 1M input, $10.00 / 1M output
+        cost = estimate_cost_usd("gpt-4o-2024-08-06", 1_000_000, 100_000)
+        assert cost == pytest.approx(3.50)
+
+    def test_longest_prefix_wins(self) -> None:
+        cost = estimate_cost_usd("gpt-4o-mini-2024-07-18", 1_000_000, 0)
+        assert cost == pytest.approx(0.15)
+
+    def test_unknown_model_costs_zero(self) -> None:
+        assert estimate_cost_usd("llama-3", 1_000, 1_000) == 0.0
+
+
+class TestUsageRecords:
+    """usage_records converts collected usage and publishes metrics."""
+
+    def test_records_and_metrics(self) -> None:
+        model = _fake_model("gpt-4o-mini", 1_000, 200)
+
+        async def _run() -> list[UsageRecord]:
+            with track_usage() as usage:
+                await model.ainvoke("hola")
+            return usage_records(usage, node="data_collection", run_id="run-1")
+
+        records = asyncio.run(_run())
+        assert records == [
+            UsageRecord(
+                run_id="run-1",
+                node="data_collection",
+                model="gpt-4o-mini",
+                input_tokens=1_000,
+                output_tokens=200,
+                total_tokens=1_200,
+                cost_usd=round((1_000 * 0.15 + 200 * 0.60) / 1_000_000, 6),
+            )
+        ]
+        labels = {"node": "data_collection", "model": "gpt-4o-mini"}
+        assert metrics.counter_value("llm_tokens_total", kind="input", **labels) == 1000
+        assert metrics.counter_value("llm_tokens_total", kind="output", **labels) == 200
+        assert metrics.counter_value("llm_cost_usd_total", **labels) > 0
+
+
+class TestSummary:
+    """summarize_usage aggregates records of a thread."""
+
+    def test_aggregates_by_node_model_and_run(self) -> None:
+        records = [
+            _record("r1", "data_collection", "gpt-4o", 100, 0.1),
+            _record("r1", "recipe_generation_batch", "gpt-4o", 1_000, 1.0),
+            _record("r1", "recipe_generation_batch", "gpt-4o-mini", 50, 0.01),
+            _record("r2", "recipe_generation_single", "gpt-4o", 300, 0.3),
+        ]
+
+        summary = summarize_usage(records)
+
+        assert summary["total"]["total_tokens"] == 1_450
+        assert summary["total"]["cost_usd"] == pytest.approx(1.41)
+        assert summary["by_node"]["recipe_generation_batch"]["calls"] == 2
+        assert summary["by_model"]["gpt-4o-mini"]["total_tokens"] == 50
+        assert set(summary["by_run"]) == {"r1", "r2"}
+        assert summary["by_run"]["r1"]["total"]["total_tokens"] == 1_150
+        assert list(summary["by_run"]["r2"]["by_node"]) == ["recipe_generation_single"]
+
+    def test_empty_thread(self) -> None:
+        summary = summarize_usage([])
+        assert summary["total"]["calls"] == 0
+        assert summary["by_run"] == {}
+
+
+class TestRunId:
+    """Run ids come from config, then state."""
+
+    def test_start_run_id_generates_unique_ids(self) -> None:
+        assert start_run_id() != start_run_id()
+
+    def test_start_run_id_config_override(self) -> None:
+        assert start_run_id({"configurable": {"run_id": "abc"}}) == "abc"
+
+    def test_resolve_prefers_config_then_state(self) -> None:
+        state = {"run_id": "from-state"}
+        config = {"configurable": {"run_id": "from-config"}}
+        assert resolve_run_id(state, config) == "from-config"
+        assert resolve_run_id(state) == "from-state"
+        assert resolve_run_id({}) == "unknown"
@@ -0,0 +1,86 @@
+"""Unit tests for src/nutrition_agent/nodes/calculation/bulk.py
+bulk_nutritional_targets (vectorized generate_nutritional_plan)."""
+
+import itertools
+
+import pytest
+
+from src.nutrition_agent.nodes.calculation.bulk import bulk_nutritional_targets
+from src.nutrition_agent.nodes.calculation.tools import (
+    generate_nutritional_plan,
+    get_meal_distribution,
+)
+from src.shared.enums import ActivityLevel, DietType, Objective
+
+# Every enum combination, with extreme and typical body data
+ROWS = [
+    {
+        "age": age,
+        "gender": gender,
+        "weight": weight,
+        "height": height,
+        "activity_level": activity.value,
+        "objective": objective.value,
+        "diet_type": diet.value,
+    }
+    for (age, weight, height), gender, activity, objective, diet in (
+        itertools.product(
+            [(18, 30, 100), (34, 77, 171), (100, 300, 250)],
+            ["male", "female"],
+            ActivityLevel,
+            Objective,
+            DietType,
+        )
+    )
+]
+
+
+def _columns(rows: list[dict]) -> dict[str, list]:
+    return {field: [row[field] for row in rows] for field in rows[0]}
+
+
+def test_identical_to_scalar_tool() -> None:
+    targets = bulk_nutritional_targets(**_columns(ROWS))
+
+    assert len(targets) == len(ROWS)
+    for i, row in enumerate(ROWS):
+        assert targets.record(i) == generate_nutritional_plan.invoke(row)
+
+
+def test_meal_distribution_identical_to_scalar_tool() -> None:
+    rows = ROWS[:6]
+    targets = bulk_nutritional_targets(
+        **_columns(rows), number_of_meals=[1, 2, 3, 4, 5, 6]
+    )
+
+    for i in range(len(rows)):
+        expected = get_meal_distribution.invoke(
+            {
+                "total_calories": float(targets.target_calories[i]),
+                "number_of_meals": i + 1,
+            }
+        )
+        assert targets.meal_distribution(i) == expected
+        assert list(targets.meal_distribution(i)) == list(expected)
+
+
+def test_defaults_normal_diet_and_three_meals() -> None:
+    columns = _columns(ROWS[:1])
+    del columns["diet_type"]
+
+    targets = bulk_nutritional_targets(**columns)
+
+    assert targets.diet_type == [DietType.NORMAL]
+    assert list(targets.meal_distribution(0)) == ["Desayuno", "Comida", "Cena"]
+
+
+@pytest.mark.parametrize(
+    ("field", "value"),
+    [("age", 17), ("weight", 80.5), ("gender", "other"), ("objective", "bulk")],
+)
+def test_invalid_values_rejected(field: str, value: object) -> None:
+    columns = _columns(ROWS[:2])
+    columns[field] = [columns[field][0], value]
+
+    with pytest.raises(ValueError, match=field):
+        bulk_nutritional_targets(**columns)
@@ -0,0 +1,130 @@
+"""Unit tests for src/nutrition_agent/nodes/validation/tools.py
+consolidate_ingredients and aggregate_shopping_lists (structured shopping list)."""
+
+from src.nutrition_agent.models import Ingredient
+from src.nutrition_agent.nodes.validation.tools import (
+    aggregate_shopping_lists,
+    consolidate_ingredients,
+)
+
+
+def _ing(nombre: str, cantidad_display: str, peso_gramos: float) -> Ingredient:
+    return Ingredient(
+        nombre=nombre,
+        cantidad_display=cantidad_display,
+        peso_gramos=peso_gramos,
+        kcal=100.0,
+    )
+
+
+def test_grams_summed_from_peso_gramos() -> None:
+    """Grams come from peso_gramos, not from the display string."""
+    items = consolidate_ingredients(
+        [
+            _ing("Pechuga de pollo", "200g", 200.0),
+            _ing("Pechuga de pollo", "1 filete", 150.0),
+        ]
+    )
+
+    assert len(items) == 1
+    assert items[0].food == "Pechuga De Pollo"
+    assert items[0].amount == 350.0
+    assert items[0].unit == "g"
+    assert items[0].quantity == "350g"
+
+
+def test_ml_and_unidades_from_display() -> None:
+    """ml and unidades keep their unit; parenthesized weights are ignored."""
+    items = consolidate_ingredients(
+        [
+            _ing("Aceite de oliva", "10ml", 9.2),
+            _ing("Aceite de oliva", "5ml", 4.6),
+            _ing("Huevo entero", "3 unidades (150g)", 150.0),
+            _ing("Huevo entero", "2 unidades", 100.0),
+        ]
+    )
+
+    by_food = {item.food: item for item in items}
+    assert by_food["Aceite De Oliva"].amount == 15.0
+    assert by_food["Aceite De Oliva"].unit == "ml"
+    assert by_food["Huevo Entero"].amount == 5.0
+    assert by_food["Huevo Entero"].unit == "unidad/es"
+    assert by_food["Huevo Entero"].quantity == "5 unidad/es"
+
+
+def test_same_food_different_units_merged_by_density() -> None:
+    """Milk (1.03 g/ml): 30g are added to the ml line."""
+    items = consolidate_ingredients(
+        [_ing("Leche", "200ml", 206.0), _ing("Leche", "30g", 30.0)]
+    )
+
+    assert [(item.unit, item.amount) for item in items] == [("ml", 229.13)]
+
+
+def test_same_food_different_units_merged_by_unit_weight() -> None:
+    """Egg (50 g per unit): a weighed egg line becomes units."""
+    items = consolidate_ingredients(
+        [_ing("Huevo entero", "2 unidades", 100.0), _ing("Huevos", "100g", 100.0)]
+    )
+
+    assert [(item.food, item.unit, item.amount) for item in items] == [
+        ("Huevo Entero", "unidad/es", 2.0),
+        ("Huevos", "g", 100.0),
+    ]
+    merged = consolidate_ingredients(
+        [_ing("Huevo", "2 unidades", 100.0), _ing("Huevo", "100g", 100.0)]
+    )
+    assert merged[0].quantity == "4 unidad/es"
+
+
+def test_unknown_food_units_kept_apart() -> None:
+    items = consolidate_ingredients(
+        [_ing("Pollo", "1 unidad", 150.0), _ing("Pollo", "100g", 100.0)]
+    )
+
+    assert [(item.unit, item.amount) for item in items] == [
+        ("g", 100.0),
+        ("unidad/es", 1.0),
+    ]
+
+
+def test_unmeasurable_item() -> None:
+    items = consolidate_ingredients([_ing("Sal", "al gusto", 0.0)])
+
+    assert items[0].amount is None
+    assert items[0].unit is None
+    assert items[0].quantity == "cantidad no especificada"
+
+
+def test_cooking_notes_removed_from_name() -> None:
+    items = consolidate_ingredients(
+        [
+            _ing("Brócoli (al vapor)", "100g", 100.0),
+            _ing("Brócoli", "100g", 100.0),
+        ]
+    )
+
+    assert len(items) == 1
+    assert items[0].amount == 200.0
+
+
+def test_aggregate_shopping_lists_sums_amounts() -> None:
+    """Several days are summed on amount / unit, merging units."""
+    monday = consolidate_ingredients(
+        [_ing("Avena", "80g", 80.0), _ing("Leche", "250ml", 257.5)]
+    )
+    tuesday = consolidate_ingredients(
+        [
+            _ing("Avena", "60g", 60.0),
+            _ing("Leche", "103g", 103.0),
+            _ing("Sal", "al gusto", 0.0),
+        ]
+    )
+
+    items = aggregate_shopping_lists([monday, tuesday])
+
+    assert [(item.food, item.unit, item.amount) for item in items] == [
+        ("Avena", "g", 140.0),
+        ("Leche", "ml", 350.0),
+        ("Sal", None, None),
+    ]
@@ -1,7 +1,10 @@
 """Unit tests for src/nutrition_agent/nodes/validation/tools.py
 consolidate_shopping_list tool."""
 
-from src.nutrition_agent.nodes.validation.tools import consolidate_shopping_list
+from src.nutrition_agent.nodes.validation.tools import (
+    _parse_ingredient,
+    consolidate_shopping_list,
+)
 
 # consolidate_shopping_list tests
 
@@ -201,7 +204,7 @@ def test_count_with_parenthesized_weight() -> None:
 
 
 def test_output_uses_colon_format() -> None:
-    """Verify output format is '- Item: 200g' for _parse_shopping_list compat."""
+    """Verify output format is '- Item: 200g'."""
     result = consolidate_shopping_list.invoke({"ingredients_raw": ["200g Pollo"]})
 
     # Should contain ": " separator for items with quantities
@@ -211,7 +214,7 @@ def test_output_uses_colon_format() -> None:
     assert "200g" in result
 
 
-# Adapter output format tests — covers _ingredients_to_raw_strings() output
+# Adapter output format tests — "<qty> <unit> <name>" strings
 
 
 def test_unidades_qty_first() -> None:
@@ -280,3 +283,35 @@ def test_mixed_units_same_plan() -> None:
     assert "unidad" in lower
     # Leche: 200ml
     assert "leche de almendra" in lower
+
+
+# Parser memo tests
+
+
+def test_parse_ingredient_memoized() -> None:
+    """Repeated strings are served from the memo with the same result."""
+    _parse_ingredient.cache_clear()
+
+    first = _parse_ingredient("Avena 80g (en copos)")
+    second = _parse_ingredient("Avena 80g (en copos)")
+
+    assert first == second == (80.0, "g", "avena")
+    assert _parse_ingredient.cache_info().hits == 1
+
+
+def test_parse_ingredient_fraction_first() -> None:
+    """A fraction + unit wins over any plain quantity, as in the legacy parser."""
+    assert _parse_ingredient("1/2 unidad Limón (50g)") == (0.5, "unidad/es", "limón")
+    assert _parse_ingredient("2 tazas (1/2 kg)") == (500.0, "g", "2 tazas")
+    assert _parse_ingredient("200g pollo 1/2 unidad") == (
+        0.5,
+        "unidad/es",
+        "200g pollo",
+    )
+    # Without a fraction the leftmost quantity is parsed
+    assert _parse_ingredient("3 huevos enteros (150g)") == (
+        150.0,
+        "g",
+        "3 huevos enteros",
+    )
+    assert _parse_ingredient("Arroz 80g (200ml de agua)") == (80.0, "g", "arroz")
@@ -0,0 +1,102 @@
+"""Unit tests for the pure functions behind the deterministic tools.
+
+Covers:
+- calculate_nutritional_plan / calculate_meal_distribution /
+  consolidate_raw_ingredients return exactly what their tools return
+- The calculation node (direct calls) matches the tool results
+"""
+
+import itertools
+
+import pytest
+
+from src.nutrition_agent.nodes.calculation.calculation import calculation
+from src.nutrition_agent.nodes.calculation.tools import (
+    calculate_meal_distribution,
+    calculate_nutritional_plan,
+    generate_nutritional_plan,
+    get_meal_distribution,
+)
+from src.nutrition_agent.nodes.validation.tools import (
+    consolidate_raw_ingredients,
+    consolidate_shopping_list,
+)
+from src.shared.enums import ActivityLevel, DietType, Objective
+from tests.nodes.fakes import make_profile
+
+PROFILES = [
+    {
+        "age": age,
+        "gender": gender,
+        "weight": weight,
+        "height": height,
+        "activity_level": activity,
+        "objective": objective,
+        "diet_type": diet,
+    }
+    for (age, weight, height), gender, activity, objective, diet in (
+        itertools.product(
+            [(18, 45, 150), (34, 77, 171), (70, 140, 200)],
+            ["male", "female"],
+            ActivityLevel,
+            Objective,
+            DietType,
+        )
+    )
+]
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_nutritional_plan_matches_tool(profile: dict) -> None:
+    direct = calculate_nutritional_plan(**profile).model_dump()
+
+    assert direct == generate_nutritional_plan.invoke(profile)
+
+
+@pytest.mark.parametrize(
+    ("total_calories", "number_of_meals"),
+    itertools.product([1234.0, 2000.0, 2687.0, 3333.3], range(1, 7)),
+)
+def test_meal_distribution_matches_tool(
+    total_calories: float, number_of_meals: int
+) -> None:
+    direct = calculate_meal_distribution(total_calories, number_of_meals)
+
+    assert direct == get_meal_distribution.invoke(
+        {"total_calories": total_calories, "number_of_meals": number_of_meals}
+    )
+
+
+def test_consolidate_raw_ingredients_matches_tool() -> None:
+    raw = ["200g Pollo", "Huevo 2 unidades", "100g Huevo", "1l Leche", "Sal"]
+
+    assert consolidate_raw_ingredients(raw) == consolidate_shopping_list.invoke(
+        {"ingredients_raw": raw}
+    )
+
+
+def test_calculation_node_matches_tools() -> None:
+    profile = make_profile()
+    plan = generate_nutritional_plan.invoke(
+        {
+            "age": profile.age,
+            "gender": profile.gender,
+            "weight": profile.weight,
+            "height": profile.height,
+            "activity_level": profile.activity_level,
+            "objective": profile.objective,
+            "diet_type": profile.diet_type,
+        }
+    )
+
+    result = calculation({"user_profile": profile.model_dump()})
+
+    targets = result["nutritional_targets"]
+    assert targets.target_calories == plan["target_calories"]
+    assert targets.protein_grams == plan["protein_grams"]
+    assert result["meal_distribution"] == get_meal_distribution.invoke(
+        {
+            "total_calories": plan["target_calories"],
+            "number_of_meals": profile.number_of_meals,
+        }
+    )
@@ -25,7 +25,7 @@ export function MealCard({ meal, animationIndex = 0 }: MealCardProps) {
     >
       {/* Meal time badge with animation */}
       <div className="absolute -top-6 -left-6 bg-green-500 text-white font-bold text-xl px-6 py-2 rounded-lg shadow-lg transform hover:scale-105 transition-transform duration-200">
-        {meal.meal_time}
+        {meal.slot ?? meal.meal_time}
       </div>
 
       <div className="mb-6 pb-4 border-b border-gray-200">
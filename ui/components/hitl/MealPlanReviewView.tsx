@@ -110,11 +110,11 @@ export function MealPlanReviewView({
         <div className="grid gap-4">
           {meals.map((meal) => (
             <MealReviewCard
-              key={meal.meal_time}
+              key={meal.slot ?? meal.meal_time}
               meal={meal}
-              isSelected={selectedMealTime === meal.meal_time}
+              isSelected={selectedMealTime === (meal.slot ?? meal.meal_time)}
               onSelect={onMealSelect}
-              notice={notices[meal.meal_time] || null}
+              notice={notices[meal.slot ?? meal.meal_time] || null}
             />
           ))}
         </div>
@@ -18,10 +18,12 @@ export function MealReviewCard({
   notice = null,
 }: MealReviewCardProps) {
   const [expanded, setExpanded] = useState(false);
+  // Slot identifies the meal in the plan (two snacks share meal_time)
+  const slot = meal.slot ?? meal.meal_time;
 
   const handleSelect = () => {
     if (onSelect) {
-      onSelect(meal.meal_time);
+      onSelect(slot);
     }
   };
 
@@ -39,7 +41,7 @@ export function MealReviewCard({
         <div className="flex-1 min-w-0">
           <div className="flex items-center gap-2 mb-1">
             <Badge variant="default" size="sm">
-              {meal.meal_time}
+              {slot}
             </Badge>
             <Badge variant="success" size="sm">
               {meal.total_calories.toFixed(0)} kcal
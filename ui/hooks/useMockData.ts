@@ -36,8 +36,10 @@ export function useMockData(scenario: MockScenario = "complete") {
 
   const userProfile = state.user_profile ?? null;
 
+  // Form values go to profile_submission, the key data_collection reads.
+  // The mock accepts them at once, as the agent does for a valid form.
   const setUserProfile = useCallback((profile: UserProfile) => {
-    setState((prev) => ({ ...prev, user_profile: profile }));
+    setState((prev) => ({ ...prev, profile_submission: profile, user_profile: profile }));
   }, []);
 
   const setScenario = useCallback((newScenario: MockScenario) => {
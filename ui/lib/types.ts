@@ -117,6 +117,8 @@ export interface Ingredient {
  */
 export interface Meal {
   meal_time: MealTime;
+  /** Slot in the daily plan (meal_distribution key, e.g. "Snack AM") */
+  slot?: string | null;
   title: string;
   description: string;
   total_calories: number;
@@ -131,6 +133,9 @@ export interface Meal {
 export interface ShoppingListItem {
   food: string;
   quantity: string;
+  /** Numeric quantity in `unit` (null when not measurable) */
+  amount?: number | null;
+  unit?: "g" | "ml" | "unidad/es" | null;
 }
 
 /**
@@ -149,7 +154,11 @@ export interface DietPlan {
 // AGENT STATE - Maps to src/nutrition_agent/state.py
 // =============================================================================
 
-export type ReviewDecision = "approve" | "change_meal" | "regenerate_all";
+export type ReviewDecision =
+  | "approve"
+  | "change_meal"
+  | "change_meals"
+  | "regenerate_all";
 
 export type AgentPhase =
   | "idle"
@@ -168,6 +177,14 @@ export interface NutritionAgentState {
   // Phase 1: Data Collection
   user_profile: UserProfile | null;
   missing_fields: string[];
+  /** Fields collected so far (null until the first extraction) */
+  partial_profile?: Partial<UserProfile> | null;
+  /**
+   * UserProfileForm values: validated by data_collection without the LLM.
+   * Set by useMockData for now; synced through CopilotKit shared state once
+   * the agent is connected (Phase 3).
+   */
+  profile_submission?: UserProfile | null;
 
   // Phase 2: Calculation
   nutritional_targets: NutritionalTargets | null;
@@ -185,6 +202,8 @@ export interface NutritionAgentState {
   // Phase 5: Validation
   validation_errors: string[];
   validation_retry_count: number;
+  /** Slot -> feedback of meals regenerated together (validation / change_meals) */
+  failed_meals?: Record<string, string>;
   meal_notices: Record<string, MealNotice>;
   final_diet_plan: DietPlan | null;
 }
@@ -204,13 +223,23 @@ export interface HITLInterruptPayload {
   daily_meals: Meal[];
   nutritional_targets: NutritionalTargets | null;
   meal_notices: Record<string, MealNotice>;
+  slots?: string[];
   options: HITLOption[];
 }
 
+export interface MealChange {
+  /** Slot of the meal to change (meal_distribution key) */
+  slot: string;
+  feedback: string;
+}
+
 export interface HITLUserResponse {
   action: ReviewDecision;
-  meal_time?: MealTime;
+  /** Slot of the meal to change (meal_distribution key) */
+  slot?: string;
   feedback?: string;
+  /** Meals to change in one round (action "change_meals") */
+  changes?: MealChange[];
 }
 
 // =============================================================================